@@ -30,6 +30,7 @@ from ..services.agent_celery_tasks import (
     document_summary_task,
     complete_contract_workflow
 )
+from .v1.ai_agents_ws import notify_workflow_progress
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/ai-agents/orchestrator", tags=["AI Agent Orchestrator"])
@@ -71,6 +72,11 @@ class WorkflowStatusResponse(BaseModel):
     execution_time: Optional[float] = Field(None, description="Execution time in seconds")
     completed_at: Optional[datetime] = Field(None, description="Completion timestamp")
     errors: List[str] = Field(default_factory=list, description="Error messages")
+    progress: Optional[float] = Field(None, description="Completed share of tasks (0-100) while running")
+    current_agent: Optional[str] = Field(None, description="Role of the agent currently working")
+    token_usage: Dict[str, int] = Field(default_factory=dict, description="Tokens used so far")
+    cost: Optional[float] = Field(None, description="LLM cost so far")
+    cancel_requested: bool = Field(False, description="Whether cancellation has been requested")
 
 
 class AgentStatusResponse(BaseModel):
@@ -187,7 +193,8 @@ async def execute_workflow(
     Execute a created workflow in the background.
     
     This endpoint starts the execution of a previously created workflow
-    using Celery for background processing.
+    in the background. The crew runs on the orchestrator's bounded crew
+    executor and its progress is pushed to workflow WebSocket subscribers.
     """
     try:
         orchestrator = get_agent_orchestrator()
@@ -200,10 +207,14 @@ async def execute_workflow(
                 detail=f"Workflow {workflow_id} not found"
             )
         
+        async def on_progress(event: Dict[str, Any]):
+            await notify_workflow_progress(workflow_id, event["progress"], event["type"], event)
+
         # Execute workflow in background
         background_tasks.add_task(
             orchestrator.execute_workflow,
-            workflow_id
+            workflow_id,
+            on_progress=on_progress
         )
         
         logger.info(
@@ -251,7 +262,12 @@ async def get_workflow_status(
             active=status_info["active"],
             execution_time=status_info.get("execution_time"),
             completed_at=datetime.fromisoformat(status_info["completed_at"]) if status_info.get("completed_at") else None,
-            errors=status_info.get("errors", [])
+            errors=status_info.get("errors", []),
+            progress=status_info.get("progress"),
+            current_agent=status_info.get("current_agent"),
+            token_usage=status_info.get("token_usage", {}),
+            cost=status_info.get("cost"),
+            cancel_requested=status_info.get("cancel_requested", False)
         )
         
     except HTTPException:
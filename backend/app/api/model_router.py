@@ -35,6 +35,8 @@ class ModelRequestAPI(BaseModel):
     stream: bool = Field(False, description="Enable streaming response")
     tools: Optional[List[Dict[str, Any]]] = Field(None, description="Available tools")
     system_prompt: Optional[str] = Field(None, description="System prompt")
+    cache: bool = Field(True, description="Allow serving deterministic requests from the response cache")
+    latency_critical: bool = Field(False, description="Hedge on a second model if the first responds slowly")
 
 
 class ModelResponseAPI(BaseModel):
@@ -89,7 +91,9 @@ async def generate_response(
             temperature=request.temperature,
             stream=request.stream,
             tools=request.tools,
-            system_prompt=request.system_prompt
+            system_prompt=request.system_prompt,
+            cache=request.cache,
+            latency_critical=request.latency_critical
         )
 
         # Generate response
@@ -217,6 +221,48 @@ async def health_check(
         )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_active_user),
+    model_router: ModelRouter = Depends(get_model_router)
+) -> Dict[str, Any]:
+    """
+    Get response cache statistics.
+
+    Returns hit rate, tier hit counts, evictions and the cost saved by
+    serving deterministic requests from the cache.
+    """
+    return model_router.get_cache_stats()
+
+
+@router.get("/admission/metrics")
+async def get_admission_metrics(
+    current_user: User = Depends(get_current_active_user),
+    model_router: ModelRouter = Depends(get_model_router)
+) -> Dict[str, Any]:
+    """
+    Get provider admission control metrics.
+
+    Returns current adaptive concurrency limits, in-flight requests, queue
+    depth and queue wait times per provider and per model.
+    """
+    return model_router.get_admission_metrics()
+
+
+@router.get("/models/health")
+async def get_model_health(
+    current_user: User = Depends(get_current_active_user),
+    model_router: ModelRouter = Depends(get_model_router)
+) -> Dict[str, Any]:
+    """
+    Get real-time model health.
+
+    Returns EWMA latency, tokens per second, error rate and circuit breaker
+    state for every model that has served requests.
+    """
+    return model_router.get_model_health()
+
+
 @router.post("/strategy")
 async def update_routing_strategy(
     strategy: str,
@@ -233,10 +279,10 @@ async def update_routing_strategy(
     """
     try:
         # Validate strategy
-        if strategy not in ["cost_optimized", "performance", "balanced"]:
+        if strategy not in ["cost_optimized", "performance", "balanced", "latency_optimized"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid strategy. Must be: cost_optimized, performance, or balanced"
+                detail="Invalid strategy. Must be: cost_optimized, performance, balanced, or latency_optimized"
             )
 
         # Update strategy
@@ -7,6 +7,7 @@ and management of background processing operations.
 
 from typing import Dict, Any, Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlmodel import Session
 
@@ -51,6 +52,14 @@ class DocumentExportRequest(TaskSubmissionRequest):
     include_metadata: bool = Field(default=True, description="Include contract metadata")
 
 
+class DocumentPackageExportRequest(TaskSubmissionRequest):
+    """Request model for multi-document package export tasks."""
+    contract_ids: List[int] = Field(min_length=1, description="Database contract record IDs in package order")
+    export_format: str = Field(default="pdf", description="Export format (pdf, docx)")
+    template_options: Optional[Dict[str, Any]] = Field(default=None, description="Template options applied to every document")
+    include_metadata: bool = Field(default=True, description="Include contract metadata")
+
+
 class TaskResponse(BaseModel):
     """Response model for task operations."""
     status: str
@@ -311,6 +320,74 @@ async def submit_document_export(
         )
 
 
+@router.post("/contracts/export/package", response_model=TaskResponse, tags=["document-export"])
+async def submit_document_package_export(
+    request: DocumentPackageExportRequest,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Submit several contracts for export as one package (e.g. a closing package).
+    
+    Each document is exported by its own task so the package renders in
+    parallel across export workers. The returned task ID identifies the
+    group; per-document task IDs are listed in the metadata.
+    """
+    try:
+        # Validate priority
+        try:
+            priority = TaskPriority[request.priority.upper()]
+        except KeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid priority: {request.priority}"
+            )
+        
+        # Validate export format
+        if request.export_format.lower() not in ["pdf", "docx"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported export format: {request.export_format}"
+            )
+        
+        # Validate contracts exist
+        from ..models.contract import Contract
+        missing = [
+            contract_id for contract_id in request.contract_ids
+            if not session.get(Contract, contract_id)
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Contracts not found: {missing}"
+            )
+        
+        # Submit one export task per document as a group
+        result = task_service.submit_document_package(
+            contract_ids=request.contract_ids,
+            user_id=current_user.id,
+            export_format=request.export_format,
+            template_options=request.template_options,
+            include_metadata=request.include_metadata,
+            priority=priority
+        )
+        
+        return TaskResponse(
+            status=result["status"],
+            task_id=result["group_id"],
+            estimated_completion=result.get("estimated_completion"),
+            metadata=result
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit document package export: {str(e)}"
+        )
+
+
 # Task Monitoring Endpoints
 
 @router.get("/tasks/{task_id}/status", response_model=TaskStatusResponse, tags=["task-monitoring"])
@@ -343,16 +420,18 @@ async def get_task_status(
 
 @router.get("/tasks/queues/status", tags=["task-monitoring"])
 async def get_queue_status(
+    refresh: bool = Query(default=False, description="Take a live sample instead of using the cached snapshot"),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get status of all task queues.
     
     Returns information about active, scheduled, and reserved tasks
-    across all processing queues.
+    across all processing queues, served from the periodically
+    collected introspection snapshot.
     """
     try:
-        return task_service.get_queue_status()
+        return await run_in_threadpool(task_service.get_queue_status, None, refresh)
         
     except Exception as e:
         raise HTTPException(
@@ -394,6 +473,7 @@ async def cancel_task(
 
 @router.get("/admin/workers/stats", tags=["admin"])
 async def get_worker_stats(
+    refresh: bool = Query(default=False, description="Take a live sample instead of using the cached snapshot"),
     current_user: User = Depends(require_admin)
 ):
     """
@@ -403,7 +483,7 @@ async def get_worker_stats(
     registered tasks, and health status.
     """
     try:
-        return task_service.get_worker_stats()
+        return await run_in_threadpool(task_service.get_worker_stats, None, refresh)
         
     except Exception as e:
         raise HTTPException(
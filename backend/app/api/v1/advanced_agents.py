@@ -417,6 +417,7 @@ async def get_suggested_clauses(
     transaction_type: str = Query(..., description="Transaction type"),
     jurisdiction: str = Query(..., description="Jurisdiction"),
     risk_factors: List[str] = Query(default=[], description="Risk factors"),
+    query: Optional[str] = Query(default=None, description="Deal description to rank clauses by relevance"),
     current_user: User = Depends(verify_agent_access)
 ) -> Dict[str, Any]:
     """Get suggested contract clauses for a transaction."""
@@ -433,7 +434,8 @@ async def get_suggested_clauses(
             property_type=property_type_enum,
             transaction_type=transaction_type_enum,
             jurisdiction=jurisdiction_enum,
-            risk_factors=risk_factors
+            risk_factors=risk_factors,
+            query=query
         )
 
         return {
@@ -441,7 +443,8 @@ async def get_suggested_clauses(
                 "property_type": property_type,
                 "transaction_type": transaction_type,
                 "jurisdiction": jurisdiction,
-                "risk_factors": risk_factors
+                "risk_factors": risk_factors,
+                "query": query
             },
             "suggested_clauses": clauses,
             "total_clauses": len(clauses),
@@ -20,6 +20,7 @@ from ...models.user import User
 from ...services.agent_orchestrator import get_agent_orchestrator, AgentRole
 from ...services.agent_memory import get_memory_manager
 from ...services.agent_tools import get_tools_for_agent
+from .ai_agents_ws import notify_execution_stream
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -452,13 +453,23 @@ async def _execute_agent_background(
         _execution_storage[execution_id]["progress"] = 30.0
         _execution_storage[execution_id]["updated_at"] = datetime.utcnow()
 
-        # Execute the task (simplified for now)
-        # In a full implementation, this would use the agent's tools and capabilities
+        # Execute the task, streaming partial output to execution subscribers
+        response = await orchestrator.stream_agent_response(
+            agent_role_enum,
+            task_description,
+            input_data,
+            on_chunk=lambda chunk: notify_execution_stream(execution_id, chunk)
+        )
+
         result = {
             "agent_role": agent_role,
             "task_description": task_description,
             "input_data": input_data,
-            "execution_time": "2.5s",
+            "output": response.content,
+            "model_used": response.model_used,
+            "token_usage": response.token_usage,
+            "cost": response.cost,
+            "execution_time": f"{response.processing_time:.1f}s",
             "tools_used": len(get_tools_for_agent(agent_role)),
             "status": "completed",
             "timestamp": datetime.utcnow().isoformat()
@@ -468,9 +479,6 @@ async def _execute_agent_background(
         _execution_storage[execution_id]["progress"] = 90.0
         _execution_storage[execution_id]["updated_at"] = datetime.utcnow()
 
-        # Simulate some processing time
-        await asyncio.sleep(1)
-
         # Complete execution
         _execution_storage[execution_id]["status"] = "completed"
         _execution_storage[execution_id]["progress"] = 100.0
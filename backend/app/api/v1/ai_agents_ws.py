@@ -17,6 +17,7 @@ import structlog
 from ...core.auth import get_current_user_ws
 from ...models.user import User
 from ...services.agent_memory import get_memory_manager
+from ...services.model_router import StreamChunk
 
 logger = structlog.get_logger(__name__)
 
@@ -109,6 +110,19 @@ class ConnectionManager:
             for connection_id in list(self.execution_subscribers[execution_id]):
                 await self.send_personal_message(message, connection_id)
     
+    async def broadcast_execution_stream(self, execution_id: str, data: Dict[str, Any]):
+        """Broadcast streamed model output to all execution subscribers."""
+        if execution_id in self.execution_subscribers:
+            message = {
+                "type": "execution_stream",
+                "execution_id": execution_id,
+                "data": data,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            
+            for connection_id in list(self.execution_subscribers[execution_id]):
+                await self.send_personal_message(message, connection_id)
+    
     async def broadcast_workflow_update(self, workflow_id: str, update: Dict[str, Any]):
         """Broadcast workflow update to all subscribers."""
         if workflow_id in self.workflow_subscribers:
@@ -246,6 +260,26 @@ async def notify_execution_progress(execution_id: str, progress: float, status:
     await manager.broadcast_execution_update(execution_id, update)
 
 
+async def notify_execution_stream(execution_id: str, chunk: StreamChunk):
+    """Forward a streamed token delta to execution subscribers."""
+    data = {
+        "delta": chunk.delta,
+        "index": chunk.index,
+        "model": chunk.model_used,
+        "done": chunk.done
+    }
+    
+    if chunk.done:
+        # Usage and cost are only known once the stream has finished
+        data.update({
+            "token_usage": chunk.response.token_usage,
+            "cost": chunk.response.cost,
+            "time_to_first_token": chunk.response.metadata.get("time_to_first_token")
+        })
+    
+    await manager.broadcast_execution_stream(execution_id, data)
+
+
 async def notify_workflow_progress(workflow_id: str, progress: float, status: str, details: Dict[str, Any] = None):
     """Notify WebSocket subscribers about workflow progress."""
     update = {
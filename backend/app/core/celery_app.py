@@ -150,6 +150,14 @@ celery_app.conf.update(
             "task": "app.tasks.system_tasks.update_task_metrics",
             "schedule": 60.0,  # Run every minute
         },
+        "reconcile-storage-quotas": {
+            "task": "app.tasks.system_tasks.reconcile_storage_quotas",
+            "schedule": float(settings.STORAGE_QUOTA_RECONCILE_INTERVAL),
+        },
+        "collect-export-artifacts": {
+            "task": "app.tasks.system_tasks.collect_export_artifacts",
+            "schedule": float(settings.EXPORT_ARTIFACT_GC_INTERVAL),
+        },
     },
     beat_schedule_filename="celerybeat-schedule",
 )
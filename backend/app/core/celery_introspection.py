@@ -0,0 +1,424 @@
+"""
+Cached Celery introspection for queue and worker statistics.
+
+Broadcast ``inspect()`` calls wait for every worker's reply timeout, and
+per-queue ``LLEN`` calls cost one Redis round trip each. Instead of doing that
+work on every API request, a background collector samples the cluster once
+per interval (pipelined Redis calls, one round of inspect broadcasts, live
+worker state from Celery events) and publishes the snapshot to a shared Redis
+cache. API reads are then served from the in-process copy or the shared cache.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import structlog
+from celery import Celery
+
+from .config import get_settings
+from .redis_config import get_redis_client
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Queues whose backlog is reported (matches celery_app task_queues)
+QUEUE_NAMES = ["ingest", "ocr", "llm", "export", "system"]
+
+SNAPSHOT_CACHE_KEY = "celery:introspection:snapshot"
+LEADER_LOCK_KEY = "celery:introspection:leader"
+
+# Registered task lists rarely change; refresh them every N samples
+REGISTERED_REFRESH_EVERY = 10
+
+
+@dataclass
+class IntrospectionSnapshot:
+    """Point-in-time view of Celery queues and workers."""
+    timestamp: datetime
+    queue_lengths: Dict[str, int] = field(default_factory=dict)
+    active_tasks: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    scheduled_tasks: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    reserved_tasks: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    worker_stats: Optional[Dict[str, Any]] = None
+    registered_tasks: Optional[Dict[str, List[str]]] = None
+    worker_ping: Optional[Dict[str, Any]] = None
+    workers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    collection_time_ms: float = 0.0
+    collected_by: str = ""
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(0.0, (datetime.utcnow() - self.timestamp).total_seconds())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the snapshot for the shared cache."""
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IntrospectionSnapshot":
+        """Deserialize a snapshot read from the shared cache."""
+        data = dict(data)
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return cls(**data)
+
+
+class CeleryIntrospectionService:
+    """
+    Background collector and cache for Celery queue and worker statistics.
+
+    Only one process per cluster samples at a time (guarded by a Redis lock);
+    every process can serve reads from the shared snapshot.
+    """
+
+    def __init__(self, celery_app: Celery):
+        self.celery_app = celery_app
+
+        # Configuration
+        self.interval = settings.CELERY_INTROSPECTION_INTERVAL
+        self.inspect_timeout = settings.CELERY_INSPECT_TIMEOUT
+        self.use_events = settings.CELERY_INTROSPECTION_USE_EVENTS
+        self.queue_names = list(QUEUE_NAMES)
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Cached state
+        self._snapshot: Optional[IntrospectionSnapshot] = None
+        self._registered_cache: Optional[Dict[str, List[str]]] = None
+        self._sample_count = 0
+        self._collect_lock = threading.Lock()
+
+        # Background threads
+        self._stop_event = threading.Event()
+        self._collector_thread: Optional[threading.Thread] = None
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_receiver = None
+        self._events_state = None
+
+        # Metrics
+        self.metrics = {
+            "collections": 0,
+            "collection_errors": 0,
+            "cache_hits": 0,
+            "shared_cache_hits": 0,
+            "on_demand_collections": 0,
+            "last_collection_ms": 0.0,
+        }
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the background collector (and event listener, if enabled)."""
+        if self._collector_thread and self._collector_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._collector_thread = threading.Thread(
+            target=self._run_collector, name="celery-introspection", daemon=True
+        )
+        self._collector_thread.start()
+
+        if self.use_events:
+            self._events_thread = threading.Thread(
+                target=self._run_event_listener, name="celery-introspection-events", daemon=True
+            )
+            self._events_thread.start()
+
+        logger.info(
+            "Celery introspection collector started",
+            interval=self.interval,
+            use_events=self.use_events,
+            instance_id=self.instance_id
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop background threads."""
+        self._stop_event.set()
+        if self._events_receiver is not None:
+            self._events_receiver.should_stop = True
+
+        for thread in (self._collector_thread, self._events_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=timeout)
+
+        self._collector_thread = None
+        self._events_thread = None
+        logger.info("Celery introspection collector stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background collector is running."""
+        return bool(self._collector_thread and self._collector_thread.is_alive())
+
+    # Reads
+
+    def get_snapshot(self, max_age_seconds: Optional[float] = None,
+                     refresh: bool = False) -> IntrospectionSnapshot:
+        """
+        Get the latest snapshot, collecting one only if nothing fresh is cached.
+
+        Args:
+            max_age_seconds: Maximum acceptable snapshot age (defaults to 2x interval)
+            refresh: Force a live collection
+
+        Returns:
+            IntrospectionSnapshot: Cached or freshly collected snapshot
+        """
+        max_age = max_age_seconds if max_age_seconds is not None else self.interval * 2
+
+        if not refresh:
+            snapshot = self._snapshot
+            if snapshot and snapshot.age_seconds <= max_age:
+                self.metrics["cache_hits"] += 1
+                return snapshot
+
+            snapshot = self._read_shared_snapshot()
+            if snapshot and snapshot.age_seconds <= max_age:
+                self._snapshot = snapshot
+                self.metrics["shared_cache_hits"] += 1
+                return snapshot
+
+        # Nothing fresh: collect once, letting concurrent callers share the result
+        with self._collect_lock:
+            snapshot = self._snapshot
+            if not refresh and snapshot and snapshot.age_seconds <= max_age:
+                self.metrics["cache_hits"] += 1
+                return snapshot
+
+            self.metrics["on_demand_collections"] += 1
+            return self.collect_snapshot()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get collector metrics."""
+        snapshot = self._snapshot
+        return {
+            **self.metrics,
+            "running": self.is_running,
+            "events_enabled": self._events_state is not None,
+            "snapshot_age_seconds": snapshot.age_seconds if snapshot else None,
+            "interval_seconds": self.interval,
+        }
+
+    # Collection
+
+    def collect_snapshot(self) -> IntrospectionSnapshot:
+        """
+        Sample queues and workers once and publish the result.
+
+        Returns:
+            IntrospectionSnapshot: The new snapshot
+        """
+        start = time.perf_counter()
+        errors: List[str] = []
+
+        queue_lengths = self._fetch_queue_lengths(errors)
+
+        inspect = self.celery_app.control.inspect(timeout=self.inspect_timeout)
+        active = self._safe_inspect(inspect, "active", errors)
+        scheduled = self._safe_inspect(inspect, "scheduled", errors)
+        reserved = self._safe_inspect(inspect, "reserved", errors)
+        stats = self._safe_inspect(inspect, "stats", errors)
+
+        if self._registered_cache is None or self._sample_count % REGISTERED_REFRESH_EVERY == 0:
+            registered = self._safe_inspect(inspect, "registered", errors)
+            if registered is not None:
+                self._registered_cache = registered
+        registered = self._registered_cache
+
+        # Worker liveness comes from event heartbeats when available, which
+        # avoids another broadcast round trip
+        workers = self._workers_from_events()
+        if workers:
+            ping = {name: "pong" for name, info in workers.items() if info.get("alive")}
+        else:
+            ping = self._safe_inspect(inspect, "ping", errors)
+
+        snapshot = IntrospectionSnapshot(
+            timestamp=datetime.utcnow(),
+            queue_lengths=queue_lengths,
+            active_tasks=active,
+            scheduled_tasks=scheduled,
+            reserved_tasks=reserved,
+            worker_stats=stats,
+            registered_tasks=registered,
+            worker_ping=ping,
+            workers=workers,
+            collection_time_ms=(time.perf_counter() - start) * 1000,
+            collected_by=self.instance_id,
+            errors=errors,
+        )
+
+        self._snapshot = snapshot
+        self._sample_count += 1
+        self.metrics["collections"] += 1
+        self.metrics["last_collection_ms"] = snapshot.collection_time_ms
+        if errors:
+            self.metrics["collection_errors"] += 1
+
+        self._write_shared_snapshot(snapshot)
+        return snapshot
+
+    def _fetch_queue_lengths(self, errors: List[str]) -> Dict[str, int]:
+        """Read all queue lengths in a single pipelined round trip."""
+        try:
+            redis_client = get_redis_client()
+            pipe = redis_client.pipeline(transaction=False)
+            for queue_name in self.queue_names:
+                pipe.llen(queue_name)
+            lengths = pipe.execute()
+            return {name: int(length or 0) for name, length in zip(self.queue_names, lengths)}
+        except Exception as e:
+            errors.append(f"queue_lengths: {e}")
+            return {name: 0 for name in self.queue_names}
+
+    def _safe_inspect(self, inspect, method: str, errors: List[str]) -> Optional[Dict[str, Any]]:
+        """Run one inspect broadcast, recording failures instead of raising."""
+        try:
+            return getattr(inspect, method)()
+        except Exception as e:
+            errors.append(f"{method}: {e}")
+            return None
+
+    # Shared cache
+
+    def _read_shared_snapshot(self) -> Optional[IntrospectionSnapshot]:
+        """Read the snapshot published by the collecting process."""
+        try:
+            redis_client = get_redis_client()
+            if redis_client is None:
+                return None
+            raw = redis_client.get(SNAPSHOT_CACHE_KEY)
+            if not raw:
+                return None
+            return IntrospectionSnapshot.from_dict(json.loads(raw))
+        except Exception as e:
+            logger.warning("Failed to read introspection snapshot", error=str(e))
+            return None
+
+    def _write_shared_snapshot(self, snapshot: IntrospectionSnapshot) -> None:
+        """Publish a snapshot for other processes."""
+        try:
+            redis_client = get_redis_client()
+            if redis_client is None:
+                return
+            redis_client.set(
+                SNAPSHOT_CACHE_KEY,
+                json.dumps(snapshot.to_dict(), default=str),
+                ex=max(1, int(self.interval * 3))
+            )
+        except Exception as e:
+            logger.warning("Failed to publish introspection snapshot", error=str(e))
+
+    def _acquire_leadership(self) -> bool:
+        """Ensure a single process samples the cluster per interval."""
+        try:
+            redis_client = get_redis_client()
+            if redis_client is None:
+                return True
+            ttl = max(1, int(self.interval * 2))
+            if redis_client.set(LEADER_LOCK_KEY, self.instance_id, nx=True, ex=ttl):
+                return True
+            current = redis_client.get(LEADER_LOCK_KEY)
+            if current in (self.instance_id, self.instance_id.encode()):
+                redis_client.expire(LEADER_LOCK_KEY, ttl)
+                return True
+            return False
+        except Exception:
+            # Without Redis there is no shared cache to coordinate through
+            return True
+
+    # Background loops
+
+    def _run_collector(self) -> None:
+        """Collector loop: sample once per interval while leader."""
+        while not self._stop_event.is_set():
+            try:
+                if self._acquire_leadership():
+                    self.collect_snapshot()
+            except Exception as e:
+                self.metrics["collection_errors"] += 1
+                logger.error("Celery introspection collection failed", error=str(e))
+            self._stop_event.wait(self.interval)
+
+    def _run_event_listener(self) -> None:
+        """Track worker heartbeats and task state from Celery events."""
+        try:
+            state = self.celery_app.events.State()
+        except Exception as e:
+            logger.warning("Celery events unavailable, falling back to ping", error=str(e))
+            return
+
+        self._events_state = state
+        while not self._stop_event.is_set():
+            try:
+                with self.celery_app.connection() as connection:
+                    self._events_receiver = self.celery_app.events.Receiver(
+                        connection, handlers={"*": state.event}
+                    )
+                    self._events_receiver.capture(limit=None, timeout=None, wakeup=True)
+            except Exception as e:
+                logger.warning("Celery event receiver disconnected", error=str(e))
+                self._stop_event.wait(self.interval)
+            finally:
+                self._events_receiver = None
+
+    def _workers_from_events(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize worker state tracked from events."""
+        state = self._events_state
+        if state is None:
+            return {}
+
+        workers = {}
+        try:
+            for hostname, worker in list(state.workers.items()):
+                workers[hostname] = {
+                    "alive": worker.alive,
+                    "active": worker.active,
+                    "processed": worker.processed,
+                    "loadavg": worker.loadavg,
+                    "last_heartbeat": worker.heartbeats[-1] if worker.heartbeats else None,
+                }
+        except Exception as e:
+            logger.warning("Failed to read worker event state", error=str(e))
+        return workers
+
+
+# Global introspection service instance
+_introspection_service = None
+
+
+def get_celery_introspection_service(celery_app: Optional[Celery] = None) -> CeleryIntrospectionService:
+    """
+    Get global Celery introspection service instance.
+
+    Args:
+        celery_app: Celery application instance (defaults to the configured app)
+
+    Returns:
+        CeleryIntrospectionService: Introspection service instance
+    """
+    global _introspection_service
+
+    if _introspection_service is None:
+        if celery_app is None:
+            from .celery_app import get_celery_app
+            celery_app = get_celery_app()
+        _introspection_service = CeleryIntrospectionService(celery_app)
+
+    return _introspection_service
+
+
+# Export for easy importing
+__all__ = [
+    "IntrospectionSnapshot",
+    "CeleryIntrospectionService",
+    "get_celery_introspection_service"
+]
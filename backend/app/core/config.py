@@ -6,7 +6,7 @@ supporting environment variables and configuration validation.
 """
 
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import Field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -41,6 +41,10 @@ class Settings(BaseSettings):
     REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/1", description="Celery broker URL")
     CELERY_RESULT_BACKEND: str = Field(default="redis://localhost:6379/2", description="Celery result backend URL")
+    CELERY_INTROSPECTION_ENABLED: bool = Field(default=True, description="Run the background Celery queue/worker stats collector")
+    CELERY_INTROSPECTION_INTERVAL: int = Field(default=15, description="Seconds between Celery queue/worker stats samples")
+    CELERY_INSPECT_TIMEOUT: float = Field(default=1.0, description="Reply timeout in seconds for Celery inspect broadcasts")
+    CELERY_INTROSPECTION_USE_EVENTS: bool = Field(default=True, description="Track worker liveness from Celery events instead of ping broadcasts")
 
     # JWT settings
     JWT_SECRET_KEY: str = Field(
@@ -71,6 +75,15 @@ class Settings(BaseSettings):
         default=["pdf", "docx", "doc", "png", "jpg", "jpeg", "tiff"],
         description="Allowed file extensions"
     )
+    UPLOAD_URL_EXPIRY_SECONDS: int = Field(default=3600, description="Lifetime of presigned upload and download URLs; unfinished uploads stop counting toward quota after this")
+    STORAGE_QUOTA_REDIS_ENABLED: bool = Field(default=True, description="Reserve storage quota through Redis counters instead of the database row")
+    STORAGE_QUOTA_CACHE_TTL: int = Field(default=86400, description="Seconds cached quota counters live without activity")
+    STORAGE_QUOTA_RESERVATION_TIMEOUT: int = Field(default=300, description="Seconds a quota reservation is held when its upload record is never created")
+    STORAGE_QUOTA_RECONCILE_INTERVAL: int = Field(default=300, description="Seconds between storage quota reconciliations against file sizes")
+    DOCUMENT_WORKER_CONCURRENCY: int = Field(default=3, description="Document processing jobs each worker instance runs concurrently")
+    DOCUMENT_WORKER_POLL_INTERVAL: int = Field(default=10, description="Fallback seconds between job table checks when no wake-up arrives")
+    DOCUMENT_WORKER_LEASE_SECONDS: int = Field(default=1800, description="Seconds a claimed document job may run before another worker may claim it again")
+    DOCUMENT_WORKER_LEASE_MARGIN_SECONDS: int = Field(default=60, description="Seconds before its lease expires at which a document job is abandoned, so a late result never races a reclaim")
     UPLOAD_DIR: str = Field(default="./uploads", description="Upload directory path")
 
     # OCR settings
@@ -81,6 +94,12 @@ class Settings(BaseSettings):
 
     # Document processing settings
     PROCESSING_TIMEOUT_SECONDS: int = Field(default=300, description="Document processing timeout")
+    RENDER_POOL_WORKERS: int = Field(default=2, description="Worker processes rendering PDF/DOCX output (0 renders in-process)")
+    RENDER_POOL_PRESTART: bool = Field(default=False, description="Start and warm up render workers at application startup")
+    RENDER_SPOOL_THRESHOLD_BYTES: int = Field(default=8 * 1024 * 1024, description="Rendered documents at least this large are returned as spool files")
+    RENDER_SPOOL_DIR: Optional[str] = Field(default=None, description="Directory for rendered spool files (system temp dir if unset)")
+    EXPORT_ARTIFACT_GC_GRACE_SECONDS: int = Field(default=7 * 24 * 3600, description="Seconds an unreferenced rendered export is kept before garbage collection")
+    EXPORT_ARTIFACT_GC_INTERVAL: int = Field(default=6 * 3600, description="Seconds between export artifact garbage collection runs")
 
     # Storage settings (aliases for compatibility)
     STORAGE_BUCKET_NAME: str = Field(default="realestate-files", description="Storage bucket name")
@@ -109,10 +128,93 @@ class Settings(BaseSettings):
     DEFAULT_EMBEDDING_MODEL: str = Field(default="text-embedding-3-small", description="Default embedding model")
 
     # Model Router settings
-    MODEL_ROUTER_STRATEGY: str = Field(default="cost_optimized", description="Model routing strategy: cost_optimized, performance, balanced")
+    MODEL_ROUTER_STRATEGY: str = Field(default="cost_optimized", description="Model routing strategy: cost_optimized, performance, balanced, latency_optimized")
     MODEL_ROUTER_FALLBACK_ENABLED: bool = Field(default=True, description="Enable fallback to alternative models")
     MODEL_ROUTER_HEALTH_CHECK_INTERVAL: int = Field(default=300, description="Health check interval in seconds")
     MODEL_ROUTER_MAX_RETRIES: int = Field(default=3, description="Maximum retry attempts for failed requests")
+    MODEL_ROUTER_PROVIDER_LIMITS: Dict[str, Dict[str, float]] = Field(
+        default={
+            "openrouter": {"max_concurrency": 16, "requests_per_minute": 200, "tokens_per_minute": 400000},
+            "openai": {"max_concurrency": 16, "requests_per_minute": 500, "tokens_per_minute": 800000},
+            "anthropic": {"max_concurrency": 8, "requests_per_minute": 50, "tokens_per_minute": 100000},
+            "ollama": {"max_concurrency": 2, "requests_per_minute": 0, "tokens_per_minute": 0},
+        },
+        description="Per-provider starting concurrency and request/token rate limits (0 = unlimited)"
+    )
+    MODEL_ROUTER_MODEL_MAX_CONCURRENCY: int = Field(default=8, description="Starting concurrent request limit per model")
+    MODEL_ROUTER_CONCURRENCY_HEADROOM: float = Field(default=2.0, description="Factor by which adaptive provider and model concurrency may grow above the configured limits while latency stays on target")
+    MODEL_ROUTER_QUEUE_TIMEOUT: float = Field(default=30.0, description="Seconds a request may queue for provider capacity before failing over")
+    MODEL_ROUTER_LATENCY_TARGET: float = Field(default=30.0, description="Request latency in seconds above which provider concurrency is reduced")
+    MODEL_ROUTER_HTTP2: bool = Field(default=True, description="Use HTTP/2 for provider connections when the h2 package is installed")
+    MODEL_ROUTER_MAX_CONNECTIONS: int = Field(default=50, description="Maximum pooled connections per provider client")
+    MODEL_ROUTER_KEEPALIVE_EXPIRY: float = Field(default=120.0, description="Seconds an idle provider connection is kept open for reuse")
+    MODEL_ROUTER_EWMA_ALPHA: float = Field(default=0.2, description="Smoothing factor for per-model latency/error EWMAs")
+    MODEL_ROUTER_BREAKER_FAILURE_THRESHOLD: int = Field(default=3, description="Consecutive failures that open a model's circuit breaker")
+    MODEL_ROUTER_BREAKER_COOLDOWN: float = Field(default=30.0, description="Seconds an open circuit waits before a half-open probe")
+    MODEL_ROUTER_HEDGE_DELAY: float = Field(default=2.0, description="Seconds before hedging a latency-critical request on a second model when no latency history exists")
+    LLM_RESPONSE_CACHE_ENABLED: bool = Field(default=True, description="Cache responses to deterministic (temperature 0) model requests")
+    LLM_RESPONSE_CACHE_TTL: int = Field(default=7 * 24 * 3600, description="Seconds cached model responses stay valid")
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=2000, description="Maximum responses kept in the in-memory cache tier")
+    LLM_RESPONSE_CACHE_MAX_MEMORY_BYTES: int = Field(default=64 * 1024 * 1024, description="Maximum size of the in-memory cache tier in bytes")
+    LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES: int = Field(default=512 * 1024, description="Responses larger than this are not cached")
+
+    # Long document summarization settings
+    LLM_SUMMARY_CHUNK_CHARS: int = Field(default=12000, description="Documents longer than this are summarized chunk by chunk")
+    LLM_SUMMARY_MAX_CONCURRENCY: int = Field(default=8, description="Chunk summaries requested concurrently per document")
+    LLM_SUMMARY_CHUNK_MAX_TOKENS: int = Field(default=600, description="Completion token budget of each chunk summary")
+    LLM_SUMMARY_CACHE_TTL: int = Field(default=30 * 24 * 3600, description="Seconds chunk summaries stay cached")
+
+    # Agent workflow settings
+    AGENT_WORKFLOW_MAX_CONCURRENCY: int = Field(default=4, description="Crews executed concurrently per process; further workflows queue")
+
+    # Agent memory settings
+    AGENT_MEMORY_WRITE_BEHIND: bool = Field(default=True, description="Buffer tool execution memories and write them to Redis in pipelined batches")
+    AGENT_MEMORY_FLUSH_INTERVAL_MS: int = Field(default=200, description="Milliseconds between write-behind flushes of agent memory")
+    AGENT_MEMORY_FLUSH_BATCH_SIZE: int = Field(default=100, description="Buffered agent memory entries that trigger an early flush; also the pipeline size")
+    AGENT_MEMORY_MAX_PENDING: int = Field(default=10000, description="Buffered agent memory entries kept while Redis is unreachable; the oldest are dropped beyond this")
+    AGENT_MEMORY_REDIS_MAX_CONNECTIONS: int = Field(default=10, description="Connections in the async Redis pool used for agent memory writes")
+
+    # Agent tool execution settings
+    AGENT_TOOL_TIMEOUT_SECONDS: float = Field(default=60.0, description="Deadline of a tool execution through the tool registry, including time queued behind other calls")
+    AGENT_TOOL_MAX_CONCURRENCY: int = Field(default=8, description="Concurrent executions of each tool; tools may set their own limit")
+    AGENT_TOOL_CACHE_SIZE: int = Field(default=512, description="Results of cacheable tools kept in memory")
+    AGENT_TOOL_CACHE_TTL_SECONDS: int = Field(default=300, description="Seconds a cached tool result is reused")
+
+    # Agent resource pool settings
+    AGENT_RESOURCE_POOL_ACQUIRE_TIMEOUT_SECONDS: float = Field(default=30.0, description="Time an agent tool waits for a pooled resource before failing")
+    AGENT_RESOURCE_POOL_MAX_IDLE_SECONDS: float = Field(default=300.0, description="Idle time after which a pooled resource is closed")
+    AGENT_RESOURCE_POOL_MAX_LIFETIME_SECONDS: float = Field(default=3600.0, description="Age after which a pooled resource is closed instead of reused")
+    AGENT_RESOURCE_POOL_HEALTH_CHECK_AFTER_SECONDS: float = Field(default=30.0, description="Idle time after which a pooled resource is health checked before reuse")
+    AGENT_DB_SESSION_POOL_SIZE: int = Field(default=10, description="Database sessions agent tools use at once; keep within the engine's pool size plus overflow")
+    AGENT_DB_MAX_BATCH_SIZE: int = Field(default=500, description="Records one database tool call may fetch or update by ID")
+    AGENT_DB_STREAM_MAX_ROWS: int = Field(default=1000, description="Records one database tool stream call returns before handing back a cursor")
+    AGENT_DB_STREAM_CHUNK_SIZE: int = Field(default=100, description="Rows fetched from the database cursor at a time while streaming")
+
+    # Compliance checking settings
+    COMPLIANCE_RULE_MAX_MATCH_CHARS: int = Field(default=4000, description="Longest text a compliance rule pattern may match from its first term")
+    COMPLIANCE_RULE_TIME_BUDGET_MS: float = Field(default=250.0, description="Pattern matching time allowed per compliance rule and document")
+
+    # Entity extraction settings
+    ENTITY_EXTRACTION_WORKERS: int = Field(default=4, description="Processes scanning chunks of large documents; 0 scans in-process")
+    ENTITY_EXTRACTION_CHUNK_CHARS: int = Field(default=1024 * 1024, description="Texts longer than this are scanned in parallel chunks of this size")
+    ENTITY_EXTRACTION_CHUNK_OVERLAP: int = Field(default=2000, description="Characters each chunk scans into the next so boundary entities are found")
+
+    # Version diff settings
+    DIFF_CACHE_SIZE: int = Field(default=64, description="Computed document diffs kept in memory, keyed by the content hashes of both versions")
+    DIFF_MAX_EDIT_DISTANCE: int = Field(default=1000, description="Edits diffed exactly between two anchor lines; larger gaps are reported as replaced")
+    DIFF_SIMILARITY_REJECT_BELOW: float = Field(default=0.3, description="Estimated shingle similarity under which versions are scored without a full diff")
+
+    # Contract version storage settings
+    VERSION_SNAPSHOT_INTERVAL: int = Field(default=10, description="Every this many contract versions store full content; the others store deltas")
+    VERSION_CONTENT_CACHE_SIZE: int = Field(default=256, description="Rebuilt contract version contents kept in memory")
+
+    # Document index settings
+    DOCUMENT_INDEX_CACHE_SIZE: int = Field(default=32, description="Parsed document section indexes kept in memory by content hash")
+
+    # Real estate knowledge base settings
+    KNOWLEDGE_BASE_DATA_PATH: Optional[str] = Field(default=None, description="Versioned JSON knowledge data file (built-in data if unset)")
+    KNOWLEDGE_BASE_RELOAD_INTERVAL: int = Field(default=60, description="Seconds between checks of the knowledge data file for a new version; 0 disables reloading")
+    KNOWLEDGE_SEARCH_CACHE_SIZE: int = Field(default=1024, description="Knowledge search results cached until the search index changes")
 
     # E-signature settings
     DOCUSIGN_INTEGRATION_KEY: Optional[str] = Field(default=None, description="DocuSign integration key")
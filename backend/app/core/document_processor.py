@@ -14,14 +14,22 @@ from pathlib import Path
 import tempfile
 import os
 
-# Document processing imports
+from .config import get_settings
+from .lazy_imports import lazy_import
+
+# Document processing libraries are imported on first use so that importing
+# the API application does not load PyMuPDF, python-docx, Pillow or Tesseract.
 # import pymupdf4llm  # Temporarily disabled for debugging
-# import fitz  # PyMuPDF  # Temporarily disabled for debugging
-# from docx import Document as DocxDocument  # Temporarily disabled for testing
-from PIL import Image
-# import pytesseract  # Temporarily disabled for server startup
+fitz = lazy_import("fitz")  # PyMuPDF
+docx = lazy_import("docx")
+Image = lazy_import("PIL.Image")
+pytesseract = lazy_import("pytesseract")
+
+
+def DocxDocument(*args, **kwargs):
+    """Open a python-docx Document, importing python-docx on first use."""
+    return docx.Document(*args, **kwargs)
 
-from .config import get_settings
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -149,7 +157,7 @@ class DocumentProcessor:
                     pass
                 else:
                     # Use basic PyMuPDF extraction
-                    # doc = fitz.open(temp_path)  # Temporarily disabled
+                    doc = fitz.open(temp_path)
                     extracted_text = ""
                     pages_data = []
 
@@ -0,0 +1,134 @@
+"""
+Lazy import helpers for deferring heavy subsystems.
+
+Importing the API application should not pay for CrewAI, the LLM provider
+SDKs, PDF/OCR libraries or the agent tool registry until a request actually
+needs them. These helpers provide import-time-cheap facades that resolve the
+real module or attribute on first use.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class LazyModule:
+    """
+    Proxy for a module that is imported on first attribute access.
+
+    Example:
+        fitz = lazy_import("fitz")
+        doc = fitz.open(path)  # PyMuPDF is imported here, not at module load
+    """
+
+    def __init__(self, name: str, package: Optional[str] = None):
+        self._lazy_name = name
+        self._lazy_package = package
+        self._lazy_module: Optional[ModuleType] = None
+        self._lazy_lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        """Import the wrapped module if it has not been imported yet."""
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(
+                        self._lazy_name, self._lazy_package
+                    )
+        return self._lazy_module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the wrapped module has been imported."""
+        return self._lazy_module is not None
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._load(), item)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule {self._lazy_name!r} ({state})>"
+
+
+def lazy_import(name: str, package: Optional[str] = None) -> LazyModule:
+    """
+    Create a lazily imported module facade.
+
+    Args:
+        name: Module name (absolute, or relative when package is given)
+        package: Anchor package for relative imports
+
+    Returns:
+        LazyModule: Proxy that imports the module on first attribute access
+    """
+    return LazyModule(name, package)
+
+
+class LazyAttributes:
+    """
+    Module attributes that are imported on first access (PEP 562).
+
+    The owning module assigns ``__getattr__ = lazy.module_getattr`` so that
+    ``module.Name`` and ``from module import Name`` keep working. Code inside
+    the module must call ``lazy.load(...)`` before using a name, because
+    global name lookups do not go through a module ``__getattr__``.
+
+    Attributes map a public name to ``"module"`` (same attribute name) or
+    ``"module:attribute"``. Relative module names are resolved against the
+    owning module's package.
+    """
+
+    def __init__(self, module_globals: Dict[str, Any], attributes: Dict[str, str]):
+        self._globals = module_globals
+        self._attributes = dict(attributes)
+        self._lock = threading.RLock()
+
+    @property
+    def names(self) -> List[str]:
+        """Names managed by this instance."""
+        return list(self._attributes)
+
+    def resolve(self, name: str) -> Any:
+        """
+        Return the value for a lazy attribute, importing it if needed.
+
+        A value already bound in the module (for example by ``unittest.mock.patch``)
+        is returned as-is and never overwritten.
+        """
+        if name in self._globals:
+            return self._globals[name]
+
+        try:
+            spec = self._attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {self._globals.get('__name__')!r} has no attribute {name!r}"
+            ) from None
+
+        module_name, _, attribute = spec.partition(":")
+        with self._lock:
+            if name not in self._globals:
+                module = importlib.import_module(module_name, self._globals.get("__package__"))
+                self._globals[name] = getattr(module, attribute or name)
+        return self._globals[name]
+
+    def load(self, *names: str) -> None:
+        """Bind the given lazy names (or all of them) into the module globals."""
+        for name in names or self._attributes:
+            self.resolve(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a lazy name has been bound in the module globals."""
+        return name in self._globals
+
+    def module_getattr(self, name: str) -> Any:
+        """Implementation for the owning module's ``__getattr__``."""
+        return self.resolve(name)
+
+    def module_dir(self, extra: Iterable[str] = ()) -> List[str]:
+        """Implementation for the owning module's ``__dir__``."""
+        return sorted(set(self._globals) | set(self._attributes) | set(extra))
@@ -6,12 +6,13 @@ supporting PDF, DOCX, HTML, and TXT formats with proper styling
 and formatting for professional contract documents.
 """
 
+import asyncio
 import logging
 import io
 import tempfile
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional, BinaryIO
+from typing import Dict, Any, Optional, BinaryIO, Tuple, Union
 from pathlib import Path
 
 # PDF generation
@@ -34,12 +35,15 @@ except ImportError:
     DOCX_AVAILABLE = False
     logging.warning("python-docx not available - DOCX generation disabled")
 
-# HTML processing
-from bs4 import BeautifulSoup
 import re
 
 from ..models.template import OutputFormat
 from ..core.config import get_settings
+from .lazy_imports import lazy_import
+from .render_engine import RenderJob, get_render_engine
+
+# HTML processing, imported on first use
+bs4 = lazy_import("bs4")
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -50,18 +54,31 @@ class OutputGenerationError(Exception):
     pass
 
 
+# Formats rendered in the render pool rather than on the event loop
+POOLED_FORMATS = (OutputFormat.PDF, OutputFormat.DOCX)
+
+WARM_UP_CONTENT = """
+<div class="contract-header"><h1>Warm-up</h1><div class="version">Version 1</div></div>
+<div class="contract-section"><h2>Terms</h2><p class="contract-clause"><b>Bold</b> <i>italic</i> text.</p>
+<table><tr><th>Item</th><td>Value</td></tr></table></div>
+"""
+
+
 class OutputGenerator:
     """
     Multi-format output generator for contracts.
     
     Supports PDF, DOCX, HTML, and TXT output formats with
-    professional styling and formatting.
+    professional styling and formatting. PDF and DOCX documents are
+    prepared and rendered in the process pool of the render engine.
     """
     
     def __init__(self):
         """Initialize output generator."""
         self.default_css = self._get_default_css()
         self.supported_formats = self._get_supported_formats()
+        self.render_engine = get_render_engine()
+        self._font_config = None
     
     def _get_supported_formats(self) -> list[OutputFormat]:
         """Get list of supported output formats."""
@@ -241,7 +258,8 @@ class OutputGenerator:
         output_format: OutputFormat,
         title: str = "Contract Document",
         custom_css: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> bytes:
         """
         Generate output in specified format.
@@ -252,6 +270,7 @@ class OutputGenerator:
             title: Document title
             custom_css: Custom CSS styles
             metadata: Document metadata
+            use_cache: Reuse a previously rendered PDF/DOCX of the same input
             
         Returns:
             bytes: Generated document content
@@ -260,15 +279,29 @@ class OutputGenerator:
             if output_format not in self.supported_formats:
                 raise OutputGenerationError(f"Format {output_format} not supported")
             
+            if output_format in POOLED_FORMATS:
+                artifact_hash = None
+                if use_cache:
+                    artifact_hash, cached = await self._fetch_artifact(
+                        content, output_format, title, custom_css, metadata
+                    )
+                    if cached is not None:
+                        return cached
+                
+                # Preparation and rendering both run in the render pool
+                result = await self.render_engine.render(RenderJob(
+                    output_format.value, content, title, custom_css, metadata, spool=False
+                ))
+                data = result.read()
+                if artifact_hash:
+                    await self._store_artifact(artifact_hash, output_format, data)
+                return data
+            
             # Clean and prepare content
             content = self._prepare_content(content, title, custom_css)
             
             if output_format == OutputFormat.HTML:
                 return await self._generate_html(content, title, metadata)
-            elif output_format == OutputFormat.PDF:
-                return await self._generate_pdf(content, title, metadata)
-            elif output_format == OutputFormat.DOCX:
-                return await self._generate_docx(content, title, metadata)
             elif output_format == OutputFormat.TXT:
                 return await self._generate_txt(content, title, metadata)
             else:
@@ -278,10 +311,93 @@ class OutputGenerator:
             logger.error(f"Output generation failed: {e}")
             raise OutputGenerationError(f"Failed to generate {output_format} output: {str(e)}")
     
+    async def _fetch_artifact(
+        self,
+        content: str,
+        output_format: OutputFormat,
+        title: str,
+        custom_css: Optional[str],
+        metadata: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[bytes]]:
+        """Look up a stored rendering; returns its hash and content, if stored."""
+        # Imported here so render workers do not load storage clients
+        from ..services.export_artifacts import compute_artifact_hash, get_export_artifact_store
+        
+        artifact_hash = compute_artifact_hash(
+            content,
+            output_format.value,
+            {"title": title, "custom_css": custom_css, "metadata": metadata}
+        )
+        try:
+            data = await asyncio.to_thread(
+                get_export_artifact_store().fetch, artifact_hash, output_format.value
+            )
+        except Exception as e:
+            logger.warning(f"Rendered output cache lookup failed: {e}")
+            data = None
+        return artifact_hash, data
+    
+    async def _store_artifact(self, artifact_hash: str, output_format: OutputFormat, data: bytes):
+        """Store a rendering for reuse; failures only cost a later re-render."""
+        from ..services.export_artifacts import get_export_artifact_store
+        
+        try:
+            await asyncio.to_thread(
+                get_export_artifact_store().store, artifact_hash, output_format.value, data
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store rendered output: {e}")
+    
+    def render_sync(
+        self,
+        output_format: Union[OutputFormat, str],
+        content: str,
+        title: str = "Contract Document",
+        custom_css: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        prepared: bool = False
+    ) -> bytes:
+        """
+        Prepare and render a document in the calling thread.
+        
+        This is the CPU-bound part of output generation; it runs inside the
+        render pool workers.
+        """
+        output_format = OutputFormat(output_format)
+        if not prepared:
+            content = self._prepare_content(content, title, custom_css)
+        
+        if output_format == OutputFormat.PDF:
+            return self._build_pdf(content)
+        elif output_format == OutputFormat.DOCX:
+            return self._build_docx(content, title, metadata)
+        elif output_format == OutputFormat.HTML:
+            return content.encode('utf-8')
+        else:
+            raise OutputGenerationError(f"Unsupported format: {output_format}")
+    
+    def warm_up(self):
+        """
+        Load fonts and rendering code ahead of the first document.
+        
+        Creates the font configuration shared by all PDF renders and renders
+        a sample document with the default stylesheet in each format.
+        """
+        if WEASYPRINT_AVAILABLE:
+            try:
+                from weasyprint.text.fonts import FontConfiguration
+            except ImportError:
+                from weasyprint.fonts import FontConfiguration
+            self._font_config = FontConfiguration()
+            self.render_sync(OutputFormat.PDF, WARM_UP_CONTENT, "Warm-up")
+        
+        if DOCX_AVAILABLE:
+            self.render_sync(OutputFormat.DOCX, WARM_UP_CONTENT, "Warm-up")
+    
     def _prepare_content(self, content: str, title: str, custom_css: Optional[str] = None) -> str:
         """Prepare and clean HTML content."""
         # Parse HTML
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = bs4.BeautifulSoup(content, 'html.parser')
         
         # Add document structure if missing
         if not soup.find('html'):
@@ -327,12 +443,7 @@ class OutputGenerator:
         """Generate HTML output."""
         return content.encode('utf-8')
     
-    async def _generate_pdf(
-        self, 
-        content: str, 
-        title: str, 
-        metadata: Optional[Dict[str, Any]] = None
-    ) -> bytes:
+    def _build_pdf(self, content: str) -> bytes:
         """Generate PDF output using WeasyPrint."""
         if not WEASYPRINT_AVAILABLE:
             raise OutputGenerationError("PDF generation not available - WeasyPrint not installed")
@@ -341,8 +452,8 @@ class OutputGenerator:
             # Create HTML document
             html_doc = HTML(string=content)
             
-            # Generate PDF
-            pdf_bytes = html_doc.write_pdf()
+            # Generate PDF, reusing the fonts loaded by earlier renders
+            pdf_bytes = html_doc.write_pdf(font_config=self._font_config)
             
             return pdf_bytes
             
@@ -350,7 +461,7 @@ class OutputGenerator:
             logger.error(f"PDF generation failed: {e}")
             raise OutputGenerationError(f"PDF generation failed: {str(e)}")
     
-    async def _generate_docx(
+    def _build_docx(
         self, 
         content: str, 
         title: str, 
@@ -362,7 +473,7 @@ class OutputGenerator:
         
         try:
             # Parse HTML content
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = bs4.BeautifulSoup(content, 'html.parser')
             
             # Create new document
             doc = Document()
@@ -402,7 +513,7 @@ class OutputGenerator:
         """Generate plain text output."""
         try:
             # Parse HTML and extract text
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = bs4.BeautifulSoup(content, 'html.parser')
             
             # Remove script and style elements
             for script in soup(["script", "style"]):
@@ -17,6 +17,7 @@ import structlog
 from celery import Celery
 
 from .redis_config import get_redis_client
+from .celery_introspection import get_celery_introspection_service
 from .config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -67,6 +68,7 @@ class PerformanceMonitor:
     def __init__(self, celery_app: Celery):
         self.celery_app = celery_app
         self.redis_client = get_redis_client()
+        self.introspection = get_celery_introspection_service(celery_app)
         
         # Configuration
         self.monitoring_interval = getattr(settings, 'MONITORING_INTERVAL', 60)  # seconds
@@ -102,18 +104,10 @@ class PerformanceMonitor:
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
-            # Queue length metrics
-            queue_lengths = {}
-            for queue_name in ['ingest', 'ocr', 'llm', 'export', 'system']:
-                try:
-                    length = self.redis_client.llen(queue_name)
-                    queue_lengths[queue_name] = length
-                except Exception:
-                    queue_lengths[queue_name] = 0
-            
-            # Worker and task metrics
-            inspect = self.celery_app.control.inspect()
-            active_tasks_data = inspect.active() or {}
+            # Queue and worker metrics from the shared introspection snapshot
+            snapshot = self.introspection.get_snapshot(max_age_seconds=self.monitoring_interval)
+            queue_lengths = dict(snapshot.queue_lengths)
+            active_tasks_data = snapshot.active_tasks or {}
             active_tasks = sum(len(tasks) for tasks in active_tasks_data.values())
             worker_count = len(active_tasks_data)
             
@@ -0,0 +1,252 @@
+"""
+Process-pool rendering engine for PDF and DOCX output.
+
+WeasyPrint layout and python-docx building are CPU-bound pure Python, so
+they run in a pool of worker processes rather than on the event loop (or a
+thread, which would still hold the GIL). Workers are started with the spawn
+method, since the API process runs threads that must not be forked, and are
+warmed up once: the rendering libraries are imported, a shared font
+configuration is created and a sample document using the default stylesheet
+is rendered, so fonts are loaded before the first real job.
+
+Jobs can be submitted one at a time or in batches. Results come back as
+bytes, or for large documents as a spool file written by the worker, so big
+PDFs are not pickled through the result pipe.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class RenderJob:
+    """One document to render."""
+    output_format: str
+    content: str
+    title: str = "Contract Document"
+    custom_css: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    # Content is already a complete HTML document with styles
+    prepared: bool = False
+    # Force (True) or suppress (False) a spool file; None decides by size
+    spool: Optional[bool] = None
+
+
+@dataclass
+class RenderResult:
+    """Rendered document, held in memory or in a spool file."""
+    output_format: str
+    size: int
+    render_time: float
+    data: Optional[bytes] = field(default=None, repr=False)
+    path: Optional[str] = None
+
+    @property
+    def spooled(self) -> bool:
+        return self.path is not None
+
+    def read(self) -> bytes:
+        """Get the document content."""
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def open(self) -> BinaryIO:
+        """Open the document for streaming, e.g. to upload it."""
+        if self.path is not None:
+            return open(self.path, "rb")
+        return io.BytesIO(self.data)
+
+    def cleanup(self):
+        """Remove the spool file, if any."""
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+# Output generator of the current worker process
+_worker_generator = None
+
+
+def _init_worker():
+    """Pool initializer: load rendering libraries, fonts and styles."""
+    global _worker_generator
+    from .output_generator import OutputGenerator
+
+    _worker_generator = OutputGenerator()
+    try:
+        _worker_generator.warm_up()
+    except Exception as e:
+        # A failed warm-up only costs the first job its start-up time
+        logger.warning(f"Render worker warm-up failed: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _render_job(job: RenderJob, spool_threshold: int, spool_dir: Optional[str]) -> RenderResult:
+    """Render a job in the current process."""
+    global _worker_generator
+    if _worker_generator is None:
+        from .output_generator import OutputGenerator
+        _worker_generator = OutputGenerator()
+
+    start = time.perf_counter()
+    data = _worker_generator.render_sync(
+        job.output_format, job.content, job.title, job.custom_css, job.metadata, job.prepared
+    )
+    render_time = time.perf_counter() - start
+
+    spool = job.spool if job.spool is not None else len(data) >= spool_threshold
+    if not spool:
+        return RenderResult(job.output_format, len(data), render_time, data=data)
+
+    fd, path = tempfile.mkstemp(prefix="render-", suffix=f".{job.output_format}", dir=spool_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return RenderResult(job.output_format, len(data), render_time, path=path)
+
+
+class RenderEngine:
+    """Pool of warm rendering processes."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = settings.RENDER_POOL_WORKERS if max_workers is None else max_workers
+        self.spool_threshold = settings.RENDER_SPOOL_THRESHOLD_BYTES
+        self.spool_dir = settings.RENDER_SPOOL_DIR
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def in_process(self) -> bool:
+        """
+        Whether jobs render in the calling process.
+
+        Daemonic processes, such as Celery prefork workers, may not start
+        child processes; there the worker process itself is the unit of
+        parallelism.
+        """
+        return self.max_workers <= 0 or multiprocessing.current_process().daemon
+
+    def start(self, warm: bool = True):
+        """
+        Start the pool.
+
+        Args:
+            warm: Start every worker now instead of on first use
+        """
+        if self.in_process:
+            return
+        pool = self._get_pool()
+        if warm:
+            for future in [pool.submit(_ping) for _ in range(self.max_workers)]:
+                future.result()
+            logger.info(f"Render pool started with {self.max_workers} workers")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def submit(self, job: RenderJob) -> Future:
+        """
+        Queue a job.
+
+        Returns:
+            Future: Resolves to a RenderResult
+        """
+        if self.in_process:
+            future: Future = Future()
+            try:
+                future.set_result(_render_job(job, self.spool_threshold, self.spool_dir))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        try:
+            return self._get_pool().submit(_render_job, job, self.spool_threshold, self.spool_dir)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool once
+            logger.warning("Render pool broken, restarting")
+            self._reset_pool()
+            return self._get_pool().submit(_render_job, job, self.spool_threshold, self.spool_dir)
+
+    async def render(self, job: RenderJob) -> RenderResult:
+        """Render a document without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(job))
+
+    async def render_batch(self, jobs: List[RenderJob]) -> List[RenderResult]:
+        """Render documents in parallel; results are in job order."""
+        futures = [asyncio.wrap_future(self.submit(job)) for job in jobs]
+        return list(await asyncio.gather(*futures))
+
+    def render_batch_sync(self, jobs: List[RenderJob], timeout: Optional[float] = None) -> List[RenderResult]:
+        """Blocking variant of ``render_batch`` for synchronous callers."""
+        futures = [self.submit(job) for job in jobs]
+        return [future.result(timeout) for future in futures]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global render engine instance
+_render_engine: Optional[RenderEngine] = None
+
+
+def get_render_engine() -> RenderEngine:
+    """
+    Get global render engine instance.
+
+    Returns:
+        RenderEngine: Shared rendering pool
+    """
+    global _render_engine
+
+    if _render_engine is None:
+        _render_engine = RenderEngine()
+
+    return _render_engine
+
+
+# Export engine
+__all__ = [
+    "RenderEngine",
+    "RenderJob",
+    "RenderResult",
+    "get_render_engine",
+]
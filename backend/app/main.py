@@ -10,6 +10,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import time
 import logging
 from contextlib import asynccontextmanager
@@ -71,12 +72,25 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning("Redis connection issues detected", extra={"health": redis_health})
 
+        # Sample queue/worker stats in the background so API reads stay cheap
+        if settings.CELERY_INTROSPECTION_ENABLED:
+            from .core.celery_introspection import get_celery_introspection_service
+            get_celery_introspection_service(celery_app).start()
+
         logger.info("Background processing system initialized successfully")
 
     except Exception as e:
         logger.error(f"Failed to initialize background processing: {e}")
         # Continue startup even if background processing fails
 
+    # Start warm document rendering workers before the first export request
+    if settings.RENDER_POOL_PRESTART:
+        try:
+            from .core.render_engine import get_render_engine
+            await asyncio.to_thread(get_render_engine().start)
+        except Exception as e:
+            logger.error(f"Failed to start render pool: {e}")
+
     # Run comprehensive startup validation
     try:
         startup_service = get_startup_validation_service()
@@ -108,6 +122,68 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Multi-Agent Real-Estate Contract Platform Backend")
 
+    # Stop the Celery introspection collector
+    try:
+        from .core.celery_introspection import get_celery_introspection_service
+        get_celery_introspection_service().stop()
+    except Exception as e:
+        logger.error(f"Error stopping Celery introspection collector: {e}")
+
+    # Stop the document rendering workers
+    try:
+        from .core.render_engine import get_render_engine
+        get_render_engine().shutdown(wait=False)
+    except Exception as e:
+        logger.error(f"Error stopping render pool: {e}")
+
+    # Stop the entity extraction workers
+    try:
+        from .services import entity_extraction
+        if entity_extraction._entity_extractor is not None:
+            entity_extraction._entity_extractor.shutdown(wait=False)
+    except Exception as e:
+        logger.error(f"Error stopping entity extraction pool: {e}")
+
+    # Stop running agent workflows
+    try:
+        from .services import agent_orchestrator
+        if agent_orchestrator._orchestrator is not None:
+            agent_orchestrator._orchestrator.shutdown()
+    except Exception as e:
+        logger.error(f"Error stopping agent workflows: {e}")
+
+    # Write buffered agent memory before its event loop stops
+    try:
+        from .services import agent_memory
+        if agent_memory._memory_manager is not None:
+            await agent_memory._memory_manager.close()
+    except Exception as e:
+        logger.error(f"Error flushing agent memory: {e}")
+
+    # Close pooled agent tool resources
+    try:
+        from .services.agent_tools import performance_optimization
+        if performance_optimization._resource_pools:
+            await performance_optimization.close_resource_pools()
+    except Exception as e:
+        logger.error(f"Error closing agent resource pools: {e}")
+
+    # Close the model router's HTTP clients of this event loop; the agent
+    # loop closes its own when it stops
+    try:
+        from .services import model_router as model_router_service
+        if model_router_service._model_router is not None:
+            await model_router_service._model_router.close_clients()
+    except Exception as e:
+        logger.error(f"Error closing model router clients: {e}")
+
+    # Stop the agent LLM event loop thread
+    try:
+        from .services.agent_event_loop import get_agent_event_loop
+        get_agent_event_loop().stop()
+    except Exception as e:
+        logger.error(f"Error stopping agent event loop: {e}")
+
     # Close Redis connections
     try:
         from .core.redis_config import get_redis_manager
@@ -0,0 +1,116 @@
+"""
+Long-lived event loop for synchronous agent LLM calls.
+
+CrewAI calls ``LLM.call`` synchronously. Rather than creating and closing
+an event loop for every call, calls are submitted to a single event loop
+running in a daemon thread. Async provider clients created on that loop
+keep their HTTP connection pools (and TLS sessions) across agent steps.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class AgentEventLoop:
+    """Event loop running forever in a background thread."""
+
+    def __init__(self, name: str = "agent-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self.is_running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+            logger.info("Agent event loop started", thread=self.name)
+            return loop
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the loop and join its thread."""
+        with self._lock:
+            if not self.is_running:
+                return
+            loop, thread = self._loop, self._thread
+            # Lets resources tied to the loop, such as the model router's
+            # HTTP clients, close on it before it stops
+            try:
+                asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result(timeout)
+            except Exception as e:
+                logger.warning("Agent event loop cleanup failed", thread=self.name, error=str(e))
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
+
+        logger.info("Agent event loop stopped", thread=self.name)
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller is running on the loop thread itself."""
+        return self._thread is threading.current_thread()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait for the result
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop thread (it would deadlock)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AgentEventLoop.run() cannot be called from the loop thread")
+
+        loop = self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timed out or interrupted: do not leave the call running
+            future.cancel()
+            raise
+
+
+# Global agent event loop instance
+_agent_event_loop: Optional[AgentEventLoop] = None
+
+
+def get_agent_event_loop() -> AgentEventLoop:
+    """Get the global agent event loop."""
+    global _agent_event_loop
+    if _agent_event_loop is None:
+        _agent_event_loop = AgentEventLoop()
+    return _agent_event_loop
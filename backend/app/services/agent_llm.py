@@ -0,0 +1,119 @@
+"""
+CrewAI LLM adapter backed by the Model Router Service.
+
+Kept separate from the agent orchestrator so that CrewAI is only imported
+when an agent is actually created.
+"""
+
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+import structlog
+from crewai.llm import LLM
+
+from .agent_event_loop import get_agent_event_loop
+from .agent_workflow_run import WorkflowRun, current_workflow_run
+from .model_router import get_model_router, ModelRequest, StreamChunk
+
+logger = structlog.get_logger(__name__)
+
+# Receives the token deltas of every agent LLM call made while it is set.
+# The orchestrator sets it around a workflow run so partial output reaches
+# execution subscribers; calls stream only when a sink is present.
+agent_stream_sink: ContextVar[Optional[Callable[[StreamChunk], None]]] = ContextVar(
+    "agent_stream_sink", default=None
+)
+
+
+class ModelRouterLLM(LLM):
+    """
+    Custom LLM wrapper that integrates CrewAI with our Model Router Service.
+
+    This allows all agents to use the unified model routing with intelligent
+    fallbacks and cost optimization.
+    """
+
+    def __init__(self, model_preference: Optional[str] = None):
+        self.model_router = get_model_router()
+        self.model_preference = model_preference or "openrouter/auto"
+        super().__init__(model=self.model_preference)
+
+    def call(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Make a synchronous call to the model router.
+
+        Args:
+            messages: List of chat messages
+            **kwargs: Additional parameters
+
+        Returns:
+            Generated response content
+        """
+        # Stop a cancelled workflow before spending another call on it
+        workflow_run = current_workflow_run.get()
+        if workflow_run is not None:
+            workflow_run.check_cancelled()
+
+        # Run on the long-lived agent loop so provider connection pools are
+        # reused. Context variables live in this thread, so pass them along.
+        return get_agent_event_loop().run(
+            self._async_call(
+                messages,
+                stream_sink=agent_stream_sink.get(),
+                workflow_run=workflow_run,
+                **kwargs
+            )
+        )
+
+    async def _async_call(self, messages: List[Dict[str, str]],
+                          stream_sink: Optional[Callable[[StreamChunk], None]] = None,
+                          workflow_run: Optional[WorkflowRun] = None,
+                          **kwargs) -> str:
+        """
+        Make an async call to the model router.
+
+        Args:
+            messages: List of chat messages
+            stream_sink: Receives streamed chunks (defaults to the context's sink)
+            workflow_run: Workflow to account token usage to
+            **kwargs: Additional parameters
+
+        Returns:
+            Generated response content
+        """
+        try:
+            # Create model request
+            request = ModelRequest(
+                messages=messages,
+                model_preference=self.model_preference,
+                max_tokens=kwargs.get('max_tokens', 2000),
+                temperature=kwargs.get('temperature', 0.1),
+                system_prompt=kwargs.get('system_prompt')
+            )
+
+            # Generate response using model router, streaming to the sink if one is set
+            sink = stream_sink if stream_sink is not None else agent_stream_sink.get()
+            if sink is None:
+                response = await self.model_router.generate_response(request)
+            else:
+                response = None
+                async for chunk in self.model_router.generate_stream(request):
+                    sink(chunk)
+                    response = chunk.response or response
+
+            logger.info(
+                "Agent LLM call completed",
+                model_used=response.model_used,
+                provider=response.provider.value,
+                cost=response.cost,
+                processing_time=response.processing_time
+            )
+
+            if workflow_run is not None:
+                workflow_run.on_llm_call(response)
+
+            return response.content
+
+        except Exception as e:
+            logger.error(f"Agent LLM call failed: {e}")
+            raise
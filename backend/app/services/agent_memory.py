@@ -7,17 +7,22 @@ enabling collaboration, workflow continuity, and knowledge sharing.
 
 import json
 import asyncio
-from typing import Dict, Any, List, Optional, Set, Callable
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Set, Callable, Deque, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
 
 import structlog
 from redis import Redis
+from redis.asyncio import ConnectionPool as AsyncConnectionPool, Redis as AsyncRedis
 from redis.exceptions import RedisError
 
 from ..core.config import get_settings
+from .agent_event_loop import AgentEventLoop, get_agent_event_loop
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
@@ -56,6 +61,230 @@ class MemoryEntry:
     last_accessed: Optional[datetime] = None
 
 
+class MemoryWriteBuffer:
+    """
+    Write-behind buffer for memory entries.
+
+    Entries are queued in process and written to Redis in pipelined batches
+    by a flusher task on the agent event loop, every ``flush_interval_ms`` or
+    as soon as ``batch_size`` entries are pending. The async Redis client and
+    its connection pool live on that loop and are shared by all writes.
+    """
+
+    def __init__(self,
+                 redis_url: Optional[str] = None,
+                 flush_interval_ms: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 max_connections: Optional[int] = None,
+                 event_loop: Optional[AgentEventLoop] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.flush_interval = (flush_interval_ms or settings.AGENT_MEMORY_FLUSH_INTERVAL_MS) / 1000
+        self.batch_size = batch_size or settings.AGENT_MEMORY_FLUSH_BATCH_SIZE
+        self.max_pending = max_pending or settings.AGENT_MEMORY_MAX_PENDING
+        self.max_connections = max_connections or settings.AGENT_MEMORY_REDIS_MAX_CONNECTIONS
+        self._event_loop = event_loop or get_agent_event_loop()
+
+        # (key, serialized entry, ttl seconds) in write order
+        self._pending: Deque[Tuple[str, str, Optional[int]]] = deque()
+        self._lock = threading.Lock()
+        self._client: Optional[AsyncRedis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flusher: Optional[Future] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+        self._failing = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> bool:
+        """
+        Queue a write. Safe to call from any thread; never blocks on Redis.
+
+        Args:
+            key: Redis key
+            value: Serialized value
+            ttl_seconds: Expiry of the key, or None to keep it
+
+        Returns:
+            bool: False if the buffer is closed
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            self._pending.append((key, value, ttl_seconds))
+            self._stats["enqueued"] += 1
+            self._trim()
+            full = len(self._pending) >= self.batch_size
+
+        self._ensure_flusher()
+        if full:
+            self._wake()
+        return True
+
+    def _trim(self) -> None:
+        """Drop the oldest entries beyond ``max_pending``. Caller holds the lock."""
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self._stats["dropped"] += 1
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._closed or (self._flusher is not None and not self._flusher.done()):
+                return
+            self._loop = self._event_loop.start()
+            self._flusher = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+
+    def _wake(self) -> None:
+        wakeup, loop = self._wakeup, self._loop
+        if wakeup is not None and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _get_client(self) -> AsyncRedis:
+        """Async client on the agent event loop, created on first flush."""
+        if self._client is None:
+            pool = AsyncConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                decode_responses=True,
+                socket_timeout=5,
+                socket_connect_timeout=5
+            )
+            self._client = AsyncRedis(connection_pool=pool)
+        return self._client
+
+    async def _run(self) -> None:
+        """Flush periodically, or early when a full batch is pending."""
+        self._flusher_task = asyncio.current_task()
+        self._wakeup = asyncio.Event()
+        while not self._closed:
+            if len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            if not self._closed:
+                await self._flush()
+
+    async def _flush(self) -> int:
+        """Write pending entries in pipelined batches until none are left."""
+        written = 0
+        while True:
+            with self._lock:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            if not batch:
+                return written
+
+            started = time.perf_counter()
+            try:
+                async with self._get_client().pipeline(transaction=False) as pipe:
+                    for key, value, ttl_seconds in batch:
+                        if ttl_seconds:
+                            pipe.setex(key, ttl_seconds, value)
+                        else:
+                            pipe.set(key, value)
+                    await pipe.execute()
+            except asyncio.CancelledError:
+                # Cancelled by close(); the final flush writes the batch
+                with self._lock:
+                    self._pending.extendleft(reversed(batch))
+                raise
+            except Exception as e:
+                # Keep the batch for the next flush, in front of newer entries
+                with self._lock:
+                    self._pending.extendleft(reversed(batch))
+                    self._trim()
+                    self._stats["failed_flushes"] += 1
+                if not self._failing:
+                    logger.warning(f"Agent memory flush failed, keeping entries buffered: {e}",
+                                   pending=len(self._pending))
+                self._failing = True
+                return written
+
+            with self._lock:
+                self._stats["written"] += len(batch)
+                self._stats["flushes"] += 1
+                self._stats["last_batch_size"] = len(batch)
+                self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            if self._failing:
+                logger.info("Agent memory flushes recovered", pending=len(self._pending))
+                self._failing = False
+            written += len(batch)
+
+    async def _on_loop(self, coro) -> Any:
+        """Run a coroutine on the agent event loop and await its result."""
+        if self._event_loop.in_loop_thread():
+            return await coro
+        loop = self._event_loop.start()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def flush(self) -> int:
+        """
+        Write all pending entries now.
+
+        Returns:
+            int: Number of entries written
+        """
+        if not self._pending:
+            return 0
+        return await self._on_loop(self._flush())
+
+    async def close(self) -> int:
+        """
+        Stop the flusher, write what is pending and release the connection pool.
+
+        Returns:
+            int: Number of entries written by the final flush
+        """
+        with self._lock:
+            self._closed = True
+        self._wake()
+        if self._flusher is None and self._client is None and not self._pending:
+            return 0
+        written = await self._on_loop(self._close())
+        if self._pending:
+            logger.warning("Agent memory entries not written at shutdown", pending=len(self._pending))
+        return written
+
+    async def _close(self) -> int:
+        # Stop the flusher first so the final flush is the only writer
+        flusher = self._flusher_task
+        if flusher is not None and flusher is not asyncio.current_task() and not flusher.done():
+            flusher.cancel()
+            await asyncio.wait({flusher})
+        written = await self._flush()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+            await client.connection_pool.disconnect()
+        return written
+
+    def metrics(self) -> Dict[str, Any]:
+        """Buffer counters for monitoring."""
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "batch_size": self.batch_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "flusher_running": self._flusher is not None and not self._flusher.done(),
+                "failing": self._failing,
+            }
+
+
 class AgentMemoryManager:
     """
     Manages memory and context for multi-agent collaboration.
@@ -64,10 +293,13 @@ class AgentMemoryManager:
     between agents to enable workflow continuity and knowledge sharing.
     """
 
-    def __init__(self):
+    def __init__(self, write_buffer: Optional[MemoryWriteBuffer] = None):
         self.settings = get_settings()
         self._redis_client = None
+        self._write_buffer = write_buffer
         self._memory_cache: Dict[str, MemoryEntry] = {}
+        # Crews store memories from worker threads
+        self._cache_lock = threading.Lock()
 
         # Memory configuration
         self.default_ttl = {
@@ -105,6 +337,13 @@ class AgentMemoryManager:
 
         return self._redis_client
 
+    @property
+    def write_buffer(self) -> Optional[MemoryWriteBuffer]:
+        """Write-behind buffer for batched Redis writes, if enabled."""
+        if self._write_buffer is None and self.settings.AGENT_MEMORY_WRITE_BEHIND:
+            self._write_buffer = MemoryWriteBuffer()
+        return self._write_buffer
+
     def _generate_key(self, memory_type: MemoryType, scope: MemoryScope,
                      identifier: str) -> str:
         """Generate a unique key for memory storage."""
@@ -155,7 +394,8 @@ class AgentMemoryManager:
                           workflow_id: Optional[str] = None,
                           user_id: Optional[str] = None,
                           tags: Optional[Set[str]] = None,
-                          ttl: Optional[timedelta] = None) -> str:
+                          ttl: Optional[timedelta] = None,
+                          write_behind: bool = False) -> str:
         """
         Store a memory entry.
 
@@ -169,6 +409,8 @@ class AgentMemoryManager:
             user_id: Optional user ID
             tags: Optional tags for categorization
             ttl: Optional time-to-live override
+            write_behind: Queue the Redis write in the write buffer instead
+                of writing it before returning
 
         Returns:
             Memory entry ID
@@ -198,15 +440,21 @@ class AgentMemoryManager:
             )
 
             # Store in cache
-            self._memory_cache[memory_id] = entry
+            with self._cache_lock:
+                self._memory_cache[memory_id] = entry
 
-            # Store in Redis if available
-            if self.redis_client:
-                key = self._generate_key(memory_type, scope, identifier)
-                serialized = self._serialize_entry(entry)
-
-                if expires_at:
-                    ttl_seconds = int((expires_at - datetime.utcnow()).total_seconds())
+            # Store in Redis, batched by the write buffer or right away
+            key = self._generate_key(memory_type, scope, identifier)
+            serialized = self._serialize_entry(entry)
+            ttl_seconds = None
+            if expires_at:
+                ttl_seconds = int((expires_at - datetime.utcnow()).total_seconds())
+
+            write_buffer = self.write_buffer if write_behind else None
+            if write_buffer is not None and write_buffer.add(key, serialized, ttl_seconds):
+                logger.debug("Memory write buffered", memory_id=memory_id, pending=write_buffer.pending)
+            elif self.redis_client:
+                if ttl_seconds:
                     self.redis_client.setex(key, ttl_seconds, serialized)
                 else:
                     self.redis_client.set(key, serialized)
@@ -245,7 +493,9 @@ class AgentMemoryManager:
             key = self._generate_key(memory_type, scope, identifier)
 
             # Try cache first
-            for entry in self._memory_cache.values():
+            with self._cache_lock:
+                cached = list(self._memory_cache.values())
+            for entry in cached:
                 if (entry.memory_type == memory_type and
                     entry.scope == scope and
                     identifier in entry.id):
@@ -277,7 +527,8 @@ class AgentMemoryManager:
                     entry.last_accessed = datetime.utcnow()
 
                     # Update in cache and Redis
-                    self._memory_cache[entry.id] = entry
+                    with self._cache_lock:
+                        self._memory_cache[entry.id] = entry
                     self.redis_client.set(key, self._serialize_entry(entry))
 
                     return entry
@@ -315,7 +566,9 @@ class AgentMemoryManager:
             results = []
 
             # Search in cache
-            for entry in self._memory_cache.values():
+            with self._cache_lock:
+                cached = list(self._memory_cache.values())
+            for entry in cached:
                 # Check expiration
                 if entry.expires_at and datetime.utcnow() > entry.expires_at:
                     await self._cleanup_expired_entry(entry.id)
@@ -360,8 +613,8 @@ class AgentMemoryManager:
         """Clean up an expired memory entry."""
         try:
             # Remove from cache
-            if memory_id in self._memory_cache:
-                del self._memory_cache[memory_id]
+            with self._cache_lock:
+                self._memory_cache.pop(memory_id, None)
 
             # Remove from Redis if available
             if self.redis_client:
@@ -383,13 +636,14 @@ class AgentMemoryManager:
         """Clear all memory entries for a specific workflow."""
         try:
             # Clear from cache
-            to_remove = [
-                entry_id for entry_id, entry in self._memory_cache.items()
-                if entry.workflow_id == workflow_id
-            ]
+            with self._cache_lock:
+                to_remove = [
+                    entry_id for entry_id, entry in self._memory_cache.items()
+                    if entry.workflow_id == workflow_id
+                ]
 
-            for entry_id in to_remove:
-                del self._memory_cache[entry_id]
+                for entry_id in to_remove:
+                    del self._memory_cache[entry_id]
 
             # Clear from Redis if available
             if self.redis_client:
@@ -408,14 +662,18 @@ class AgentMemoryManager:
     async def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory usage statistics."""
         try:
+            with self._cache_lock:
+                cached = list(self._memory_cache.values())
             stats = {
-                "total_entries": len(self._memory_cache),
+                "total_entries": len(cached),
                 "by_type": {},
                 "by_scope": {},
                 "redis_connected": self.redis_client is not None
             }
+            if self._write_buffer is not None:
+                stats["write_buffer"] = self._write_buffer.metrics()
 
-            for entry in self._memory_cache.values():
+            for entry in cached:
                 # Count by type
                 type_key = entry.memory_type.value
                 stats["by_type"][type_key] = stats["by_type"].get(type_key, 0) + 1
@@ -430,6 +688,20 @@ class AgentMemoryManager:
             logger.error(f"Failed to get memory stats: {e}")
             return {"error": str(e)}
 
+    async def flush(self) -> int:
+        """Write buffered memory entries to Redis now."""
+        if self._write_buffer is None:
+            return 0
+        return await self._write_buffer.flush()
+
+    async def close(self) -> None:
+        """Flush buffered memory entries and release Redis connections."""
+        if self._write_buffer is not None:
+            await self._write_buffer.close()
+        if self._redis_client is not None:
+            self._redis_client.close()
+            self._redis_client = None
+
     # Enhanced Phase 4 Methods for Agent Collaboration
 
     async def set_workflow_state(self, workflow_id: str, state: Dict[str, Any]) -> bool:
@@ -6,24 +6,51 @@ using the CrewAI framework with integration to our Model Router Service.
 """
 
 import asyncio
+import contextvars
+import json
 import uuid
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Callable, Awaitable
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, field
 
 import structlog
-from crewai import Agent, Task, Crew, Process
-from crewai.llm import LLM
 
 from ..core.config import get_settings
-from ..services.model_router import get_model_router, ModelRequest
+from ..core.lazy_imports import LazyAttributes
+from ..services.model_router import get_model_router, ModelRequest, ModelResponse, StreamChunk
 from .agent_memory import AgentMemoryManager, MemoryType, MemoryScope
 from .agent_tools import get_tools_for_agent, tool_registry
+from .agent_workflow_run import (
+    WorkflowRun,
+    WorkflowCancelled,
+    current_workflow_run,
+    crew_step_callback,
+    crew_task_callback,
+)
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+# CrewAI and the CrewAI LLM adapter are imported on first use so that API
+# pods which never run an agent do not pay for them at startup.
+_lazy = LazyAttributes(globals(), {
+    "Agent": "crewai",
+    "Task": "crewai",
+    "Crew": "crewai",
+    "Process": "crewai",
+    "ModelRouterLLM": ".agent_llm",
+    "agent_stream_sink": ".agent_llm",
+})
+__getattr__ = _lazy.module_getattr
+
+# Async callback receiving streamed token deltas (e.g. a WebSocket broadcast)
+StreamCallback = Callable[[StreamChunk], Awaitable[None]]
+
+# Async callback receiving workflow progress events
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
 
 class AgentRole(Enum):
     """Available agent roles in the real estate system."""
@@ -92,77 +119,6 @@ class WorkflowResult:
     completed_at: Optional[datetime] = None
 
 
-class ModelRouterLLM(LLM):
-    """
-    Custom LLM wrapper that integrates CrewAI with our Model Router Service.
-
-    This allows all agents to use the unified model routing with intelligent
-    fallbacks and cost optimization.
-    """
-
-    def __init__(self, model_preference: Optional[str] = None):
-        self.model_router = get_model_router()
-        self.model_preference = model_preference or "openrouter/auto"
-        super().__init__(model=self.model_preference)
-
-    def call(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """
-        Make a synchronous call to the model router.
-
-        Args:
-            messages: List of chat messages
-            **kwargs: Additional parameters
-
-        Returns:
-            Generated response content
-        """
-        # Convert to async call
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._async_call(messages, **kwargs))
-        finally:
-            loop.close()
-
-    async def _async_call(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """
-        Make an async call to the model router.
-
-        Args:
-            messages: List of chat messages
-            **kwargs: Additional parameters
-
-        Returns:
-            Generated response content
-        """
-        try:
-            # Create model request
-            request = ModelRequest(
-                messages=messages,
-                model_preference=self.model_preference,
-                max_tokens=kwargs.get('max_tokens', 2000),
-                temperature=kwargs.get('temperature', 0.1),
-                system_prompt=kwargs.get('system_prompt')
-            )
-
-            # Generate response using model router
-            response = await self.model_router.generate_response(request)
-
-            logger.info(
-                "Agent LLM call completed",
-                model_used=response.model_used,
-                provider=response.provider.value,
-                cost=response.cost,
-                processing_time=response.processing_time
-            )
-
-            return response.content
-
-        except Exception as e:
-            logger.error(f"Agent LLM call failed: {e}")
-            raise
-
-
 class AgentOrchestrator:
     """
     Core orchestrator for managing CrewAI agents and workflows.
@@ -177,12 +133,20 @@ class AgentOrchestrator:
         self.memory_manager = AgentMemoryManager()
 
         # Agent registry
-        self.agents: Dict[AgentRole, Agent] = {}
+        self.agents: Dict[AgentRole, "Agent"] = {}
         self.agent_configs: Dict[AgentRole, AgentConfig] = {}
 
         # Workflow tracking
-        self.active_workflows: Dict[str, Crew] = {}
+        self.active_workflows: Dict[str, "Crew"] = {}
         self.workflow_results: Dict[str, WorkflowResult] = {}
+        self.workflow_runs: Dict[str, WorkflowRun] = {}
+
+        # Crews run synchronously, so they get their own bounded thread pool
+        # instead of blocking the event loop
+        self._crew_executor = ThreadPoolExecutor(
+            max_workers=settings.AGENT_WORKFLOW_MAX_CONCURRENCY,
+            thread_name_prefix="agent-crew"
+        )
 
         # Initialize default agent configurations
         self._init_agent_configs()
@@ -258,7 +222,7 @@ class AgentOrchestrator:
 
         logger.info(f"Initialized {len(self.agent_configs)} agent configurations")
 
-    def create_agent(self, role: AgentRole, model_preference: Optional[str] = None) -> Agent:
+    def create_agent(self, role: AgentRole, model_preference: Optional[str] = None) -> "Agent":
         """
         Create a CrewAI agent with the specified role.
 
@@ -273,6 +237,7 @@ class AgentOrchestrator:
             raise ValueError(f"Unknown agent role: {role}")
 
         config = self.agent_configs[role]
+        _lazy.load("Agent", "ModelRouterLLM")
 
         # Create custom LLM with model router integration
         llm = ModelRouterLLM(model_preference=model_preference)
@@ -305,12 +270,12 @@ class AgentOrchestrator:
 
         return agent
 
-    def get_agent(self, role: AgentRole) -> Optional[Agent]:
+    def get_agent(self, role: AgentRole) -> Optional["Agent"]:
         """Get an existing agent by role."""
         return self.agents.get(role)
 
     def get_or_create_agent(self, role: AgentRole,
-                           model_preference: Optional[str] = None) -> Agent:
+                           model_preference: Optional[str] = None) -> "Agent":
         """Get an existing agent or create a new one."""
         agent = self.get_agent(role)
         if agent is None:
@@ -320,7 +285,7 @@ class AgentOrchestrator:
     async def create_workflow(self,
                              tasks: List[WorkflowTask],
                              workflow_id: Optional[str] = None,
-                             process_type: Process = Process.sequential,
+                             process_type: Optional["Process"] = None,
                              user_id: Optional[str] = None) -> str:
         """
         Create and execute a multi-agent workflow.
@@ -328,12 +293,16 @@ class AgentOrchestrator:
         Args:
             tasks: List of tasks to execute
             workflow_id: Optional workflow ID (generated if not provided)
-            process_type: CrewAI process type (sequential, hierarchical)
+            process_type: CrewAI process type (defaults to sequential)
             user_id: Optional user ID for context
 
         Returns:
             Workflow ID
         """
+        _lazy.load("Task", "Crew", "Process")
+        if process_type is None:
+            process_type = Process.sequential
+
         if not workflow_id:
             workflow_id = str(uuid.uuid4())
 
@@ -396,7 +365,9 @@ class AgentOrchestrator:
                 tasks=crew_tasks,
                 process=process_type,
                 verbose=True,
-                memory=True
+                memory=True,
+                step_callback=crew_step_callback,
+                task_callback=crew_task_callback
             )
 
             # Store active workflow
@@ -416,12 +387,22 @@ class AgentOrchestrator:
             logger.error(f"Failed to create workflow {workflow_id}: {e}")
             raise
 
-    async def execute_workflow(self, workflow_id: str) -> WorkflowResult:
+    async def execute_workflow(self, workflow_id: str,
+                               on_chunk: Optional[StreamCallback] = None,
+                               on_progress: Optional[ProgressCallback] = None) -> WorkflowResult:
         """
         Execute a workflow and return results.
 
+        The crew runs on the bounded crew executor, so the event loop keeps
+        serving other requests; workflows beyond the executor's capacity
+        queue. A running workflow stops at its next agent step or LLM call
+        after ``cancel_workflow``.
+
         Args:
             workflow_id: The workflow ID to execute
+            on_chunk: Optional callback receiving the agents' LLM output as it streams
+            on_progress: Optional callback receiving progress events (agent
+                started, tool invoked, tokens used, task completed)
 
         Returns:
             Workflow execution results
@@ -432,11 +413,35 @@ class AgentOrchestrator:
         crew = self.active_workflows[workflow_id]
         start_time = datetime.utcnow()
 
+        crew_tasks = getattr(crew, "tasks", None)
+        run = WorkflowRun(
+            workflow_id=workflow_id,
+            task_roles=[
+                str(getattr(getattr(task, "agent", None), "role", "agent"))
+                for task in (crew_tasks if isinstance(crew_tasks, list) else [])
+            ],
+            emit=self._thread_safe_callback(on_progress) if on_progress else None
+        )
+        self.workflow_runs[workflow_id] = run
+
         try:
             logger.info(f"Starting workflow execution: {workflow_id}")
-
-            # Execute the crew
-            result = crew.kickoff()
+            run.publish("workflow_queued")
+
+            # Execute the crew off the event loop. It runs in a copy of this
+            # context, so the run and stream sink it sets do not leak into
+            # other work on the same pool thread.
+            sink = self._thread_safe_callback(on_chunk) if on_chunk else None
+            context = contextvars.copy_context()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._crew_executor, context.run, self._kickoff_crew, crew, run, sink
+                )
+            except asyncio.CancelledError:
+                # Nobody is waiting for the crew any more; stop it as well
+                run.cancel()
+                self.active_workflows.pop(workflow_id, None)
+                raise
 
             execution_time = (datetime.utcnow() - start_time).total_seconds()
 
@@ -444,10 +449,10 @@ class AgentOrchestrator:
             workflow_result = WorkflowResult(
                 workflow_id=workflow_id,
                 status=WorkflowStatus.COMPLETED,
-                results={"output": str(result)},
+                results={"output": str(result), "token_usage": dict(run.token_usage)},
                 execution_time=execution_time,
-                cost=0.0,  # Will be calculated from model router usage
-                agent_interactions=[],
+                cost=run.cost,
+                agent_interactions=list(run.recent_events),
                 completed_at=datetime.utcnow()
             )
 
@@ -471,7 +476,8 @@ class AgentOrchestrator:
             )
 
             # Clean up active workflow
-            del self.active_workflows[workflow_id]
+            self.active_workflows.pop(workflow_id, None)
+            run.publish("workflow_completed", execution_time=execution_time, cost=run.cost)
 
             logger.info(
                 "Workflow completed",
@@ -482,6 +488,25 @@ class AgentOrchestrator:
 
             return workflow_result
 
+        except WorkflowCancelled:
+            execution_time = (datetime.utcnow() - start_time).total_seconds()
+
+            workflow_result = WorkflowResult(
+                workflow_id=workflow_id,
+                status=WorkflowStatus.CANCELLED,
+                results={"token_usage": dict(run.token_usage)},
+                execution_time=execution_time,
+                cost=run.cost,
+                agent_interactions=list(run.recent_events),
+                completed_at=datetime.utcnow()
+            )
+            self.workflow_results[workflow_id] = workflow_result
+            self.active_workflows.pop(workflow_id, None)
+            run.publish("workflow_cancelled", execution_time=execution_time)
+
+            logger.info("Workflow stopped after cancellation", workflow_id=workflow_id)
+            return workflow_result
+
         except Exception as e:
             execution_time = (datetime.utcnow() - start_time).total_seconds()
 
@@ -491,8 +516,8 @@ class AgentOrchestrator:
                 status=WorkflowStatus.FAILED,
                 results={},
                 execution_time=execution_time,
-                cost=0.0,
-                agent_interactions=[],
+                cost=run.cost,
+                agent_interactions=list(run.recent_events),
                 errors=[str(e)],
                 completed_at=datetime.utcnow()
             )
@@ -501,8 +526,8 @@ class AgentOrchestrator:
             self.workflow_results[workflow_id] = workflow_result
 
             # Clean up active workflow
-            if workflow_id in self.active_workflows:
-                del self.active_workflows[workflow_id]
+            self.active_workflows.pop(workflow_id, None)
+            run.publish("workflow_failed", error=str(e))
 
             logger.error(
                 "Workflow failed",
@@ -513,14 +538,108 @@ class AgentOrchestrator:
 
             raise
 
+        finally:
+            self.workflow_runs.pop(workflow_id, None)
+
+    @staticmethod
+    def _kickoff_crew(crew: "Crew", run: WorkflowRun,
+                      sink: Optional[Callable[[StreamChunk], None]]) -> Any:
+        """Run a crew in a crew executor thread with the workflow's context set."""
+        current_workflow_run.set(run)
+        if sink is not None:
+            _lazy.load("agent_stream_sink")
+            agent_stream_sink.set(sink)
+
+        # Cancelled while still queued
+        run.check_cancelled()
+
+        run.publish("workflow_started")
+        if run.current_agent is not None:
+            run.publish("agent_started", agent=run.current_agent)
+        return crew.kickoff()
+
+    async def stream_agent_response(self,
+                                    role: AgentRole,
+                                    task_description: str,
+                                    input_data: Optional[Dict[str, Any]] = None,
+                                    on_chunk: Optional[StreamCallback] = None,
+                                    model_preference: Optional[str] = None) -> ModelResponse:
+        """
+        Run a single-turn task for an agent role, streaming the output.
+
+        Args:
+            role: Agent role whose goal and backstory frame the task
+            task_description: Task to perform
+            input_data: Optional input data included in the prompt
+            on_chunk: Optional callback awaited for every streamed chunk
+            model_preference: Optional model preference
+
+        Returns:
+            Complete response with token usage and cost
+        """
+        if role not in self.agent_configs:
+            raise ValueError(f"Unknown agent role: {role}")
+
+        config = self.agent_configs[role]
+        prompt = task_description
+        if input_data:
+            prompt += "\n\nInput data:\n" + json.dumps(input_data, indent=2, default=str)
+
+        request = ModelRequest(
+            messages=[{"role": "user", "content": prompt}],
+            model_preference=model_preference,
+            stream=True,
+            system_prompt=f"{config.backstory}\n\nYour goal: {config.goal}"
+        )
+
+        response = None
+        async for chunk in self.model_router.generate_stream(request):
+            if on_chunk is not None:
+                await on_chunk(chunk)
+            if chunk.done:
+                response = chunk.response
+
+        logger.info(
+            "Agent response streamed",
+            role=role.value,
+            model_used=response.model_used,
+            time_to_first_token=response.metadata.get("time_to_first_token")
+        )
+
+        return response
+
+    @staticmethod
+    def _thread_safe_callback(callback: Callable[[Any], Awaitable[None]]) -> Callable[[Any], None]:
+        """
+        Adapt an async callback for use from crew and agent LLM threads.
+
+        Crews run in executor threads and agent LLM calls on their own event
+        loop, so each invocation is handed back to the loop that started the
+        workflow.
+        """
+        loop = asyncio.get_running_loop()
+
+        def log_failure(future):
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning(f"Workflow callback failed: {future.exception()}")
+
+        def invoke(value):
+            asyncio.run_coroutine_threadsafe(callback(value), loop).add_done_callback(log_failure)
+
+        return invoke
+
     async def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """Get the current status of a workflow."""
         if workflow_id in self.active_workflows:
-            return {
+            status_info = {
                 "workflow_id": workflow_id,
                 "status": WorkflowStatus.RUNNING.value,
                 "active": True
             }
+            run = self.workflow_runs.get(workflow_id)
+            if run is not None:
+                status_info.update(run.snapshot())
+            return status_info
         elif workflow_id in self.workflow_results:
             result = self.workflow_results[workflow_id]
             return {
@@ -539,10 +658,19 @@ class AgentOrchestrator:
             }
 
     async def cancel_workflow(self, workflow_id: str) -> bool:
-        """Cancel an active workflow."""
+        """
+        Cancel an active workflow.
+
+        A running crew is stopped cooperatively at its next agent step or LLM
+        call; a workflow that has not started yet never runs.
+        """
         if workflow_id in self.active_workflows:
             del self.active_workflows[workflow_id]
 
+            run = self.workflow_runs.get(workflow_id)
+            if run is not None:
+                run.cancel()
+
             # Store cancellation in memory
             await self.memory_manager.store_memory(
                 content={
@@ -562,11 +690,20 @@ class AgentOrchestrator:
 
         return False
 
+    def shutdown(self):
+        """Cancel running workflows and stop the crew executor."""
+        for run in list(self.workflow_runs.values()):
+            run.cancel()
+        self._crew_executor.shutdown(wait=False, cancel_futures=True)
+
 
-# Global orchestrator instance
-orchestrator = AgentOrchestrator()
+# Global orchestrator instance (created on first use)
+_orchestrator = None
 
 
 def get_agent_orchestrator() -> AgentOrchestrator:
     """Get the global agent orchestrator instance."""
-    return orchestrator
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = AgentOrchestrator()
+    return _orchestrator
@@ -14,76 +14,64 @@ from .base import (
     ToolRegistry,
     get_tool_registry
 )
+from .executor import ToolExecutor
 
-# Data Extraction Tools
-from .data_extraction import (
-    DocumentParsingTool,
-    EntityRecognitionTool,
-    ConfidenceScoringTool
-)
+from ...core.lazy_imports import LazyAttributes
 
-# Contract Generation Tools
-from .contract_generation import (
-    TemplateFillTool,
-    ClauseGenerationTool,
-    DocumentGenerationTool
-)
+# Tool classes are imported from their submodules on first access so that
+# importing this package (and therefore the API application) stays cheap.
+_lazy = LazyAttributes(globals(), {
+    # Data Extraction Tools
+    'DocumentParsingTool': '.data_extraction',
+    'EntityRecognitionTool': '.data_extraction',
+    'ConfidenceScoringTool': '.data_extraction',
 
-# Compliance Checking Tools
-from .compliance_checking import (
-    ComplianceValidationTool,
-    RuleEngineValidationTool,
-    ComplianceReportTool
-)
+    # Contract Generation Tools
+    'TemplateFillTool': '.contract_generation',
+    'ClauseGenerationTool': '.contract_generation',
+    'DocumentGenerationTool': '.contract_generation',
 
-# Signature Tracking Tools
-from .signature_tracking import (
-    SignatureTrackingTool,
-    WebhookReconciliationTool,
-    NotificationTool,
-    AuditTrailTool
-)
+    # Compliance Checking Tools
+    'ComplianceValidationTool': '.compliance_checking',
+    'RuleEngineValidationTool': '.compliance_checking',
+    'ComplianceReportTool': '.compliance_checking',
 
-# Summarization Tools
-from .summarization import (
-    DocumentSummarizationTool,
-    DiffGenerationTool
-)
+    # Signature Tracking Tools
+    'SignatureTrackingTool': '.signature_tracking',
+    'WebhookReconciliationTool': '.signature_tracking',
+    'NotificationTool': '.signature_tracking',
+    'AuditTrailTool': '.signature_tracking',
 
-# Help and Assistance Tools
-from .help_assistance import (
-    ContextualQATool,
-    WorkflowGuidanceTool,
-    ClauseExplanationTool
-)
+    # Summarization Tools
+    'DocumentSummarizationTool': '.summarization',
+    'DiffGenerationTool': '.summarization',
 
-# Database Access Tools
-from .database_access import (
-    ContractDatabaseTool,
-    TemplateDatabaseTool,
-    FileDatabaseTool,
-    UserDatabaseTool
-)
+    # Help and Assistance Tools
+    'ContextualQATool': '.help_assistance',
+    'WorkflowGuidanceTool': '.help_assistance',
+    'ClauseExplanationTool': '.help_assistance',
 
-# File Operation Tools
-from .file_operations import (
-    FileReadTool,
-    FileWriteTool,
-    FileProcessingTool,
-    FileManagementTool
-)
+    # Database Access Tools
+    'ContractDatabaseTool': '.database_access',
+    'TemplateDatabaseTool': '.database_access',
+    'FileDatabaseTool': '.database_access',
+    'UserDatabaseTool': '.database_access',
 
-# Template Processing Tools
-from .template_processing import (
-    TemplateAnalysisTool,
-    TemplateRenderingTool
-)
+    # File Operation Tools
+    'FileReadTool': '.file_operations',
+    'FileWriteTool': '.file_operations',
+    'FileProcessingTool': '.file_operations',
+    'FileManagementTool': '.file_operations',
 
-# Performance Optimization Tools
-from .performance_optimization import (
-    CacheTool,
-    PerformanceMonitorTool
-)
+    # Template Processing Tools
+    'TemplateAnalysisTool': '.template_processing',
+    'TemplateRenderingTool': '.template_processing',
+
+    # Performance Optimization Tools
+    'CacheTool': '.performance_optimization',
+    'PerformanceMonitorTool': '.performance_optimization',
+})
+__getattr__ = _lazy.module_getattr
 
 # Tool registry instance
 tool_registry = get_tool_registry()
@@ -91,6 +79,7 @@ tool_registry = get_tool_registry()
 
 def register_all_tools():
     """Register all available tools in the tool registry."""
+    _lazy.load()
 
     # Data Extraction Tools
     tool_registry.register_tool(DocumentParsingTool())
@@ -220,8 +209,8 @@ def list_all_tools() -> list:
     return tool_registry.list_tools()
 
 
-# Auto-register tools when module is imported
-register_all_tools()
+# Register tools the first time the registry is queried
+tool_registry.set_loader(register_all_tools)
 
 __all__ = [
     # Base classes
@@ -230,6 +219,7 @@ __all__ = [
     'ToolResult',
     'ToolInput',
     'ToolRegistry',
+    'ToolExecutor',
     'get_tool_registry',
 
     # Data Extraction Tools
@@ -7,7 +7,7 @@ common functionality, error handling, and integration patterns.
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, List, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -16,7 +16,7 @@ import structlog
 from pydantic import BaseModel, Field
 
 from ...core.config import get_settings
-from ...services.agent_memory import AgentMemoryManager, MemoryType, MemoryScope
+from ...services.agent_memory import AgentMemoryManager, MemoryType, MemoryScope, get_memory_manager
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
@@ -61,8 +61,16 @@ class BaseTool(ABC):
     memory integration, and standardized result formatting.
     """
     
+    # Execution limits applied by the registry's ToolExecutor; None uses the
+    # AGENT_TOOL_* settings. Only tools whose result depends on nothing but
+    # their input may be cacheable.
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    cacheable: bool = False
+    
     def __init__(self, memory_manager: Optional[AgentMemoryManager] = None):
-        self.memory_manager = memory_manager or AgentMemoryManager()
+        # Tools share the process-wide manager, its cache and Redis clients
+        self.memory_manager = memory_manager or get_memory_manager()
         self.settings = get_settings()
         self.logger = structlog.get_logger(self.__class__.__name__)
     
@@ -120,7 +128,8 @@ class BaseTool(ABC):
                 agent_id=input_data.agent_id,
                 workflow_id=input_data.workflow_id,
                 user_id=input_data.user_id,
-                tags={self.category.value, "tool_execution", self.name}
+                tags={self.category.value, "tool_execution", self.name},
+                write_behind=True
             )
             
         except Exception as e:
@@ -333,9 +342,37 @@ class ToolRegistry:
     def __init__(self):
         self.tools: Dict[str, BaseTool] = {}
         self.tools_by_category: Dict[ToolCategory, List[BaseTool]] = {}
+        self._loader: Optional[Callable[[], None]] = None
+        self._loaded = False
+        self._executor = None
+    
+    def set_loader(self, loader: Callable[[], None]) -> None:
+        """
+        Defer registration of the built-in tools until the registry is first queried.
+        
+        Args:
+            loader: Callable that registers tools via register_tool
+        """
+        self._loader = loader
+        self._loaded = False
+    
+    def ensure_loaded(self) -> None:
+        """Run the deferred tool loader once, if one is configured."""
+        if self._loaded or self._loader is None:
+            return
+        self._loaded = True
+        try:
+            self._loader()
+        except Exception:
+            self._loaded = False
+            raise
     
     def register_tool(self, tool: BaseTool) -> None:
         """Register a tool in the registry."""
+        previous = self.tools.get(tool.name)
+        if previous is not None:
+            self.tools_by_category[previous.category].remove(previous)
+        
         self.tools[tool.name] = tool
         
         if tool.category not in self.tools_by_category:
@@ -346,15 +383,53 @@ class ToolRegistry:
     
     def get_tool(self, name: str) -> Optional[BaseTool]:
         """Get a tool by name."""
+        self.ensure_loaded()
         return self.tools.get(name)
     
     def get_tools_by_category(self, category: ToolCategory) -> List[BaseTool]:
         """Get all tools in a category."""
+        self.ensure_loaded()
         return self.tools_by_category.get(category, [])
     
     def list_tools(self) -> List[Dict[str, Any]]:
         """List all registered tools."""
+        self.ensure_loaded()
         return [tool.get_tool_info() for tool in self.tools.values()]
+    
+    @property
+    def executor(self):
+        """Executor running this registry's tools, created on first use."""
+        if self._executor is None:
+            from .executor import ToolExecutor
+            self._executor = ToolExecutor(self)
+        return self._executor
+    
+    async def execute(self, name: str, input_data: ToolInput, timeout: Optional[float] = None) -> ToolResult:
+        """
+        Execute a registered tool with its concurrency limit, deadline and cache.
+        
+        Args:
+            name: Tool name
+            input_data: Tool input data
+            timeout: Deadline in seconds, overriding the tool's
+            
+        Returns:
+            Tool execution result; a failed result for unknown tools and timeouts
+        """
+        return await self.executor.execute(name, input_data, timeout)
+    
+    async def execute_many(self, calls: List[tuple], timeout: Optional[float] = None) -> List[ToolResult]:
+        """
+        Execute independent tool calls concurrently.
+        
+        Args:
+            calls: (tool name, input data) pairs
+            timeout: Deadline of each call in seconds
+            
+        Returns:
+            Results in the order of the calls
+        """
+        return await self.executor.execute_many(calls, timeout)
 
 
 # Global tool registry
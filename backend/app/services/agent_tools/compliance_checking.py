@@ -15,11 +15,22 @@ import structlog
 from pydantic import BaseModel, Field
 
 from .base import ComplianceTool, ToolInput, ToolResult, ToolCategory
+from ..compliance_rule_engine import RuleScanResult, compile_rule_set
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+# Pattern rules that fail when their element is missing; other pattern
+# rules report what they found
+REQUIRED_ELEMENT_RULES = frozenset({"required_parties", "purchase_price", "signatures"})
+
+# Terms checked by rule engine logic: every group needs one of its terms
+RULE_LOGIC_TERMS = {
+    "must_contain_buyer_and_seller": [["buyer"], ["seller"]],
+    "must_contain_price_and_terms": [["$"], ["price", "payment"]],
+}
+
 
 class SeverityLevel(Enum):
     """Severity levels for compliance issues."""
@@ -207,9 +218,13 @@ class ComplianceValidationTool(ComplianceTool):
             "info": []
         }
         
+        # All pattern rules are matched in one pass over the document
+        rule_set = compile_rule_set((rule.id, rule.pattern) for rule in rules if rule.pattern)
+        scan_results = rule_set.scan(content, first_only=REQUIRED_ELEMENT_RULES)
+        
         for rule in rules:
             try:
-                violations = await self._check_rule(content, rule)
+                violations = await self._check_rule(content, rule, scan_results.get(rule.id))
                 
                 for violation in violations:
                     issue = {
@@ -235,17 +250,37 @@ class ComplianceValidationTool(ComplianceTool):
         
         return results
     
-    async def _check_rule(self, content: str, rule: ComplianceRule) -> List[Dict[str, Any]]:
+    async def _check_rule(self,
+                          content: str,
+                          rule: ComplianceRule,
+                          scan_result: Optional[RuleScanResult] = None) -> List[Dict[str, Any]]:
         """Check a single compliance rule."""
         violations = []
         
         if rule.pattern:
             # Pattern-based rule
-            matches = list(re.finditer(rule.pattern, content))
+            if scan_result is None:
+                scan_result = compile_rule_set([(rule.id, rule.pattern)]).scan(
+                    content, first_only=REQUIRED_ELEMENT_RULES
+                )[rule.id]
             
-            if rule.id in ["required_parties", "purchase_price", "signatures"]:
+            if scan_result.timed_out:
+                logger.warning(
+                    "Compliance rule scan timed out",
+                    rule_id=rule.id,
+                    candidates=scan_result.candidates,
+                    matches=len(scan_result.matches)
+                )
+            
+            if rule.id in REQUIRED_ELEMENT_RULES:
                 # These rules require matches to be present
-                if not matches:
+                if scan_result.timed_out and not scan_result.found:
+                    violations.append({
+                        "type": "scan_timeout",
+                        "message": f"Could not verify within the time limit: {rule.name}",
+                        "location": "document"
+                    })
+                elif not scan_result.found:
                     violations.append({
                         "type": "missing_required_element",
                         "message": f"Required element not found: {rule.name}",
@@ -253,11 +288,11 @@ class ComplianceValidationTool(ComplianceTool):
                     })
             else:
                 # These rules are informational about what was found
-                for match in matches:
+                for start, end, text in scan_result.matches:
                     violations.append({
                         "type": "found_element",
-                        "message": f"Found: {match.group(0)}",
-                        "location": f"position {match.start()}-{match.end()}"
+                        "message": f"Found: {text}",
+                        "location": f"position {start}-{end}"
                     })
         
         elif rule.validator_function:
@@ -411,8 +446,11 @@ class RuleEngineValidationTool(ComplianceTool):
             "overall_result": "passed"
         }
         
+        # Terms of all rules are looked up in one pass over the document
+        found_terms = self._find_logic_terms(content, [rule.get("logic", "") for rule in rule_set.get("rules", [])])
+        
         for rule in rule_set.get("rules", []):
-            rule_result = await self._execute_single_rule(content, rule)
+            rule_result = await self._execute_single_rule(content, rule, found_terms)
             results["rule_results"].append(rule_result)
             
             if rule_result["passed"]:
@@ -426,7 +464,22 @@ class RuleEngineValidationTool(ComplianceTool):
         
         return results
     
-    async def _execute_single_rule(self, content: str, rule: Dict[str, Any]) -> Dict[str, Any]:
+    def _find_logic_terms(self, content: str, logics: List[str]) -> set:
+        """Find which terms used by rule logic occur in the content (case-insensitive)."""
+        terms = {
+            term
+            for logic in logics
+            for group in RULE_LOGIC_TERMS.get(logic, [])
+            for term in group
+        }
+        rule_set = compile_rule_set((term, f"(?i){re.escape(term)}") for term in sorted(terms))
+        scan_results = rule_set.scan(content, first_only=terms)
+        return {term for term, result in scan_results.items() if result.found}
+    
+    async def _execute_single_rule(self,
+                                   content: str,
+                                   rule: Dict[str, Any],
+                                   found_terms: Optional[set] = None) -> Dict[str, Any]:
         """Execute a single rule."""
         rule_id = rule.get("id", "unknown")
         logic = rule.get("logic", "")
@@ -434,10 +487,13 @@ class RuleEngineValidationTool(ComplianceTool):
         
         try:
             # Simple rule logic implementation
-            if logic == "must_contain_buyer_and_seller":
-                passed = "buyer" in content.lower() and "seller" in content.lower()
-            elif logic == "must_contain_price_and_terms":
-                passed = "$" in content and ("price" in content.lower() or "payment" in content.lower())
+            if logic in RULE_LOGIC_TERMS:
+                if found_terms is None:
+                    found_terms = self._find_logic_terms(content, [logic])
+                passed = all(
+                    any(term in found_terms for term in group)
+                    for group in RULE_LOGIC_TERMS[logic]
+                )
             else:
                 passed = True  # Unknown logic passes by default
             
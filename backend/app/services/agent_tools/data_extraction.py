@@ -5,7 +5,7 @@ This module provides specialized tools for the Data Extraction Agent,
 including document parsing, entity recognition, and confidence scoring.
 """
 
-import re
+import asyncio
 import json
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
@@ -15,6 +15,7 @@ import structlog
 from pydantic import BaseModel, Field
 
 from .base import DataExtractionTool, ToolInput, ToolResult, ToolCategory
+from ..entity_extraction import ENTITY_CATEGORIES, get_entity_extractor
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -213,162 +214,13 @@ class EntityRecognitionTool(DataExtractionTool):
                                   document_type: str,
                                   entity_types: List[str]) -> Dict[str, List[Dict[str, Any]]]:
         """Extract all types of real estate entities."""
-        entities = {
-            "properties": await self._extract_property_entities(text),
-            "parties": await self._extract_party_entities(text),
-            "financial_terms": await self._extract_financial_entities(text),
-            "dates": await self._extract_date_entities(text),
-            "legal_terms": await self._extract_legal_entities(text),
-            "addresses": await self._extract_address_entities(text)
-        }
-        
         # Filter by requested entity types if specified
-        if entity_types:
-            entities = {k: v for k, v in entities.items() if k in entity_types}
-        
-        return entities
-    
-    async def _extract_property_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract property-related entities."""
-        properties = []
-        
-        # Property type patterns
-        property_patterns = [
-            r'(?i)(single[- ]family|multi[- ]family|condominium|townhouse|apartment|commercial|residential)',
-            r'(?i)(\d+[- ]bedroom|\d+[- ]bath|\d+[- ]story)',
-            r'(?i)(\d+[,\d]*\s*square\s*feet|\d+[,\d]*\s*sq\.?\s*ft\.?)'
-        ]
-        
-        for pattern in property_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                properties.append({
-                    "type": "property_feature",
-                    "value": match.group(1),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.8
-                })
-        
-        return properties
-    
-    async def _extract_party_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract party-related entities (buyers, sellers, agents)."""
-        parties = []
-        
-        # Name patterns (simplified)
-        name_patterns = [
-            r'(?i)(buyer|seller|purchaser|vendor|agent|broker):\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'(?i)([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(buyer|seller|purchaser|vendor)'
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                parties.append({
-                    "type": "party",
-                    "name": match.group(2) if len(match.groups()) > 1 else match.group(1),
-                    "role": match.group(1) if len(match.groups()) > 1 else "unknown",
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.7
-                })
-        
-        return parties
-    
-    async def _extract_financial_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract financial terms and amounts."""
-        financial = []
-        
-        # Money patterns
-        money_patterns = [
-            r'\$[\d,]+\.?\d*',
-            r'(?i)(purchase\s+price|down\s+payment|earnest\s+money|closing\s+costs):\s*\$?([\d,]+\.?\d*)',
-            r'(?i)(\d+\.?\d*)\s*percent|(\d+\.?\d*)%'
-        ]
-        
-        for pattern in money_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                financial.append({
-                    "type": "financial_amount",
-                    "value": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.9
-                })
+        categories = [category for category in ENTITY_CATEGORIES if not entity_types or category in entity_types]
+        if not categories:
+            return {}
         
-        return financial
-    
-    async def _extract_date_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract date-related entities."""
-        dates = []
-        
-        # Date patterns
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{1,2}-\d{1,2}-\d{4}',
-            r'(?i)(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                dates.append({
-                    "type": "date",
-                    "value": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.85
-                })
-        
-        return dates
-    
-    async def _extract_legal_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract legal terms and clauses."""
-        legal = []
-        
-        # Legal term patterns
-        legal_patterns = [
-            r'(?i)(contingency|addendum|amendment|disclosure|warranty|covenant|lien|easement)',
-            r'(?i)(as[- ]is|subject\s+to|provided\s+that|notwithstanding)'
-        ]
-        
-        for pattern in legal_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                legal.append({
-                    "type": "legal_term",
-                    "value": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.75
-                })
-        
-        return legal
-    
-    async def _extract_address_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract address entities."""
-        addresses = []
-        
-        # Address patterns (simplified)
-        address_patterns = [
-            r'\d+\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd)',
-            r'[A-Z][a-z]+,\s*[A-Z]{2}\s+\d{5}(-\d{4})?'
-        ]
-        
-        for pattern in address_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                addresses.append({
-                    "type": "address",
-                    "value": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "confidence": 0.8
-                })
-        
-        return addresses
+        # All patterns are matched in one pass; large texts are scanned in parallel processes
+        return await asyncio.to_thread(get_entity_extractor().extract, text, categories)
     
     async def _validate_entities(self, entities: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """Validate extracted entities for consistency and accuracy."""
@@ -390,6 +242,9 @@ class EntityRecognitionTool(DataExtractionTool):
 class ConfidenceScoringTool(DataExtractionTool):
     """Tool for calculating confidence scores for extracted data."""
     
+    # Scores depend only on the entities and validation results passed in
+    cacheable = True
+    
     @property
     def name(self) -> str:
         return "confidence_scorer"
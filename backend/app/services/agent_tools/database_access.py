@@ -5,16 +5,20 @@ This module provides specialized tools for agents to interact with the database
 using existing models (contracts, templates, files, users) for agent operations.
 """
 
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+import asyncio
+from typing import Dict, Any, FrozenSet, List, Optional, Union
+from datetime import date, datetime
+from enum import Enum
+from sqlalchemy.orm import Query, Session, joinedload, load_only, selectinload
+from sqlalchemy import JSON, LargeBinary, Text, and_, or_, desc, asc, text
+from sqlalchemy import inspect as sa_inspect
 
 import structlog
 from pydantic import BaseModel, Field
 
 from .base import BaseTool, ToolInput, ToolResult, ToolCategory
-from ...core.database import get_session
+from .performance_optimization import ResourcePool, get_resource_pool
+from ...core.database import get_session_context
 from ...models.contract import Contract
 from ...models.template import Template
 from ...models.file import File
@@ -24,6 +28,12 @@ from ...core.config import get_settings
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+# Never returned by the database tools
+SENSITIVE_FIELDS = frozenset({"password_hash", "hashed_password"})
+
+# Column types returned only when requested by name
+_BULKY_TYPES = (Text, JSON, LargeBinary)
+
 
 class DatabaseQueryInput(ToolInput):
     """Input for database query operations."""
@@ -32,6 +42,9 @@ class DatabaseQueryInput(ToolInput):
     filters: Dict[str, Any] = Field(default_factory=dict, description="Filter conditions")
     limit: int = Field(default=100, description="Maximum number of results")
     offset: int = Field(default=0, description="Offset for pagination")
+    fields: Optional[List[str]] = Field(default=None, description="Columns to return; omit for the default serialization, or for get_many and stream every column except text bodies, JSON documents and binaries")
+    include: List[str] = Field(default_factory=list, description="Related rows to load with get_many and stream, e.g. deal or versions")
+    related_fields: Dict[str, List[str]] = Field(default_factory=dict, description="Columns to return for each included relationship")
 
 
 class DatabaseCreateInput(ToolInput):
@@ -47,9 +60,278 @@ class DatabaseUpdateInput(ToolInput):
     data: Dict[str, Any] = Field(..., description="Data for updating the model")
 
 
-class ContractDatabaseTool(BaseTool):
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _reset_session(session: Session) -> None:
+    """End the session's transaction, returning its connection to the engine pool."""
+    session.rollback()
+    session.expunge_all()
+
+
+def _check_session(session: Session) -> bool:
+    """Verify the database is reachable through the session."""
+    session.execute(text("SELECT 1"))
+    session.rollback()
+    return True
+
+
+def get_session_pool() -> ResourcePool:
+    """
+    Get the pool of database sessions shared by the database tools.
+
+    The pool bounds concurrent database use by agents to
+    AGENT_DB_SESSION_POOL_SIZE, so bursts of tool calls wait for a session
+    instead of exhausting the engine's connections.
+    """
+    return get_resource_pool(
+        "database",
+        factory=get_session_context,
+        close=Session.close,
+        reset=_reset_session,
+        health_check=_check_session,
+        max_size=settings.AGENT_DB_SESSION_POOL_SIZE
+    )
+
+
+class _DatabaseAccessTool(BaseTool):
+    """
+    Batched, projected access to one model, shared by the database tools.
+
+    ``get_many`` fetches records by ID, ``stream`` pages through filtered
+    records with an ID cursor, and ``bulk_update`` writes many records in
+    one statement, all on a single pooled session. Records carry only the
+    requested ``fields`` (by default every column except text bodies, JSON
+    documents and binaries), selected in SQL rather than trimmed after
+    loading. ``include`` loads related rows with one query per relationship
+    instead of one per record. Batches run in a worker thread so they do
+    not block the event loop.
+    """
+
+    model: Any = None
+    # Columns agents may read; None for every column except sensitive ones
+    readable_fields: Optional[FrozenSet[str]] = None
+    # Columns bulk_update may write; None for every readable column except
+    # id and created_at, empty for read-only tools
+    updatable_fields: Optional[FrozenSet[str]] = frozenset()
+    # Relationships include may load; None for all of them
+    includable: Optional[FrozenSet[str]] = None
+    # Whether stream may page through whole tables
+    streamable: bool = True
+
+    def _columns(self, model: Any = None) -> Dict[str, Any]:
+        """Readable column properties of a model by attribute name."""
+        model = model if model is not None else self.model
+        columns = {
+            prop.key: prop for prop in sa_inspect(model).column_attrs
+            if prop.key not in SENSITIVE_FIELDS
+        }
+        if model is self.model and self.readable_fields is not None:
+            columns = {key: prop for key, prop in columns.items() if key in self.readable_fields}
+        return columns
+
+    def _fields(self, requested: Optional[List[str]], model: Any = None) -> List[str]:
+        """Validated field names to return, always including the primary key."""
+        model = model if model is not None else self.model
+        columns = self._columns(model)
+        if not requested:
+            return [key for key, prop in columns.items() if not isinstance(prop.columns[0].type, _BULKY_TYPES)]
+
+        unknown = [field for field in requested if field not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields for {model.__name__}: {', '.join(unknown)}")
+        fields = list(dict.fromkeys(requested))
+        if "id" in columns and "id" not in fields:
+            fields.insert(0, "id")
+        return fields
+
+    def _related_fields(self, input_data: DatabaseQueryInput) -> Dict[str, List[str]]:
+        """Fields to return for each included relationship."""
+        relationships = sa_inspect(self.model).relationships
+        related = {}
+        for name in dict.fromkeys(input_data.include):
+            if name not in relationships or (self.includable is not None and name not in self.includable):
+                raise ValueError(f"Cannot include {name} with {self.model.__name__}")
+            related[name] = self._fields(input_data.related_fields.get(name), relationships[name].mapper.class_)
+        return related
+
+    def _select(self, db: Session, fields: List[str], related: Dict[str, List[str]]) -> Query:
+        """Query selecting only the given fields, eager loading related rows."""
+        model = self.model
+        if not related:
+            return db.query(*(getattr(model, field) for field in fields))
+
+        relationships = sa_inspect(model).relationships
+        options = [load_only(*(getattr(model, field) for field in fields))]
+        for name, related_fields in related.items():
+            relationship = relationships[name]
+            target = relationship.mapper.class_
+            # Collections in one IN query per relationship, single rows joined in
+            loader = selectinload if relationship.uselist else joinedload
+            options.append(loader(getattr(model, name)).load_only(*(getattr(target, field) for field in related_fields)))
+        return db.query(model).options(*options)
+
+    def _record(self, row: Any, fields: List[str], related: Dict[str, List[str]]) -> Dict[str, Any]:
+        record = {field: _jsonable(getattr(row, field)) for field in fields}
+        for name, related_fields in related.items():
+            value = getattr(row, name)
+            if isinstance(value, (list, tuple, set)):
+                record[name] = [self._record(item, related_fields, {}) for item in value]
+            else:
+                record[name] = self._record(value, related_fields, {}) if value is not None else None
+        return record
+
+    def _projected(self, query: Query, fields: List[str]) -> List[Dict[str, Any]]:
+        """Records of an entity query loading only the given fields."""
+        query = query.options(load_only(*(getattr(self.model, field) for field in fields)))
+        return [self._record(row, fields, {}) for row in query.all()]
+
+    def _ids(self, ids: Any) -> List[Any]:
+        """Distinct IDs in request order, converted to the primary key type."""
+        if not isinstance(ids, (list, tuple)) or not ids:
+            raise ValueError("ids must be a non-empty list")
+        ids = list(dict.fromkeys(self._id(value) for value in ids))
+        if len(ids) > settings.AGENT_DB_MAX_BATCH_SIZE:
+            raise ValueError(f"At most {settings.AGENT_DB_MAX_BATCH_SIZE} records per call, got {len(ids)}")
+        return ids
+
+    def _id(self, value: Any) -> Any:
+        try:
+            python_type = self.model.id.type.python_type
+        except NotImplementedError:
+            return value
+        try:
+            return value if isinstance(value, python_type) else python_type(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {self.model.__name__} ID: {value!r}")
+
+    def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
+        """Filter by equality on readable columns."""
+        columns = self._columns()
+        for key, value in filters.items():
+            if key in columns and value is not None:
+                query = query.filter(getattr(self.model, key) == value)
+        return query
+
+    def _get_many(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
+        """Fetch records by ID in one query, in the order requested."""
+        ids = self._ids(input_data.query_params.get("ids"))
+        fields = self._fields(input_data.fields)
+        related = self._related_fields(input_data)
+
+        found = {row.id: row for row in self._select(db, fields, related).filter(self.model.id.in_(ids))}
+
+        return {
+            "records": [self._record(found[record_id], fields, related) for record_id in ids if record_id in found],
+            "missing_ids": [record_id for record_id in ids if record_id not in found],
+            "fields": fields,
+            "included": list(related)
+        }
+
+    def _stream(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
+        """Return the next page of filtered records after an ID cursor."""
+        if not self.streamable:
+            raise ValueError(f"{self.name} does not support stream")
+        if input_data.limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(input_data.limit, settings.AGENT_DB_STREAM_MAX_ROWS)
+        fields = self._fields(input_data.fields)
+        related = self._related_fields(input_data)
+
+        query = self._apply_filters(self._select(db, fields, related), input_data.filters)
+        after_id = input_data.query_params.get("after_id")
+        if after_id is not None:
+            query = query.filter(self.model.id > self._id(after_id))
+        # One extra row tells whether another page follows
+        query = query.order_by(asc(self.model.id)).limit(limit + 1)
+        if not related:
+            query = query.yield_per(settings.AGENT_DB_STREAM_CHUNK_SIZE)
+
+        records = []
+        has_more = False
+        for row in query:
+            if len(records) == limit:
+                has_more = True
+                break
+            records.append(self._record(row, fields, related))
+
+        return {
+            "records": records,
+            "count": len(records),
+            "has_more": has_more,
+            "next_cursor": records[-1]["id"] if has_more and records else None,
+            "fields": fields,
+            "included": list(related)
+        }
+
+    def _bulk_update(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
+        """
+        Update many records in one statement.
+
+        Takes either ``updates``, a list of ``{"id": ..., field: value}``
+        rows, or ``ids`` with the ``data`` to set on all of them.
+        """
+        if self.updatable_fields is not None and not self.updatable_fields:
+            raise ValueError(f"{self.name} does not support bulk updates")
+        columns = self._columns()
+        writable = (
+            set(columns) - {"id", "created_at"} if self.updatable_fields is None
+            else set(self.updatable_fields) & set(columns)
+        )
+
+        params = input_data.query_params
+        updates = params.get("updates")
+        if updates is not None:
+            if not isinstance(updates, list) or not all(isinstance(row, dict) and "id" in row for row in updates):
+                raise ValueError("updates must be a list of objects with an id")
+            changes = [dict(row, id=self._id(row["id"])) for row in updates]
+            ids = self._ids([row["id"] for row in changes])
+            if len(ids) != len(changes):
+                raise ValueError("updates must not repeat an id")
+            fields = {key for row in changes for key in row if key != "id"}
+        else:
+            ids = self._ids(params.get("ids"))
+            data = params.get("data") or {}
+            fields = set(data)
+        if not fields:
+            raise ValueError("No fields to update")
+        denied = sorted(fields - writable)
+        if denied:
+            raise ValueError(f"Fields cannot be bulk updated: {', '.join(denied)}")
+
+        existing = {row.id for row in db.query(self.model.id).filter(self.model.id.in_(ids))}
+        stamp = {"updated_at": datetime.utcnow()} if "updated_at" in columns else {}
+        if updates is not None:
+            db.bulk_update_mappings(self.model, [dict(row, **stamp) for row in changes if row["id"] in existing])
+        elif existing:
+            db.query(self.model).filter(self.model.id.in_(existing)).update(
+                {**data, **stamp}, synchronize_session=False
+            )
+        db.commit()
+
+        return {
+            "updated_ids": [record_id for record_id in ids if record_id in existing],
+            "missing_ids": [record_id for record_id in ids if record_id not in existing],
+            "updated_count": len(existing),
+            "operation": "bulk_updated"
+        }
+
+    async def _run_batch(self, db: Session, operation: str, input_data: DatabaseQueryInput) -> Dict[str, Any]:
+        handler = {"get_many": self._get_many, "stream": self._stream, "bulk_update": self._bulk_update}[operation]
+        return await asyncio.to_thread(handler, db, input_data)
+
+
+class ContractDatabaseTool(_DatabaseAccessTool):
     """Tool for accessing contract data from the database."""
 
+    model = Contract
+    updatable_fields = None
+
     @property
     def name(self) -> str:
         return "contract_db_access"
@@ -65,13 +347,15 @@ class ContractDatabaseTool(BaseTool):
     async def execute(self, input_data: DatabaseQueryInput) -> ToolResult:
         """Execute contract database operations."""
         try:
-            with get_session() as db:
+            async with get_session_pool().connection() as db:
                 if input_data.query_params.get("operation") == "create":
                     result = await self._create_contract(db, input_data)
                 elif input_data.query_params.get("operation") == "update":
                     result = await self._update_contract(db, input_data)
                 elif input_data.query_params.get("operation") == "delete":
                     result = await self._delete_contract(db, input_data)
+                elif input_data.query_params.get("operation") in ("get_many", "stream", "bulk_update"):
+                    result = await self._run_batch(db, input_data.query_params["operation"], input_data)
                 else:
                     result = await self._query_contracts(db, input_data)
 
@@ -97,20 +381,7 @@ class ContractDatabaseTool(BaseTool):
 
     async def _query_contracts(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Query contracts from database."""
-        query = db.query(Contract)
-
-        # Apply filters
-        filters = input_data.filters
-        if filters.get("user_id"):
-            query = query.filter(Contract.user_id == filters["user_id"])
-        if filters.get("status"):
-            query = query.filter(Contract.status == filters["status"])
-        if filters.get("template_id"):
-            query = query.filter(Contract.template_id == filters["template_id"])
-        if filters.get("created_after"):
-            query = query.filter(Contract.created_at >= filters["created_after"])
-        if filters.get("created_before"):
-            query = query.filter(Contract.created_at <= filters["created_before"])
+        query = self._apply_filters(db.query(Contract), input_data.filters)
 
         # Apply ordering
         order_by = input_data.query_params.get("order_by", "created_at")
@@ -124,16 +395,34 @@ class ContractDatabaseTool(BaseTool):
 
         # Apply pagination
         total_count = query.count()
-        contracts = query.offset(input_data.offset).limit(input_data.limit).all()
+        query = query.offset(input_data.offset).limit(input_data.limit)
+        if input_data.fields:
+            contracts = self._projected(query, self._fields(input_data.fields))
+        else:
+            contracts = [self._serialize_contract(contract) for contract in query.all()]
 
         return {
-            "contracts": [self._serialize_contract(contract) for contract in contracts],
+            "contracts": contracts,
             "total_count": total_count,
             "limit": input_data.limit,
             "offset": input_data.offset,
             "has_more": total_count > (input_data.offset + input_data.limit)
         }
 
+    def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
+        """Apply contract filters."""
+        if filters.get("user_id"):
+            query = query.filter(Contract.user_id == filters["user_id"])
+        if filters.get("status"):
+            query = query.filter(Contract.status == filters["status"])
+        if filters.get("template_id"):
+            query = query.filter(Contract.template_id == filters["template_id"])
+        if filters.get("created_after"):
+            query = query.filter(Contract.created_at >= filters["created_after"])
+        if filters.get("created_before"):
+            query = query.filter(Contract.created_at <= filters["created_before"])
+        return query
+
     async def _create_contract(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Create a new contract."""
         contract_data = input_data.query_params.get("data", {})
@@ -210,9 +499,11 @@ class ContractDatabaseTool(BaseTool):
         }
 
 
-class TemplateDatabaseTool(BaseTool):
+class TemplateDatabaseTool(_DatabaseAccessTool):
     """Tool for accessing template data from the database."""
 
+    model = Template
+
     @property
     def name(self) -> str:
         return "template_db_access"
@@ -228,13 +519,15 @@ class TemplateDatabaseTool(BaseTool):
     async def execute(self, input_data: DatabaseQueryInput) -> ToolResult:
         """Execute template database operations."""
         try:
-            with get_session() as db:
+            async with get_session_pool().connection() as db:
                 if input_data.query_params.get("operation") == "query":
                     result = await self._query_templates(db, input_data)
                 elif input_data.query_params.get("operation") == "get_by_id":
                     result = await self._get_template_by_id(db, input_data)
                 elif input_data.query_params.get("operation") == "search":
                     result = await self._search_templates(db, input_data)
+                elif input_data.query_params.get("operation") in ("get_many", "stream"):
+                    result = await self._run_batch(db, input_data.query_params["operation"], input_data)
                 else:
                     result = await self._query_templates(db, input_data)
 
@@ -261,31 +554,36 @@ class TemplateDatabaseTool(BaseTool):
 
     async def _query_templates(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Query templates from database."""
-        query = db.query(Template)
-
-        # Apply filters
-        filters = input_data.filters
-        if filters.get("category"):
-            query = query.filter(Template.category == filters["category"])
-        if filters.get("is_active") is not None:
-            query = query.filter(Template.is_active == filters["is_active"])
-        if filters.get("user_id"):
-            query = query.filter(Template.user_id == filters["user_id"])
+        query = self._apply_filters(db.query(Template), input_data.filters)
 
         # Apply ordering
         query = query.order_by(desc(Template.created_at))
 
         # Apply pagination
         total_count = query.count()
-        templates = query.offset(input_data.offset).limit(input_data.limit).all()
+        query = query.offset(input_data.offset).limit(input_data.limit)
+        if input_data.fields:
+            templates = self._projected(query, self._fields(input_data.fields))
+        else:
+            templates = [self._serialize_template(template) for template in query.all()]
 
         return {
-            "templates": [self._serialize_template(template) for template in templates],
+            "templates": templates,
             "total_count": total_count,
             "limit": input_data.limit,
             "offset": input_data.offset
         }
 
+    def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
+        """Apply template filters."""
+        if filters.get("category"):
+            query = query.filter(Template.category == filters["category"])
+        if filters.get("is_active") is not None:
+            query = query.filter(Template.is_active == filters["is_active"])
+        if filters.get("user_id"):
+            query = query.filter(Template.user_id == filters["user_id"])
+        return query
+
     async def _get_template_by_id(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Get a specific template by ID."""
         template_id = input_data.query_params.get("template_id")
@@ -309,10 +607,14 @@ class TemplateDatabaseTool(BaseTool):
             )
         )
 
-        templates = query.limit(input_data.limit).all()
+        query = query.limit(input_data.limit)
+        if input_data.fields:
+            templates = self._projected(query, self._fields(input_data.fields))
+        else:
+            templates = [self._serialize_template(template) for template in query.all()]
 
         return {
-            "templates": [self._serialize_template(template) for template in templates],
+            "templates": templates,
             "search_term": search_term,
             "count": len(templates)
         }
@@ -340,9 +642,12 @@ class TemplateDatabaseTool(BaseTool):
         return data
 
 
-class FileDatabaseTool(BaseTool):
+class FileDatabaseTool(_DatabaseAccessTool):
     """Tool for accessing file data from the database."""
 
+    model = File
+    updatable_fields = None
+
     @property
     def name(self) -> str:
         return "file_db_access"
@@ -358,13 +663,15 @@ class FileDatabaseTool(BaseTool):
     async def execute(self, input_data: DatabaseQueryInput) -> ToolResult:
         """Execute file database operations."""
         try:
-            with get_session() as db:
+            async with get_session_pool().connection() as db:
                 if input_data.query_params.get("operation") == "query":
                     result = await self._query_files(db, input_data)
                 elif input_data.query_params.get("operation") == "get_by_id":
                     result = await self._get_file_by_id(db, input_data)
                 elif input_data.query_params.get("operation") == "update_metadata":
                     result = await self._update_file_metadata(db, input_data)
+                elif input_data.query_params.get("operation") in ("get_many", "stream", "bulk_update"):
+                    result = await self._run_batch(db, input_data.query_params["operation"], input_data)
                 else:
                     result = await self._query_files(db, input_data)
 
@@ -391,31 +698,36 @@ class FileDatabaseTool(BaseTool):
 
     async def _query_files(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Query files from database."""
-        query = db.query(File)
-
-        # Apply filters
-        filters = input_data.filters
-        if filters.get("user_id"):
-            query = query.filter(File.user_id == filters["user_id"])
-        if filters.get("file_type"):
-            query = query.filter(File.file_type == filters["file_type"])
-        if filters.get("status"):
-            query = query.filter(File.status == filters["status"])
+        query = self._apply_filters(db.query(File), input_data.filters)
 
         # Apply ordering
         query = query.order_by(desc(File.created_at))
 
         # Apply pagination
         total_count = query.count()
-        files = query.offset(input_data.offset).limit(input_data.limit).all()
+        query = query.offset(input_data.offset).limit(input_data.limit)
+        if input_data.fields:
+            files = self._projected(query, self._fields(input_data.fields))
+        else:
+            files = [self._serialize_file(file) for file in query.all()]
 
         return {
-            "files": [self._serialize_file(file) for file in files],
+            "files": files,
             "total_count": total_count,
             "limit": input_data.limit,
             "offset": input_data.offset
         }
 
+    def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
+        """Apply file filters."""
+        if filters.get("user_id"):
+            query = query.filter(File.user_id == filters["user_id"])
+        if filters.get("file_type"):
+            query = query.filter(File.file_type == filters["file_type"])
+        if filters.get("status"):
+            query = query.filter(File.status == filters["status"])
+        return query
+
     async def _get_file_by_id(self, db: Session, input_data: DatabaseQueryInput) -> Dict[str, Any]:
         """Get a specific file by ID."""
         file_id = input_data.query_params.get("file_id")
@@ -471,9 +783,17 @@ class FileDatabaseTool(BaseTool):
         return data
 
 
-class UserDatabaseTool(BaseTool):
+class UserDatabaseTool(_DatabaseAccessTool):
     """Tool for accessing user data from the database."""
 
+    model = User
+    readable_fields = frozenset({
+        "id", "email", "name", "full_name", "role", "is_active", "created_at", "last_login"
+    })
+    includable = frozenset()
+    # Paging through every user would expose all emails and roles
+    streamable = False
+
     @property
     def name(self) -> str:
         return "user_db_access"
@@ -489,11 +809,13 @@ class UserDatabaseTool(BaseTool):
     async def execute(self, input_data: DatabaseQueryInput) -> ToolResult:
         """Execute user database operations (read-only)."""
         try:
-            with get_session() as db:
+            async with get_session_pool().connection() as db:
                 if input_data.query_params.get("operation") == "get_by_id":
                     result = await self._get_user_by_id(db, input_data)
                 elif input_data.query_params.get("operation") == "get_profile":
                     result = await self._get_user_profile(db, input_data)
+                elif input_data.query_params.get("operation") in ("get_many", "stream"):
+                    result = await self._run_batch(db, input_data.query_params["operation"], input_data)
                 else:
                     result = await self._get_user_profile(db, input_data)
 
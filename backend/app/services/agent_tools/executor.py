@@ -0,0 +1,261 @@
+"""
+Concurrent execution of agent tools.
+
+The tool registry runs tools through a ToolExecutor, which:
+
+- runs independent tool calls concurrently, with at most
+  ``max_concurrency`` executions of each tool at a time;
+- gives every call a deadline covering both the time queued behind other
+  calls of the tool and the execution itself; a timeout becomes a failed
+  ToolResult like any other tool error;
+- caches successful results of tools marked ``cacheable`` by a hash of the
+  tool name and full input, for ``AGENT_TOOL_CACHE_TTL_SECONDS``;
+- records a latency histogram per tool.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import structlog
+
+from .base import BaseTool, ToolInput, ToolResult
+from ...core.config import get_settings
+
+if TYPE_CHECKING:
+    from .base import ToolRegistry
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Upper bounds in seconds, as in Prometheus histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+ToolCall = Tuple[Union[str, BaseTool], ToolInput]
+
+
+class LatencyHistogram:
+    """Bucketed latencies and outcomes of one tool's executions."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # The last bucket counts latencies above the highest bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.outcomes: Counter = Counter()
+
+    def observe(self, seconds: float, outcome: str) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.outcomes[outcome] += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "buckets": buckets,
+            "outcomes": dict(self.outcomes)
+        }
+
+
+def tool_cache_key(tool_name: str, input_data: ToolInput) -> str:
+    """Hash of a tool call, identical for identical inputs."""
+    payload = json.dumps(
+        {"tool": tool_name, "input_type": type(input_data).__name__, "input": input_data.model_dump(mode="json")},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ToolExecutor:
+    """Runs registered tools with concurrency limits, deadlines and result caching."""
+
+    def __init__(
+        self,
+        registry: "ToolRegistry",
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            registry: Registry resolving tool names
+            timeout: Default deadline of a call in seconds
+            max_concurrency: Default concurrent executions per tool
+            cache_size: Results of cacheable tools kept
+            cache_ttl: Seconds a cached result is reused
+        """
+        self.registry = registry
+        self.timeout = timeout or settings.AGENT_TOOL_TIMEOUT_SECONDS
+        self.max_concurrency = max_concurrency or settings.AGENT_TOOL_MAX_CONCURRENCY
+        self.cache_size = cache_size or settings.AGENT_TOOL_CACHE_SIZE
+        self.cache_ttl = cache_ttl or settings.AGENT_TOOL_CACHE_TTL_SECONDS
+
+        self._lock = threading.Lock()
+        # Semaphores are bound to an event loop, so each loop gets its own
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # key -> (expiry, result)
+        self._cache: "OrderedDict[str, Tuple[float, ToolResult]]" = OrderedDict()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    async def execute(
+        self,
+        tool: Union[str, BaseTool],
+        input_data: ToolInput,
+        timeout: Optional[float] = None
+    ) -> ToolResult:
+        """
+        Execute one tool call.
+
+        Args:
+            tool: Tool or registered tool name
+            input_data: Tool input
+            timeout: Deadline in seconds; defaults to the tool's, then the executor's
+
+        Returns:
+            ToolResult: The tool's result, a cached copy of it, or a failed
+            result for unknown tools and timeouts
+        """
+        if isinstance(tool, str):
+            name = tool
+            tool = self.registry.get_tool(name)
+            if tool is None:
+                return ToolResult(success=False, errors=[f"Unknown tool: {name}"], execution_time=0.0, tool_name=name)
+
+        start = time.perf_counter()
+        key = tool_cache_key(tool.name, input_data) if tool.cacheable else None
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._observe(tool.name, time.perf_counter() - start, "cache_hit")
+                result = cached.model_copy(deep=True)
+                result.metadata["cache_hit"] = True
+                return result
+
+        deadline = timeout or tool.timeout or self.timeout
+        try:
+            result = await asyncio.wait_for(self._execute_limited(tool, input_data), deadline)
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - start
+            self._observe(tool.name, elapsed, "timeout")
+            logger.warning("Tool execution timed out", tool_name=tool.name, timeout=deadline)
+            return ToolResult(
+                success=False,
+                metadata={"error_type": "TimeoutError"},
+                errors=[f"Tool {tool.name} timed out after {deadline}s"],
+                execution_time=elapsed,
+                tool_name=tool.name
+            )
+
+        if key is not None and result.success:
+            self._cache_put(key, result.model_copy(deep=True))
+        self._observe(tool.name, time.perf_counter() - start, "success" if result.success else "failure")
+        return result
+
+    async def execute_many(self, calls: Sequence[ToolCall], timeout: Optional[float] = None) -> List[ToolResult]:
+        """
+        Execute independent tool calls concurrently.
+
+        Args:
+            calls: (tool or tool name, input) pairs
+            timeout: Deadline of each call in seconds
+
+        Returns:
+            List[ToolResult]: Results in the order of ``calls``
+        """
+        return list(await asyncio.gather(*(self.execute(tool, input_data, timeout) for tool, input_data in calls)))
+
+    def metrics(self, tool_name: Optional[str] = None) -> Dict[str, Any]:
+        """Latency histograms by tool name, or of one tool."""
+        with self._lock:
+            if tool_name is not None:
+                histogram = self._histograms.get(tool_name)
+                return histogram.snapshot() if histogram else LatencyHistogram().snapshot()
+            return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "max_entries": self.cache_size}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    async def _execute_limited(self, tool: BaseTool, input_data: ToolInput) -> ToolResult:
+        async with self._limiter(tool):
+            return await tool.safe_execute(input_data)
+
+    def _limiter(self, tool: BaseTool) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            limiters = self._limiters.get(loop)
+            if limiters is None:
+                limiters = self._limiters[loop] = {}
+            limiter = limiters.get(tool.name)
+            if limiter is None:
+                limiter = limiters[tool.name] = asyncio.Semaphore(tool.max_concurrency or self.max_concurrency)
+            return limiter
+
+    def _cache_get(self, key: str) -> Optional[ToolResult]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _cache_put(self, key: str, result: ToolResult) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _observe(self, tool_name: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            histogram = self._histograms.get(tool_name)
+            if histogram is None:
+                histogram = self._histograms[tool_name] = LatencyHistogram()
+            histogram.observe(seconds, outcome)
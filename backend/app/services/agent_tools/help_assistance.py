@@ -14,6 +14,7 @@ import structlog
 from pydantic import BaseModel, Field
 
 from .base import BaseTool, ToolInput, ToolResult, ToolCategory
+from ..real_estate_knowledge_base import get_real_estate_knowledge_base
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -197,51 +198,23 @@ class ContextualQATool(BaseTool):
                                        analysis: Dict[str, Any],
                                        context: Dict[str, Any]) -> Dict[str, Any]:
         """Search for relevant knowledge to answer the question."""
-        # This would integrate with a real knowledge base
-        # For now, return mock relevant knowledge
-        
-        knowledge_base = {
-            "contract_basics": {
-                "content": "A real estate contract is a legally binding agreement between buyer and seller that outlines the terms and conditions of a property sale.",
-                "relevance": 0.9,
-                "source": "real_estate_fundamentals"
-            },
-            "closing_process": {
-                "content": "The closing process typically takes 30-45 days and involves loan approval, inspections, appraisal, and final walkthrough.",
-                "relevance": 0.8,
-                "source": "process_guide"
-            },
-            "contingencies": {
-                "content": "Contingencies are conditions that must be met for the contract to proceed. Common contingencies include financing, inspection, and appraisal.",
-                "relevance": 0.85,
-                "source": "legal_guide"
+        results = get_real_estate_knowledge_base().search_knowledge(question, limit=3)
+        
+        relevant_items = [
+            {
+                "id": hit.document.metadata["id"],
+                "kind": hit.document.kind,
+                "content": hit.document.content,
+                "relevance_score": round(hit.score, 4),
+                "source": hit.document.source
             }
-        }
-        
-        # Simple keyword matching for relevance
-        question_words = set(question.lower().split())
-        relevant_items = []
-        
-        for item_id, item_data in knowledge_base.items():
-            content_words = set(item_data["content"].lower().split())
-            overlap = len(question_words.intersection(content_words))
-            
-            if overlap > 0:
-                relevance_score = overlap / len(question_words)
-                relevant_items.append({
-                    "id": item_id,
-                    "content": item_data["content"],
-                    "relevance_score": relevance_score,
-                    "source": item_data["source"]
-                })
-        
-        # Sort by relevance
-        relevant_items.sort(key=lambda x: x["relevance_score"], reverse=True)
+            for hit in results.hits
+        ]
         
         return {
-            "items": relevant_items[:3],  # Top 3 most relevant
-            "sources": list(set(item["source"] for item in relevant_items)),
-            "total_found": len(relevant_items)
+            "items": relevant_items,  # Top 3 most relevant
+            "sources": list(dict.fromkeys(item["source"] for item in relevant_items)),
+            "total_found": results.total
         }
     
     async def _generate_contextual_answer(self, 
@@ -581,6 +554,9 @@ class WorkflowGuidanceTool(BaseTool):
 class ClauseExplanationTool(BaseTool):
     """Tool for explaining legal clauses and contract terms."""
     
+    # Explanations depend only on the clause text and the clause library
+    cacheable = True
+    
     @property
     def name(self) -> str:
         return "clause_explainer"
@@ -596,9 +572,12 @@ class ClauseExplanationTool(BaseTool):
     async def execute(self, input_data: ClauseExplanationInput) -> ToolResult:
         """Explain a legal clause in plain language."""
         try:
+            # Closest clauses in the clause library
+            related_clauses = await self._find_related_clauses(input_data.clause_text)
+            
             # Identify clause type if not provided
             if input_data.clause_type == "unknown":
-                clause_type = await self._identify_clause_type(input_data.clause_text)
+                clause_type = await self._identify_clause_type(input_data.clause_text, related_clauses)
             else:
                 clause_type = input_data.clause_type
             
@@ -630,6 +609,7 @@ class ClauseExplanationTool(BaseTool):
                     "key_terms": key_terms,
                     "practical_implications": implications,
                     "suggested_questions": questions,
+                    "related_clauses": related_clauses,
                     "explanation_level": input_data.explanation_level
                 },
                 metadata={
@@ -649,7 +629,22 @@ class ClauseExplanationTool(BaseTool):
                 tool_name=self.name
             )
     
-    async def _identify_clause_type(self, clause_text: str) -> str:
+    async def _find_related_clauses(self, clause_text: str) -> List[Dict[str, Any]]:
+        """Find the clause library entries most similar to the clause."""
+        results = get_real_estate_knowledge_base().search_knowledge(clause_text, limit=3, kinds=["clause"])
+        return [
+            {
+                "clause_id": hit.document.metadata["id"],
+                "title": hit.document.title,
+                "category": hit.document.metadata["clause_category"],
+                "relevance_score": round(hit.score, 4)
+            }
+            for hit in results.hits
+        ]
+    
+    async def _identify_clause_type(self, 
+                                  clause_text: str,
+                                  related_clauses: Optional[List[Dict[str, Any]]] = None) -> str:
         """Identify the type of legal clause."""
         clause_text_lower = clause_text.lower()
         
@@ -670,6 +665,11 @@ class ClauseExplanationTool(BaseTool):
             if any(indicator in clause_text_lower for indicator in indicators):
                 return clause_type
         
+        # Fall back to the category of the closest library clause
+        for related in related_clauses or []:
+            if related["category"] in clause_indicators:
+                return related["category"]
+        
         return "general"
     
     async def _generate_clause_explanation(self, 
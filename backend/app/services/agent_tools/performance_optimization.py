@@ -6,8 +6,12 @@ connection pooling, and resource management for agent operations.
 """
 
 import asyncio
+import inspect
+import threading
 import time
-from typing import Dict, Any, List, Optional, Union, Callable
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Any, List, Optional, Set, Tuple, Union, Callable
 from datetime import datetime, timedelta
 from functools import wraps
 import hashlib
@@ -16,7 +20,7 @@ import json
 import structlog
 from pydantic import BaseModel, Field
 
-from .base import BaseTool, ToolInput, ToolResult, ToolCategory
+from .base import BaseTool, ToolInput, ToolResult, ToolCategory, get_tool_registry
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -33,8 +37,8 @@ class CacheInput(ToolInput):
 
 class PerformanceMonitorInput(ToolInput):
     """Input for performance monitoring."""
-    operation: str = Field(..., description="Monitor operation: start, stop, report")
-    metric_name: str = Field(..., description="Name of the metric to monitor")
+    operation: str = Field(..., description="Monitor operation: start, stop, increment, report, tool_latency, resource_pools")
+    metric_name: str = Field(..., description="Name of the metric to monitor; a tool name or \"all\" for tool_latency")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
@@ -215,107 +219,402 @@ class PerformanceMonitor:
         return summary
 
 
+class ResourcePoolError(Exception):
+    """Raised when a resource cannot be acquired from a pool."""
+    pass
+
+
+class _PooledResource:
+    """A pooled resource with its creation and last use times."""
+    
+    __slots__ = ("resource", "created_at", "last_used")
+    
+    def __init__(self, resource: Any):
+        self.resource = resource
+        self.created_at = self.last_used = time.monotonic()
+
+
+async def _call(func: Callable, resource: Any) -> Any:
+    """Call a sync or async resource hook."""
+    result = func(resource)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
 class ResourcePool:
-    """Generic resource pool for managing connections and resources."""
+    """
+    Bounded pool of reusable resources such as database sessions or clients.
+    
+    Resources are created by ``factory`` on demand, up to ``max_size``.
+    Further callers wait in FIFO order until a resource is released, or fail
+    after ``acquire_timeout``. Released resources are reset and handed to
+    the next waiter or kept idle. A resource is closed instead of reused
+    once it is older than ``max_lifetime``, idle longer than ``max_idle``
+    (``min_size`` idle resources are kept), or fails its health check, which
+    runs when it has been idle longer than ``health_check_after``.
+    
+    The factory and the close, reset and health check hooks may be sync or
+    async. One pool may be used from several event loops, so resources
+    bound to an event loop need a pool per loop.
+    """
     
-    def __init__(self, pool_type: str, max_size: int = 10, min_size: int = 2):
+    def __init__(
+        self,
+        pool_type: str,
+        factory: Callable[[], Any],
+        close: Optional[Callable[[Any], Any]] = None,
+        reset: Optional[Callable[[Any], Any]] = None,
+        health_check: Optional[Callable[[Any], Any]] = None,
+        max_size: int = 10,
+        min_size: int = 0,
+        max_idle: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        health_check_after: Optional[float] = None,
+        acquire_timeout: Optional[float] = None
+    ):
         self.pool_type = pool_type
+        self.factory = factory
+        self.close_resource = close
+        self.reset_resource = reset
+        self.health_check = health_check
         self.max_size = max_size
         self.min_size = min_size
-        self._available = []
-        self._in_use = {}
-        self._created_count = 0
+        self.max_idle = max_idle if max_idle is not None else settings.AGENT_RESOURCE_POOL_MAX_IDLE_SECONDS
+        self.max_lifetime = max_lifetime if max_lifetime is not None else settings.AGENT_RESOURCE_POOL_MAX_LIFETIME_SECONDS
+        self.health_check_after = (
+            health_check_after if health_check_after is not None
+            else settings.AGENT_RESOURCE_POOL_HEALTH_CHECK_AFTER_SECONDS
+        )
+        self.acquire_timeout = (
+            acquire_timeout if acquire_timeout is not None
+            else settings.AGENT_RESOURCE_POOL_ACQUIRE_TIMEOUT_SECONDS
+        )
+        
+        self._lock = threading.Lock()
+        # Least recently used first
+        self._idle: Deque[_PooledResource] = deque()
+        self._in_use: Dict[int, _PooledResource] = {}
+        # Idle, in use and being created
+        self._size = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._closed = False
+        # Destruction of resources handed back after close()
+        self._closing: Set[asyncio.Task] = set()
         self._stats = {
             "acquired": 0,
             "released": 0,
             "created": 0,
-            "destroyed": 0
+            "destroyed": 0,
+            "expired": 0,
+            "creation_failures": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+            "wait_timeouts": 0
         }
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
     
-    async def acquire(self) -> Optional[str]:
-        """Acquire a resource from the pool."""
-        try:
-            # Try to get from available pool
-            if self._available:
-                resource_id = self._available.pop()
-                self._in_use[resource_id] = datetime.utcnow()
-                self._stats["acquired"] += 1
-                return resource_id
+    async def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Acquire a resource, waiting for one to be released if the pool is full.
+        
+        Args:
+            timeout: Seconds to wait; defaults to the pool's acquire_timeout
             
-            # Create new resource if under max size
-            if len(self._in_use) < self.max_size:
-                resource_id = await self._create_resource()
-                if resource_id:
-                    self._in_use[resource_id] = datetime.utcnow()
-                    self._stats["acquired"] += 1
-                    return resource_id
+        Returns:
+            The resource, to be given back with release()
             
-            # Pool is full
-            return None
+        Raises:
+            ResourcePoolError: If the pool is closed or no resource became
+                available in time
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.acquire_timeout)
+        wait_started = None
+        while True:
+            entry, create, waiter = self._checkout()
+            if waiter is not None:
+                if wait_started is None:
+                    wait_started = time.monotonic()
+                entry = await self._wait(waiter, deadline)
+                if entry is None:
+                    # A slot was freed; try again
+                    continue
+            elif create:
+                entry = await self._create()
+                break
+            try:
+                usable = await self._usable(entry)
+            except BaseException:
+                # Cancelled during the health check; the entry is no longer
+                # idle and would otherwise keep its slot forever
+                await self._destroy(entry)
+                raise
+            if usable:
+                break
+            await self._destroy(entry)
+        
+        with self._lock:
+            self._in_use[id(entry.resource)] = entry
+            self._stats["acquired"] += 1
+            if wait_started is not None:
+                waited = time.monotonic() - wait_started
+                self._stats["waits"] += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+        return entry.resource
+    
+    async def release(self, resource: Any, discard: bool = False) -> bool:
+        """
+        Give a resource back to the pool.
+        
+        Args:
+            resource: Resource returned by acquire()
+            discard: Close the resource instead of reusing it
             
-        except Exception as e:
-            logger.error(f"Resource acquisition failed: {e}")
-            return None
+        Returns:
+            False if the resource was not acquired from this pool
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(resource), None)
+            if entry is None:
+                return False
+            self._stats["released"] += 1
+        
+        entry.last_used = time.monotonic()
+        if discard or self._closed or self._expired(entry, entry.last_used):
+            await self._destroy(entry)
+        elif await self._reset(entry):
+            self._put_back(entry)
+        await self._prune()
+        return True
     
-    async def release(self, resource_id: str) -> bool:
-        """Release a resource back to the pool."""
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Acquire a resource for the duration of an ``async with`` block."""
+        resource = await self.acquire(timeout)
         try:
-            if resource_id in self._in_use:
-                del self._in_use[resource_id]
-                
-                # Add back to available pool if under max size
-                if len(self._available) + len(self._in_use) < self.max_size:
-                    self._available.append(resource_id)
-                else:
-                    await self._destroy_resource(resource_id)
-                
-                self._stats["released"] += 1
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Resource release failed: {e}")
+            yield resource
+        finally:
+            await self.release(resource)
+    
+    async def close(self) -> None:
+        """Close idle resources; resources in use are closed when released."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for loop, future in waiters:
+            self._notify(loop, future, None)
+        for entry in idle:
+            await self._destroy(entry)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool status."""
+        with self._lock:
+            waits = self._stats["waits"]
+            return {
+                "pool_type": self.pool_type,
+                "max_size": self.max_size,
+                "min_size": self.min_size,
+                "available": len(self._idle),
+                "in_use": len(self._in_use),
+                "total": self._size,
+                "waiting": sum(1 for _, future in self._waiters if not future.done()),
+                "closed": self._closed,
+                "stats": {
+                    **self._stats,
+                    "wait_time_total": round(self._wait_time_total, 6),
+                    "wait_time_avg": round(self._wait_time_total / waits, 6) if waits else 0.0,
+                    "wait_time_max": round(self._wait_time_max, 6)
+                }
+            }
+    
+    def _checkout(self) -> Tuple[Optional[_PooledResource], bool, Optional[asyncio.Future]]:
+        """Take an idle resource, a slot to create one, or a place in the wait queue."""
+        with self._lock:
+            if self._closed:
+                raise ResourcePoolError(f"Resource pool {self.pool_type} is closed")
+            if self._idle:
+                return self._idle.pop(), False, None
+            if self._size < self.max_size:
+                self._size += 1
+                return None, True, None
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+            return None, False, future
+    
+    async def _wait(self, future: asyncio.Future, deadline: float) -> Optional[_PooledResource]:
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            return await asyncio.wait_for(future, remaining)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                self._waiters = deque(waiter for waiter in self._waiters if waiter[1] is not future)
+            if future.done() and not future.cancelled():
+                # Handed over just as the wait ended; pass it on
+                self._put_back(future.result())
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            with self._lock:
+                self._stats["wait_timeouts"] += 1
+            raise ResourcePoolError(f"Timed out waiting for a {self.pool_type} resource") from None
+    
+    def _put_back(self, entry: Optional[_PooledResource]) -> None:
+        """Hand a resource, or a freed slot if None, to the next waiter; keep resources idle otherwise."""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not future.done() and self._notify(loop, future, entry):
+                    return
+            if entry is None:
+                return
+            if not self._closed:
+                self._idle.append(entry)
+                return
+        # Handed back after close(), e.g. to a waiter that gave up; nothing
+        # will take it from the idle list anymore
+        task = asyncio.get_running_loop().create_task(self._destroy(entry))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    def _notify(self, loop: asyncio.AbstractEventLoop, future: asyncio.Future, entry: Optional[_PooledResource]) -> bool:
+        try:
+            loop.call_soon_threadsafe(self._resolve, future, entry)
+            return True
+        except RuntimeError:
+            # The waiter's event loop is closed
             return False
     
-    async def _create_resource(self) -> Optional[str]:
-        """Create a new resource."""
+    def _resolve(self, future: asyncio.Future, entry: Optional[_PooledResource]) -> None:
+        if future.done():
+            self._put_back(entry)
+        else:
+            future.set_result(entry)
+    
+    async def _create(self) -> _PooledResource:
         try:
-            self._created_count += 1
-            resource_id = f"{self.pool_type}_resource_{self._created_count}"
+            resource = self.factory()
+            if inspect.isawaitable(resource):
+                resource = await resource
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._stats["creation_failures"] += 1
+            self._put_back(None)
+            raise
+        with self._lock:
             self._stats["created"] += 1
-            return resource_id
-        except Exception as e:
-            logger.error(f"Resource creation failed: {e}")
-            return None
+        return _PooledResource(resource)
     
-    async def _destroy_resource(self, resource_id: str) -> bool:
-        """Destroy a resource."""
-        try:
-            # Resource cleanup would happen here
+    async def _destroy(self, entry: _PooledResource) -> None:
+        with self._lock:
+            self._size -= 1
             self._stats["destroyed"] += 1
+        if self.close_resource is not None:
+            try:
+                await _call(self.close_resource, entry.resource)
+            except Exception as e:
+                logger.warning(f"Closing {self.pool_type} resource failed: {e}")
+        self._put_back(None)
+    
+    async def _reset(self, entry: _PooledResource) -> bool:
+        if self.reset_resource is None:
+            return True
+        try:
+            await _call(self.reset_resource, entry.resource)
             return True
         except Exception as e:
-            logger.error(f"Resource destruction failed: {e}")
+            logger.warning(f"Resetting {self.pool_type} resource failed: {e}")
+            await self._destroy(entry)
             return False
     
-    def get_status(self) -> Dict[str, Any]:
-        """Get pool status."""
-        return {
-            "pool_type": self.pool_type,
-            "max_size": self.max_size,
-            "min_size": self.min_size,
-            "available": len(self._available),
-            "in_use": len(self._in_use),
-            "total": len(self._available) + len(self._in_use),
-            "stats": self._stats.copy()
-        }
+    async def _usable(self, entry: _PooledResource) -> bool:
+        """Whether an idle resource may be reused, health checking it if it sat idle."""
+        now = time.monotonic()
+        if self._expired(entry, now):
+            with self._lock:
+                self._stats["expired"] += 1
+            return False
+        if self.health_check is None or now - entry.last_used < self.health_check_after:
+            return True
+        try:
+            healthy = await _call(self.health_check, entry.resource)
+        except Exception as e:
+            logger.warning(f"Health check of {self.pool_type} resource failed: {e}")
+            healthy = False
+        if not healthy:
+            with self._lock:
+                self._stats["health_check_failures"] += 1
+        return bool(healthy)
+    
+    def _expired(self, entry: _PooledResource, now: float) -> bool:
+        return now - entry.created_at > self.max_lifetime or now - entry.last_used > self.max_idle
+    
+    async def _prune(self) -> None:
+        """Close resources idle longer than max_idle, keeping min_size of them."""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            while (
+                self._idle and len(self._idle) > self.min_size
+                and now - self._idle[0].last_used > self.max_idle
+            ):
+                expired.append(self._idle.popleft())
+            self._stats["expired"] += len(expired)
+        for entry in expired:
+            await self._destroy(entry)
 
 
 # Global instances
 _cache_manager = CacheManager()
 _performance_monitor = PerformanceMonitor()
-_resource_pools = {}
+_resource_pools: Dict[str, ResourcePool] = {}
+_resource_pools_lock = threading.Lock()
+
+
+def get_resource_pool(pool_type: str, factory: Optional[Callable[[], Any]] = None, **options) -> ResourcePool:
+    """
+    Get a shared resource pool, creating it on first use.
+    
+    Args:
+        pool_type: Pool name
+        factory: Creates a resource; required the first time
+        **options: ResourcePool options used when the pool is created
+        
+    Returns:
+        The pool registered under ``pool_type``
+    """
+    with _resource_pools_lock:
+        pool = _resource_pools.get(pool_type)
+        if pool is None:
+            if factory is None:
+                raise KeyError(f"Unknown resource pool: {pool_type}")
+            pool = _resource_pools[pool_type] = ResourcePool(pool_type, factory, **options)
+        return pool
+
+
+def get_resource_pool_status() -> Dict[str, Dict[str, Any]]:
+    """Status of every shared resource pool by name."""
+    with _resource_pools_lock:
+        pools = list(_resource_pools.values())
+    return {pool.pool_type: pool.get_status() for pool in pools}
+
+
+async def close_resource_pools() -> None:
+    """Close and forget every shared resource pool."""
+    with _resource_pools_lock:
+        pools = list(_resource_pools.values())
+        _resource_pools.clear()
+    for pool in pools:
+        await pool.close()
 
 
 class CacheTool(BaseTool):
@@ -459,6 +758,24 @@ class PerformanceMonitorTool(BaseTool):
                     "metrics": metrics
                 }
             
+            elif input_data.operation == "tool_latency":
+                tool_name = None if input_data.metric_name in ("", "*", "all") else input_data.metric_name
+                result = {
+                    "operation": "tool_latency",
+                    "metric_name": input_data.metric_name,
+                    "latency": get_tool_registry().executor.metrics(tool_name)
+                }
+            
+            elif input_data.operation == "resource_pools":
+                pools = get_resource_pool_status()
+                if input_data.metric_name not in ("", "*", "all"):
+                    pools = {name: status for name, status in pools.items() if name == input_data.metric_name}
+                result = {
+                    "operation": "resource_pools",
+                    "metric_name": input_data.metric_name,
+                    "pools": pools
+                }
+            
             else:
                 raise ValueError(f"Unknown monitor operation: {input_data.operation}")
             
@@ -5,16 +5,18 @@ This module provides specialized tools for the Summary Agent,
 including document summarization, diff generation, and executive reporting.
 """
 
+import asyncio
 import re
 import json
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from difflib import unified_diff, SequenceMatcher
 
 import structlog
 from pydantic import BaseModel, Field
 
 from .base import BaseTool, ToolInput, ToolResult, ToolCategory
+from ..diff_engine import get_diff_engine
+from ..document_index import DocumentIndex, get_document_indexer
 from ...core.config import get_settings
 
 logger = structlog.get_logger(__name__)
@@ -67,8 +69,9 @@ class DocumentSummarizationTool(BaseTool):
     async def execute(self, input_data: DocumentSummarizationInput) -> ToolResult:
         """Generate document summary."""
         try:
-            # Extract key sections
-            sections = await self._extract_document_sections(input_data.document_content)
+            # Parse the document once; every extraction below reads the index
+            index = await self._index_document(input_data.document_content)
+            sections = index.sections
             
             # Generate summary based on type
             if input_data.summary_type == "executive":
@@ -81,10 +84,10 @@ class DocumentSummarizationTool(BaseTool):
                 summary = await self._generate_comprehensive_summary(sections, input_data.summary_options)
             
             # Extract key points
-            key_points = await self._extract_key_points(input_data.document_content, sections)
+            key_points = await self._extract_key_points(index)
             
             # Generate action items
-            action_items = await self._extract_action_items(input_data.document_content)
+            action_items = await self._extract_action_items(index)
             
             # Calculate summary metrics
             metrics = await self._calculate_summary_metrics(
@@ -99,6 +102,7 @@ class DocumentSummarizationTool(BaseTool):
                     "key_points": key_points,
                     "action_items": action_items,
                     "sections": sections,
+                    "outline": index.outline(),
                     "metrics": metrics,
                     "summary_type": input_data.summary_type
                 },
@@ -120,34 +124,9 @@ class DocumentSummarizationTool(BaseTool):
                 tool_name=self.name
             )
     
-    async def _extract_document_sections(self, content: str) -> Dict[str, str]:
-        """Extract logical sections from document content."""
-        sections = {}
-        
-        # Common real estate contract sections
-        section_patterns = {
-            "parties": r"(?i)(parties|buyer|seller|purchaser|vendor).*?(?=\n\n|\n[A-Z]|$)",
-            "property": r"(?i)(property|premises|real estate|located).*?(?=\n\n|\n[A-Z]|$)",
-            "purchase_price": r"(?i)(purchase price|consideration|amount).*?(?=\n\n|\n[A-Z]|$)",
-            "financing": r"(?i)(financing|loan|mortgage|contingent).*?(?=\n\n|\n[A-Z]|$)",
-            "closing": r"(?i)(closing|settlement|possession).*?(?=\n\n|\n[A-Z]|$)",
-            "contingencies": r"(?i)(contingencies|subject to|provided that).*?(?=\n\n|\n[A-Z]|$)",
-            "disclosures": r"(?i)(disclosure|warranty|representation).*?(?=\n\n|\n[A-Z]|$)"
-        }
-        
-        for section_name, pattern in section_patterns.items():
-            matches = re.findall(pattern, content, re.DOTALL)
-            if matches:
-                sections[section_name] = matches[0].strip()
-        
-        # If no specific sections found, create general sections
-        if not sections:
-            paragraphs = content.split('\n\n')
-            for i, paragraph in enumerate(paragraphs[:5]):  # First 5 paragraphs
-                if paragraph.strip():
-                    sections[f"section_{i+1}"] = paragraph.strip()
-        
-        return sections
+    async def _index_document(self, content: str) -> DocumentIndex:
+        """Get the cached structural index of a document, parsing it off the event loop on first use."""
+        return await asyncio.to_thread(get_document_indexer().index, content)
     
     async def _generate_executive_summary(self, 
                                         sections: Dict[str, str],
@@ -255,15 +234,12 @@ class DocumentSummarizationTool(BaseTool):
             "word_count": len(content.split())
         }
     
-    async def _extract_key_points(self, 
-                                content: str,
-                                sections: Dict[str, str]) -> List[Dict[str, Any]]:
+    async def _extract_key_points(self, index: DocumentIndex) -> List[Dict[str, Any]]:
         """Extract key points from document."""
         key_points = []
         
         # Financial terms
-        money_matches = re.findall(r'\$[\d,]+\.?\d*', content)
-        for amount in money_matches:
+        for amount in index.amounts:
             key_points.append({
                 "type": "financial",
                 "content": f"Financial amount: {amount}",
@@ -271,8 +247,7 @@ class DocumentSummarizationTool(BaseTool):
             })
         
         # Dates
-        date_matches = re.findall(r'\d{1,2}/\d{1,2}/\d{4}', content)
-        for date in date_matches:
+        for date in index.dates:
             key_points.append({
                 "type": "timeline",
                 "content": f"Important date: {date}",
@@ -280,7 +255,7 @@ class DocumentSummarizationTool(BaseTool):
             })
         
         # Parties
-        if "parties" in sections:
+        if "parties" in index.sections:
             key_points.append({
                 "type": "parties",
                 "content": "Parties to the agreement identified",
@@ -289,28 +264,18 @@ class DocumentSummarizationTool(BaseTool):
         
         return key_points
     
-    async def _extract_action_items(self, content: str) -> List[Dict[str, Any]]:
+    async def _extract_action_items(self, index: DocumentIndex) -> List[Dict[str, Any]]:
         """Extract action items and next steps."""
-        action_items = []
-        
-        # Look for action-oriented language
-        action_patterns = [
-            r"(?i)(shall|must|will|required to|needs to|should)([^.]+)",
-            r"(?i)(deadline|due date|by)([^.]+)",
-            r"(?i)(contingent upon|subject to)([^.]+)"
+        # Action-oriented language; the index keeps the first ten matches
+        return [
+            {
+                "action": action,
+                "type": "requirement",
+                "priority": "medium",
+                "source": "document_analysis"
+            }
+            for action in index.actions
         ]
-        
-        for pattern in action_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                action_items.append({
-                    "action": match[1].strip(),
-                    "type": "requirement",
-                    "priority": "medium",
-                    "source": "document_analysis"
-                })
-        
-        return action_items[:10]  # Limit to top 10 action items
     
     async def _calculate_summary_metrics(self, 
                                        original_content: str,
@@ -402,28 +367,17 @@ class DiffGenerationTool(BaseTool):
     
     async def _generate_line_diff(self, original: str, modified: str) -> List[str]:
         """Generate line-by-line diff."""
-        original_lines = original.splitlines(keepends=True)
-        modified_lines = modified.splitlines(keepends=True)
-        
-        diff = list(unified_diff(
-            original_lines,
-            modified_lines,
-            fromfile='original',
-            tofile='modified',
-            lineterm=''
-        ))
-        
-        return diff
+        diff = get_diff_engine().diff_lines(original, modified)
+        
+        return list(diff.unified(fromfile='original', tofile='modified', lineterm=''))
     
     async def _generate_word_diff(self, original: str, modified: str) -> Dict[str, Any]:
         """Generate word-level diff for better granularity."""
-        original_words = original.split()
-        modified_words = modified.split()
-        
-        matcher = SequenceMatcher(None, original_words, modified_words)
+        diff = get_diff_engine().diff_words(original, modified)
+        original_words, modified_words = diff.a, diff.b
         
         word_changes = []
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in diff.opcodes:
             if tag == 'delete':
                 word_changes.append({
                     "type": "deletion",
@@ -451,18 +405,15 @@ class DiffGenerationTool(BaseTool):
     
     async def _analyze_changes(self, original: str, modified: str) -> Dict[str, Any]:
         """Analyze the nature and impact of changes."""
-        original_lines = original.splitlines()
-        modified_lines = modified.splitlines()
-        
-        matcher = SequenceMatcher(None, original_lines, modified_lines)
-        similarity_ratio = matcher.ratio()
+        diff = get_diff_engine().diff_lines(original, modified, keepends=False)
+        similarity_ratio = diff.ratio()
         
         # Count different types of changes
         lines_added = 0
         lines_removed = 0
         lines_modified = 0
         
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in diff.opcodes:
             if tag == 'delete':
                 lines_removed += i2 - i1
             elif tag == 'insert':
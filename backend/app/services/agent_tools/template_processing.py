@@ -53,6 +53,9 @@ class TemplateOptimizationInput(ToolInput):
 class TemplateAnalysisTool(BaseTool):
     """Tool for analyzing template structure, variables, and complexity."""
 
+    # Analysis depends only on the template content
+    cacheable = True
+
     @property
     def name(self) -> str:
         return "template_analyzer"
@@ -0,0 +1,163 @@
+"""
+Execution context of a running agent workflow.
+
+A crew runs synchronously in a worker thread. The ``WorkflowRun`` for it is
+published through a context variable so that CrewAI step/task callbacks and
+agent LLM calls in that thread can emit progress events, account token
+usage and check for cooperative cancellation without extra plumbing.
+"""
+
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Events kept per run for status queries
+MAX_RECENT_EVENTS = 50
+
+
+class WorkflowCancelled(Exception):
+    """Raised inside a running crew once its workflow has been cancelled."""
+    pass
+
+
+@dataclass
+class WorkflowRun:
+    """Progress, usage and cancellation state of one workflow execution."""
+    workflow_id: str
+    task_roles: List[str] = field(default_factory=list)
+    emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    completed_tasks: int = 0
+    llm_calls: int = 0
+    token_usage: Dict[str, int] = field(
+        default_factory=lambda: {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    )
+    cost: float = 0.0
+    recent_events: List[Dict[str, Any]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def progress(self) -> float:
+        """Completed share of tasks, 0-100."""
+        if not self.task_roles:
+            return 0.0
+        return round(100.0 * self.completed_tasks / len(self.task_roles), 1)
+
+    @property
+    def current_agent(self) -> Optional[str]:
+        if self.completed_tasks < len(self.task_roles):
+            return self.task_roles[self.completed_tasks]
+        return None
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation; the crew stops at its next step or LLM call."""
+        if not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.publish("cancel_requested")
+
+    def check_cancelled(self):
+        """
+        Raises:
+            WorkflowCancelled: If cancellation has been requested
+        """
+        if self.cancel_event.is_set():
+            raise WorkflowCancelled(f"Workflow {self.workflow_id} was cancelled")
+
+    def publish(self, event_type: str, **details):
+        """Record an event and hand it to the emitter."""
+        event = {
+            "type": event_type,
+            "workflow_id": self.workflow_id,
+            "progress": self.progress,
+            "current_agent": self.current_agent,
+            "timestamp": datetime.utcnow().isoformat(),
+            **details,
+        }
+        with self._lock:
+            self.recent_events.append(event)
+            del self.recent_events[:-MAX_RECENT_EVENTS]
+
+        if self.emit is not None:
+            try:
+                self.emit(event)
+            except Exception as e:
+                logger.warning("Workflow progress emitter failed", workflow_id=self.workflow_id, error=str(e))
+
+    # Hooks called from the crew thread
+
+    def on_llm_call(self, response):
+        """Account an agent LLM call."""
+        with self._lock:
+            self.llm_calls += 1
+            for key in self.token_usage:
+                self.token_usage[key] += int(response.token_usage.get(key, 0) or 0)
+            self.cost += response.cost or 0.0
+            totals = dict(self.token_usage)
+
+        self.publish(
+            "tokens_used",
+            model=response.model_used,
+            call_tokens=response.token_usage.get("total_tokens", 0),
+            total_tokens=totals["total_tokens"],
+            cost=round(self.cost, 6),
+        )
+
+    def on_step(self, step: Any):
+        """CrewAI step callback: reports tool use and honours cancellation."""
+        self.check_cancelled()
+        tool = getattr(step, "tool", None)
+        if tool:
+            self.publish("tool_invoked", tool=tool, tool_input=str(getattr(step, "tool_input", ""))[:500])
+        else:
+            self.publish("agent_step")
+
+    def on_task_completed(self, output: Any):
+        """CrewAI task callback: advances progress to the next agent."""
+        with self._lock:
+            self.completed_tasks += 1
+        self.publish("task_completed", summary=str(getattr(output, "raw", output))[:500])
+        if self.current_agent is not None:
+            self.publish("agent_started", agent=self.current_agent)
+        self.check_cancelled()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "progress": self.progress,
+                "current_agent": self.current_agent,
+                "completed_tasks": self.completed_tasks,
+                "total_tasks": len(self.task_roles),
+                "llm_calls": self.llm_calls,
+                "token_usage": dict(self.token_usage),
+                "cost": self.cost,
+                "cancel_requested": self.cancel_requested,
+                "recent_events": list(self.recent_events[-10:]),
+            }
+
+
+# Run of the workflow executing in the current thread, if any
+current_workflow_run: ContextVar[Optional[WorkflowRun]] = ContextVar("current_workflow_run", default=None)
+
+
+def crew_step_callback(step: Any):
+    """Step callback installed on every crew; forwards to the current run."""
+    run = current_workflow_run.get()
+    if run is not None:
+        run.on_step(step)
+
+
+def crew_task_callback(output: Any):
+    """Task callback installed on every crew; forwards to the current run."""
+    run = current_workflow_run.get()
+    if run is not None:
+        run.on_task_completed(output)
@@ -0,0 +1,312 @@
+"""
+Map-reduce summarization of long contracts.
+
+Long documents are split into chunks at the contract section headings the
+summarization tool recognizes. Chunks are summarized concurrently by a
+bounded worker pool (map), and the chunk summaries are combined into the
+final summary (reduce). Documents that fit in a single chunk are sent in one
+call as before.
+
+Chunk summaries are cached in Redis by a hash of the chunk content, model
+and focus, so re-summarizing an edited document only calls the model for the
+sections that changed.
+"""
+
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import structlog
+
+from ..core.config import get_settings
+from ..core.redis_config import get_redis_client
+from .document_index import SECTION_KEYWORDS, is_heading
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# (system_prompt, user_prompt, max_tokens) -> completion text
+CompletionFn = Callable[[str, str, int], str]
+
+CHUNK_CACHE_PREFIX = "llm:chunk_summary:"
+
+# Bump when the map prompt or key derivation changes
+CHUNK_CACHE_VERSION = 1
+
+MAP_SYSTEM_PROMPT = "You are an expert real estate contract analyst."
+
+MAP_PROMPT = (
+    "Summarize the following section of a real estate contract{focus}. Keep every "
+    "party, property detail, amount, date, deadline, contingency and obligation it "
+    "states; omit boilerplate.\n\nSection: {label}\n\n{text}"
+)
+
+MERGE_PROMPT = (
+    "Combine the following summaries of consecutive sections of a real estate "
+    "contract into one summary{focus}, keeping every party, amount, date, deadline, "
+    "contingency and obligation.\n\n{text}"
+)
+
+REDUCE_NOTE = "The contract is long, so it is given as summaries of its sections in document order."
+
+_SECTION_LABELS = [
+    (name, re.compile(rf"(?i)\b({keywords})")) for name, keywords in SECTION_KEYWORDS.items()
+]
+
+
+@dataclass
+class DocumentChunk:
+    """A run of consecutive paragraphs summarized together."""
+    index: int
+    label: str
+    text: str
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.text.encode()).hexdigest()
+
+
+def _section_label(heading: str) -> str:
+    """Name a section after the contract section it covers, or its heading."""
+    for name, pattern in _SECTION_LABELS:
+        if pattern.search(heading):
+            return name
+    return heading.strip(" .:")[:60]
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> List[str]:
+    """Split a paragraph longer than a chunk at line breaks, then hard."""
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+
+    pieces: List[str] = []
+    current = ""
+    for line in paragraph.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) + 1 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_document(text: str, max_chars: int) -> List[DocumentChunk]:
+    """
+    Split a document into chunks of at most ``max_chars`` characters.
+
+    Chunks start at section headings where possible, so each chunk covers
+    whole sections; short sections are merged with their neighbours and long
+    ones split at paragraph boundaries.
+
+    Args:
+        text: Document text
+        max_chars: Maximum chunk size in characters
+
+    Returns:
+        List[DocumentChunk]: Chunks in document order
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text.replace("\r\n", "\n")) if p.strip()]
+
+    chunks: List[DocumentChunk] = []
+    current: List[str] = []
+    size = 0
+    label = "preamble"
+    # Sections smaller than this are merged into the preceding chunk
+    min_chars = max_chars // 4
+
+    for paragraph in paragraphs:
+        first_line = paragraph.split("\n", 1)[0].strip()
+        if is_heading(first_line):
+            if size >= min_chars:
+                chunks.append(DocumentChunk(len(chunks), label, "\n\n".join(current)))
+                current, size = [], 0
+            if not current:
+                label = _section_label(first_line)
+
+        for piece in _split_oversized(paragraph, max_chars):
+            if current and size + len(piece) + 2 > max_chars:
+                chunks.append(DocumentChunk(len(chunks), label, "\n\n".join(current)))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+
+    if current:
+        chunks.append(DocumentChunk(len(chunks), label, "\n\n".join(current)))
+    return chunks
+
+
+class ChunkedSummarizer:
+    """Map-reduce summarizer over a synchronous completion function."""
+
+    def __init__(self, complete: CompletionFn, model: str,
+                 chunk_chars: Optional[int] = None,
+                 max_concurrency: Optional[int] = None):
+        """
+        Args:
+            complete: Provider call taking (system_prompt, user_prompt, max_tokens)
+            model: Model identifier, part of the chunk cache key
+            chunk_chars: Maximum chunk size in characters
+            max_concurrency: Maximum chunk summaries requested at once
+        """
+        self.complete = complete
+        self.model = model
+        self.chunk_chars = chunk_chars or settings.LLM_SUMMARY_CHUNK_CHARS
+        self.max_concurrency = max_concurrency or settings.LLM_SUMMARY_MAX_CONCURRENCY
+        self.chunk_max_tokens = settings.LLM_SUMMARY_CHUNK_MAX_TOKENS
+        self.cache_ttl = settings.LLM_SUMMARY_CACHE_TTL
+
+    def summarize(self, text: str, instruction: str, max_tokens: int,
+                  system_prompt: str = MAP_SYSTEM_PROMPT, focus: str = "") -> Dict[str, Any]:
+        """
+        Summarize a document with ``instruction``.
+
+        Args:
+            text: Document text
+            instruction: Prompt for the final summary
+            max_tokens: Completion budget of the final summary
+            system_prompt: System prompt of the final call
+            focus: Short description of the summary purpose used in chunk prompts
+
+        Returns:
+            Dict: ``summary`` plus chunking statistics
+        """
+        condensed, stats = self.condense(text, focus)
+        if stats["chunk_count"] > 1:
+            prompt = f"{instruction}\n\n{REDUCE_NOTE}\n\nSection summaries:\n{condensed}"
+        else:
+            prompt = f"{instruction}\n\nContract:\n{condensed}"
+
+        start = time.monotonic()
+        summary = self.complete(system_prompt, prompt, max_tokens)
+        stats["reduce_time"] += time.monotonic() - start
+
+        return {"summary": summary, **stats}
+
+    def condense(self, text: str, focus: str = "") -> Tuple[str, Dict[str, Any]]:
+        """
+        Reduce a document to section summaries that fit in one chunk.
+
+        Text that already fits is returned unchanged.
+
+        Returns:
+            Tuple[str, Dict]: Condensed text and chunking statistics
+        """
+        chunks = split_document(text, self.chunk_chars)
+        stats = {
+            "chunk_count": len(chunks),
+            "cached_chunks": 0,
+            "reduce_rounds": 0,
+            "map_time": 0.0,
+            "reduce_time": 0.0,
+        }
+        if len(chunks) <= 1:
+            return text, stats
+
+        start = time.monotonic()
+        summaries, cached = self._map_chunks(chunks, focus)
+        stats["map_time"] = time.monotonic() - start
+        stats["cached_chunks"] = cached
+
+        sections = [f"[{chunk.label}]\n{summary}" for chunk, summary in zip(chunks, summaries)]
+        condensed = "\n\n".join(sections)
+
+        # Section summaries of very long documents may still not fit; merge
+        # neighbouring summaries until they do
+        start = time.monotonic()
+        while len(condensed) > self.chunk_chars and len(sections) > 1:
+            sections = self._merge_round(sections, focus)
+            condensed = "\n\n".join(sections)
+            stats["reduce_rounds"] += 1
+        stats["reduce_time"] = time.monotonic() - start
+
+        logger.info(
+            "Condensed long document",
+            model=self.model,
+            original_length=len(text),
+            condensed_length=len(condensed),
+            **{k: v for k, v in stats.items() if not k.endswith("_time")}
+        )
+        return condensed, stats
+
+    def _map_chunks(self, chunks: List[DocumentChunk], focus: str) -> Tuple[List[str], int]:
+        """Summarize chunks concurrently, serving unchanged chunks from the cache."""
+        summaries: List[Optional[str]] = [None] * len(chunks)
+        keys = [self._cache_key(chunk, focus) for chunk in chunks]
+
+        for i, key in enumerate(keys):
+            summaries[i] = self._cache_get(key)
+        misses = [chunk for chunk in chunks if summaries[chunk.index] is None]
+
+        def summarize_chunk(chunk: DocumentChunk) -> str:
+            prompt = MAP_PROMPT.format(focus=_focus_suffix(focus), label=chunk.label, text=chunk.text)
+            return self.complete(MAP_SYSTEM_PROMPT, prompt, self.chunk_max_tokens)
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(misses))) as pool:
+                for chunk, summary in zip(misses, pool.map(summarize_chunk, misses)):
+                    summaries[chunk.index] = summary
+                    self._cache_set(keys[chunk.index], summary)
+
+        return summaries, len(chunks) - len(misses)
+
+    def _merge_round(self, sections: List[str], focus: str) -> List[str]:
+        """Merge neighbouring section summaries in groups that fit in a chunk."""
+        groups: List[List[str]] = [[]]
+        size = 0
+        for section in sections:
+            if groups[-1] and size + len(section) > self.chunk_chars:
+                groups.append([])
+                size = 0
+            groups[-1].append(section)
+            size += len(section) + 2
+
+        # Always make progress, even if every section is near chunk size
+        if len(groups) == len(sections):
+            groups = [sections[i:i + 2] for i in range(0, len(sections), 2)]
+
+        def merge(group: List[str]) -> str:
+            if len(group) == 1:
+                return group[0]
+            prompt = MERGE_PROMPT.format(focus=_focus_suffix(focus), text="\n\n".join(group))
+            return self.complete(MAP_SYSTEM_PROMPT, prompt, self.chunk_max_tokens)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(groups))) as pool:
+            return list(pool.map(merge, groups))
+
+    # Chunk summary cache
+
+    def _cache_key(self, chunk: DocumentChunk, focus: str) -> str:
+        digest = hashlib.sha256(
+            f"{CHUNK_CACHE_VERSION}|{self.model}|{focus}|{chunk.label}|{chunk.content_hash}".encode()
+        ).hexdigest()
+        return f"{CHUNK_CACHE_PREFIX}{digest}"
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        try:
+            raw = get_redis_client().get(key)
+        except Exception as e:
+            logger.debug("Chunk summary cache read failed", error=str(e))
+            return None
+        if raw is None:
+            return None
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    def _cache_set(self, key: str, summary: str):
+        try:
+            get_redis_client().set(key, summary, ex=self.cache_ttl)
+        except Exception as e:
+            logger.debug("Chunk summary cache write failed", error=str(e))
+
+
+def _focus_suffix(focus: str) -> str:
+    return f" for a {focus}" if focus else ""
@@ -0,0 +1,305 @@
+"""
+Compiled rule sets for pattern-based compliance checks.
+
+Running every rule's regex over the whole document costs one full pass per
+rule, and lazy patterns such as ``(buyer|purchaser).*?and.*?(seller|vendor)``
+backtrack over the rest of the line at every occurrence of their first term.
+A compiled rule set instead:
+
+- compiles every rule pattern once and caches the compiled set;
+- extracts the literal terms each pattern must start with and scans the
+  lowercased document once for all of them with a single combined pattern
+  (a zero-width alternation, so overlapping terms are all seen);
+- verifies a rule only where one of its terms occurs, with a match anchored
+  at that position and limited to a window of ``max_match_chars``, which
+  bounds backtracking;
+- stops verifying a rule once its time budget is used up and reports it as
+  timed out rather than scanning on.
+
+Rules whose patterns do not start with literal terms are matched with a full
+scan, still subject to the time budget between matches.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+_INLINE_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_METACHARS = set(".^$*+?{}[]()|\\")
+_QUANTIFIERS = set("*?{")
+
+
+@dataclass
+class RuleScanResult:
+    """Matches of one rule in a document."""
+    rule_id: str
+    # (start, end, matched text) in document order, non-overlapping
+    matches: List[Tuple[int, int, str]] = field(default_factory=list)
+    # Candidate positions verified
+    candidates: int = 0
+    timed_out: bool = False
+    scan_time: float = 0.0
+
+    @property
+    def found(self) -> bool:
+        return bool(self.matches)
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern at its top-level ``|``."""
+    parts, depth, start, i, in_class = [], 0, 0, 0, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def _group_end(pattern: str) -> int:
+    """Index of the parenthesis closing the group opened at index 0, or -1."""
+    depth, i, in_class = 0, 0, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Literal text every match of ``pattern`` starts with."""
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            literal, width = pattern[i + 1], 2
+        elif char in _METACHARS:
+            break
+        else:
+            literal, width = char, 1
+        # A quantified character may be absent or repeated
+        if i + width < len(pattern) and pattern[i + width] in _QUANTIFIERS:
+            break
+        prefix.append(literal)
+        i += width
+    return "".join(prefix)
+
+
+def _leading_terms(pattern: str) -> Optional[List[str]]:
+    """Literal terms of which every match starts with one, or None."""
+    terms: List[str] = []
+    for alternative in _split_alternatives(pattern):
+        if alternative.startswith("("):
+            end = _group_end(alternative)
+            if end < 0 or (end + 1 < len(alternative) and alternative[end + 1] in _QUANTIFIERS):
+                return None
+            inner = alternative[1:end]
+            if inner.startswith("?:"):
+                inner = inner[2:]
+            elif inner.startswith("?P<"):
+                inner = inner[inner.index(">") + 1:]
+            elif inner.startswith("?"):
+                # Lookarounds and inline flag groups
+                return None
+            group_terms = _leading_terms(inner)
+            if not group_terms:
+                return None
+            terms.extend(group_terms)
+        else:
+            prefix = _literal_prefix(alternative)
+            if not prefix:
+                return None
+            terms.append(prefix)
+    return terms
+
+
+def extract_trigger_terms(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Find literal terms that every match of a pattern starts with.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Optional[Tuple[str, ...]]: Lowercase terms, or None if the pattern
+        does not start with literal text
+    """
+    body = pattern
+    flags = _INLINE_FLAGS.match(body)
+    while flags:
+        if "x" in flags.group(1):
+            # Verbose patterns treat whitespace differently
+            return None
+        body = body[flags.end():]
+        flags = _INLINE_FLAGS.match(body)
+
+    terms = _leading_terms(body)
+    if not terms:
+        return None
+    return tuple(dict.fromkeys(term.lower() for term in terms))
+
+
+class CompiledRuleSet:
+    """Rules compiled for single-pass scanning."""
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, str]],
+        max_match_chars: Optional[int] = None,
+        time_budget_ms: Optional[float] = None
+    ):
+        """
+        Args:
+            rules: ``(rule_id, pattern)`` pairs
+            max_match_chars: Longest match a rule can produce
+            time_budget_ms: Verification time allowed per rule and document
+        """
+        self.rule_ids = [rule_id for rule_id, _ in rules]
+        self.patterns = [re.compile(pattern) for _, pattern in rules]
+        self.max_match_chars = max_match_chars or settings.COMPLIANCE_RULE_MAX_MATCH_CHARS
+        self.time_budget = (time_budget_ms or settings.COMPLIANCE_RULE_TIME_BUDGET_MS) / 1000
+
+        rule_terms: Dict[int, Tuple[str, ...]] = {}
+        self.full_scan_rules: List[int] = []
+        for index, (_, pattern) in enumerate(rules):
+            terms = extract_trigger_terms(pattern)
+            if terms is None:
+                self.full_scan_rules.append(index)
+            else:
+                rule_terms[index] = terms
+
+        # At a position the prefilter reports the longest term found; rules
+        # whose terms are prefixes of it are candidates there too
+        all_terms = sorted({term for terms in rule_terms.values() for term in terms}, key=len, reverse=True)
+        self.dispatch: Dict[str, Tuple[int, ...]] = {
+            found: tuple(
+                index for index, terms in rule_terms.items()
+                if any(found.startswith(term) for term in terms)
+            )
+            for found in all_terms
+        }
+        self.prefilter = None
+        self.prefilter_ignorecase = None
+        if all_terms:
+            alternation = "|".join(re.escape(term) for term in all_terms)
+            # Run over the lowercased document, which is several times faster
+            # than a case-insensitive scan
+            self.prefilter = re.compile(f"(?=({alternation}))")
+            self.prefilter_ignorecase = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+    def scan(self, content: str, first_only: Iterable[str] = ()) -> Dict[str, RuleScanResult]:
+        """
+        Find all rule matches in a single pass over the document.
+
+        Args:
+            content: Document text
+            first_only: Rules for which only the first match is needed
+
+        Returns:
+            Dict[str, RuleScanResult]: Results by rule id
+        """
+        results = [RuleScanResult(rule_id) for rule_id in self.rule_ids]
+        first_only = set(first_only)
+        single = [rule_id in first_only for rule_id in self.rule_ids]
+        done = [False] * len(results)
+        # Matches of a rule do not overlap, as with re.finditer
+        next_start = [0] * len(results)
+        remaining = len(results) - len(self.full_scan_rules)
+        length = len(content)
+
+        if self.prefilter is not None and remaining:
+            lowered = content.lower()
+            if len(lowered) == length:
+                hits = self.prefilter.finditer(lowered)
+            else:
+                # Lowercasing changed offsets (e.g. "İ"); scan the original
+                hits = self.prefilter_ignorecase.finditer(content)
+
+            for hit in hits:
+                position = hit.start()
+                for index in self.dispatch[hit.group(1).lower()]:
+                    if done[index] or position < next_start[index]:
+                        continue
+                    result = results[index]
+                    started = time.perf_counter()
+                    match = self.patterns[index].match(
+                        content, position, min(length, position + self.max_match_chars)
+                    )
+                    result.scan_time += time.perf_counter() - started
+                    result.candidates += 1
+
+                    if match:
+                        result.matches.append((match.start(), match.end(), match.group(0)))
+                        next_start[index] = max(match.end(), position + 1)
+                        if single[index]:
+                            done[index] = True
+                    if not done[index] and result.scan_time > self.time_budget:
+                        result.timed_out = True
+                        done[index] = True
+                    if done[index]:
+                        remaining -= 1
+                if not remaining:
+                    break
+
+        for index in self.full_scan_rules:
+            result = results[index]
+            started = time.perf_counter()
+            for match in self.patterns[index].finditer(content):
+                result.matches.append((match.start(), match.end(), match.group(0)))
+                if single[index]:
+                    break
+                if time.perf_counter() - started > self.time_budget:
+                    result.timed_out = True
+                    break
+            result.scan_time = time.perf_counter() - started
+
+        return {result.rule_id: result for result in results}
+
+
+@lru_cache(maxsize=128)
+def _compile_rule_set(rules: Tuple[Tuple[str, str], ...]) -> CompiledRuleSet:
+    return CompiledRuleSet(rules)
+
+
+def compile_rule_set(rules: Iterable[Tuple[str, str]]) -> CompiledRuleSet:
+    """
+    Get the compiled rule set for ``(rule_id, pattern)`` pairs.
+
+    Compiled sets are cached, so the rules of a jurisdiction are compiled
+    once per process.
+    """
+    return _compile_rule_set(tuple(rules))
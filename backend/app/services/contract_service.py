@@ -16,6 +16,9 @@ from fastapi import HTTPException, status
 from ..core.database import get_session_context
 from ..core.storage import get_storage_client, StorageError
 from ..core.template_engine import get_template_engine, TemplateRenderingError
+from .export_artifacts import get_export_artifact_store
+from .template_inheritance import get_template_inheritance_resolver
+from .version_store import get_version_store, is_payload
 from ..models.contract import (
     Contract, ContractCreate, ContractUpdate, ContractPublic, ContractWithDetails
 )
@@ -55,6 +58,7 @@ class ContractService:
         """Initialize contract service."""
         self.storage_client = get_storage_client()
         self.template_engine = get_template_engine()
+        self.inheritance_resolver = get_template_inheritance_resolver()
 
     async def create_contract(
         self,
@@ -189,13 +193,17 @@ class ContractService:
                     detail="Template is not active"
                 )
 
+            # Resolve the template with its ancestor chain merged in
+            effective = self.inheritance_resolver.resolve(template, session)
+
             # Validate variables if requested
             validation_results = None
             if generation_request.validate_before_generation:
                 validation_results = await self._validate_contract_variables(
                     generation_request.variables,
                     template,
-                    session
+                    session,
+                    variable_definitions=effective.variables
                 )
 
                 if not validation_results['is_valid']:
@@ -204,21 +212,21 @@ class ContractService:
                     )
 
             # Apply business rules if requested
-            if generation_request.apply_business_rules and template.business_rules:
+            if generation_request.apply_business_rules and effective.business_rules:
                 generation_request.variables = await self._apply_business_rules(
                     generation_request.variables,
-                    template.business_rules,
+                    effective.business_rules,
                     session
                 )
 
-            # Get template content
-            template_content = await self._get_template_content(template, session)
+            # Get template content, falling back to inherited content
+            template_content = effective.html_content or await self._get_template_content(template, session)
 
             # Render template
             render_result = self.template_engine.render_template(
                 template_content=template_content,
                 variables=generation_request.variables,
-                variable_definitions=template.variables or [],
+                variable_definitions=effective.variables,
                 validate_variables=generation_request.validate_before_generation,
                 output_format=generation_request.output_format
             )
@@ -703,18 +711,21 @@ class ContractService:
                 # For now, allow deletion - implement proper ownership check
                 pass
 
-            # Delete generated files from storage
-            if contract.generated_pdf_key:
+            # Release generated files; shared artifacts are removed by
+            # garbage collection once no contract references them
+            artifact_store = get_export_artifact_store()
+            for output_format, file_key in (("pdf", contract.generated_pdf_key), ("docx", contract.generated_docx_key)):
+                if not file_key:
+                    continue
+                if artifact_store.is_artifact_key(file_key):
+                    artifact_store.detach(f"contract:{contract.id}:generated", output_format)
+                    continue
                 try:
-                    self.storage_client.delete_file(contract.generated_pdf_key)
+                    self.storage_client.delete_file(file_key)
                 except StorageError as e:
-                    logger.warning(f"Failed to delete PDF file: {e}")
-
-            if contract.generated_docx_key:
-                try:
-                    self.storage_client.delete_file(contract.generated_docx_key)
-                except StorageError as e:
-                    logger.warning(f"Failed to delete DOCX file: {e}")
+                    logger.warning(f"Failed to delete {output_format.upper()} file: {e}")
+            for output_format in ("pdf", "docx"):
+                artifact_store.detach(f"contract:{contract.id}:export", output_format)
 
             # Mark as deleted (soft delete)
             contract.status = "void"
@@ -963,16 +974,19 @@ class ContractService:
         self,
         variables: Dict[str, Any],
         template: Template,
-        session: Session
+        session: Session,
+        variable_definitions: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """Validate contract variables against template schema."""
         try:
-            if not template.variables:
+            if variable_definitions is None:
+                variable_definitions = template.variables
+            if not variable_definitions:
                 return {'is_valid': True, 'errors': [], 'warnings': []}
 
             return self.template_engine.validate_variables(
                 variables,
-                template.variables
+                variable_definitions
             )
 
         except Exception as e:
@@ -1343,35 +1357,23 @@ class ContractService:
         output_format: OutputFormat,
         session: Session
     ) -> str:
-        """Store generated contract content in storage."""
+        """
+        Store generated contract content in storage.
+
+        Content is stored content-addressed, so regenerating an unchanged
+        contract reuses the stored file.
+        """
         try:
-            # Generate storage key
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            file_extension = output_format.value.lower()
-            storage_key = f"contracts/{contract_id}/generated_{timestamp}.{file_extension}"
-
-            # Convert content to bytes
-            content_bytes = content.encode('utf-8')
-
-            # Determine MIME type
-            mime_type = {
-                OutputFormat.HTML: 'text/html',
-                OutputFormat.PDF: 'application/pdf',
-                OutputFormat.DOCX: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                OutputFormat.TXT: 'text/plain'
-            }.get(output_format, 'text/plain')
-
-            # Upload to storage
-            import io
-            file_obj = io.BytesIO(content_bytes)
-
-            result = self.storage_client.upload_file(
-                file_obj=file_obj,
-                storage_key=storage_key,
-                mime_type=mime_type
+            record, _ = await asyncio.to_thread(
+                get_export_artifact_store().get_or_create,
+                f"contract:{contract_id}:generated",
+                content,
+                output_format.value,
+                None,
+                lambda: content.encode('utf-8'),
+                {"contract_id": str(contract_id)}
             )
-
-            return storage_key
+            return record["storage_key"]
 
         except Exception as e:
             logger.error(f"Failed to store generated content: {e}")
@@ -1391,14 +1393,19 @@ class ContractService:
                 select(func.count(Version.id)).where(Version.contract_id == contract.id)
             ).first() or 0
 
+            # Store the content as a snapshot, delta or reference
+            payload, content_hash = get_version_store().prepare(
+                session, contract.id, version_count + 1, contract.variables
+            )
+
             # Create version
             version_data = VersionCreate(
                 contract_id=contract.id,
                 number=version_count + 1,
-                diff=change_summary,
+                diff=payload,
                 created_by=user.email,
                 change_summary=change_summary,
-                content_hash="",  # TODO: Calculate content hash
+                content_hash=content_hash,
                 is_current=True
             )
 
@@ -1467,7 +1474,8 @@ class ContractService:
             created_at=version.created_at,
             contract_id=version.contract_id,
             number=version.number,
-            diff=version.diff,
+            # Stored content stays internal; the summary was the diff text
+            diff=version.change_summary if is_payload(version.diff) else version.diff,
             created_by=version.created_by,
             change_summary=version.change_summary,
             content_hash=version.content_hash,
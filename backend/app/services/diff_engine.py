@@ -0,0 +1,538 @@
+"""
+Line and word diffs for document version comparison.
+
+``difflib.SequenceMatcher`` compares full strings and its matching is
+quadratic in the worst case, which makes comparing two versions of a long
+contract take seconds. The diff engine instead:
+
+- hashes each line (or word) once per document and caches the hashed
+  sequence by content digest, so every comparison after the first compares
+  integers;
+- anchors the diff on lines that occur exactly once in both documents
+  (patience diff) and runs a Myers O(ND) diff only in the gaps between
+  anchors, with a bounded edit distance per gap;
+- estimates similarity from cached bottom-k MinHash sketches of word
+  shingles, so clearly unrelated documents are rejected without diffing;
+- caches computed diffs by the pair of content digests, so viewing the
+  same two versions again does not recompute them.
+
+Opcodes use the ``difflib`` format, and the unified and context renderings
+match ``difflib.unified_diff`` and ``difflib.context_diff``.
+"""
+
+import hashlib
+import heapq
+import html
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+Opcode = Tuple[str, int, int, int, int]
+
+SHINGLE_WORDS = 4
+SKETCH_SIZE = 128
+
+# Anchor regions nested deeper than this are diffed with Myers directly
+_MAX_PATIENCE_DEPTH = 64
+
+
+def _unique_anchors(a: Sequence[int], b: Sequence[int],
+                    alo: int, ahi: int, blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Longest increasing run of tokens unique in both ranges, as (i, j) pairs."""
+    a_index: Dict[int, int] = {}
+    for i in range(alo, ahi):
+        token = a[i]
+        a_index[token] = -1 if token in a_index else i
+    b_index: Dict[int, int] = {}
+    for j in range(blo, bhi):
+        token = b[j]
+        if a_index.get(token, -1) >= 0:
+            b_index[token] = -1 if token in b_index else j
+
+    pairs = [
+        (i, b_index[a[i]]) for i in range(alo, ahi)
+        if a_index[a[i]] == i and b_index.get(a[i], -1) >= 0
+    ]
+
+    # Patience sorting on the b positions
+    tails: List[int] = []
+    tail_pairs: List[int] = []
+    previous: List[Optional[int]] = []
+    for index, (_, j) in enumerate(pairs):
+        position = bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_pairs.append(index)
+        else:
+            tails[position] = j
+            tail_pairs[position] = index
+        previous.append(tail_pairs[position - 1] if position else None)
+
+    anchors = []
+    index = tail_pairs[-1] if tail_pairs else None
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(a: Sequence[int], b: Sequence[int], alo: int, ahi: int, blo: int, bhi: int,
+           max_edits: int, blocks: List[Tuple[int, int, int]]) -> None:
+    """
+    Append the matching blocks of a shortest edit script (Myers' O(ND) diff).
+
+    If more than ``max_edits`` edits are needed, the range is left without
+    matches and reported as replaced.
+    """
+    n, m = ahi - alo, bhi - blo
+    limit = min(n + m, max_edits)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace: List[List[int]] = []
+
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                _myers_backtrack(trace, d, n, m, alo, blo, blocks)
+                return
+        trace.append(v[offset - d:offset + d + 1])
+
+
+def _myers_backtrack(trace: List[List[int]], edits: int, x: int, y: int,
+                     alo: int, blo: int, blocks: List[Tuple[int, int, int]]) -> None:
+    found = []
+    for d in range(edits, 0, -1):
+        previous = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d - 1] < previous[k + 1 + d - 1]):
+            previous_k = k + 1
+            start_x = previous[previous_k + d - 1]
+        else:
+            previous_k = k - 1
+            start_x = previous[previous_k + d - 1] + 1
+        # The snake after the edit runs from start_x to x on diagonal k
+        if x > start_x:
+            found.append((alo + start_x, blo + start_x - k, x - start_x))
+        x = previous[previous_k + d - 1]
+        y = x - previous_k
+    if x:
+        found.append((alo, blo, x))
+    blocks.extend(reversed(found))
+
+
+def _match(a: Sequence[int], b: Sequence[int], alo: int, ahi: int, blo: int, bhi: int,
+           max_edits: int, blocks: List[Tuple[int, int, int]], depth: int = 0) -> None:
+    """Append the matching blocks of ``a[alo:ahi]`` and ``b[blo:bhi]`` in order."""
+    prefix = 0
+    while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+        prefix += 1
+    if prefix:
+        blocks.append((alo, blo, prefix))
+        alo += prefix
+        blo += prefix
+
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - 1 - suffix] == b[bhi - 1 - suffix]:
+        suffix += 1
+    ahi -= suffix
+    bhi -= suffix
+
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi) if depth < _MAX_PATIENCE_DEPTH else []
+        if anchors:
+            i, j = alo, blo
+            for anchor_i, anchor_j in anchors:
+                _match(a, b, i, anchor_i, j, anchor_j, max_edits, blocks, depth + 1)
+                blocks.append((anchor_i, anchor_j, 1))
+                i, j = anchor_i + 1, anchor_j + 1
+            _match(a, b, i, ahi, j, bhi, max_edits, blocks, depth + 1)
+        else:
+            _myers(a, b, alo, ahi, blo, bhi, max_edits, blocks)
+
+    if suffix:
+        blocks.append((ahi, bhi, suffix))
+
+
+def diff_opcodes(a: Sequence[int], b: Sequence[int], max_edits: Optional[int] = None) -> List[Opcode]:
+    """
+    Diff two token sequences.
+
+    Args:
+        a: Original tokens (any hashable values)
+        b: Modified tokens
+        max_edits: Edit distance above which a gap between anchors is
+            reported as replaced instead of diffed further
+
+    Returns:
+        List[Opcode]: ``difflib``-style ``(tag, i1, i2, j1, j2)`` opcodes
+    """
+    blocks: List[Tuple[int, int, int]] = []
+    _match(a, b, 0, len(a), 0, len(b), max_edits or settings.DIFF_MAX_EDIT_DISTANCE, blocks)
+
+    # Merge adjacent blocks
+    merged: List[Tuple[int, int, int]] = []
+    for block in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == block[0] and merged[-1][1] + merged[-1][2] == block[1]:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + block[2])
+        else:
+            merged.append(block)
+    merged.append((len(a), len(b), 0))
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in merged:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(("insert", i, block_i, j, block_j))
+        i, j = block_i + size, block_j + size
+        if size:
+            opcodes.append(("equal", block_i, i, block_j, j))
+    return opcodes
+
+
+def grouped_opcodes(opcodes: List[Opcode], n: int = 3) -> Iterator[List[Opcode]]:
+    """Hunks of changes with up to ``n`` lines of context, as in ``difflib``."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _format_range_context(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if not length:
+        beginning -= 1
+    if length <= 1:
+        return str(beginning)
+    return f"{beginning},{beginning + length - 1}"
+
+
+class TextDiff:
+    """Diff between two token sequences with ``difflib``-compatible output."""
+
+    def __init__(self, a: Sequence[str], b: Sequence[str], opcodes: List[Opcode]):
+        self.a = a
+        self.b = b
+        self.opcodes = opcodes
+
+    @property
+    def matched(self) -> int:
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.opcodes if tag == "equal")
+
+    def ratio(self) -> float:
+        """Token similarity in [0, 1], as ``SequenceMatcher.ratio()``."""
+        total = len(self.a) + len(self.b)
+        return 2.0 * self.matched / total if total else 1.0
+
+    def char_ratio(self, max_edits: Optional[int] = None) -> float:
+        """
+        Share of unchanged characters, in [0, 1].
+
+        Replaced blocks are diffed again by word, so a line with one changed
+        word still counts its other words as unchanged.
+        """
+        total = sum(map(len, self.a)) + sum(map(len, self.b))
+        if not total:
+            return 1.0
+        matched = 0
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == "equal":
+                matched += sum(map(len, self.a[i1:i2]))
+            elif tag == "replace":
+                words_a = "".join(self.a[i1:i2]).split()
+                words_b = "".join(self.b[j1:j2]).split()
+                for word_tag, w1, w2, _, _ in diff_opcodes(words_a, words_b, max_edits):
+                    if word_tag == "equal":
+                        matched += sum(map(len, words_a[w1:w2]))
+        return 2.0 * matched / total
+
+    def unified(self, fromfile: str = "", tofile: str = "", n: int = 3, lineterm: str = "\n") -> Iterator[str]:
+        """Lines of a unified diff, as ``difflib.unified_diff``."""
+        started = False
+        for group in grouped_opcodes(self.opcodes, n):
+            if not started:
+                started = True
+                yield f"--- {fromfile}{lineterm}"
+                yield f"+++ {tofile}{lineterm}"
+            first, last = group[0], group[-1]
+            yield (f"@@ -{_format_range_unified(first[1], last[2])} "
+                   f"+{_format_range_unified(first[3], last[4])} @@{lineterm}")
+            for tag, i1, i2, j1, j2 in group:
+                if tag == "equal":
+                    for line in self.a[i1:i2]:
+                        yield " " + line
+                    continue
+                if tag in ("replace", "delete"):
+                    for line in self.a[i1:i2]:
+                        yield "-" + line
+                if tag in ("replace", "insert"):
+                    for line in self.b[j1:j2]:
+                        yield "+" + line
+
+    def context(self, fromfile: str = "", tofile: str = "", n: int = 3, lineterm: str = "\n") -> Iterator[str]:
+        """Lines of a context diff, as ``difflib.context_diff``."""
+        prefix = {"insert": "+ ", "delete": "- ", "replace": "! ", "equal": "  "}
+        started = False
+        for group in grouped_opcodes(self.opcodes, n):
+            if not started:
+                started = True
+                yield f"*** {fromfile}{lineterm}"
+                yield f"--- {tofile}{lineterm}"
+            first, last = group[0], group[-1]
+            yield "***************" + lineterm
+
+            yield f"*** {_format_range_context(first[1], last[2])} ****{lineterm}"
+            if any(tag in ("replace", "delete") for tag, _, _, _, _ in group):
+                for tag, i1, i2, _, _ in group:
+                    if tag != "insert":
+                        for line in self.a[i1:i2]:
+                            yield prefix[tag] + line
+
+            yield f"--- {_format_range_context(first[3], last[4])} ----{lineterm}"
+            if any(tag in ("replace", "insert") for tag, _, _, _, _ in group):
+                for tag, _, _, j1, j2 in group:
+                    if tag != "delete":
+                        for line in self.b[j1:j2]:
+                            yield prefix[tag] + line
+
+    def html(self, fromdesc: str = "", todesc: str = "") -> str:
+        """Side-by-side HTML table of the two documents."""
+        rows = []
+
+        def cell(number: Optional[int], text: Optional[str], css: str) -> str:
+            if text is None:
+                return '<td class="diff_next"></td><td></td>'
+            content = html.escape(text.rstrip("\r\n"))
+            if css:
+                content = f'<span class="{css}">{content}</span>'
+            return f'<td class="diff_header">{number}</td><td nowrap="nowrap">{content}</td>'
+
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    rows.append(cell(i1 + offset + 1, self.a[i1 + offset], "")
+                                + cell(j1 + offset + 1, self.b[j1 + offset], ""))
+                continue
+            left_css = "diff_chg" if tag == "replace" else "diff_sub"
+            right_css = "diff_chg" if tag == "replace" else "diff_add"
+            for offset in range(max(i2 - i1, j2 - j1)):
+                i, j = i1 + offset, j1 + offset
+                left = cell(i + 1, self.a[i], left_css) if i < i2 else cell(None, None, "")
+                right = cell(j + 1, self.b[j], right_css) if j < j2 else cell(None, None, "")
+                rows.append(left + right)
+
+        body = "\n".join(f"<tr>{row}</tr>" for row in rows)
+        return (
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\" />\n<title></title>\n"
+            "<style type=\"text/css\">\n"
+            "  table.diff {font-family:Courier; border:medium;}\n"
+            "  .diff_header {background-color:#e0e0e0}\n"
+            "  .diff_next {background-color:#c0c0c0}\n"
+            "  .diff_add {background-color:#aaffaa}\n"
+            "  .diff_chg {background-color:#ffff77}\n"
+            "  .diff_sub {background-color:#ffaaaa}\n"
+            "</style>\n</head>\n<body>\n"
+            "<table class=\"diff\" cellspacing=\"0\" cellpadding=\"0\" rules=\"groups\">\n"
+            f"<thead><tr><th colspan=\"2\">{html.escape(fromdesc)}</th>"
+            f"<th colspan=\"2\">{html.escape(todesc)}</th></tr></thead>\n"
+            f"<tbody>\n{body}\n</tbody>\n</table>\n</body>\n</html>"
+        )
+
+
+class _LRU:
+    """Thread-safe bounded mapping."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class DiffEngine:
+    """Cached line and word diffs and similarity estimates between texts."""
+
+    def __init__(self, cache_size: Optional[int] = None, max_edits: Optional[int] = None,
+                 reject_below: Optional[float] = None):
+        """
+        Args:
+            cache_size: Diffs kept, and twice as many tokenized documents
+            max_edits: Edit distance bound of each Myers gap
+            reject_below: Estimated similarity under which documents are
+                not diffed for a similarity score
+        """
+        cache_size = cache_size or settings.DIFF_CACHE_SIZE
+        self.max_edits = max_edits or settings.DIFF_MAX_EDIT_DISTANCE
+        self.reject_below = settings.DIFF_SIMILARITY_REJECT_BELOW if reject_below is None else reject_below
+        self._tokens = _LRU(cache_size * 2)
+        self._diffs = _LRU(cache_size)
+
+    @staticmethod
+    def digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _tokenize(self, content: str, digest: str, mode: str) -> Tuple[Sequence[str], Tuple[int, ...]]:
+        """Tokens of a document and their hashes, cached by content digest."""
+        key = (digest, mode)
+        cached = self._tokens.get(key)
+        if cached is None:
+            if mode == "words":
+                tokens = content.split()
+            else:
+                tokens = content.splitlines(keepends=mode == "lines")
+            cached = (tokens, tuple(map(hash, tokens)))
+            self._tokens.put(key, cached)
+        return cached
+
+    def _diff(self, original: str, modified: str, mode: str) -> TextDiff:
+        digests = (self.digest(original), self.digest(modified))
+        key = digests + (mode,)
+        cached = self._diffs.get(key)
+        if cached is None:
+            a, a_hashes = self._tokenize(original, digests[0], mode)
+            b, b_hashes = self._tokenize(modified, digests[1], mode)
+            cached = TextDiff(a, b, diff_opcodes(a_hashes, b_hashes, self.max_edits))
+            self._diffs.put(key, cached)
+        return cached
+
+    def diff_lines(self, original: str, modified: str, keepends: bool = True) -> TextDiff:
+        """
+        Line diff between two texts.
+
+        Args:
+            original: Original text
+            modified: Modified text
+            keepends: Keep line endings in the tokens, as unified diffs need
+
+        Returns:
+            TextDiff: The diff, shared with other callers of the same pair
+        """
+        return self._diff(original, modified, "lines" if keepends else "bare_lines")
+
+    def diff_words(self, original: str, modified: str) -> TextDiff:
+        """Whitespace-separated word diff between two texts."""
+        return self._diff(original, modified, "words")
+
+    def sketch(self, content: str, digest: Optional[str] = None) -> Tuple[int, ...]:
+        """Bottom-k MinHash sketch of the word shingles of a text, cached by digest."""
+        key = (digest or self.digest(content), "sketch")
+        cached = self._tokens.get(key)
+        if cached is None:
+            words = content.split()
+            shingles = {
+                hash(tuple(words[i:i + SHINGLE_WORDS]))
+                for i in range(max(1, len(words) - SHINGLE_WORDS + 1))
+            } if words else set()
+            cached = tuple(sorted(heapq.nsmallest(SKETCH_SIZE, shingles)))
+            self._tokens.put(key, cached)
+        return cached
+
+    def estimate_similarity(self, original: str, modified: str) -> float:
+        """Estimated Jaccard similarity of the word shingles of two texts."""
+        sketch_a, sketch_b = self.sketch(original), self.sketch(modified)
+        if not sketch_a and not sketch_b:
+            return 1.0
+        union = heapq.nsmallest(SKETCH_SIZE, set(sketch_a) | set(sketch_b))
+        both = set(sketch_a) & set(sketch_b)
+        return sum(1 for value in union if value in both) / len(union)
+
+    def similarity(self, original: str, modified: str) -> float:
+        """
+        Similarity of two texts in [0, 1].
+
+        Texts whose estimated similarity is below ``reject_below`` get the
+        estimate; others the share of unchanged characters in their diff.
+        """
+        if original == modified:
+            return 1.0
+        estimate = self.estimate_similarity(original, modified)
+        if estimate < self.reject_below:
+            return estimate
+        return self.diff_lines(original, modified).char_ratio(self.max_edits)
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        return {"diffs": self._diffs.info(), "documents": self._tokens.info()}
+
+    def clear(self) -> None:
+        self._diffs.clear()
+        self._tokens.clear()
+
+
+# Global diff engine instance
+_diff_engine: Optional[DiffEngine] = None
+
+
+def get_diff_engine() -> DiffEngine:
+    """Get the global diff engine."""
+    global _diff_engine
+    if _diff_engine is None:
+        _diff_engine = DiffEngine()
+    return _diff_engine
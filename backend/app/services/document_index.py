@@ -0,0 +1,305 @@
+"""
+Structural index of contract documents.
+
+A document is parsed once into paragraph spans, a tree of headed sections
+and the keyword sections, amounts, dates and obligations the summarization
+tools report. Indexes are immutable and cached by a hash of the document
+content, so summarizing the same document again, for another summary type
+or audience, reads the cached index instead of re-scanning the text.
+
+Keyword sections keep the semantics of the original per-section patterns:
+the text from the first keyword of a section up to the next blank line or
+line starting with a letter. All keywords are found by one scan that stops
+once every section has matched.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+# Common real estate contract sections
+SECTION_KEYWORDS = {
+    "parties": r"parties|buyer|seller|purchaser|vendor",
+    "property": r"property|premises|real estate|located",
+    "purchase_price": r"purchase price|consideration|amount",
+    "financing": r"financing|loan|mortgage|contingent",
+    "closing": r"closing|settlement|possession",
+    "contingencies": r"contingencies|subject to|provided that",
+    "disclosures": r"disclosure|warranty|representation",
+}
+
+MAX_ACTION_ITEMS = 10
+
+# Paragraphs used as sections when no keyword section is found
+MAX_FALLBACK_SECTIONS = 5
+
+# "ARTICLE IV", "Section 12.", "3.", "3.2)" and similar numbered headings
+_NUMBERED_HEADING = re.compile(
+    r"^\s*(?:(?:article|section)\s+[\dIVXLC]+[.:]?|\d+(?:\.\d+)*[.)])\s*\S", re.IGNORECASE
+)
+_CLAUSE_NUMBER = re.compile(r"^\s*(\d+(?:\.\d+)*)(?:[.)]|\s)")
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_LINE = re.compile(r"[^\n]+")
+
+# Terms longest first, so a term reported at a position covers every
+# shorter keyword matching there (which is necessarily its prefix)
+_TERMS = sorted(
+    {term for keywords in SECTION_KEYWORDS.values() for term in keywords.split("|")},
+    key=len, reverse=True
+)
+_KEYWORD_SCAN = re.compile(
+    "(?=(?:" + "|".join(f"({re.escape(term)})" for term in _TERMS) + "))", re.IGNORECASE
+)
+# Group number -> sections a match of that term starts
+_GROUP_SECTIONS = {
+    group: [name for name, keywords in SECTION_KEYWORDS.items()
+            if any(term.startswith(keyword) for keyword in keywords.split("|"))]
+    for group, term in enumerate(_TERMS, 1)
+}
+# Where a keyword section ends
+_CLAUSE_END = re.compile(r"\n\n|\n[A-Z]|$", re.IGNORECASE)
+
+_AMOUNT = re.compile(r"\$[\d,]+\.?\d*")
+_DATE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+_ACTION_PATTERNS = [
+    re.compile(r"(?i)(shall|must|will|required to|needs to|should)([^.]+)"),
+    re.compile(r"(?i)(deadline|due date|by)([^.]+)"),
+    re.compile(r"(?i)(contingent upon|subject to)([^.]+)"),
+]
+
+Span = Tuple[int, int]
+
+
+def is_heading(line: str) -> bool:
+    """Whether a stripped line looks like a section heading."""
+    if not line or len(line) > 100:
+        return False
+    if _NUMBERED_HEADING.match(line):
+        return True
+    words = line.split()
+    return len(words) <= 10 and line.isupper()
+
+
+def heading_level(line: str) -> int:
+    """Nesting depth of a heading: 2 for "3.2", 1 for "3." and unnumbered ones."""
+    match = _CLAUSE_NUMBER.match(line)
+    return match.group(1).count(".") + 1 if match else 1
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class DocumentSection:
+    """A heading and the text up to the next heading of the same or higher level."""
+    title: str
+    level: int
+    start: int
+    end: int
+    # Paragraph spans from the heading to the next heading, split at headings
+    paragraphs: List[Span] = field(default_factory=list)
+    children: List["DocumentSection"] = field(default_factory=list)
+
+    def walk(self) -> Iterator["DocumentSection"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "level": self.level,
+            "start": self.start,
+            "end": self.end,
+            "paragraphs": [list(span) for span in self.paragraphs],
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+@dataclass
+class DocumentIndex:
+    """Everything the summarization tools read from one document."""
+    content: str
+    digest: str
+    paragraphs: List[Span]
+    root: DocumentSection
+    sections: Dict[str, str]
+    amounts: List[str]
+    dates: List[str]
+    actions: List[str]
+
+    def text(self, span: Span) -> str:
+        return self.content[span[0]:span[1]]
+
+    def headings(self) -> List[DocumentSection]:
+        """Headed sections in document order."""
+        return [section for section in self.root.walk() if section is not self.root]
+
+    def section_at(self, offset: int) -> DocumentSection:
+        """Innermost section containing ``offset``."""
+        section = self.root
+        while True:
+            for child in section.children:
+                if child.start <= offset < child.end:
+                    section = child
+                    break
+            else:
+                return section
+
+    def outline(self) -> List[Dict[str, Any]]:
+        return [child.to_dict() for child in self.root.children]
+
+
+def _paragraph_spans(content: str) -> List[Span]:
+    breaks = [(match.start(), match.end()) for match in _PARAGRAPH_BREAK.finditer(content)]
+    breaks.append((len(content), len(content)))
+
+    spans: List[Span] = []
+    position = 0
+    for end, next_start in breaks:
+        text = content[position:end]
+        stripped = text.lstrip()
+        if stripped:
+            start = position + len(text) - len(stripped)
+            spans.append((start, start + len(stripped.rstrip())))
+        position = next_start
+    return spans
+
+
+def _section_tree(content: str, paragraphs: List[Span]) -> DocumentSection:
+    root = DocumentSection(title="", level=0, start=0, end=len(content))
+    # (offset, section owning the text from offset to the next heading)
+    owners: List[Tuple[int, DocumentSection]] = []
+    stack = [root]
+    for match in _LINE.finditer(content):
+        line = match.group().strip()
+        if not is_heading(line):
+            continue
+        level = heading_level(line)
+        start = match.start() + len(match.group()) - len(match.group().lstrip())
+        while stack[-1].level >= level:
+            stack.pop().end = start
+        section = DocumentSection(title=line, level=level, start=start, end=len(content))
+        stack[-1].children.append(section)
+        stack.append(section)
+        owners.append((start, section))
+
+    owner, position = root, 0
+    for start, end in paragraphs:
+        while position < len(owners) and owners[position][0] <= start:
+            owner = owners[position][1]
+            position += 1
+        while position < len(owners) and owners[position][0] < end:
+            boundary, next_owner = owners[position]
+            piece_end = start + len(content[start:boundary].rstrip())
+            if piece_end > start:
+                owner.paragraphs.append((start, piece_end))
+            owner, start = next_owner, boundary
+            position += 1
+        owner.paragraphs.append((start, end))
+    return root
+
+
+def _keyword_sections(content: str) -> Dict[str, str]:
+    starts: Dict[str, int] = {}
+    for match in _KEYWORD_SCAN.finditer(content):
+        for name in _GROUP_SECTIONS[match.lastindex]:
+            starts.setdefault(name, match.start())
+        if len(starts) == len(SECTION_KEYWORDS):
+            break
+
+    sections: Dict[str, str] = {}
+    for name in SECTION_KEYWORDS:
+        if name in starts:
+            start = starts[name]
+            sections[name] = content[start:_CLAUSE_END.search(content, start).start()].strip()
+
+    # If no specific sections found, create general sections
+    if not sections:
+        for i, paragraph in enumerate(content.split("\n\n", MAX_FALLBACK_SECTIONS)[:MAX_FALLBACK_SECTIONS]):
+            if paragraph.strip():
+                sections[f"section_{i + 1}"] = paragraph.strip()
+    return sections
+
+
+def _actions(content: str) -> List[str]:
+    actions: List[str] = []
+    for pattern in _ACTION_PATTERNS:
+        for match in pattern.finditer(content):
+            actions.append(match.group(2).strip())
+            if len(actions) == MAX_ACTION_ITEMS:
+                return actions
+    return actions
+
+
+def build_document_index(content: str, digest: Optional[str] = None) -> DocumentIndex:
+    """Parse a document into a :class:`DocumentIndex`."""
+    paragraphs = _paragraph_spans(content)
+    return DocumentIndex(
+        content=content,
+        digest=digest or content_hash(content),
+        paragraphs=paragraphs,
+        root=_section_tree(content, paragraphs),
+        sections=_keyword_sections(content),
+        amounts=_AMOUNT.findall(content),
+        dates=_DATE.findall(content),
+        actions=_actions(content),
+    )
+
+
+class DocumentIndexer:
+    """LRU cache of document indexes keyed by content hash."""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = cache_size or settings.DOCUMENT_INDEX_CACHE_SIZE
+        self._cache: "OrderedDict[str, DocumentIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def index(self, content: str) -> DocumentIndex:
+        """Get the index of ``content``, parsing it on first use."""
+        digest = content_hash(content)
+        with self._lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        index = build_document_index(content, digest)
+        with self._lock:
+            self._cache[digest] = index
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return index
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self._hits, "misses": self._misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Global document indexer instance
+_document_indexer: Optional[DocumentIndexer] = None
+
+
+def get_document_indexer() -> DocumentIndexer:
+    """Get the global document indexer."""
+    global _document_indexer
+    if _document_indexer is None:
+        _document_indexer = DocumentIndexer()
+    return _document_indexer
@@ -0,0 +1,365 @@
+"""
+Single-pass extraction of real estate entities from text.
+
+All entity patterns are combined into one compiled scanner with a named
+group per pattern, so a document is scanned once instead of once per
+pattern. Matches may only start where no word character precedes them,
+which lets the scanner skip the inside of words; scanning consumes the
+text, so entities never overlap. Where patterns could match at the same
+position, the one listed first in ``ENTITY_PATTERNS`` wins.
+
+Multi-megabyte texts are split into chunks at whitespace and scanned in
+parallel worker processes. Each chunk also scans a margin of the next one,
+so entities crossing a boundary are found; entities overlapping one already
+taken from the previous chunk are dropped when the chunks are merged.
+Entities are produced as an iterator in document order.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import structlog
+
+from ..core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class EntityPattern:
+    """Pattern producing entities of one category."""
+    category: str
+    entity_type: str
+    pattern: str
+    confidence: float
+    # Entity fields and the pattern group each is taken from (0 is the whole match)
+    fields: Tuple[Tuple[str, int], ...] = (("value", 0),)
+
+
+ENTITY_PATTERNS: Tuple[EntityPattern, ...] = (
+    # Properties
+    EntityPattern(
+        "properties", "property_feature",
+        r"(?i)(single[- ]family|multi[- ]family|condominium|townhouse|apartment|commercial|residential)",
+        0.8, (("value", 1),)
+    ),
+    EntityPattern("properties", "property_feature", r"(?i)(\d+[- ]bedroom|\d+[- ]bath|\d+[- ]story)", 0.8, (("value", 1),)),
+    EntityPattern(
+        "properties", "property_feature",
+        r"(?i)(\d+[,\d]*\s*square\s*feet|\d+[,\d]*\s*sq\.?\s*ft\.?)",
+        0.8, (("value", 1),)
+    ),
+    # Parties
+    EntityPattern(
+        "parties", "party",
+        r"(?i)(buyer|seller|purchaser|vendor|agent|broker):\s*([A-Z][a-z]+\s+[A-Z][a-z]+)",
+        0.7, (("name", 2), ("role", 1))
+    ),
+    EntityPattern(
+        "parties", "party",
+        r"(?i)([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(buyer|seller|purchaser|vendor)",
+        0.7, (("name", 1), ("role", 2))
+    ),
+    # Financial terms
+    EntityPattern(
+        "financial_terms", "financial_amount",
+        r"(?i)(purchase\s+price|down\s+payment|earnest\s+money|closing\s+costs):\s*\$?([\d,]+\.?\d*)",
+        0.9
+    ),
+    EntityPattern("financial_terms", "financial_amount", r"\$[\d,]+\.?\d*", 0.9),
+    EntityPattern("financial_terms", "financial_amount", r"(?i)(\d+\.?\d*)\s*percent|(\d+\.?\d*)%", 0.9),
+    # Dates
+    EntityPattern("dates", "date", r"\d{1,2}/\d{1,2}/\d{4}", 0.85),
+    EntityPattern("dates", "date", r"\d{1,2}-\d{1,2}-\d{4}", 0.85),
+    EntityPattern(
+        "dates", "date",
+        r"(?i)(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}",
+        0.85
+    ),
+    # Legal terms
+    EntityPattern(
+        "legal_terms", "legal_term",
+        r"(?i)(contingency|addendum|amendment|disclosure|warranty|covenant|lien|easement)",
+        0.75
+    ),
+    EntityPattern("legal_terms", "legal_term", r"(?i)(as[- ]is|subject\s+to|provided\s+that|notwithstanding)", 0.75),
+    # Addresses
+    EntityPattern(
+        "addresses", "address",
+        r"\d+\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd)",
+        0.8
+    ),
+    EntityPattern("addresses", "address", r"[A-Z][a-z]+,\s*[A-Z]{2}\s+\d{5}(-\d{4})?", 0.8),
+)
+
+ENTITY_CATEGORIES: Tuple[str, ...] = tuple(dict.fromkeys(p.category for p in ENTITY_PATTERNS))
+
+_WHITESPACE = re.compile(r"\s")
+
+
+class ExtractedEntity(NamedTuple):
+    """An entity found in a text."""
+    # A named tuple, which pickles at half the cost of a dataclass when
+    # worker processes return the entities of a chunk
+    category: str
+    entity_type: str
+    fields: Tuple[Tuple[str, Optional[str]], ...]
+    start: int
+    end: int
+    confidence: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.entity_type,
+            **dict(self.fields),
+            "start_pos": self.start,
+            "end_pos": self.end,
+            "confidence": self.confidence,
+        }
+
+
+class EntityScanner:
+    """Combined pattern for a set of entity categories."""
+
+    def __init__(self, categories: Optional[Iterable[str]] = None):
+        wanted = set(categories) if categories else set(ENTITY_CATEGORIES)
+        self.patterns = [p for p in ENTITY_PATTERNS if p.category in wanted]
+
+        alternatives = []
+        for index, entity_pattern in enumerate(self.patterns):
+            pattern = entity_pattern.pattern
+            # Pattern-wide inline flags become scoped to the pattern's group
+            if pattern.startswith("(?i)"):
+                pattern = f"(?i:{pattern[4:]})"
+            alternatives.append(f"(?P<p{index}>{pattern})")
+
+        self.regex = re.compile(f"(?<!\\w)(?:{'|'.join(alternatives)})") if alternatives else None
+
+    def scan(self, text: str, start: int = 0, end: Optional[int] = None,
+             stop: Optional[int] = None, offset: int = 0) -> Iterator[ExtractedEntity]:
+        """
+        Scan ``text[start:end]`` for entities.
+
+        Args:
+            text: Text to scan
+            start: Scan start
+            end: Scan end
+            stop: Only entities starting before this position are produced
+            offset: Added to positions of produced entities
+        """
+        if self.regex is None:
+            return
+        end = len(text) if end is None else end
+        stop = end if stop is None else stop
+
+        for match in self.regex.finditer(text, start, end):
+            if match.start() >= stop:
+                return
+            # The pattern's named group closes last; its own groups follow it
+            name = match.lastgroup
+            group = self.regex.groupindex[name]
+            entity_pattern = self.patterns[int(name[1:])]
+            yield ExtractedEntity(
+                entity_pattern.category,
+                entity_pattern.entity_type,
+                tuple((field_name, match.group(group + number)) for field_name, number in entity_pattern.fields),
+                match.start() + offset,
+                match.end() + offset,
+                entity_pattern.confidence
+            )
+
+
+# Scanners of the current (worker) process by category set
+_scanners: Dict[FrozenSet[str], EntityScanner] = {}
+
+
+def _get_scanner(categories: FrozenSet[str]) -> EntityScanner:
+    scanner = _scanners.get(categories)
+    if scanner is None:
+        scanner = _scanners[categories] = EntityScanner(categories)
+    return scanner
+
+
+def _resync(scanner: EntityScanner, text: str, entities: List[ExtractedEntity],
+            last_end: int, stop: int, scan_end: int) -> List[ExtractedEntity]:
+    """
+    Rescan a chunk from the end of the entity that crossed into it.
+
+    The rescan runs until it meets an entity of the worker's scan, from
+    where on both scans continue from the same position and agree.
+    """
+    positions = {(entity.start, entity.end): index for index, entity in enumerate(entities)}
+    resynced = []
+    for entity in scanner.scan(text, start=last_end, end=scan_end, stop=stop):
+        index = positions.get((entity.start, entity.end))
+        if index is not None and entities[index] == entity:
+            return resynced + entities[index:]
+        resynced.append(entity)
+    return resynced
+
+
+def _scan_chunk(categories: FrozenSet[str], chunk: str, stop: int, offset: int) -> List[ExtractedEntity]:
+    """Worker task: entities of a chunk starting before ``stop``."""
+    return list(_get_scanner(categories).scan(chunk, stop=stop, offset=offset))
+
+
+def _extract_document(categories: FrozenSet[str], text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Worker task: all entities of a document, grouped by category."""
+    return _group_by_category(_get_scanner(categories).scan(text), categories)
+
+
+def _group_by_category(entities: Iterable[ExtractedEntity], categories: FrozenSet[str]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {
+        category: [] for category in ENTITY_CATEGORIES if category in categories
+    }
+    for entity in entities:
+        grouped[entity.category].append(entity.to_dict())
+    return grouped
+
+
+class EntityExtractor:
+    """Entity extraction with process-parallel scanning of large texts."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = settings.ENTITY_EXTRACTION_WORKERS if max_workers is None else max_workers
+        self.chunk_chars = settings.ENTITY_EXTRACTION_CHUNK_CHARS
+        self.chunk_overlap = settings.ENTITY_EXTRACTION_CHUNK_OVERLAP
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def in_process(self) -> bool:
+        """
+        Whether all scanning happens in the calling process.
+
+        Daemonic processes such as Celery prefork workers cannot start a
+        pool; there the worker processes already provide the parallelism.
+        With a single CPU a pool only adds overhead.
+        """
+        return (
+            self.max_workers <= 0
+            or (os.cpu_count() or 1) < 2
+            or multiprocessing.current_process().daemon
+        )
+
+    def iter_entities(self, text: str, categories: Optional[Iterable[str]] = None) -> Iterator[ExtractedEntity]:
+        """
+        Produce the entities of a text in document order.
+
+        Args:
+            text: Text to scan
+            categories: Entity categories to extract (all if empty)
+        """
+        categories = frozenset(categories or ENTITY_CATEGORIES)
+        if len(text) <= self.chunk_chars or self.in_process:
+            yield from _get_scanner(categories).scan(text)
+            return
+
+        chunks = list(self._chunks(text))
+        futures = [
+            self._get_pool().submit(_scan_chunk, categories, text[start:scan_end], stop - start, start)
+            for start, stop, scan_end in chunks
+        ]
+        last_end = 0
+        try:
+            for (start, stop, scan_end), future in zip(chunks, futures):
+                entities = future.result()
+                if last_end > start:
+                    # An entity of the previous chunk runs into this one, so the
+                    # worker's scan from ``start`` may have matched inside it and
+                    # skipped past what a single pass finds after it
+                    entities = _resync(_get_scanner(categories), text, entities, last_end, stop, scan_end)
+                for entity in entities:
+                    last_end = entity.end
+                    yield entity
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def extract(self, text: str, categories: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract the entities of a text grouped by category.
+
+        Returns:
+            Dict[str, List[Dict]]: Entity dictionaries per category
+        """
+        categories = frozenset(categories or ENTITY_CATEGORIES)
+        return _group_by_category(self.iter_entities(text, categories), categories)
+
+    def extract_batch(self, texts: Iterable[str], categories: Optional[Iterable[str]] = None,
+                      batch_size: int = 32) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Extract many documents, e.g. when re-processing an archive.
+
+        Documents are distributed over the worker processes; results are
+        produced in input order.
+
+        Args:
+            texts: Document texts
+            categories: Entity categories to extract (all if empty)
+            batch_size: Documents sent to a worker at a time
+        """
+        categories = frozenset(categories or ENTITY_CATEGORIES)
+        if self.in_process:
+            for text in texts:
+                yield _extract_document(categories, text)
+            return
+
+        texts = iter(texts)
+        pending = []
+        # Keep a bounded number of documents in flight
+        window = max(1, self.max_workers) * batch_size * 2
+        pool = self._get_pool()
+        for text in texts:
+            pending.append(pool.submit(_extract_document, categories, text))
+            if len(pending) >= window:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _chunks(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, stop, scan end) of each chunk; chunks end at whitespace."""
+        start = 0
+        length = len(text)
+        while start < length:
+            stop = min(length, start + self.chunk_chars)
+            if stop < length:
+                boundary = _WHITESPACE.search(text, stop, min(length, stop + self.chunk_overlap))
+                if boundary:
+                    stop = boundary.start()
+            yield start, stop, min(length, stop + self.chunk_overlap)
+            start = stop
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+
+# Global entity extractor instance
+_entity_extractor: Optional[EntityExtractor] = None
+
+
+def get_entity_extractor() -> EntityExtractor:
+    """Get the global entity extractor."""
+    global _entity_extractor
+    if _entity_extractor is None:
+        _entity_extractor = EntityExtractor()
+    return _entity_extractor
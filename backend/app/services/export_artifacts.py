@@ -0,0 +1,399 @@
+"""
+Content-addressed storage for rendered contract exports.
+
+Rendered documents are stored under a key derived from a hash of what was
+rendered: the source content, the output format and the style options. An
+unchanged contract therefore maps to the same storage object on every
+export, and re-exporting it reuses that object instead of rendering and
+uploading again.
+
+Artifacts are reference counted in Redis. Each owner (e.g. a contract)
+references one artifact per format; when an owner moves to a new artifact
+the old one loses its reference. Artifacts without references are recorded
+with the time they became unreferenced and deleted by periodic garbage
+collection after a grace period, which also serves as the lifetime of
+artifacts rendered without an owner. A newly rendered artifact with an owner
+is referenced in the same Redis step that indexes it, and a failed reference
+fails the export, so an owner never records a storage key that garbage
+collection may delete. Artifacts are identified in Redis as
+``<format>:<hash>``.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, Union
+
+from ..core.config import get_settings
+from ..core.redis_config import get_redis_client
+from ..core.storage import StorageError, get_storage_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+REFS_KEY_PREFIX = "export_artifact:refs:"
+OWNER_KEY_PREFIX = "export_artifact:owner:"
+UNREFERENCED_KEY = "export_artifact:unreferenced"
+
+# Bump when the hash derivation changes
+ARTIFACT_HASH_VERSION = 1
+
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "html": "text/html",
+    "txt": "text/plain",
+}
+
+# Points an owner at an artifact and moves the previous artifact to the
+# unreferenced set once nothing references it. Returns the previous artifact.
+_ATTACH_SCRIPT = """
+local previous = redis.call('GET', KEYS[1])
+redis.call('SET', KEYS[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[2])
+if previous and previous ~= ARGV[2] then
+    local previous_refs = ARGV[4] .. previous
+    redis.call('SREM', previous_refs, ARGV[1])
+    if redis.call('SCARD', previous_refs) == 0 then
+        redis.call('ZADD', KEYS[3], ARGV[3], previous)
+    end
+end
+return previous or ''
+"""
+
+# Drops an owner's reference to its artifact, moving the artifact to the
+# unreferenced set once nothing references it. Returns the released artifact.
+_DETACH_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return ''
+end
+redis.call('DEL', KEYS[1])
+local refs = ARGV[3] .. current
+redis.call('SREM', refs, ARGV[1])
+if redis.call('SCARD', refs) == 0 then
+    redis.call('ZADD', KEYS[2], ARGV[2], current)
+end
+return current
+"""
+
+# Claims an unreferenced artifact for deletion unless it gained a reference
+_CLAIM_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+if redis.call('SCARD', KEYS[1]) > 0 then
+    return 0
+end
+return 1
+"""
+
+
+def compute_artifact_hash(
+    source: Union[str, bytes],
+    output_format: str,
+    style_options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Hash everything that determines a rendered document.
+
+    Args:
+        source: Content that is rendered
+        output_format: Output format (pdf, docx, ...)
+        style_options: Styling and layout options of the render
+
+    Returns:
+        str: Hex digest identifying the artifact
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    options = json.dumps(style_options or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+    digest = hashlib.sha256()
+    digest.update(f"{ARTIFACT_HASH_VERSION}|{output_format.lower()}|{options}|".encode())
+    digest.update(source)
+    return digest.hexdigest()
+
+
+class ExportArtifactStore:
+    """Content-addressed, reference-counted store of rendered exports."""
+
+    def __init__(self):
+        self.gc_grace_seconds = settings.EXPORT_ARTIFACT_GC_GRACE_SECONDS
+        self._attach_script = None
+        self._detach_script = None
+        self._claim_script = None
+
+    @staticmethod
+    def storage_key(artifact_hash: str, output_format: str) -> str:
+        """Storage key of an artifact."""
+        output_format = output_format.lower()
+        return f"artifacts/{output_format}/{artifact_hash[:2]}/{artifact_hash}.{output_format}"
+
+    # Lookup and storage
+
+    def lookup(self, artifact_hash: str, output_format: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a stored artifact.
+
+        Returns:
+            Optional[Dict]: Artifact record, or None if it is not stored
+        """
+        storage_key = self.storage_key(artifact_hash, output_format)
+        try:
+            metadata = get_storage_client().get_file_metadata(storage_key)
+        except StorageError:
+            return None
+        except Exception as e:
+            logger.warning(f"Export artifact lookup failed: {e}")
+            return None
+
+        self._touch(artifact_hash, output_format)
+        return {
+            "artifact_hash": artifact_hash,
+            "storage_key": storage_key,
+            "size": metadata["size"],
+            "mime_type": metadata.get("content_type") or MIME_TYPES.get(output_format.lower()),
+            "metadata": dict(metadata.get("metadata") or {}),
+        }
+
+    def fetch(self, artifact_hash: str, output_format: str) -> Optional[bytes]:
+        """Download a stored artifact, or None if it is not stored."""
+        try:
+            data = get_storage_client().download_file(self.storage_key(artifact_hash, output_format))
+        except StorageError:
+            return None
+        except Exception as e:
+            logger.warning(f"Export artifact download failed: {e}")
+            return None
+
+        self._touch(artifact_hash, output_format)
+        return data
+
+    def store(
+        self,
+        artifact_hash: str,
+        output_format: str,
+        content: Union[bytes, BinaryIO],
+        metadata: Optional[Dict[str, str]] = None,
+        owner: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload an artifact.
+
+        Without an ``owner`` the artifact starts out unreferenced; ``attach``
+        it to an owner to keep it beyond the garbage collection grace period.
+
+        Args:
+            owner: Owner referencing the artifact from the start
+
+        Returns:
+            Dict: Artifact record
+
+        Raises:
+            Exception: If the owner's reference could not be recorded
+        """
+        output_format = output_format.lower()
+        storage_key = self.storage_key(artifact_hash, output_format)
+        mime_type = MIME_TYPES.get(output_format, "application/octet-stream")
+        file_obj = io.BytesIO(content) if isinstance(content, bytes) else content
+        metadata = {"artifact_hash": artifact_hash, "format": output_format, **(metadata or {})}
+
+        result = get_storage_client().upload_file(file_obj, storage_key, mime_type, metadata)
+
+        if owner:
+            # Never enters the unreferenced set; if this fails the artifact
+            # is not indexed at all rather than collectable
+            self._reference(owner, output_format, artifact_hash)
+        else:
+            try:
+                artifact_id = _artifact_id(artifact_hash, output_format)
+                redis_client = get_redis_client()
+                if not redis_client.exists(f"{REFS_KEY_PREFIX}{artifact_id}"):
+                    redis_client.zadd(UNREFERENCED_KEY, {artifact_id: time.time()}, nx=True)
+            except Exception as e:
+                logger.debug(f"Export artifact index update failed: {e}")
+
+        return {
+            "artifact_hash": artifact_hash,
+            "storage_key": storage_key,
+            "size": result["size"],
+            "mime_type": mime_type,
+            "metadata": metadata,
+        }
+
+    def get_or_create(
+        self,
+        owner: Optional[str],
+        source: Union[str, bytes],
+        output_format: str,
+        style_options: Optional[Dict[str, Any]],
+        render: Callable[[], bytes],
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Reuse the stored artifact for ``source`` or render and store it.
+
+        Args:
+            owner: Owner to reference the artifact from, e.g. ``contract:12``
+            source: Content that is rendered
+            output_format: Output format
+            style_options: Styling and layout options of the render
+            render: Produces the document bytes on a miss
+            metadata: Storage metadata for a newly stored artifact; ``render``
+                may add entries, e.g. a page count, which are returned in the
+                record's ``metadata`` on later hits
+
+        Returns:
+            Tuple[Dict, bool]: Artifact record and whether it was reused
+
+        Raises:
+            Exception: If the owner's reference could not be recorded; the
+                storage key must then not be persisted by the caller
+        """
+        artifact_hash = compute_artifact_hash(source, output_format, style_options)
+
+        record = self.lookup(artifact_hash, output_format)
+        reused = record is not None
+        if record is None:
+            content = render()
+            record = self.store(artifact_hash, output_format, content, metadata, owner)
+        elif owner:
+            self._reference(owner, output_format, artifact_hash)
+        return record, reused
+
+    # References
+
+    def attach(self, owner: str, output_format: str, artifact_hash: str) -> Optional[str]:
+        """
+        Make ``artifact_hash`` the owner's current artifact for a format.
+
+        Returns:
+            Optional[str]: The owner's previous artifact hash
+        """
+        try:
+            return self._reference(owner, output_format, artifact_hash)
+        except Exception as e:
+            logger.warning(f"Failed to reference export artifact: {e}")
+            return None
+
+    def _reference(self, owner: str, output_format: str, artifact_hash: str) -> Optional[str]:
+        """Run the attach script; unlike ``attach``, failures are raised."""
+        artifact_id = _artifact_id(artifact_hash, output_format)
+        if self._attach_script is None:
+            self._attach_script = get_redis_client().register_script(_ATTACH_SCRIPT)
+        previous = self._attach_script(
+            keys=[
+                f"{OWNER_KEY_PREFIX}{owner}:{output_format.lower()}",
+                f"{REFS_KEY_PREFIX}{artifact_id}",
+                UNREFERENCED_KEY,
+            ],
+            args=[owner, artifact_id, time.time(), REFS_KEY_PREFIX]
+        )
+
+        if isinstance(previous, bytes):
+            previous = previous.decode()
+        return previous.split(":", 1)[1] if previous else None
+
+    def detach(self, owner: str, output_format: str) -> Optional[str]:
+        """
+        Release the owner's artifact for a format, e.g. when it is deleted.
+
+        The artifact itself is deleted by garbage collection once no other
+        owner references it.
+
+        Returns:
+            Optional[str]: The released artifact hash
+        """
+        try:
+            if self._detach_script is None:
+                self._detach_script = get_redis_client().register_script(_DETACH_SCRIPT)
+            released = self._detach_script(
+                keys=[f"{OWNER_KEY_PREFIX}{owner}:{output_format.lower()}", UNREFERENCED_KEY],
+                args=[owner, time.time(), REFS_KEY_PREFIX]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to release export artifact: {e}")
+            return None
+
+        if isinstance(released, bytes):
+            released = released.decode()
+        return released.split(":", 1)[1] if released else None
+
+    @staticmethod
+    def is_artifact_key(storage_key: str) -> bool:
+        """Whether a storage key belongs to the artifact store."""
+        return storage_key.startswith("artifacts/")
+
+    def _touch(self, artifact_hash: str, output_format: str):
+        """Restart the grace period of an unreferenced artifact that was used."""
+        try:
+            artifact_id = _artifact_id(artifact_hash, output_format)
+            get_redis_client().zadd(UNREFERENCED_KEY, {artifact_id: time.time()}, xx=True)
+        except Exception as e:
+            logger.debug(f"Export artifact index update failed: {e}")
+
+    # Garbage collection
+
+    def collect_garbage(self, grace_seconds: Optional[int] = None, limit: int = 500) -> Dict[str, Any]:
+        """
+        Delete artifacts that have been unreferenced for the grace period.
+
+        Args:
+            grace_seconds: Minimum unreferenced age (defaults to the configured grace)
+            limit: Maximum artifacts examined per run
+
+        Returns:
+            Dict: Collection statistics
+        """
+        grace = self.gc_grace_seconds if grace_seconds is None else grace_seconds
+        stats = {"examined": 0, "deleted": 0, "rereferenced": 0, "errors": []}
+
+        redis_client = get_redis_client()
+        if self._claim_script is None:
+            self._claim_script = redis_client.register_script(_CLAIM_SCRIPT)
+
+        candidates = redis_client.zrangebyscore(UNREFERENCED_KEY, "-inf", time.time() - grace, start=0, num=limit)
+        storage_client = get_storage_client()
+
+        for artifact_id in candidates:
+            if isinstance(artifact_id, bytes):
+                artifact_id = artifact_id.decode()
+            stats["examined"] += 1
+
+            claimed = self._claim_script(
+                keys=[f"{REFS_KEY_PREFIX}{artifact_id}", UNREFERENCED_KEY],
+                args=[artifact_id]
+            )
+            if not claimed:
+                stats["rereferenced"] += 1
+                continue
+
+            output_format, artifact_hash = artifact_id.split(":", 1)
+            storage_key = self.storage_key(artifact_hash, output_format)
+            try:
+                storage_client.delete_file(storage_key)
+                stats["deleted"] += 1
+            except StorageError as e:
+                stats["errors"].append(f"{storage_key}: {e}")
+
+        stats["collected_at"] = datetime.utcnow().isoformat()
+        return stats
+
+
+def _artifact_id(artifact_hash: str, output_format: str) -> str:
+    return f"{output_format.lower()}:{artifact_hash}"
+
+
+# Global artifact store instance
+_export_artifact_store: Optional[ExportArtifactStore] = None
+
+
+def get_export_artifact_store() -> ExportArtifactStore:
+    """Get the global export artifact store."""
+    global _export_artifact_store
+    if _export_artifact_store is None:
+        _export_artifact_store = ExportArtifactStore()
+    return _export_artifact_store
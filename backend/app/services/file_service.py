@@ -12,8 +12,11 @@ from typing import Optional, List, Dict, Any, BinaryIO, Tuple
 from sqlmodel import Session, select, and_, or_, func
 from fastapi import HTTPException, status
 
+from ..core.config import get_settings
 from ..core.storage import get_storage_client, StorageError, detect_file_type, validate_file_size
 from ..core.document_processor import get_document_processor, DocumentProcessingError
+from ..workers.document_worker import notify_jobs_available
+from .storage_quota import get_storage_quota_manager, QuotaExceededError, QuotaReservation
 from ..models.file import (
     File, FileCreate, FileUpdate, FilePublic, FileWithContent,
     FileUploadInitiate, FileUploadResponse, FileUploadComplete,
@@ -26,6 +29,7 @@ from ..models.user import User
 from ..models.audit_log import AuditLog, AuditAction
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class FileService:
@@ -40,6 +44,7 @@ class FileService:
         """Initialize file service."""
         self.storage_client = get_storage_client()
         self.document_processor = get_document_processor()
+        self.quota_manager = get_storage_quota_manager()
 
     async def initiate_upload(
         self,
@@ -66,74 +71,17 @@ class FileService:
                     detail="File size exceeds maximum allowed size"
                 )
 
-            # Check user quota
-            await self._check_user_quota(user.id, upload_request.file_size, session)
-
-            # Detect file type
-            file_type = detect_file_type(upload_request.filename, upload_request.mime_type)
-
-            # Generate storage key
-            storage_key = self.storage_client.generate_storage_key(
-                user.id,
-                upload_request.filename,
-                file_type
-            )
-
-            # Create file record
-            file_data = FileCreate(
-                filename=upload_request.filename,
-                file_type=file_type,
-                mime_type=upload_request.mime_type,
-                file_size=upload_request.file_size,
-                checksum=upload_request.checksum,
-                description=upload_request.description,
-                tags=upload_request.tags or [],
-                contract_id=upload_request.contract_id
-            )
-
-            file_record = File(
-                **file_data.dict(),
-                storage_path=f"s3://{self.storage_client._bucket_name}/{storage_key}",
-                storage_bucket=self.storage_client._bucket_name,
-                storage_key=storage_key,
-                uploaded_by=user.id,
-                status=FileStatus.UPLOADING
-            )
-
-            session.add(file_record)
-            session.commit()
-            session.refresh(file_record)
-
-            # Generate presigned upload URL
-            upload_url, upload_fields = self.storage_client.generate_presigned_upload_url(
-                storage_key,
-                upload_request.mime_type,
-                upload_request.file_size,
-                expires_in=3600  # 1 hour
-            )
-
-            # Log upload initiation
-            audit_log = AuditLog(
-                user_id=user.id,
-                actor=f"user:{user.id}",
-                action=AuditAction.FILE_UPLOAD_INITIATED,
-                success=True,
-                meta={
-                    "file_id": file_record.id,
-                    "filename": upload_request.filename,
-                    "file_size": upload_request.file_size,
-                    "file_type": file_type
-                }
-            )
-            session.add(audit_log)
-            session.commit()
-
-            return FileUploadResponse(
-                file_id=file_record.id,
-                upload_url=upload_url,
-                upload_fields=upload_fields,
-                expires_at=datetime.utcnow() + timedelta(hours=1)
-            )
+            # Reserve quota atomically; committed once the file record
+            # exists and cancelled if initiation fails
+            reservation = await self._reserve_user_quota(user.id, upload_request.file_size, session)
+            try:
+                response = await self._create_upload(upload_request, user, session)
+            except Exception:
+                session.rollback()
+                self.quota_manager.cancel(session, reservation)
+                raise
+            self.quota_manager.commit(session, reservation)
+            return response
 
         except HTTPException:
             raise
@@ -144,6 +92,79 @@ class FileService:
                 detail="Failed to initiate upload"
             )
 
+    async def _create_upload(
+        self,
+        upload_request: FileUploadInitiate,
+        user: User,
+        session: Session
+    ) -> FileUploadResponse:
+        """Create the file record and presigned URL for a reserved upload."""
+        # Detect file type
+        file_type = detect_file_type(upload_request.filename, upload_request.mime_type)
+
+        # Generate storage key
+        storage_key = self.storage_client.generate_storage_key(
+            user.id,
+            upload_request.filename,
+            file_type
+        )
+
+        # Create file record
+        file_data = FileCreate(
+            filename=upload_request.filename,
+            file_type=file_type,
+            mime_type=upload_request.mime_type,
+            file_size=upload_request.file_size,
+            checksum=upload_request.checksum,
+            description=upload_request.description,
+            tags=upload_request.tags or [],
+            contract_id=upload_request.contract_id
+        )
+
+        file_record = File(
+            **file_data.dict(),
+            storage_path=f"s3://{self.storage_client._bucket_name}/{storage_key}",
+            storage_bucket=self.storage_client._bucket_name,
+            storage_key=storage_key,
+            uploaded_by=user.id,
+            status=FileStatus.UPLOADING
+        )
+
+        session.add(file_record)
+        session.commit()
+        session.refresh(file_record)
+
+        # Generate presigned upload URL
+        upload_url, upload_fields = self.storage_client.generate_presigned_upload_url(
+            storage_key,
+            upload_request.mime_type,
+            upload_request.file_size,
+            expires_in=settings.UPLOAD_URL_EXPIRY_SECONDS
+        )
+
+        # Log upload initiation
+        audit_log = AuditLog(
+            user_id=user.id,
+            actor=f"user:{user.id}",
+            action=AuditAction.FILE_UPLOAD_INITIATED,
+            success=True,
+            meta={
+                "file_id": file_record.id,
+                "filename": upload_request.filename,
+                "file_size": upload_request.file_size,
+                "file_type": file_type
+            }
+        )
+        session.add(audit_log)
+        session.commit()
+
+        return FileUploadResponse(
+            file_id=file_record.id,
+            upload_url=upload_url,
+            upload_fields=upload_fields,
+            expires_at=datetime.utcnow() + timedelta(seconds=settings.UPLOAD_URL_EXPIRY_SECONDS)
+        )
+
     async def complete_upload(
         self,
         completion_request: FileUploadComplete,
@@ -186,6 +207,12 @@ class FileService:
 
             # Verify file exists in storage
             if not self.storage_client.file_exists(file_record.storage_key):
+                # The upload failed: give back the quota it was holding
+                self.quota_manager.release(session, user.id, file_record.file_size)
+                file_record.status = FileStatus.DELETED
+                file_record.updated_at = datetime.utcnow()
+                session.add(file_record)
+                session.commit()
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="File not found in storage"
@@ -194,17 +221,18 @@ class FileService:
             # Get file metadata from storage
             storage_metadata = self.storage_client.get_file_metadata(file_record.storage_key)
 
-            # Verify file size matches
+            # Confirm the reservation, correcting it if the stored size differs
             if storage_metadata['size'] != file_record.file_size:
                 logger.warning(f"File size mismatch for file {file_record.id}")
+                self.quota_manager.adjust(
+                    session, user.id, storage_metadata['size'] - file_record.file_size
+                )
+                file_record.file_size = storage_metadata['size']
 
             # Update file status
             file_record.status = FileStatus.UPLOADED
             file_record.updated_at = datetime.utcnow()
 
-            # Update user quota
-            await self._update_user_quota(user.id, file_record.file_size, 1, session)
-
             session.add(file_record)
             session.commit()
             session.refresh(file_record)
@@ -282,7 +310,7 @@ class FileService:
             # Generate download URL
             download_url = self.storage_client.generate_presigned_download_url(
                 file_record.storage_key,
-                expires_in=3600,  # 1 hour
+                expires_in=settings.UPLOAD_URL_EXPIRY_SECONDS,
                 filename=file_record.filename
             )
 
@@ -302,7 +330,7 @@ class FileService:
 
             return FileDownloadResponse(
                 download_url=download_url,
-                expires_at=datetime.utcnow() + timedelta(hours=1),
+                expires_at=datetime.utcnow() + timedelta(seconds=settings.UPLOAD_URL_EXPIRY_SECONDS),
                 filename=file_record.filename,
                 file_size=file_record.file_size,
                 mime_type=file_record.mime_type
@@ -460,12 +488,11 @@ class FileService:
                 logger.warning(f"Storage deletion failed for file {file_id}: {e}")
                 # Continue with database deletion even if storage fails
 
-            # Update user quota
-            await self._update_user_quota(
+            # Release user quota
+            self.quota_manager.release(
+                session,
                 file_record.uploaded_by,
-                -file_record.file_size,
-                -1,
-                session
+                file_record.file_size
             )
 
             # Mark as deleted in database
@@ -515,24 +542,7 @@ class FileService:
             StorageQuotaPublic: Quota information
         """
         try:
-            # Get or create quota record
-            quota = session.exec(
-                select(StorageQuota).where(StorageQuota.user_id == user_id)
-            ).first()
-
-            if not quota:
-                quota = StorageQuota(user_id=user_id)
-                session.add(quota)
-                session.commit()
-                session.refresh(quota)
-
-            return StorageQuotaPublic(
-                user_id=quota.user_id,
-                max_storage_bytes=quota.max_storage_bytes,
-                max_files=quota.max_files,
-                used_storage_bytes=quota.used_storage_bytes,
-                used_files=quota.used_files
-            )
+            return self.quota_manager.get_usage(session, user_id)
 
         except Exception as e:
             logger.error(f"Get user quota failed: {e}")
@@ -541,50 +551,21 @@ class FileService:
                 detail="Failed to get quota information"
             )
 
-    async def _check_user_quota(
+    async def _reserve_user_quota(
         self,
         user_id: int,
         additional_bytes: int,
         session: Session
-    ):
-        """Check if user has sufficient quota for upload."""
-        quota = await self.get_user_quota(user_id, session)
-
-        if quota.used_storage_bytes + additional_bytes > quota.max_storage_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="Storage quota exceeded"
-            )
-
-        if quota.used_files + 1 > quota.max_files:
+    ) -> QuotaReservation:
+        """Reserve quota for an upload, failing if it does not fit."""
+        try:
+            return self.quota_manager.reserve(session, user_id, additional_bytes)
+        except QuotaExceededError as e:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="File count quota exceeded"
+                detail=str(e)
             )
 
-    async def _update_user_quota(
-        self,
-        user_id: int,
-        bytes_delta: int,
-        files_delta: int,
-        session: Session
-    ):
-        """Update user quota usage."""
-        quota = session.exec(
-            select(StorageQuota).where(StorageQuota.user_id == user_id)
-        ).first()
-
-        if not quota:
-            quota = StorageQuota(user_id=user_id)
-            session.add(quota)
-
-        quota.used_storage_bytes = max(0, quota.used_storage_bytes + bytes_delta)
-        quota.used_files = max(0, quota.used_files + files_delta)
-        quota.updated_at = datetime.utcnow()
-
-        session.add(quota)
-        session.commit()
-
     async def _check_file_access(
         self,
         file_record: File,
@@ -635,6 +616,9 @@ class FileService:
             session.add(file_record)
             session.commit()
 
+            # Wake document workers instead of waiting for their next poll
+            notify_jobs_available()
+
             logger.info(f"Scheduled processing for file {file_record.id}")
 
         except Exception as e:
@@ -0,0 +1,359 @@
+"""
+BM25 retrieval over knowledge base content.
+
+Help articles, clauses, legal requirements and other knowledge snippets are
+tokenized into lowercase, lightly stemmed terms without stop words. Term
+frequencies live in a SciPy sparse matrix with one column per term, so a
+query only touches the postings of its own terms: the BM25 contribution of
+each posting is computed with NumPy and summed per document with
+``bincount``.
+
+The index is built once when the knowledge data is loaded. Documents added
+later go to a small tail that is searched alongside the matrix and merged
+into it once it grows past ``merge_threshold``; removed and replaced
+documents are masked out until the next merge. Document frequencies and
+lengths are kept current on every change, so scores always match those of
+a freshly built index. Query results are cached until the index changes.
+
+NumPy and SciPy are imported when the first index is created, not when
+this module is, since the knowledge base is reachable from API startup.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..core.config import get_settings
+from ..core.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+sparse = lazy_import("scipy.sparse")
+
+settings = get_settings()
+
+# Okapi BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset(
+    "a about an and are as at be been but by can could do does for from had has have how i if in into "
+    "is it its me my of on or our so than that the their them then there these they this to was we "
+    "what when where which who why with would you your".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    """Fold plurals, so "contingencies" matches "contingency"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Search terms of a text."""
+    return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    """Search terms of a text with their frequencies."""
+    counts: Dict[str, int] = {}
+    for token, count in Counter(_TOKEN.findall(text.lower())).items():
+        if token not in STOP_WORDS:
+            term = _stem(token)
+            counts[term] = counts.get(term, 0) + count
+    return counts
+
+
+@dataclass
+class SearchDocument:
+    """A searchable knowledge snippet."""
+    doc_id: str
+    kind: str
+    title: str
+    content: str
+    source: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return f"{self.title}\n{self.content}" if self.title else self.content
+
+
+class SearchHit(NamedTuple):
+    document: SearchDocument
+    score: float
+
+
+class SearchResults(NamedTuple):
+    hits: Tuple[SearchHit, ...]
+    # Documents matching any query term
+    total: int
+
+
+def _resized(array: "np.ndarray", size: int) -> "np.ndarray":
+    resized = np.zeros(size, dtype=array.dtype)
+    resized[:len(array)] = array[:size]
+    return resized
+
+
+class BM25Index:
+    """Incrementally updatable BM25 index with cached top-k queries."""
+
+    def __init__(
+        self,
+        documents: Iterable[SearchDocument] = (),
+        k1: float = K1,
+        b: float = B,
+        cache_size: Optional[int] = None,
+        merge_threshold: int = 1024
+    ):
+        """
+        Args:
+            documents: Initial documents
+            k1: Term frequency saturation
+            b: Document length normalization
+            cache_size: Query results kept until the index changes
+            merge_threshold: Added and removed documents held outside the
+                matrix before it is rebuilt
+        """
+        self.k1 = k1
+        self.b = b
+        self.cache_size = cache_size or settings.KNOWLEDGE_SEARCH_CACHE_SIZE
+        self.merge_threshold = merge_threshold
+        self._lock = threading.Lock()
+
+        self._vocabulary: Dict[str, int] = {}
+        self._kinds: Dict[str, int] = {}
+        # Row -> document; None once removed
+        self._documents: List[Optional[SearchDocument]] = []
+        self._rows: Dict[str, int] = {}
+        self._lengths = np.zeros(0)
+        self._kind_codes = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._df = np.zeros(0)
+        self._total_length = 0.0
+        self._removed = 0
+
+        # Rows below matrix.shape[0] are in the matrix, later rows in the tail
+        self._matrix = sparse.csc_matrix((0, 0))
+        self._tail: Dict[int, Dict[int, int]] = {}
+
+        self._cache: "OrderedDict[Tuple, SearchResults]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        self.add(documents)
+        self._merge()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def add(self, documents: Iterable[SearchDocument]) -> int:
+        """
+        Add documents, replacing those with the same ``doc_id``.
+
+        Returns:
+            int: Number of documents added
+        """
+        added = 0
+        with self._lock:
+            for document in documents:
+                if document.doc_id in self._rows:
+                    self._remove(document.doc_id)
+                self._add(document)
+                added += 1
+            if added:
+                self._changed()
+        return added
+
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        """
+        Remove documents by id; unknown ids are ignored.
+
+        Returns:
+            int: Number of documents removed
+        """
+        removed = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                if doc_id in self._rows:
+                    self._remove(doc_id)
+                    removed += 1
+            if removed:
+                self._changed()
+        return removed
+
+    def get(self, doc_id: str) -> Optional[SearchDocument]:
+        row = self._rows.get(doc_id)
+        return self._documents[row] if row is not None else None
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = 10,
+        kinds: Optional[Sequence[str]] = None
+    ) -> SearchResults:
+        """
+        Rank documents against a free-text query.
+
+        Args:
+            query: Query text
+            limit: Maximum hits returned; None for every matching document
+            kinds: Only search documents of these kinds
+
+        Returns:
+            SearchResults: Hits by descending score, and the number of
+            matching documents
+        """
+        terms = tuple(sorted(set(tokenize(query))))
+        key = (terms, limit, tuple(sorted(kinds)) if kinds else None)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+            results = self._search(terms, limit, key[2])
+            self._cache[key] = results
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return results
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._rows),
+                "terms": len(self._vocabulary),
+                "tail": len(self._tail),
+                "entries": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+    def _changed(self) -> None:
+        if len(self._tail) + self._removed > self.merge_threshold:
+            self._merge()
+        self._cache.clear()
+
+    def _add(self, document: SearchDocument) -> None:
+        terms = term_counts(document.text)
+        length = sum(terms.values())
+        counts: Dict[int, int] = {}
+        for term, count in terms.items():
+            column = self._vocabulary.setdefault(term, len(self._vocabulary))
+            counts[column] = count
+
+        row = len(self._documents)
+        if row >= len(self._lengths):
+            capacity = max(64, 2 * len(self._lengths))
+            self._lengths = _resized(self._lengths, capacity)
+            self._kind_codes = _resized(self._kind_codes, capacity)
+            self._alive = _resized(self._alive, capacity)
+        if len(self._vocabulary) > len(self._df):
+            self._df = _resized(self._df, max(256, 2 * len(self._df), len(self._vocabulary)))
+
+        self._documents.append(document)
+        self._rows[document.doc_id] = row
+        self._lengths[row] = length
+        self._kind_codes[row] = self._kinds.setdefault(document.kind, len(self._kinds))
+        self._alive[row] = True
+        self._df[list(counts)] += 1
+        self._total_length += length
+        self._tail[row] = counts
+
+    def _remove(self, doc_id: str) -> None:
+        row = self._rows.pop(doc_id)
+        document = self._documents[row]
+        columns = [self._vocabulary[term] for term in term_counts(document.text)]
+        self._df[columns] -= 1
+        self._total_length -= self._lengths[row]
+        self._alive[row] = False
+        self._documents[row] = None
+        if self._tail.pop(row, None) is None:
+            # Still in the matrix until the next merge
+            self._removed += 1
+
+    def _merge(self) -> None:
+        """Rebuild the matrix from its live rows and the tail."""
+        count = len(self._documents)
+        keep = np.flatnonzero(self._alive[:count])
+        matrix_rows = self._matrix.shape[0]
+
+        kept = self._matrix.tocsr()[keep[keep < matrix_rows]].tocoo()
+        rows = [kept.row]
+        columns = [kept.col]
+        data = [kept.data]
+        offset = kept.shape[0]
+        for position, row in enumerate(keep[keep >= matrix_rows]):
+            counts = self._tail[row]
+            rows.append(np.full(len(counts), offset + position))
+            columns.append(np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)))
+            data.append(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+
+        self._matrix = sparse.csc_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(len(keep), len(self._vocabulary))
+        )
+        self._documents = [self._documents[row] for row in keep]
+        self._rows = {document.doc_id: row for row, document in enumerate(self._documents)}
+        self._lengths = self._lengths[keep]
+        self._kind_codes = self._kind_codes[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._tail = {}
+        self._removed = 0
+
+    def _search(self, terms: Tuple[str, ...], limit: Optional[int], kinds: Optional[Tuple[str, ...]]) -> SearchResults:
+        live = len(self._rows)
+        columns = np.array([self._vocabulary[term] for term in terms if term in self._vocabulary], dtype=np.int64)
+        if live == 0 or len(columns) == 0:
+            return SearchResults((), 0)
+
+        df = self._df[columns]
+        idf = np.log1p((live - df + 0.5) / (df + 0.5))
+        average_length = self._total_length / live
+        k1, b = self.k1, self.b
+
+        count = len(self._documents)
+        scores = np.zeros(count)
+        in_matrix = columns < self._matrix.shape[1]
+        if in_matrix.any():
+            postings = self._matrix[:, columns[in_matrix]]
+            rows = postings.indices
+            tf = postings.data
+            weights = np.repeat(idf[in_matrix], np.diff(postings.indptr))
+            norm = k1 * (1 - b + b * self._lengths[rows] / average_length)
+            scores += np.bincount(rows, weights=weights * tf * (k1 + 1) / (tf + norm), minlength=count)
+        for row, counts in self._tail.items():
+            norm = k1 * (1 - b + b * self._lengths[row] / average_length)
+            for column, weight in zip(columns.tolist(), idf.tolist()):
+                tf = counts.get(column)
+                if tf:
+                    scores[row] += weight * tf * (k1 + 1) / (tf + norm)
+
+        mask = self._alive[:count]
+        if kinds:
+            codes = [self._kinds[kind] for kind in kinds if kind in self._kinds]
+            mask = mask & np.isin(self._kind_codes[:count], codes)
+        scores[~mask] = 0.0
+
+        matched = np.flatnonzero(scores > 0)
+        top = matched
+        if limit is not None and len(matched) > limit:
+            top = matched[np.argpartition(-scores[matched], limit - 1)[:limit]] if limit > 0 else matched[:0]
+        # Highest score first, earlier documents first on ties
+        top = top[np.lexsort((top, -scores[top]))]
+        hits = tuple(SearchHit(self._documents[row], float(scores[row])) for row in top)
+        return SearchResults(hits, len(matched))
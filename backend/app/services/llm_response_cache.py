@@ -0,0 +1,248 @@
+"""
+Content-addressed cache for LLM responses.
+
+Deterministic model requests (temperature 0, no streaming) are keyed on a
+hash of their normalized messages, system prompt, model, temperature,
+max_tokens and tools. Responses are kept in a bounded in-memory LRU tier
+and a Redis tier shared across processes, both with a TTL.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+import structlog
+
+from ..core.config import get_settings
+from ..core.redis_config import get_redis_client
+
+if TYPE_CHECKING:
+    from .model_router import ModelRequest, ModelResponse
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+CACHE_KEY_PREFIX = "llm:response:"
+
+# Bump when the key derivation or stored format changes
+CACHE_KEY_VERSION = 1
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    """Normalize prompt text so formatting-only differences share a key."""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n")
+    return _TRAILING_WHITESPACE.sub("", text).strip()
+
+
+class LLMResponseCache:
+    """
+    Two-tier LLM response cache with hit-rate metrics.
+
+    The memory tier is bounded by entry count and total size; the Redis tier
+    relies on per-entry TTLs. Entries larger than the per-entry limit are
+    never cached.
+    """
+
+    def __init__(self):
+        self.enabled = settings.LLM_RESPONSE_CACHE_ENABLED
+        self.ttl_seconds = settings.LLM_RESPONSE_CACHE_TTL
+        self.max_entries = settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+        self.max_memory_bytes = settings.LLM_RESPONSE_CACHE_MAX_MEMORY_BYTES
+        self.max_entry_bytes = settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES
+
+        # key -> (expires_at, serialized response)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            "lookups": 0,
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "skipped": 0,
+            "saved_cost": 0.0,
+            "saved_tokens": 0,
+        }
+
+    # Keys
+
+    def is_cacheable(self, request: "ModelRequest") -> bool:
+        """Whether a request is deterministic and allowed to use the cache."""
+        return (
+            self.enabled
+            and request.cache
+            and not request.stream
+            and request.temperature == 0
+        )
+
+    def make_key(self, request: "ModelRequest", model_id: str) -> str:
+        """
+        Build the content address for a request.
+
+        Args:
+            request: Model request
+            model_id: Model that will serve the request
+
+        Returns:
+            str: Cache key
+        """
+        payload = {
+            "v": CACHE_KEY_VERSION,
+            "model": model_id,
+            "system": _normalize_text(request.system_prompt),
+            "messages": [
+                [str(message.get("role", "")).lower(), _normalize_text(message.get("content"))]
+                for message in request.messages
+            ],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "tools": request.tools or [],
+        }
+        digest = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()
+        return f"{CACHE_KEY_PREFIX}{digest}"
+
+    # Lookups
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Optional[Dict]: Serialized ModelResponse fields, or None on a miss
+        """
+        self.metrics["lookups"] += 1
+
+        serialized = self._memory_get(key)
+        if serialized is not None:
+            self.metrics["memory_hits"] += 1
+            return self._record_hit(serialized)
+
+        serialized = self._persistent_get(key)
+        if serialized is not None:
+            self.metrics["persistent_hits"] += 1
+            self._memory_set(key, serialized)
+            return self._record_hit(serialized)
+
+        self.metrics["misses"] += 1
+        return None
+
+    def set(self, key: str, response: "ModelResponse"):
+        """Store a response in both tiers."""
+        data = asdict(response)
+        data["provider"] = response.provider.value
+        serialized = json.dumps(data, default=str)
+
+        if len(serialized) > self.max_entry_bytes:
+            self.metrics["skipped"] += 1
+            return
+
+        self._memory_set(key, serialized)
+        self._persistent_set(key, serialized)
+        self.metrics["stores"] += 1
+
+    def record_skip(self):
+        """Count a request that bypassed the cache."""
+        self.metrics["skipped"] += 1
+
+    def clear(self):
+        """Drop the in-memory tier."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics including hit rate."""
+        hits = self.metrics["memory_hits"] + self.metrics["persistent_hits"]
+        lookups = self.metrics["lookups"]
+        return {
+            **self.metrics,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "enabled": self.enabled,
+        }
+
+    def _record_hit(self, serialized: str) -> Dict[str, Any]:
+        data = json.loads(serialized)
+        self.metrics["saved_cost"] += data.get("cost", 0.0)
+        self.metrics["saved_tokens"] += data.get("token_usage", {}).get("total_tokens", 0)
+        return data
+
+    # Memory tier
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, serialized = entry
+            if expires_at < time.monotonic():
+                self._memory_remove(key)
+                return None
+            self._memory.move_to_end(key)
+            return serialized
+
+    def _memory_set(self, key: str, serialized: str):
+        with self._lock:
+            if key in self._memory:
+                self._memory_remove(key)
+            self._memory[key] = (time.monotonic() + self.ttl_seconds, serialized)
+            self._memory_bytes += len(serialized)
+
+            while self._memory and (
+                len(self._memory) > self.max_entries
+                or self._memory_bytes > self.max_memory_bytes
+            ):
+                oldest = next(iter(self._memory))
+                self._memory_remove(oldest)
+                self.metrics["evictions"] += 1
+
+    def _memory_remove(self, key: str):
+        """Remove a memory entry; caller holds the lock."""
+        _, serialized = self._memory.pop(key)
+        self._memory_bytes -= len(serialized)
+
+    # Persistent tier
+
+    def _persistent_get(self, key: str) -> Optional[str]:
+        try:
+            raw = get_redis_client().get(key)
+        except Exception as e:
+            logger.debug("LLM response cache read failed", error=str(e))
+            return None
+        if raw is None:
+            return None
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    def _persistent_set(self, key: str, serialized: str):
+        try:
+            get_redis_client().set(key, serialized, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.debug("LLM response cache write failed", error=str(e))
+
+
+# Global response cache instance
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the global LLM response cache instance."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache()
+    return _llm_response_cache
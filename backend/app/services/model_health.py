@@ -0,0 +1,218 @@
+"""
+Real-time model health tracking for routing decisions.
+
+Tracks exponentially weighted moving averages (EWMA) of latency, output
+tokens per second and error rate per model, and runs a circuit breaker per
+model:
+
+- CLOSED: requests flow normally;
+- OPEN: after consecutive failures the model is skipped for a cooldown;
+- HALF_OPEN: after the cooldown a single probe request is let through; its
+  outcome closes or re-opens the circuit.
+
+The tracker also estimates the expected completion time of a request on a
+model, which the latency-optimized routing strategy minimizes.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Optional
+
+import structlog
+
+from ..core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Throughput assumed for a model before any samples exist, scaled by its
+# static performance score
+DEFAULT_TOKENS_PER_SECOND = 40.0
+
+
+class CircuitOpenError(Exception):
+    """Raised when a model's circuit breaker rejects a request."""
+    pass
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class ModelStats:
+    """Rolling health statistics for one model."""
+    ewma_latency: Optional[float] = None
+    ewma_tokens_per_second: Optional[float] = None
+    ewma_error_rate: float = 0.0
+    samples: int = 0
+    consecutive_failures: int = 0
+    state: CircuitState = CircuitState.CLOSED
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ewma_latency": self.ewma_latency,
+            "ewma_tokens_per_second": self.ewma_tokens_per_second,
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "samples": self.samples,
+            "consecutive_failures": self.consecutive_failures,
+            "circuit_state": self.state.value,
+        }
+
+
+class ModelHealthTracker:
+    """EWMA statistics and circuit breakers per model."""
+
+    def __init__(self):
+        self.alpha = settings.MODEL_ROUTER_EWMA_ALPHA
+        self.failure_threshold = settings.MODEL_ROUTER_BREAKER_FAILURE_THRESHOLD
+        self.cooldown_seconds = settings.MODEL_ROUTER_BREAKER_COOLDOWN
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model_id: str) -> ModelStats:
+        stats = self._stats.get(model_id)
+        if stats is None:
+            stats = self._stats[model_id] = ModelStats()
+        return stats
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else self.alpha * sample + (1 - self.alpha) * current
+
+    # Circuit breaker
+
+    def allow_request(self, model_id: str, claim_probe: bool = False) -> bool:
+        """
+        Whether a model may receive a request.
+
+        Args:
+            model_id: Model ID
+            claim_probe: Reserve the half-open probe slot if this check lets
+                the probe through (set when the request will actually be sent)
+        """
+        with self._lock:
+            stats = self._get(model_id)
+
+            if stats.state == CircuitState.CLOSED:
+                return True
+
+            if stats.state == CircuitState.OPEN:
+                if time.monotonic() - stats.opened_at < self.cooldown_seconds:
+                    return False
+                stats.state = CircuitState.HALF_OPEN
+                stats.probe_in_flight = False
+                logger.info("Circuit half-open, probing model", model_id=model_id)
+
+            # Half-open: exactly one probe at a time
+            if stats.probe_in_flight:
+                return False
+            if claim_probe:
+                stats.probe_in_flight = True
+            return True
+
+    def release_probe(self, model_id: str):
+        """Give back a claimed probe slot when the request was never sent."""
+        with self._lock:
+            self._get(model_id).probe_in_flight = False
+
+    def record_success(self, model_id: str, latency: float, completion_tokens: int = 0):
+        """Record a successful request."""
+        with self._lock:
+            stats = self._get(model_id)
+            stats.samples += 1
+            stats.ewma_latency = self._ewma(stats.ewma_latency, latency)
+            if completion_tokens and latency > 0:
+                stats.ewma_tokens_per_second = self._ewma(
+                    stats.ewma_tokens_per_second, completion_tokens / latency
+                )
+            stats.ewma_error_rate = self._ewma(stats.ewma_error_rate, 0.0)
+            stats.consecutive_failures = 0
+
+            if stats.state != CircuitState.CLOSED:
+                logger.info("Circuit closed", model_id=model_id)
+            stats.state = CircuitState.CLOSED
+            stats.probe_in_flight = False
+
+    def record_failure(self, model_id: str, trip: bool = True):
+        """
+        Record a failed request.
+
+        Args:
+            model_id: Model ID
+            trip: Count towards opening the circuit (False for rate limiting,
+                which is saturation rather than an outage)
+        """
+        with self._lock:
+            stats = self._get(model_id)
+            stats.samples += 1
+            stats.ewma_error_rate = self._ewma(stats.ewma_error_rate, 1.0)
+            if not trip:
+                stats.probe_in_flight = False
+                return
+
+            stats.consecutive_failures += 1
+            if stats.state == CircuitState.HALF_OPEN or stats.consecutive_failures >= self.failure_threshold:
+                if stats.state != CircuitState.OPEN:
+                    logger.warning(
+                        "Circuit opened",
+                        model_id=model_id,
+                        consecutive_failures=stats.consecutive_failures
+                    )
+                stats.state = CircuitState.OPEN
+                stats.opened_at = time.monotonic()
+            stats.probe_in_flight = False
+
+    # Estimates
+
+    def expected_completion_time(self, model_id: str, max_tokens: int,
+                                 performance_score: float = 1.0) -> float:
+        """
+        Estimate seconds to complete a request, including expected retries.
+
+        Args:
+            model_id: Model ID
+            max_tokens: Requested completion token budget
+            performance_score: Static score used before samples exist
+        """
+        with self._lock:
+            stats = self._get(model_id)
+            if stats.ewma_tokens_per_second:
+                estimate = max_tokens / stats.ewma_tokens_per_second
+            elif stats.ewma_latency is not None:
+                estimate = stats.ewma_latency
+            else:
+                estimate = max_tokens / (DEFAULT_TOKENS_PER_SECOND * max(performance_score, 0.1))
+            error_rate = min(stats.ewma_error_rate, 0.95)
+
+        return estimate / (1.0 - error_rate)
+
+    def hedge_delay(self, model_id: str, default: float) -> float:
+        """Delay before hedging a request: 1.5x the model's typical latency, or the default."""
+        with self._lock:
+            stats = self._stats.get(model_id)
+            if stats is None or stats.ewma_latency is None:
+                return default
+            return max(0.1, 1.5 * stats.ewma_latency)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {model_id: stats.to_dict() for model_id, stats in self._stats.items()}
+
+
+# Global health tracker instance
+_model_health_tracker: Optional[ModelHealthTracker] = None
+
+
+def get_model_health_tracker() -> ModelHealthTracker:
+    """Get the global model health tracker."""
+    global _model_health_tracker
+    if _model_health_tracker is None:
+        _model_health_tracker = ModelHealthTracker()
+    return _model_health_tracker
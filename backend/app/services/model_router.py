@@ -7,25 +7,39 @@ fallback mechanisms, and cost optimization.
 """
 
 import asyncio
+import json
 import logging
 import time
-from typing import Dict, Any, List, Optional, Union, AsyncGenerator
+import weakref
+from typing import Dict, Any, List, Optional, Union, AsyncGenerator, Callable
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 
 import httpx
 import structlog
-from openai import OpenAI, AsyncOpenAI
-from anthropic import Anthropic, AsyncAnthropic
 
 from ..core.config import get_settings
 from ..core.ai_agent_logging import get_ai_agent_logger, log_llm_interaction
+from .llm_response_cache import get_llm_response_cache
+from .model_health import CircuitOpenError, get_model_health_tracker
+from .provider_limiter import (
+    AdmissionTimeout,
+    get_admission_controller,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
 
 logger = structlog.get_logger(__name__)
 ai_logger = get_ai_agent_logger(__name__)
 settings = get_settings()
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class ModelProvider(Enum):
     """Available model providers."""
@@ -40,6 +54,7 @@ class RoutingStrategy(Enum):
     COST_OPTIMIZED = "cost_optimized"
     PERFORMANCE = "performance"
     BALANCED = "balanced"
+    LATENCY_OPTIMIZED = "latency_optimized"
 
 
 @dataclass
@@ -66,6 +81,8 @@ class ModelRequest:
     stream: bool = False
     tools: Optional[List[Dict[str, Any]]] = None
     system_prompt: Optional[str] = None
+    cache: bool = True  # Set False to always call the provider
+    latency_critical: bool = False  # Hedge on a second model if the first is slow
 
 
 @dataclass
@@ -80,6 +97,44 @@ class ModelResponse:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class StreamChunk:
+    """Incremental output of a streamed model response."""
+    delta: str
+    model_used: str
+    index: int
+    response: Optional[ModelResponse] = None  # Set on the final chunk only
+
+    @property
+    def done(self) -> bool:
+        return self.response is not None
+
+
+class _LoopLocalClient:
+    """
+    Async provider client attribute with one instance per event loop.
+
+    HTTP connection pools belong to the event loop that opened them, so the
+    API loop and the agent loop each get their own long-lived client with
+    keep-alive connections, closed when that loop shuts down. Assigning the
+    attribute pins one instance for every loop (used by tests).
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, router: "ModelRouter", owner=None):
+        if router is None:
+            return self
+        return router._async_client(self.name)
+
+    def __set__(self, router: "ModelRouter", value):
+        router._client_overrides[self.name] = value
+
+    def __delete__(self, router: "ModelRouter"):
+        router._client_overrides.pop(self.name, None)
+
+
 class ModelRouter:
     """
     Unified model router for AI inference requests.
@@ -88,6 +143,11 @@ class ModelRouter:
     across multiple AI model providers.
     """
 
+    openrouter_async_client = _LoopLocalClient()
+    openai_async_client = _LoopLocalClient()
+    anthropic_async_client = _LoopLocalClient()
+    ollama_client = _LoopLocalClient()
+
     def __init__(self):
         self.settings = get_settings()
         self.strategy = RoutingStrategy(self.settings.MODEL_ROUTER_STRATEGY)
@@ -105,6 +165,17 @@ class ModelRouter:
         self.last_health_check = datetime.utcnow()
         self.health_check_interval = timedelta(seconds=self.settings.MODEL_ROUTER_HEALTH_CHECK_INTERVAL)
 
+        # Response cache and in-flight deduplication of identical requests
+        self.response_cache = get_llm_response_cache()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._inflight_waiters: Dict[asyncio.Task, int] = {}
+
+        # Per-provider/per-model admission control
+        self.admission = get_admission_controller()
+
+        # Real-time latency/error statistics and circuit breakers
+        self.health = get_model_health_tracker()
+
     async def initialize(self):
         """Initialize the model router asynchronously."""
         # Perform any async initialization if needed
@@ -113,39 +184,137 @@ class ModelRouter:
 
     def _init_clients(self):
         """Initialize AI provider clients."""
+        # Provider SDKs are imported here rather than at module load so that
+        # importing the API application does not pay for them.
+        if self.settings.OPENROUTER_API_KEY or self.settings.OPENAI_API_KEY:
+            from openai import OpenAI, AsyncOpenAI
+        if self.settings.ANTHROPIC_API_KEY:
+            from anthropic import Anthropic, AsyncAnthropic
+
+        # Async clients are created per event loop on first use (see _LoopLocalClient)
+        self._async_client_factories: Dict[str, Callable[[], Any]] = {}
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loop_client_closers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._unbound_clients: Dict[str, Any] = {}
+        self._client_overrides: Dict[str, Any] = {}
+
         # OpenRouter client (unified access)
         if self.settings.OPENROUTER_API_KEY:
             self.openrouter_client = OpenAI(
                 api_key=self.settings.OPENROUTER_API_KEY,
                 base_url="https://openrouter.ai/api/v1"
             )
-            self.openrouter_async_client = AsyncOpenAI(
+            self._async_client_factories["openrouter_async_client"] = lambda: AsyncOpenAI(
                 api_key=self.settings.OPENROUTER_API_KEY,
-                base_url="https://openrouter.ai/api/v1"
+                base_url="https://openrouter.ai/api/v1",
+                http_client=self._new_http_client()
             )
         else:
             self.openrouter_client = None
-            self.openrouter_async_client = None
 
         # Direct OpenAI client
         if self.settings.OPENAI_API_KEY:
             self.openai_client = OpenAI(api_key=self.settings.OPENAI_API_KEY)
-            self.openai_async_client = AsyncOpenAI(api_key=self.settings.OPENAI_API_KEY)
+            self._async_client_factories["openai_async_client"] = lambda: AsyncOpenAI(
+                api_key=self.settings.OPENAI_API_KEY,
+                http_client=self._new_http_client()
+            )
         else:
             self.openai_client = None
-            self.openai_async_client = None
 
         # Direct Anthropic client
         if self.settings.ANTHROPIC_API_KEY:
             self.anthropic_client = Anthropic(api_key=self.settings.ANTHROPIC_API_KEY)
-            self.anthropic_async_client = AsyncAnthropic(api_key=self.settings.ANTHROPIC_API_KEY)
+            self._async_client_factories["anthropic_async_client"] = lambda: AsyncAnthropic(
+                api_key=self.settings.ANTHROPIC_API_KEY,
+                http_client=self._new_http_client()
+            )
         else:
             self.anthropic_client = None
-            self.anthropic_async_client = None
 
         # Ollama client (HTTP)
         self.ollama_base_url = self.settings.OLLAMA_BASE_URL
-        self.ollama_client = httpx.AsyncClient(base_url=self.ollama_base_url, timeout=30.0)
+        self._async_client_factories["ollama_client"] = lambda: self._new_http_client(
+            base_url=self.ollama_base_url, timeout=30.0
+        )
+
+    @staticmethod
+    def _new_http_client(**kwargs) -> httpx.AsyncClient:
+        """Create an HTTP client with a keep-alive pool (HTTP/2 when available)."""
+        return httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE and settings.MODEL_ROUTER_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.MODEL_ROUTER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MODEL_ROUTER_MAX_CONNECTIONS,
+                keepalive_expiry=settings.MODEL_ROUTER_KEEPALIVE_EXPIRY
+            ),
+            **kwargs
+        )
+
+    def _async_client(self, name: str) -> Any:
+        """Get the async client for the running event loop, creating it on first use."""
+        if name in self._client_overrides:
+            return self._client_overrides[name]
+
+        factory = self._async_client_factories.get(name)
+        if factory is None:
+            return None
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside a loop the client is only checked for presence
+            clients = self._unbound_clients
+        else:
+            clients = self._loop_clients.get(loop)
+            if clients is None:
+                clients = self._loop_clients[loop] = {}
+                self._close_clients_at_shutdown(loop)
+
+        client = clients.get(name)
+        if client is None:
+            client = clients[name] = factory()
+        return client
+
+    def _close_clients_at_shutdown(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Close a loop's clients when the loop shuts down.
+
+        asyncio.run() and AgentEventLoop.stop() call loop.shutdown_asyncgens(),
+        which closes the suspended generator started here; its cleanup then
+        closes the clients on the loop their connections belong to.
+        """
+        async def closer():
+            try:
+                yield
+            finally:
+                await self.close_clients()
+
+        generator = closer()
+        # The loop tracks its async generators weakly
+        self._loop_client_closers[loop] = generator
+        asyncio.ensure_future(generator.__anext__(), loop=loop)
+
+    async def close_clients(self) -> None:
+        """
+        Close the async clients created for the running event loop.
+
+        Clients created outside any event loop are closed as well; they
+        were never used on a loop, so any loop may close them.
+        """
+        clients = list(self._loop_clients.pop(asyncio.get_running_loop(), {}).items())
+        unbound, self._unbound_clients = self._unbound_clients, {}
+        clients.extend(unbound.items())
+        for name, client in clients:
+            try:
+                # httpx clients have aclose(), the provider SDK clients an async close()
+                await (client.aclose() if hasattr(client, "aclose") else client.close())
+            except Exception as e:
+                logger.warning(f"Failed to close {name}: {e}")
 
     def _load_model_registry(self):
         """Load available models from all providers."""
@@ -252,31 +421,45 @@ class ModelRouter:
         logger.info(f"Loaded {len(self.models)} models into registry")
 
 
-    async def select_model(self, request: ModelRequest) -> str:
+    async def select_model(self, request: ModelRequest, exclude: Optional[set] = None) -> str:
         """
         Select the best model for the request based on routing strategy.
 
         Args:
             request: The model request
+            exclude: Model IDs to skip (e.g. ones that already failed this request)
 
         Returns:
             Selected model ID
         """
+        exclude = exclude or set()
+
         # Check if specific model is requested and available
         if request.model_preference and request.model_preference in self.models:
             model = self.models[request.model_preference]
-            if model.is_available:
+            if (
+                model.is_available
+                and request.model_preference not in exclude
+                and self.health.allow_request(model.id)
+            ):
                 return request.model_preference
 
-        # Filter available models
+        # Filter available models, skipping open circuits
         available_models = [
             model for model in self.models.values()
-            if model.is_available
+            if model.is_available and model.id not in exclude and self.health.allow_request(model.id)
         ]
 
         if not available_models:
             raise ValueError("No available models found")
 
+        # Only consider models whose context window fits the prompt and completion
+        required_context = self._estimate_tokens(request)
+        fitting_models = [m for m in available_models if m.context_length >= required_context]
+        if not fitting_models:
+            raise ValueError(f"No available model fits a context of {required_context} tokens")
+        available_models = fitting_models
+
         # Apply routing strategy
         if self.strategy == RoutingStrategy.COST_OPTIMIZED:
             # Select cheapest model that meets requirements
@@ -284,6 +467,12 @@ class ModelRouter:
         elif self.strategy == RoutingStrategy.PERFORMANCE:
             # Select highest performance model
             selected = max(available_models, key=lambda m: m.performance_score)
+        elif self.strategy == RoutingStrategy.LATENCY_OPTIMIZED:
+            # Select the model expected to finish first, given observed throughput and errors
+            selected = min(
+                available_models,
+                key=lambda m: self.health.expected_completion_time(m.id, request.max_tokens, m.performance_score)
+            )
         else:  # BALANCED
             # Balance cost and performance
             selected = min(available_models, key=lambda m: m.cost_per_token / m.performance_score)
@@ -310,51 +499,407 @@ class ModelRouter:
         # Select model
         selected_model_id = await self.select_model(request)
 
-        # Attempt generation with retries and fallbacks
+        if not self.response_cache.is_cacheable(request):
+            self.response_cache.record_skip()
+            return await self._generate_with_fallback(request, selected_model_id, start_time)
+
+        cache_key = self.response_cache.make_key(request, selected_model_id)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return self._response_from_cache(cached, start_time)
+
+        # Identical requests already in flight share a single provider call
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            response = await self._await_shared(inflight)
+            return self._response_from_cache(
+                {**asdict(response), "provider": response.provider.value}, start_time
+            )
+
+        task = asyncio.get_running_loop().create_task(
+            self._generate_shared(request, selected_model_id, start_time, cache_key)
+        )
+        self._inflight[cache_key] = task
+        return await self._await_shared(task)
+
+    async def _generate_shared(
+        self, request: ModelRequest, selected_model_id: str, start_time: float, cache_key: str
+    ) -> ModelResponse:
+        """Provider call shared by identical in-flight requests."""
+        try:
+            response = await self._generate_with_fallback(request, selected_model_id, start_time)
+            if response.content:
+                # Store under the model that actually answered (fallbacks included)
+                self.response_cache.set(
+                    self.response_cache.make_key(request, response.model_used), response
+                )
+            return response
+        finally:
+            if self._inflight.get(cache_key) is asyncio.current_task():
+                del self._inflight[cache_key]
+
+    async def _await_shared(self, task: asyncio.Task) -> ModelResponse:
+        """
+        Wait for a shared provider call.
+
+        A cancelled caller only stops waiting; the call itself is cancelled
+        once no caller waits for it anymore.
+        """
+        self._inflight_waiters[task] = self._inflight_waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._inflight_waiters[task] -= 1
+            if not self._inflight_waiters[task]:
+                del self._inflight_waiters[task]
+                task.cancel()
+
+    def _response_from_cache(self, data: Dict[str, Any], start_time: float) -> ModelResponse:
+        """Build a response from cached fields."""
+        data = dict(data)
+        data["provider"] = ModelProvider(data["provider"])
+        data["metadata"] = {**(data.get("metadata") or {}), "cache_hit": True}
+        data["cost"] = 0.0
+        data["processing_time"] = time.time() - start_time
+        logger.info(f"Served response for {data['model_used']} from cache")
+        return ModelResponse(**data)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics."""
+        return {**self.response_cache.get_stats(), "inflight": len(self._inflight)}
+
+    async def _generate_with_fallback(
+        self, request: ModelRequest, selected_model_id: str, start_time: float
+    ) -> ModelResponse:
+        """Call providers with retries and fallback to other models."""
         last_exception = None
+        failed_models = set()
 
         for attempt in range(self.max_retries):
             try:
-                model_info = self.models[selected_model_id]
-
-                # Route to appropriate provider
-                if model_info.provider == ModelProvider.OPENROUTER:
-                    response = await self._generate_openrouter(request, selected_model_id)
-                elif model_info.provider == ModelProvider.OPENAI:
-                    response = await self._generate_openai(request, selected_model_id)
-                elif model_info.provider == ModelProvider.ANTHROPIC:
-                    response = await self._generate_anthropic(request, selected_model_id)
-                elif model_info.provider == ModelProvider.OLLAMA:
-                    response = await self._generate_ollama(request, selected_model_id)
+                if request.latency_critical and self.fallback_enabled:
+                    response = await self._generate_hedged(request, selected_model_id, failed_models)
                 else:
-                    raise ValueError(f"Unsupported provider: {model_info.provider}")
+                    response = await self._attempt_model(request, selected_model_id)
 
                 # Calculate processing time
                 processing_time = time.time() - start_time
                 response.processing_time = processing_time
 
-                logger.info(f"Generated response using {selected_model_id} in {processing_time:.2f}s")
+                logger.info(f"Generated response using {response.model_used} in {processing_time:.2f}s")
                 return response
 
+            except (AdmissionTimeout, CircuitOpenError) as e:
+                # Saturated or known to be failing; try another model without retrying
+                last_exception = e
+                failed_models.add(selected_model_id)
+                logger.warning(f"Attempt {attempt + 1} could not be sent to model {selected_model_id}: {e}")
+
             except Exception as e:
                 last_exception = e
                 logger.warning(f"Attempt {attempt + 1} failed for model {selected_model_id}: {e}")
 
-                # Mark model as temporarily unavailable
-                self.models[selected_model_id].is_available = False
-
-                # Try fallback if enabled
-                if self.fallback_enabled and attempt < self.max_retries - 1:
-                    try:
-                        selected_model_id = await self.select_model(request)
-                        logger.info(f"Falling back to model: {selected_model_id}")
-                    except ValueError:
-                        # No more available models
-                        break
+                if is_rate_limit_error(e):
+                    # Back off and retry the same model; its limits have already been reduced
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(retry_after_seconds(e, min(2 ** attempt, 30)))
+                    continue
+
+                # Skip the model for the rest of this request; repeated failures
+                # open its circuit breaker for everyone
+                failed_models.add(selected_model_id)
+
+            # Try fallback if enabled
+            if self.fallback_enabled and attempt < self.max_retries - 1:
+                try:
+                    selected_model_id = await self.select_model(request, exclude=failed_models)
+                    logger.info(f"Falling back to model: {selected_model_id}")
+                except ValueError:
+                    # No more available models
+                    break
 
         # All attempts failed
         raise Exception(f"All model attempts failed. Last error: {last_exception}")
 
+    async def _attempt_model(self, request: ModelRequest, model_id: str) -> ModelResponse:
+        """
+        Send a request to one model through admission control.
+
+        Records the outcome with the health tracker: latency and throughput on
+        success, an error (tripping the circuit breaker unless rate limited)
+        on failure.
+
+        Raises:
+            CircuitOpenError: If the model's circuit breaker rejects the request
+            AdmissionTimeout: If the model's queue did not admit the request in time
+        """
+        if not self.health.allow_request(model_id, claim_probe=True):
+            raise CircuitOpenError(f"Circuit open for model {model_id}")
+
+        model_info = self.models[model_id]
+        try:
+            async with self.admission.admit(
+                model_info.provider.value,
+                model_id,
+                self._estimate_tokens(request)
+            ) as permit:
+                call_start = time.time()
+                try:
+                    response = await self._call_provider(model_info.provider, request, model_id)
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        permit.record_throttled()
+                    raise
+                permit.record_success(response.token_usage.get("total_tokens"))
+        except (AdmissionTimeout, asyncio.CancelledError):
+            # Never reached the provider
+            self.health.release_probe(model_id)
+            raise
+        except Exception as e:
+            self.health.record_failure(model_id, trip=not is_rate_limit_error(e))
+            raise
+
+        self.health.record_success(
+            model_id,
+            time.time() - call_start,
+            response.token_usage.get("completion_tokens", 0)
+        )
+        return response
+
+    async def _generate_hedged(
+        self, request: ModelRequest, primary_model_id: str, exclude: set
+    ) -> ModelResponse:
+        """
+        Race the primary model against a second model started after a delay.
+
+        The delay is derived from the primary model's observed latency. The
+        first successful response wins and the other request is cancelled.
+        If both fail, the primary model's error is raised for the caller to
+        attribute to it, and a failed hedge model is added to ``exclude``.
+        """
+        primary = asyncio.ensure_future(self._attempt_model(request, primary_model_id))
+        attempts = [primary]
+        try:
+            delay = self.health.hedge_delay(primary_model_id, settings.MODEL_ROUTER_HEDGE_DELAY)
+
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            try:
+                hedge_model_id = await self.select_model(request, exclude=exclude | {primary_model_id})
+            except ValueError:
+                return await primary
+
+            logger.info(f"Hedging slow request on {primary_model_id} with {hedge_model_id} after {delay:.2f}s")
+            hedge = asyncio.ensure_future(self._attempt_model(request, hedge_model_id))
+            attempts.append(hedge)
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Each attempt recorded its own outcome with the health tracker
+            if not is_rate_limit_error(hedge.exception()):
+                exclude.add(hedge_model_id)
+            raise primary.exception()
+        finally:
+            # Also reached when the caller is cancelled while waiting, so no
+            # attempt outlives this call
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    async def generate_stream(self, request: ModelRequest) -> AsyncGenerator[StreamChunk, None]:
+        """
+        Generate a response as a stream of token deltas.
+
+        Falls back to other models only until the first delta has been
+        yielded; after that a provider error is raised to the caller. The
+        final chunk has an empty delta and carries the assembled response
+        with token usage and cost.
+
+        Args:
+            request: The model request
+
+        Yields:
+            StreamChunk: Token deltas, then the final chunk
+        """
+        start_time = time.time()
+
+        await self._ensure_health_check()
+        selected_model_id = await self.select_model(request)
+
+        last_exception = None
+        failed_models = set()
+
+        for attempt in range(self.max_retries):
+            emitted = False
+            stream = self._stream_model(request, selected_model_id, start_time)
+            try:
+                async for chunk in stream:
+                    emitted = True
+                    yield chunk
+                return
+
+            except (AdmissionTimeout, CircuitOpenError) as e:
+                last_exception = e
+                failed_models.add(selected_model_id)
+                logger.warning(f"Stream attempt {attempt + 1} could not be sent to model {selected_model_id}: {e}")
+
+            except Exception as e:
+                if emitted:
+                    # Partial output has already reached the caller
+                    raise
+                last_exception = e
+                logger.warning(f"Stream attempt {attempt + 1} failed for model {selected_model_id}: {e}")
+
+                if is_rate_limit_error(e):
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(retry_after_seconds(e, min(2 ** attempt, 30)))
+                    continue
+
+                failed_models.add(selected_model_id)
+
+            finally:
+                # Release the provider connection and admission slot promptly
+                # when the consumer stops early
+                await stream.aclose()
+
+            if self.fallback_enabled and attempt < self.max_retries - 1:
+                try:
+                    selected_model_id = await self.select_model(request, exclude=failed_models)
+                    logger.info(f"Falling back to model for stream: {selected_model_id}")
+                except ValueError:
+                    break
+
+        raise Exception(f"All model attempts failed. Last error: {last_exception}")
+
+    async def _stream_model(
+        self, request: ModelRequest, model_id: str, start_time: float
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream from one model through admission control, recording its health."""
+        if not self.health.allow_request(model_id, claim_probe=True):
+            raise CircuitOpenError(f"Circuit open for model {model_id}")
+
+        model_info = self.models[model_id]
+        usage: Dict[str, int] = {}
+        parts: List[str] = []
+        first_token_time = None
+
+        try:
+            async with self.admission.admit(
+                model_info.provider.value,
+                model_id,
+                self._estimate_tokens(request)
+            ) as permit:
+                call_start = time.time()
+                deltas = self._stream_provider(model_info.provider, request, model_id, usage)
+                try:
+                    async for delta in deltas:
+                        if first_token_time is None:
+                            first_token_time = time.time() - call_start
+                        parts.append(delta)
+                        yield StreamChunk(delta=delta, model_used=model_id, index=len(parts) - 1)
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        permit.record_throttled()
+                    raise
+                finally:
+                    await deltas.aclose()
+                token_usage = self._stream_token_usage(request, "".join(parts), usage)
+                # The stream's length depends on the output, not on load
+                permit.record_success(token_usage["total_tokens"], latency=first_token_time)
+        except (AdmissionTimeout, asyncio.CancelledError, GeneratorExit):
+            # Not sent, or abandoned by the consumer rather than failed by the provider
+            self.health.release_probe(model_id)
+            raise
+        except Exception as e:
+            self.health.record_failure(model_id, trip=not is_rate_limit_error(e))
+            raise
+
+        self.health.record_success(model_id, time.time() - call_start, token_usage["completion_tokens"])
+
+        processing_time = time.time() - start_time
+        response = ModelResponse(
+            content="".join(parts),
+            model_used=model_id,
+            provider=model_info.provider,
+            cost=token_usage["total_tokens"] * model_info.cost_per_token,
+            processing_time=processing_time,
+            token_usage=token_usage,
+            metadata={
+                "streamed": True,
+                "time_to_first_token": first_token_time,
+                "usage_estimated": not usage,
+            }
+        )
+
+        logger.info(
+            f"Streamed response using {model_id} in {processing_time:.2f}s",
+            time_to_first_token=first_token_time
+        )
+        yield StreamChunk(delta="", model_used=model_id, index=len(parts), response=response)
+
+    @staticmethod
+    def _stream_token_usage(request: ModelRequest, content: str, usage: Dict[str, int]) -> Dict[str, int]:
+        """Token usage reported at the end of a stream, estimated if the provider sent none."""
+        prompt_tokens = usage.get("prompt_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = ModelRouter._estimate_tokens(request) - request.max_tokens
+        completion_tokens = usage.get("completion_tokens")
+        if completion_tokens is None:
+            completion_tokens = len(content) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    def _stream_provider(
+        self, provider: ModelProvider, request: ModelRequest, model_id: str, usage: Dict[str, int]
+    ) -> AsyncGenerator[str, None]:
+        """Route a streaming request to the provider-specific implementation."""
+        if provider == ModelProvider.OPENROUTER:
+            return self._stream_openai_compatible(self.openrouter_async_client, "OpenRouter", request, model_id, usage)
+        elif provider == ModelProvider.OPENAI:
+            return self._stream_openai_compatible(self.openai_async_client, "OpenAI", request, model_id, usage)
+        elif provider == ModelProvider.ANTHROPIC:
+            return self._stream_anthropic(request, model_id, usage)
+        elif provider == ModelProvider.OLLAMA:
+            return self._stream_ollama(request, model_id, usage)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+
+    async def _call_provider(self, provider: ModelProvider, request: ModelRequest, model_id: str) -> ModelResponse:
+        """Route a request to the provider-specific implementation."""
+        if provider == ModelProvider.OPENROUTER:
+            return await self._generate_openrouter(request, model_id)
+        elif provider == ModelProvider.OPENAI:
+            return await self._generate_openai(request, model_id)
+        elif provider == ModelProvider.ANTHROPIC:
+            return await self._generate_anthropic(request, model_id)
+        elif provider == ModelProvider.OLLAMA:
+            return await self._generate_ollama(request, model_id)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+
+    @staticmethod
+    def _estimate_tokens(request: ModelRequest) -> int:
+        """Rough prompt plus completion token estimate for rate limiting."""
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in request.messages)
+        prompt_chars += len(request.system_prompt or "")
+        return prompt_chars // 4 + request.max_tokens
+
+    def get_admission_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, wait time and concurrency limit metrics."""
+        return self.admission.get_metrics()
+
+    def get_model_health(self) -> Dict[str, Any]:
+        """Get EWMA latency, throughput, error rate and circuit state per model."""
+        return self.health.get_stats()
+
     async def _generate_openrouter(self, request: ModelRequest, model_id: str) -> ModelResponse:
         """Generate response using OpenRouter API."""
         if not self.openrouter_async_client:
@@ -535,6 +1080,98 @@ class ModelRouter:
             }
         )
 
+    async def _stream_openai_compatible(
+        self, client, client_name: str, request: ModelRequest, model_id: str, usage: Dict[str, int]
+    ) -> AsyncGenerator[str, None]:
+        """Stream token deltas from an OpenAI-compatible API (OpenAI, OpenRouter)."""
+        if not client:
+            raise ValueError(f"{client_name} client not initialized")
+
+        messages = request.messages.copy()
+        if request.system_prompt:
+            messages.insert(0, {"role": "system", "content": request.system_prompt})
+
+        stream = await client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+            tools=request.tools
+        )
+
+        async for chunk in stream:
+            # The usage chunk arrives last, with no choices
+            if getattr(chunk, "usage", None):
+                usage["prompt_tokens"] = chunk.usage.prompt_tokens
+                usage["completion_tokens"] = chunk.usage.completion_tokens
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    async def _stream_anthropic(
+        self, request: ModelRequest, model_id: str, usage: Dict[str, int]
+    ) -> AsyncGenerator[str, None]:
+        """Stream token deltas from the Anthropic API."""
+        if not self.anthropic_async_client:
+            raise ValueError("Anthropic client not initialized")
+
+        messages = []
+        system_prompt = request.system_prompt or ""
+
+        for msg in request.messages:
+            if msg["role"] == "system":
+                system_prompt = msg["content"]
+            else:
+                messages.append(msg)
+
+        async with self.anthropic_async_client.messages.stream(
+            model=model_id,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            system=system_prompt,
+            messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final_message = await stream.get_final_message()
+
+        usage["prompt_tokens"] = final_message.usage.input_tokens
+        usage["completion_tokens"] = final_message.usage.output_tokens
+
+    async def _stream_ollama(
+        self, request: ModelRequest, model_id: str, usage: Dict[str, int]
+    ) -> AsyncGenerator[str, None]:
+        """Stream token deltas from the Ollama local API (newline-delimited JSON)."""
+        messages = request.messages.copy()
+        if request.system_prompt:
+            messages.insert(0, {"role": "system", "content": request.system_prompt})
+
+        payload = {
+            "model": model_id,
+            "messages": messages,
+            "stream": True,
+            "options": {
+                "temperature": request.temperature,
+                "num_predict": request.max_tokens
+            }
+        }
+
+        async with self.ollama_client.stream("POST", "/api/chat", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                delta = data.get("message", {}).get("content", "")
+                if delta:
+                    yield delta
+                if data.get("done"):
+                    usage["prompt_tokens"] = data.get("prompt_eval_count", 0)
+                    usage["completion_tokens"] = data.get("eval_count", 0)
+
     async def _ensure_health_check(self):
         """Ensure health check is recent, run if needed."""
         now = datetime.utcnow()
@@ -609,10 +1246,13 @@ class ModelRouter:
         ]
 
 
-# Global model router instance
-model_router = ModelRouter()
+# Global model router instance (created on first use)
+_model_router = None
 
 
 def get_model_router() -> ModelRouter:
     """Get the global model router instance."""
-    return model_router
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter()
+    return _model_router
@@ -0,0 +1,380 @@
+"""
+Admission control for model provider requests.
+
+Every provider call made by the model router passes through:
+
+- a per-provider and a per-model concurrency limit that adapts AIMD-style:
+  it starts at the configured concurrency, grows additively (up to
+  ``MODEL_ROUTER_CONCURRENCY_HEADROOM`` times that) while requests succeed
+  within the latency target and halves on rate-limit responses (HTTP 429)
+  or latency overruns. Streams are judged by their time to first token;
+  their total duration reflects output length, not provider load;
+- per-provider request-per-minute and token-per-minute buckets;
+- a bounded wait queue, so bursts queue up to a deadline instead of
+  failing over immediately.
+
+Limiters are thread-safe and not bound to an event loop, because the agent
+runtime drives the router from several loops.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Deque, Tuple
+
+import structlog
+
+from ..core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+
+class AdmissionTimeout(Exception):
+    """Raised when a request could not be admitted before its deadline."""
+    pass
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take ``amount`` tokens, going into debt if necessary.
+
+        Returns:
+            float: Seconds the caller must wait before the reservation is valid
+        """
+        if self.unlimited:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # Requests larger than the bucket still pass once it is full
+            amount = min(amount, self.capacity)
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Return unused tokens (estimate was higher than actual usage)."""
+        if self.unlimited or amount <= 0:
+            return
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Concurrency limit with AIMD adjustment and a FIFO wait queue.
+
+    Waiters are futures on their own event loop and are woken thread-safely.
+    """
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int = 1,
+                 max_limit: Optional[int] = None, latency_target: float = 30.0):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        # Room to grow past the starting limit; capped there, AIMD could
+        # only ever recover lost capacity
+        self.max_limit = max_limit if max_limit is not None else 2 * initial_limit
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            "admitted": 0,
+            "timeouts": 0,
+            "throttled": 0,
+            "decreases": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, deadline: float):
+        """
+        Wait for a slot until ``deadline`` (monotonic seconds).
+
+        Raises:
+            AdmissionTimeout: If no slot became free in time
+        """
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                self._record_admission(0.0)
+                return
+            future = loop.create_future()
+            entry = (loop, future)
+            self._waiters.append(entry)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=max(0.0, deadline - time.monotonic()))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    granted = False
+                else:
+                    # The slot was handed over just as we gave up: pass it on
+                    granted = True
+            if granted:
+                self.release()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.metrics["timeouts"] += 1
+            raise AdmissionTimeout(f"Timed out waiting for {self.name} capacity")
+
+        self._record_admission(time.monotonic() - start)
+
+    def release(self):
+        """Free a slot, handing it to the next waiter if the limit allows."""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def on_success(self, latency: float):
+        """Additive increase while latency stays within the target."""
+        with self._lock:
+            if latency > self.latency_target:
+                self._decrease(0.9)
+            elif self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+                self._wake_waiters()
+
+    def on_throttled(self):
+        """Multiplicative decrease on a rate-limit response."""
+        with self._lock:
+            self.metrics["throttled"] += 1
+            self._decrease(0.5)
+
+    def snapshot(self) -> Dict[str, Any]:
+        admitted = self.metrics["admitted"]
+        return {
+            **self.metrics,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "avg_wait_seconds": self.metrics["total_wait_seconds"] / admitted if admitted else 0.0,
+        }
+
+    def _decrease(self, factor: float):
+        """Shrink the limit; caller holds the lock."""
+        new_limit = max(float(self.min_limit), self.limit * factor)
+        if new_limit < self.limit:
+            self.metrics["decreases"] += 1
+            logger.info("Reduced provider concurrency limit", limiter=self.name, limit=round(new_limit, 2))
+        self.limit = new_limit
+
+    def _wake_waiters(self):
+        """Hand free slots to queued waiters; caller holds the lock."""
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def _record_admission(self, waited: float):
+        self.metrics["admitted"] += 1
+        self.metrics["total_wait_seconds"] += waited
+        self.metrics["max_wait_seconds"] = max(self.metrics["max_wait_seconds"], waited)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Permit:
+    """Outcome reporting handle for an admitted request."""
+
+    def __init__(self, limiters, token_bucket: TokenBucket, estimated_tokens: int):
+        self._limiters = limiters
+        self._token_bucket = token_bucket
+        self._estimated_tokens = estimated_tokens
+        self._start = time.monotonic()
+        self.throttled = False
+
+    def record_success(self, total_tokens: Optional[int] = None, latency: Optional[float] = None):
+        """
+        Report a completed request.
+
+        Args:
+            total_tokens: Actual token usage, to refund an over-estimate
+            latency: Latency to judge against the target; defaults to the
+                time since admission. Streams pass their time to first token.
+        """
+        if latency is None:
+            latency = time.monotonic() - self._start
+        for limiter in self._limiters:
+            limiter.on_success(latency)
+        if total_tokens is not None:
+            self._token_bucket.refund(self._estimated_tokens - total_tokens)
+
+    def record_throttled(self):
+        self.throttled = True
+        for limiter in self._limiters:
+            limiter.on_throttled()
+
+
+class ProviderAdmissionController:
+    """Per-provider and per-model admission control for the model router."""
+
+    def __init__(self):
+        self.provider_config: Dict[str, Dict[str, float]] = settings.MODEL_ROUTER_PROVIDER_LIMITS
+        self.model_max_concurrency = settings.MODEL_ROUTER_MODEL_MAX_CONCURRENCY
+        self.latency_target = settings.MODEL_ROUTER_LATENCY_TARGET
+        self.concurrency_headroom = settings.MODEL_ROUTER_CONCURRENCY_HEADROOM
+        self.queue_timeout = settings.MODEL_ROUTER_QUEUE_TIMEOUT
+
+        self._provider_limits: Dict[str, AdaptiveConcurrencyLimit] = {}
+        self._model_limits: Dict[str, AdaptiveConcurrencyLimit] = {}
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @asynccontextmanager
+    async def admit(self, provider: str, model_id: str, estimated_tokens: int,
+                    timeout: Optional[float] = None):
+        """
+        Wait for capacity on a provider and model.
+
+        Args:
+            provider: Provider name
+            model_id: Model ID
+            estimated_tokens: Prompt plus max completion token estimate
+            timeout: Maximum seconds to wait (defaults to the configured queue timeout)
+
+        Yields:
+            Permit: Used to report success or throttling
+
+        Raises:
+            AdmissionTimeout: If capacity did not free up before the deadline
+        """
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        provider_limit, model_limit = self._limits_for(provider, model_id)
+
+        # Rate buckets: wait out any debt, but never past the deadline
+        wait = max(
+            self._request_buckets[provider].reserve(1),
+            self._token_buckets[provider].reserve(estimated_tokens),
+        )
+        if wait > 0 and time.monotonic() + wait > deadline:
+            self._refund_rate(provider, estimated_tokens)
+            provider_limit.metrics["timeouts"] += 1
+            raise AdmissionTimeout(f"{provider} rate limit would delay request by {wait:.1f}s")
+
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await provider_limit.acquire(deadline)
+            try:
+                await model_limit.acquire(deadline)
+            except BaseException:
+                provider_limit.release()
+                raise
+        except BaseException:
+            # Timed out or cancelled before reaching the provider
+            self._refund_rate(provider, estimated_tokens)
+            raise
+
+        try:
+            yield Permit((provider_limit, model_limit), self._token_buckets[provider], estimated_tokens)
+        finally:
+            model_limit.release()
+            provider_limit.release()
+
+    def _refund_rate(self, provider: str, estimated_tokens: int):
+        """Return the rate budget reserved for a request that was not sent."""
+        self._request_buckets[provider].refund(1)
+        self._token_buckets[provider].refund(estimated_tokens)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, wait time and limit metrics per provider and model."""
+        return {
+            "providers": {name: limit.snapshot() for name, limit in self._provider_limits.items()},
+            "models": {name: limit.snapshot() for name, limit in self._model_limits.items()},
+        }
+
+    def _limits_for(self, provider: str, model_id: str):
+        with self._lock:
+            if provider not in self._provider_limits:
+                config = self.provider_config.get(provider, {})
+                max_concurrency = int(config.get("max_concurrency", 8))
+                self._provider_limits[provider] = AdaptiveConcurrencyLimit(
+                    f"provider:{provider}", max_concurrency,
+                    max_limit=self._ceiling(max_concurrency), latency_target=self.latency_target
+                )
+                self._request_buckets[provider] = TokenBucket(config.get("requests_per_minute", 0))
+                self._token_buckets[provider] = TokenBucket(config.get("tokens_per_minute", 0))
+
+            if model_id not in self._model_limits:
+                self._model_limits[model_id] = AdaptiveConcurrencyLimit(
+                    f"model:{model_id}", self.model_max_concurrency,
+                    max_limit=self._ceiling(self.model_max_concurrency), latency_target=self.latency_target
+                )
+
+            return self._provider_limits[provider], self._model_limits[model_id]
+
+    def _ceiling(self, configured: int) -> int:
+        """Highest limit AIMD may grow a configured concurrency to."""
+        return max(configured, math.ceil(configured * self.concurrency_headroom))
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether a provider error is a rate-limit (HTTP 429) response."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "rate_limit" in message
+
+
+def retry_after_seconds(error: Exception, default: float) -> float:
+    """Read a Retry-After header from a provider error if present."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Global admission controller instance
+_admission_controller: Optional[ProviderAdmissionController] = None
+
+
+def get_admission_controller() -> ProviderAdmissionController:
+    """Get the global provider admission controller."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = ProviderAdmissionController()
+    return _admission_controller
@@ -7,13 +7,24 @@ and industry-specific workflow automation.
 """
 
 import json
+import os
+import threading
+import time
+from functools import lru_cache, partial
+from itertools import product
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
 import structlog
 
+from ..core.config import get_settings
+from .knowledge_search import BM25Index, SearchDocument, SearchResults
+
 logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+CLAUSE_PRIORITY_ORDER = {"critical": 0, "high": 1, "normal": 2, "low": 3}
 
 
 class PropertyType(Enum):
@@ -111,15 +122,81 @@ class MarketData:
     last_updated: datetime
 
 
+class _KnowledgeIndex:
+    """
+    Lookup indexes over one version of the knowledge data.
+
+    Built once per load; results are stored pre-filtered and pre-sorted as
+    tuples, so lookups are dictionary hits. A reload builds a new index and
+    swaps it in, so readers always see one consistent version.
+    """
+
+    def __init__(self, knowledge_base: "RealEstateKnowledgeBase", clause_cache_size: int):
+        self.requirements: Dict[Tuple[Jurisdiction, PropertyType, TransactionType], Tuple[LegalRequirement, ...]] = {}
+        self.rules: Dict[Jurisdiction, Tuple[ComplianceRule, ...]] = {}
+        self.templates: Dict[Tuple[PropertyType, TransactionType, Jurisdiction], Tuple[DocumentTemplate, ...]] = {}
+
+        requirements: Dict[Tuple, List[LegalRequirement]] = {}
+        for req in knowledge_base.legal_requirements.values():
+            requirements.setdefault((req.jurisdiction, req.property_type, req.transaction_type), []).append(req)
+        for key, reqs in requirements.items():
+            # Mandatory first, then by deadline
+            reqs.sort(key=lambda x: (not x.mandatory, x.deadline_days or 999))
+            self.requirements[key] = tuple(reqs)
+
+        rules: Dict[Jurisdiction, List[ComplianceRule]] = {}
+        for rule in knowledge_base.compliance_rules.values():
+            rules.setdefault(rule.jurisdiction, []).append(rule)
+        self.rules = {jurisdiction: tuple(items) for jurisdiction, items in rules.items()}
+
+        templates: Dict[Tuple, List[DocumentTemplate]] = {}
+        for template in knowledge_base.document_templates.values():
+            keys = product(template.property_types, template.transaction_types, template.jurisdictions)
+            for key in dict.fromkeys(keys):
+                templates.setdefault(key, []).append(template)
+        self.templates = {key: tuple(items) for key, items in templates.items()}
+
+        # Full-text search over help articles, clauses, requirements, rules and templates
+        self.search = BM25Index(_search_documents(knowledge_base))
+
+        # Memoized per index, so a reload also drops suggestions built from old data
+        self.suggested_clauses = lru_cache(maxsize=clause_cache_size)(
+            partial(knowledge_base._build_suggested_clauses, knowledge_base.clause_library)
+        )
+
+
 class RealEstateKnowledgeBase:
     """Comprehensive real estate knowledge base."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        reload_interval: float = 0,
+        clause_cache_size: int = 1024
+    ):
+        """
+        Args:
+            data_path: Versioned JSON file with legal requirements, compliance
+                rules, document templates and clauses; replaces the built-in
+                data for the sections it contains
+            reload_interval: Seconds between checks of ``data_path`` for a new
+                version; 0 disables hot reloading
+            clause_cache_size: Suggested clause results kept per data version
+        """
         self.legal_requirements: Dict[str, LegalRequirement] = {}
         self.compliance_rules: Dict[str, ComplianceRule] = {}
         self.document_templates: Dict[str, DocumentTemplate] = {}
         self.market_data: Dict[str, MarketData] = {}
         self.clause_library: Dict[str, Dict[str, Any]] = {}
+        self.help_articles: Dict[str, Dict[str, Any]] = {}
+
+        self.data_path = data_path
+        self.data_version = "builtin"
+        self.reload_interval = reload_interval
+        self.clause_cache_size = clause_cache_size
+        self._data_mtime: Optional[int] = None
+        self._next_reload_check = 0.0
+        self._reload_lock = threading.Lock()
 
         # Initialize with default data
         self._initialize_legal_requirements()
@@ -127,6 +204,11 @@ class RealEstateKnowledgeBase:
         self._initialize_document_templates()
         self._initialize_clause_library()
         self._initialize_sample_market_data()
+        self._initialize_help_articles()
+
+        self._index = _KnowledgeIndex(self, clause_cache_size)
+        if data_path:
+            self.load_data_file(data_path)
 
     def get_legal_requirements(
         self,
@@ -135,17 +217,8 @@ class RealEstateKnowledgeBase:
         transaction_type: TransactionType
     ) -> List[LegalRequirement]:
         """Get legal requirements for specific transaction parameters."""
-        requirements = []
-
-        for req in self.legal_requirements.values():
-            if (req.jurisdiction == jurisdiction and
-                req.property_type == property_type and
-                req.transaction_type == transaction_type):
-                requirements.append(req)
-
-        # Sort by mandatory first, then by deadline
-        requirements.sort(key=lambda x: (not x.mandatory, x.deadline_days or 999))
-        return requirements
+        # Sorted by mandatory first, then by deadline
+        return list(self._get_index().requirements.get((jurisdiction, property_type, transaction_type), ()))
 
     def validate_compliance(
         self,
@@ -155,10 +228,7 @@ class RealEstateKnowledgeBase:
         """Validate transaction compliance against rules."""
         violations = []
 
-        for rule in self.compliance_rules.values():
-            if rule.jurisdiction != jurisdiction:
-                continue
-
+        for rule in self._get_index().rules.get(jurisdiction, ()):
             violation = self._check_compliance_rule(rule, transaction_data)
             if violation:
                 violations.append(violation)
@@ -172,15 +242,7 @@ class RealEstateKnowledgeBase:
         jurisdiction: Jurisdiction
     ) -> List[DocumentTemplate]:
         """Get applicable document templates."""
-        templates = []
-
-        for template in self.document_templates.values():
-            if (property_type in template.property_types and
-                transaction_type in template.transaction_types and
-                jurisdiction in template.jurisdictions):
-                templates.append(template)
-
-        return templates
+        return list(self._get_index().templates.get((property_type, transaction_type, jurisdiction), ()))
 
     def get_market_analysis(
         self,
@@ -212,14 +274,85 @@ class RealEstateKnowledgeBase:
         property_type: PropertyType,
         transaction_type: TransactionType,
         jurisdiction: Jurisdiction,
-        risk_factors: List[str] = None
+        risk_factors: List[str] = None,
+        query: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get suggested contract clauses."""
+        """
+        Get suggested contract clauses.
+
+        With a ``query`` (such as a description of the deal), each clause gets
+        a BM25 ``relevance_score`` and clauses are ordered by it, then by
+        priority.
+        """
+        index = self._get_index()
+        clauses = index.suggested_clauses(
+            property_type, transaction_type, jurisdiction, tuple(risk_factors or ())
+        )
+        # Copies, so callers cannot modify the memoized suggestions
+        clauses = [dict(clause) for clause in clauses]
+
+        if query:
+            scores: Dict[str, float] = {}
+            for hit in index.search.search(query, limit=None, kinds=("clause",)).hits:
+                clause_id = hit.document.metadata["id"]
+                scores[clause_id] = max(scores.get(clause_id, 0.0), hit.score)
+            for clause in clauses:
+                clause["relevance_score"] = round(scores.get(clause["clause_id"], 0.0), 4)
+            # Stable, so equally relevant clauses stay in priority order
+            clauses.sort(key=lambda clause: -clause["relevance_score"])
+
+        return clauses
+
+    def search_knowledge(
+        self,
+        query: str,
+        limit: Optional[int] = 5,
+        kinds: Optional[List[str]] = None
+    ) -> SearchResults:
+        """
+        Full-text search of the knowledge base.
+
+        Args:
+            query: Free-text question or clause
+            limit: Maximum hits; None for all matches
+            kinds: Restrict to "help", "clause", "legal_requirement",
+                "compliance_rule" and/or "document_template" documents
+
+        Returns:
+            SearchResults: BM25-ranked hits and the number of matches
+        """
+        return self._get_index().search.search(query, limit=limit, kinds=kinds)
+
+    def add_help_articles(self, articles: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Add or replace help articles without rebuilding the search index.
+
+        Args:
+            articles: Articles by id, each with ``content`` and optional
+                ``title`` and ``source``
+
+        Returns:
+            int: Number of articles indexed
+        """
+        with self._reload_lock:
+            self.help_articles.update(articles)
+            return self._index.search.add(
+                _help_article_document(article_id, article) for article_id, article in articles.items()
+            )
+
+    def _build_suggested_clauses(
+        self,
+        clause_library: Dict[str, Dict[str, Any]],
+        property_type: PropertyType,
+        transaction_type: TransactionType,
+        jurisdiction: Jurisdiction,
+        risk_factors: Tuple[str, ...]
+    ) -> Tuple[Dict[str, Any], ...]:
+        """Collect and sort suggested clauses; memoized by the index."""
         suggested_clauses = []
-        risk_factors = risk_factors or []
 
         # Base clauses for all transactions
-        base_clauses = self.clause_library.get("base", {})
+        base_clauses = clause_library.get("base", {})
         for clause_id, clause in base_clauses.items():
             if self._is_clause_applicable(clause, property_type, transaction_type, jurisdiction):
                 suggested_clauses.append({
@@ -230,7 +363,7 @@ class RealEstateKnowledgeBase:
                 })
 
         # Property-specific clauses
-        property_clauses = self.clause_library.get(property_type.value, {})
+        property_clauses = clause_library.get(property_type.value, {})
         for clause_id, clause in property_clauses.items():
             suggested_clauses.append({
                 "clause_id": clause_id,
@@ -241,7 +374,7 @@ class RealEstateKnowledgeBase:
 
         # Risk-specific clauses
         for risk_factor in risk_factors:
-            risk_clauses = self.clause_library.get(f"risk_{risk_factor}", {})
+            risk_clauses = clause_library.get(f"risk_{risk_factor}", {})
             for clause_id, clause in risk_clauses.items():
                 suggested_clauses.append({
                     "clause_id": clause_id,
@@ -251,10 +384,120 @@ class RealEstateKnowledgeBase:
                 })
 
         # Sort by priority
-        priority_order = {"critical": 0, "high": 1, "normal": 2, "low": 3}
-        suggested_clauses.sort(key=lambda x: priority_order.get(x["priority"], 2))
+        suggested_clauses.sort(key=lambda x: CLAUSE_PRIORITY_ORDER.get(x["priority"], 2))
+
+        return tuple(suggested_clauses)
+
+    # Data loading and hot reload
+
+    def load_data_file(self, path: str) -> str:
+        """
+        Load knowledge data from a versioned JSON file and rebuild the indexes.
+
+        The file holds a ``version`` and any of the ``legal_requirements``,
+        ``compliance_rules`` and ``document_templates`` lists and the
+        ``clause_library`` and ``help_articles`` mappings; sections it contains
+        replace the current ones. Lookups running meanwhile keep using the
+        previous data.
+
+        Args:
+            path: Data file path
+
+        Returns:
+            str: Loaded data version
+        """
+        with self._reload_lock:
+            mtime = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            version = str(data.get("version") or "")
+            if not version:
+                raise ValueError(f"Knowledge base data file {path} has no version")
+
+            legal_requirements = self.legal_requirements
+            if "legal_requirements" in data:
+                legal_requirements = {}
+                for item in data["legal_requirements"]:
+                    req = _legal_requirement_from_dict(item)
+                    legal_requirements[req.requirement_id] = req
+
+            compliance_rules = self.compliance_rules
+            if "compliance_rules" in data:
+                compliance_rules = {}
+                for item in data["compliance_rules"]:
+                    rule = _compliance_rule_from_dict(item)
+                    compliance_rules[rule.rule_id] = rule
+
+            document_templates = self.document_templates
+            if "document_templates" in data:
+                document_templates = {}
+                for item in data["document_templates"]:
+                    template = _document_template_from_dict(item)
+                    document_templates[template.template_id] = template
+
+            # Swap in the new data; lookups read the index reference once
+            self.legal_requirements = legal_requirements
+            self.compliance_rules = compliance_rules
+            self.document_templates = document_templates
+            self.clause_library = data.get("clause_library", self.clause_library)
+            self.help_articles = data.get("help_articles", self.help_articles)
+            self._index = _KnowledgeIndex(self, self.clause_cache_size)
+
+            self.data_path = path
+            self.data_version = version
+            self._data_mtime = mtime
+
+        logger.info(
+            "Loaded knowledge base data",
+            path=path,
+            version=version,
+            legal_requirements=len(legal_requirements),
+            compliance_rules=len(compliance_rules),
+            document_templates=len(document_templates)
+        )
+        return version
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the data file if it was modified and carries a new version.
+
+        Returns:
+            bool: Whether new data was loaded
+        """
+        if not self.data_path:
+            return False
+
+        try:
+            mtime = os.stat(self.data_path).st_mtime_ns
+            if mtime == self._data_mtime:
+                return False
 
-        return suggested_clauses
+            with open(self.data_path, "r", encoding="utf-8") as f:
+                version = str(json.load(f).get("version") or "")
+            if version == self.data_version:
+                self._data_mtime = mtime
+                return False
+
+            self.load_data_file(self.data_path)
+            return True
+        except Exception as e:
+            # Keep serving the loaded data until the file is fixed
+            logger.error("Knowledge base reload failed", path=self.data_path, error=str(e))
+            return False
+
+    def rebuild_indexes(self):
+        """Rebuild the lookup indexes after modifying the data in place."""
+        self._index = _KnowledgeIndex(self, self.clause_cache_size)
+
+    def _get_index(self) -> _KnowledgeIndex:
+        """Current index, checking for a new data version when due."""
+        if self.reload_interval > 0 and self.data_path:
+            now = time.monotonic()
+            if now >= self._next_reload_check:
+                self._next_reload_check = now + self.reload_interval
+                self.reload_if_changed()
+        return self._index
 
     def estimate_property_value(
         self,
@@ -612,6 +855,26 @@ class RealEstateKnowledgeBase:
             }
         }
 
+    def _initialize_help_articles(self):
+        """Initialize help articles."""
+        self.help_articles = {
+            "contract_basics": {
+                "title": "Contract Basics",
+                "content": "A real estate contract is a legally binding agreement between buyer and seller that outlines the terms and conditions of a property sale.",
+                "source": "real_estate_fundamentals"
+            },
+            "closing_process": {
+                "title": "Closing Process",
+                "content": "The closing process typically takes 30-45 days and involves loan approval, inspections, appraisal, and final walkthrough.",
+                "source": "process_guide"
+            },
+            "contingencies": {
+                "title": "Contingencies",
+                "content": "Contingencies are conditions that must be met for the contract to proceed. Common contingencies include financing, inspection, and appraisal.",
+                "source": "legal_guide"
+            }
+        }
+
     def _initialize_sample_market_data(self):
         """Initialize sample market data."""
         self.market_data["los_angeles_residential_single_family"] = MarketData(
@@ -637,6 +900,86 @@ class RealEstateKnowledgeBase:
         )
 
 
+def _legal_requirement_from_dict(item: Dict[str, Any]) -> LegalRequirement:
+    return LegalRequirement(**{
+        **item,
+        "jurisdiction": Jurisdiction(item["jurisdiction"]),
+        "property_type": PropertyType(item["property_type"]),
+        "transaction_type": TransactionType(item["transaction_type"]),
+    })
+
+
+def _compliance_rule_from_dict(item: Dict[str, Any]) -> ComplianceRule:
+    return ComplianceRule(**{**item, "jurisdiction": Jurisdiction(item["jurisdiction"])})
+
+
+def _document_template_from_dict(item: Dict[str, Any]) -> DocumentTemplate:
+    return DocumentTemplate(**{
+        **item,
+        "property_types": [PropertyType(value) for value in item["property_types"]],
+        "transaction_types": [TransactionType(value) for value in item["transaction_types"]],
+        "jurisdictions": [Jurisdiction(value) for value in item["jurisdictions"]],
+    })
+
+
+def _help_article_document(article_id: str, article: Dict[str, Any]) -> SearchDocument:
+    return SearchDocument(
+        doc_id=f"help:{article_id}",
+        kind="help",
+        title=article.get("title", ""),
+        content=article["content"],
+        source=article.get("source", "help"),
+        metadata={"id": article_id}
+    )
+
+
+def _search_documents(knowledge_base: RealEstateKnowledgeBase):
+    """Searchable documents of one version of the knowledge data."""
+    for article_id, article in knowledge_base.help_articles.items():
+        yield _help_article_document(article_id, article)
+
+    for category, clauses in knowledge_base.clause_library.items():
+        for clause_id, clause in clauses.items():
+            yield SearchDocument(
+                doc_id=f"clause:{category}:{clause_id}",
+                kind="clause",
+                title=clause.get("title", ""),
+                content=clause.get("content", ""),
+                source="clause_library",
+                metadata={"id": clause_id, "category": category, "clause_category": clause.get("category", "")}
+            )
+
+    for req in knowledge_base.legal_requirements.values():
+        yield SearchDocument(
+            doc_id=f"requirement:{req.requirement_id}",
+            kind="legal_requirement",
+            title=req.title,
+            content=req.description,
+            source="legal_requirements",
+            metadata={"id": req.requirement_id, "jurisdiction": req.jurisdiction.value}
+        )
+
+    for rule in knowledge_base.compliance_rules.values():
+        yield SearchDocument(
+            doc_id=f"rule:{rule.rule_id}",
+            kind="compliance_rule",
+            title=rule.title,
+            content=" ".join([rule.description, *rule.remediation_steps]),
+            source="compliance_rules",
+            metadata={"id": rule.rule_id, "jurisdiction": rule.jurisdiction.value}
+        )
+
+    for template in knowledge_base.document_templates.values():
+        yield SearchDocument(
+            doc_id=f"template:{template.template_id}",
+            kind="document_template",
+            title=template.name,
+            content=template.description,
+            source="document_templates",
+            metadata={"id": template.template_id}
+        )
+
+
 # Global knowledge base instance
 _knowledge_base = None
 
@@ -645,5 +988,8 @@ def get_real_estate_knowledge_base() -> RealEstateKnowledgeBase:
     """Get the global real estate knowledge base instance."""
     global _knowledge_base
     if _knowledge_base is None:
-        _knowledge_base = RealEstateKnowledgeBase()
+        _knowledge_base = RealEstateKnowledgeBase(
+            data_path=settings.KNOWLEDGE_BASE_DATA_PATH,
+            reload_interval=settings.KNOWLEDGE_BASE_RELOAD_INTERVAL
+        )
     return _knowledge_base
@@ -0,0 +1,578 @@
+"""
+Storage quota accounting.
+
+Quota usage is reserved atomically when an upload is initiated and
+confirmed or released when it completes, so concurrent uploads can never
+both pass a check that only one of them fits into.
+
+When Redis is available, a per-user counter hash holds usage backed by
+File records and a sorted set holds reservations whose File record does not
+exist yet. A Lua script checks the limits against both and records the
+reservation in a single round trip; committing the reservation moves it
+into the counters. Periodic reconciliation resets the counters to actual
+File sizes and leaves open reservations alone. Without Redis, a single
+conditional UPDATE on the StorageQuota row is used. Either way, uploads
+never completed are expired by reconciliation, which gives their quota
+back.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional, List, Dict, Any, Tuple
+
+from sqlalchemy import update
+from sqlmodel import Session, select, and_, or_, func
+
+from ..core.config import get_settings
+from ..core.redis_config import get_redis_client
+from ..models.file import File, FileStatus, StorageQuota, StorageQuotaPublic
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+QUOTA_KEY_PREFIX = "storage_quota:user:"
+RESERVATIONS_KEY_PREFIX = "storage_quota:reservations:"
+DIRTY_USERS_KEY = "storage_quota:dirty"
+
+# Applies a delta to the counters (KEYS[1]) or, when ARGV[7] is set, records
+# it as the reservation ARGV[7] expiring at ARGV[8] (KEYS[3]). ARGV[9] names
+# a reservation to settle first. Limits are enforced against counters plus
+# unexpired reservations when ARGV[6] is '1', and only for growing deltas.
+#
+# Returns 1 when applied, 0 when the byte limit would be exceeded, -1 when
+# the file count limit would be exceeded and -2 when the counters for the
+# user are not cached. Settling without cached counters only drops the
+# reservation, since seeding counts the File record from the database.
+_APPLY_SCRIPT = """
+if ARGV[9] ~= '' then
+    redis.call('ZREM', KEYS[3], ARGV[9])
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    if ARGV[9] ~= '' then
+        return 1
+    end
+    return -2
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[5])
+local bytes = tonumber(ARGV[1])
+local files = tonumber(ARGV[2])
+local used_bytes = tonumber(redis.call('HGET', KEYS[1], 'used_bytes'))
+local used_files = tonumber(redis.call('HGET', KEYS[1], 'used_files'))
+if ARGV[6] == '1' then
+    local reserved_bytes, reserved_files = 0, 0
+    for _, reservation in ipairs(redis.call('ZRANGE', KEYS[3], 0, -1)) do
+        local reservation_bytes, reservation_files = string.match(reservation, ':(%d+):(%d+)$')
+        reserved_bytes = reserved_bytes + tonumber(reservation_bytes)
+        reserved_files = reserved_files + tonumber(reservation_files)
+    end
+    if bytes > 0 and used_bytes + reserved_bytes + bytes > tonumber(redis.call('HGET', KEYS[1], 'max_bytes')) then
+        return 0
+    end
+    if files > 0 and used_files + reserved_files + files > tonumber(redis.call('HGET', KEYS[1], 'max_files')) then
+        return -1
+    end
+end
+if ARGV[7] ~= '' then
+    redis.call('ZADD', KEYS[3], ARGV[8], ARGV[7])
+    redis.call('EXPIRE', KEYS[3], ARGV[4])
+else
+    redis.call('HSET', KEYS[1], 'used_bytes', math.max(0, used_bytes + bytes))
+    redis.call('HSET', KEYS[1], 'used_files', math.max(0, used_files + files))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[3])
+return 1
+"""
+
+# Seeds the counter hash unless another process already did
+_SEED_SCRIPT = """
+if ARGV[6] == '0' and redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'used_bytes', ARGV[1], 'used_files', ARGV[2],
+           'max_bytes', ARGV[3], 'max_files', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+class QuotaLimit(str, Enum):
+    """Quota limit that rejected a reservation."""
+    STORAGE = "storage"
+    FILES = "files"
+
+
+class QuotaExceededError(Exception):
+    """Raised when a reservation does not fit into the user's quota."""
+
+    def __init__(self, limit: QuotaLimit):
+        self.limit = limit
+        message = "Storage quota exceeded" if limit == QuotaLimit.STORAGE else "File count quota exceeded"
+        super().__init__(message)
+
+
+@dataclass
+class QuotaReservation:
+    """Quota held for an upload until its File record is committed."""
+    user_id: int
+    bytes: int
+    files: int
+    # Reservation in Redis; None when the quota row was charged directly
+    token: Optional[str] = None
+
+
+class StorageQuotaManager:
+    """
+    Atomic storage quota reservations.
+
+    Reservations count toward the limits immediately. A reservation that is
+    neither committed nor cancelled expires after the reservation timeout;
+    uploads whose File record exists but that are never completed stop
+    counting once the upload window has passed and the user's usage is
+    reconciled.
+    """
+
+    def __init__(self):
+        """Initialize quota manager."""
+        self.use_redis = settings.STORAGE_QUOTA_REDIS_ENABLED
+        self.cache_ttl = settings.STORAGE_QUOTA_CACHE_TTL
+        self.upload_window = timedelta(seconds=settings.UPLOAD_URL_EXPIRY_SECONDS)
+        self.reservation_timeout = settings.STORAGE_QUOTA_RESERVATION_TIMEOUT
+        self._apply_script = None
+        self._seed_script = None
+
+    # Reservations
+
+    def reserve(self, session: Session, user_id: int, bytes_delta: int, files_delta: int = 1) -> QuotaReservation:
+        """
+        Atomically reserve quota for an upload.
+
+        The reservation must be committed once the File record exists, or
+        cancelled if the upload is not created.
+
+        Args:
+            session: Database session
+            user_id: User ID
+            bytes_delta: Bytes to reserve
+            files_delta: Files to reserve
+
+        Returns:
+            QuotaReservation: The reservation
+
+        Raises:
+            QuotaExceededError: If the reservation does not fit
+        """
+        token = f"{uuid.uuid4().hex}:{bytes_delta}:{files_delta}"
+        if self._apply_cached(session, user_id, bytes_delta, files_delta, enforce=True, reservation=token):
+            return QuotaReservation(user_id, bytes_delta, files_delta, token)
+
+        self._apply_database(session, user_id, bytes_delta, files_delta, enforce=True)
+        return QuotaReservation(user_id, bytes_delta, files_delta)
+
+    def commit(self, session: Session, reservation: QuotaReservation):
+        """
+        Count a reservation as used once its File record is committed.
+
+        Args:
+            session: Database session
+            reservation: Reservation returned by ``reserve``
+        """
+        if reservation.token is None:
+            # The quota row was charged when reserving
+            return
+
+        if not self._apply_cached(session, reservation.user_id, reservation.bytes, reservation.files,
+                                  enforce=False, settle=reservation.token):
+            # The File record is counted when the user is next reconciled
+            logger.warning(f"Could not commit quota reservation for user {reservation.user_id}")
+
+    def cancel(self, session: Session, reservation: QuotaReservation):
+        """
+        Drop a reservation whose upload was not created.
+
+        Args:
+            session: Database session
+            reservation: Reservation returned by ``reserve``
+        """
+        if reservation.token is None:
+            self._apply_database(session, reservation.user_id, -reservation.bytes, -reservation.files,
+                                 enforce=False)
+            return
+
+        # If Redis is unavailable the reservation expires on its own
+        self._apply_cached(session, reservation.user_id, 0, 0, enforce=False, settle=reservation.token)
+
+    def release(self, session: Session, user_id: int, bytes_delta: int, files_delta: int = 1):
+        """
+        Release quota of a deleted file.
+
+        Args:
+            session: Database session
+            user_id: User ID
+            bytes_delta: Bytes to release
+            files_delta: Files to release
+        """
+        self.adjust(session, user_id, -bytes_delta, -files_delta)
+
+    def adjust(self, session: Session, user_id: int, bytes_delta: int, files_delta: int = 0):
+        """
+        Apply a correction to a user's usage without enforcing limits.
+
+        Used when a completed upload turns out to be a different size than
+        was reserved.
+        """
+        if bytes_delta == 0 and files_delta == 0:
+            return
+
+        # Corrections that grow usage are recorded even over the limit
+        if self._apply_cached(session, user_id, bytes_delta, files_delta, enforce=False):
+            return
+
+        self._apply_database(session, user_id, bytes_delta, files_delta, enforce=False)
+
+    def get_usage(self, session: Session, user_id: int) -> StorageQuotaPublic:
+        """
+        Get the user's quota with current usage.
+
+        Returns:
+            StorageQuotaPublic: Quota information; usage comes from the Redis
+            counters and open reservations when they are cached, which can be
+            ahead of the database row
+        """
+        quota = self._get_or_create_quota(session, user_id)
+        used_bytes, used_files = quota.used_storage_bytes, quota.used_files
+
+        cached = self._read_cached(user_id)
+        if cached:
+            used_bytes = cached["used_bytes"] + cached["reserved_bytes"]
+            used_files = cached["used_files"] + cached["reserved_files"]
+
+        return StorageQuotaPublic(
+            user_id=quota.user_id,
+            max_storage_bytes=quota.max_storage_bytes,
+            max_files=quota.max_files,
+            used_storage_bytes=used_bytes,
+            used_files=used_files
+        )
+
+    # Reconciliation
+
+    def reconcile(self, session: Session, user_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Recompute usage from actual File sizes and resynchronize the counters.
+
+        Open reservations are kept apart from the counters and still count
+        toward the limits afterwards. Uploads not completed within the
+        upload window are marked deleted first, and their users are always
+        reconciled, so their quota is given back with or without Redis.
+
+        Args:
+            session: Database session
+            user_ids: Users to reconcile (defaults to users with cached
+                reservations since the last run)
+
+        Returns:
+            Dict: Reconciliation statistics
+        """
+        abandoned_users, abandoned_uploads = self._expire_abandoned_uploads(session)
+        if user_ids is None:
+            user_ids = self._pop_dirty_users()
+        user_ids = sorted(set(user_ids) | set(abandoned_users))
+
+        corrected = 0
+        for user_id in user_ids:
+            quota, changed = self._sync_quota_row(session, user_id)
+            if changed:
+                corrected += 1
+            self._seed_cache(quota, overwrite=True)
+
+        return {
+            "users_reconciled": len(user_ids),
+            "users_corrected": corrected,
+            "uploads_expired": abandoned_uploads,
+        }
+
+    def _expire_abandoned_uploads(self, session: Session) -> Tuple[List[int], int]:
+        """
+        Mark uploads still pending after the upload window as deleted.
+
+        Their presigned URL has expired, so they can no longer complete.
+
+        Returns:
+            Tuple: Users who started them and the number of uploads
+        """
+        abandoned = and_(
+            File.status == FileStatus.UPLOADING,
+            File.created_at < datetime.utcnow() - self.upload_window
+        )
+        user_ids = list(session.exec(select(File.uploaded_by).where(abandoned).distinct()).all())
+        if not user_ids:
+            return [], 0
+
+        result = session.execute(
+            update(File).where(abandoned).values(status=FileStatus.DELETED, updated_at=datetime.utcnow())
+        )
+        session.commit()
+        logger.info(f"Expired {result.rowcount} abandoned uploads of {len(user_ids)} users")
+        return user_ids, result.rowcount
+
+    def _sync_quota_row(self, session: Session, user_id: int) -> Tuple[StorageQuota, bool]:
+        """
+        Write usage recomputed from File sizes to the quota row.
+
+        Returns:
+            Tuple: The quota record and whether its usage had drifted
+        """
+        quota = self._get_or_create_quota(session, user_id)
+        used_bytes, used_files = self._actual_usage(session, user_id)
+
+        changed = (quota.used_storage_bytes, quota.used_files) != (used_bytes, used_files)
+        if changed:
+            logger.info(
+                f"Reconciled storage quota for user {user_id}: "
+                f"{quota.used_storage_bytes}/{quota.used_files} -> {used_bytes}/{used_files}"
+            )
+
+        quota.used_storage_bytes = used_bytes
+        quota.used_files = used_files
+        quota.updated_at = datetime.utcnow()
+        session.add(quota)
+        session.commit()
+        return quota, changed
+
+    def _actual_usage(self, session: Session, user_id: int) -> Tuple[int, int]:
+        """Sum stored files plus uploads still inside their upload window."""
+        upload_cutoff = datetime.utcnow() - self.upload_window
+        used_bytes, used_files = session.exec(
+            select(func.coalesce(func.sum(File.file_size), 0), func.count(File.id)).where(
+                and_(
+                    File.uploaded_by == user_id,
+                    or_(
+                        File.status.in_([FileStatus.UPLOADED, FileStatus.PROCESSED]),
+                        and_(
+                            File.status == FileStatus.UPLOADING,
+                            File.created_at >= upload_cutoff
+                        )
+                    )
+                )
+            )
+        ).one()
+        return int(used_bytes or 0), int(used_files or 0)
+
+    # Redis fast path
+
+    def _apply_cached(self, session: Session, user_id: int, bytes_delta: int, files_delta: int,
+                      enforce: bool, reservation: Optional[str] = None,
+                      settle: Optional[str] = None) -> bool:
+        """
+        Apply a delta to the Redis counters.
+
+        Args:
+            enforce: Reject growing deltas that do not fit
+            reservation: Record the delta as this reservation instead
+            settle: Reservation to remove before applying the delta
+
+        Returns:
+            bool: False when Redis is unavailable and the database path
+            should be used instead
+        """
+        if not self.use_redis:
+            return False
+
+        try:
+            redis_client = get_redis_client()
+            if self._apply_script is None:
+                self._apply_script = redis_client.register_script(_APPLY_SCRIPT)
+
+            for _ in range(2):
+                now = time.time()
+                result = self._apply_script(
+                    keys=[self._key(user_id), DIRTY_USERS_KEY, self._reservations_key(user_id)],
+                    args=[
+                        bytes_delta, files_delta, user_id, self.cache_ttl, now,
+                        1 if enforce else 0, reservation or "", now + self.reservation_timeout,
+                        settle or ""
+                    ],
+                    client=redis_client
+                )
+                if result == -2:
+                    # Counters not cached yet: seed them from actual usage
+                    self._seed_from_database(session, user_id)
+                    continue
+                break
+        except Exception as e:
+            logger.warning(f"Redis quota path unavailable, using database: {e}")
+            return False
+
+        if result == 0:
+            raise QuotaExceededError(QuotaLimit.STORAGE)
+        if result == -1:
+            raise QuotaExceededError(QuotaLimit.FILES)
+        return result == 1
+
+    def _seed_from_database(self, session: Session, user_id: int):
+        """Seed the counter hash with usage recomputed from File sizes."""
+        quota, _ = self._sync_quota_row(session, user_id)
+        self._seed_cache(quota, overwrite=False)
+
+    def _seed_cache(self, quota: StorageQuota, overwrite: bool):
+        """Write the counters for a quota record to Redis."""
+        if not self.use_redis:
+            return
+
+        try:
+            redis_client = get_redis_client()
+            if self._seed_script is None:
+                self._seed_script = redis_client.register_script(_SEED_SCRIPT)
+            self._seed_script(
+                keys=[self._key(quota.user_id)],
+                args=[
+                    quota.used_storage_bytes, quota.used_files,
+                    quota.max_storage_bytes, quota.max_files,
+                    self.cache_ttl, 1 if overwrite else 0
+                ],
+                client=redis_client
+            )
+        except Exception as e:
+            logger.warning(f"Failed to seed quota counters for user {quota.user_id}: {e}")
+
+    def _read_cached(self, user_id: int) -> Optional[Dict[str, int]]:
+        """Read cached counters and open reservations for a user."""
+        if not self.use_redis:
+            return None
+
+        try:
+            redis_client = get_redis_client()
+            values = redis_client.hgetall(self._key(user_id))
+            reservations = redis_client.zrangebyscore(self._reservations_key(user_id), time.time(), "+inf")
+        except Exception:
+            return None
+
+        if not values:
+            return None
+        cached = {
+            (key.decode() if isinstance(key, bytes) else key): int(value)
+            for key, value in values.items()
+        }
+        cached["reserved_bytes"] = cached["reserved_files"] = 0
+        for reservation in reservations:
+            if isinstance(reservation, bytes):
+                reservation = reservation.decode()
+            _, reserved_bytes, reserved_files = reservation.split(":")
+            cached["reserved_bytes"] += int(reserved_bytes)
+            cached["reserved_files"] += int(reserved_files)
+        return cached
+
+    def _pop_dirty_users(self) -> List[int]:
+        """Take the set of users with reservations since the last reconciliation."""
+        if not self.use_redis:
+            return []
+
+        try:
+            redis_client = get_redis_client()
+            members = redis_client.spop(DIRTY_USERS_KEY, redis_client.scard(DIRTY_USERS_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Failed to read users pending quota reconciliation: {e}")
+            return []
+
+        return sorted(int(member) for member in members or [])
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{QUOTA_KEY_PREFIX}{user_id}"
+
+    @staticmethod
+    def _reservations_key(user_id: int) -> str:
+        return f"{RESERVATIONS_KEY_PREFIX}{user_id}"
+
+    # Database path
+
+    def _apply_database(self, session: Session, user_id: int, bytes_delta: int,
+                        files_delta: int, enforce: bool):
+        """Apply a delta with one conditional UPDATE on the quota row."""
+        conditions = [StorageQuota.user_id == user_id]
+        if enforce:
+            conditions.append(StorageQuota.used_storage_bytes + bytes_delta <= StorageQuota.max_storage_bytes)
+            conditions.append(StorageQuota.used_files + files_delta <= StorageQuota.max_files)
+
+        # Two-argument MAX() is SQLite's spelling of GREATEST()
+        clamp = func.max if session.get_bind().dialect.name == "sqlite" else func.greatest
+
+        statement = (
+            update(StorageQuota)
+            .where(and_(*conditions))
+            .values(
+                used_storage_bytes=clamp(0, StorageQuota.used_storage_bytes + bytes_delta),
+                used_files=clamp(0, StorageQuota.used_files + files_delta),
+                updated_at=datetime.utcnow()
+            )
+            .returning(StorageQuota.used_storage_bytes, StorageQuota.used_files)
+        )
+
+        for _ in range(2):
+            row = session.execute(statement).first()
+            session.commit()
+            if row is not None:
+                return
+
+            # No row updated: either the quota row does not exist yet or the
+            # reservation does not fit
+            quota = session.exec(
+                select(StorageQuota).where(StorageQuota.user_id == user_id)
+            ).first()
+            if quota is None:
+                self._get_or_create_quota(session, user_id)
+                continue
+            if not enforce:
+                return
+
+            if quota.used_storage_bytes + bytes_delta > quota.max_storage_bytes:
+                raise QuotaExceededError(QuotaLimit.STORAGE)
+            raise QuotaExceededError(QuotaLimit.FILES)
+
+    def _get_or_create_quota(self, session: Session, user_id: int) -> StorageQuota:
+        """Get the quota row for a user, creating it with default limits."""
+        quota = session.exec(
+            select(StorageQuota).where(StorageQuota.user_id == user_id)
+        ).first()
+
+        if not quota:
+            quota = StorageQuota(user_id=user_id)
+            session.add(quota)
+            session.commit()
+            session.refresh(quota)
+
+        return quota
+
+
+# Global quota manager instance
+_storage_quota_manager: Optional[StorageQuotaManager] = None
+
+
+def get_storage_quota_manager() -> StorageQuotaManager:
+    """
+    Get global storage quota manager instance.
+
+    Returns:
+        StorageQuotaManager: Quota manager
+    """
+    global _storage_quota_manager
+
+    if _storage_quota_manager is None:
+        _storage_quota_manager = StorageQuotaManager()
+
+    return _storage_quota_manager
+
+
+# Export manager
+__all__ = [
+    "StorageQuotaManager",
+    "QuotaExceededError",
+    "QuotaLimit",
+    "QuotaReservation",
+    "get_storage_quota_manager",
+]
@@ -15,6 +15,7 @@ from celery import group, chain, chord
 from celery.result import AsyncResult, GroupResult
 
 from ..core.celery_app import get_celery_app
+from ..core.celery_introspection import get_celery_introspection_service
 from ..tasks.ingest_tasks import process_file_upload, validate_document, extract_metadata, virus_scan_file
 from ..tasks.ocr_tasks import extract_text_from_pdf, extract_text_from_image, process_document_ocr
 from ..tasks.llm_tasks import analyze_contract_content, generate_contract_summary, extract_contract_entities
@@ -52,6 +53,7 @@ class TaskService:
     
     def __init__(self):
         self.celery_app = get_celery_app()
+        self.introspection = get_celery_introspection_service(self.celery_app)
     
     # File Processing Tasks
     
@@ -320,6 +322,71 @@ class TaskService:
             logger.error("Failed to submit document export", contract_id=contract_id, error=str(exc))
             raise
     
+    def submit_document_package(
+        self,
+        contract_ids: List[int],
+        user_id: int,
+        export_format: str = "pdf",
+        template_options: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        priority: TaskPriority = TaskPriority.NORMAL
+    ) -> Dict[str, Any]:
+        """
+        Submit a multi-document package (e.g. a closing package) for export.
+        
+        Each document is a separate export task in one Celery group, so the
+        documents render in parallel across export workers instead of one
+        after another.
+        
+        Args:
+            contract_ids: Database contract record IDs in package order
+            user_id: User requesting export
+            export_format: Export format (pdf, docx)
+            template_options: Formatting options applied to every document
+            include_metadata: Include contract metadata
+            priority: Task priority level
+            
+        Returns:
+            Dict: Task submission results with the group ID and one task ID per document
+        """
+        try:
+            logger.info(
+                "Submitting document package export",
+                contract_count=len(contract_ids),
+                user_id=user_id,
+                export_format=export_format,
+                priority=priority.name
+            )
+            
+            if export_format.lower() == "pdf":
+                task = generate_pdf_document
+            elif export_format.lower() == "docx":
+                task = generate_docx_document
+            else:
+                raise ValueError(f"Unsupported export format: {export_format}")
+            
+            package = group(
+                task.s(contract_id, user_id, template_options, include_metadata).set(priority=priority.value)
+                for contract_id in contract_ids
+            )
+            result = package.apply_async()
+            result.save()
+            
+            return {
+                "status": "submitted",
+                "group_id": result.id,
+                "task_ids": {
+                    contract_id: child.id for contract_id, child in zip(contract_ids, result.results)
+                },
+                "export_format": export_format,
+                "priority": priority.name,
+                "estimated_completion": (datetime.utcnow() + timedelta(minutes=2)).isoformat()
+            }
+            
+        except Exception as exc:
+            logger.error("Failed to submit document package export", contract_ids=contract_ids, error=str(exc))
+            raise
+    
     # Task Monitoring and Management
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
@@ -361,43 +428,38 @@ class TaskService:
                 "error": str(exc)
             }
     
-    def get_queue_status(self) -> Dict[str, Any]:
+    def get_queue_status(
+        self,
+        max_age_seconds: Optional[float] = None,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         Get status of all task queues.
         
+        Served from the cached introspection snapshot; a live sample is
+        only taken when no sufficiently fresh snapshot exists.
+        
+        Args:
+            max_age_seconds: Maximum acceptable snapshot age
+            refresh: Force a live sample
+        
         Returns:
             Dict: Queue status information
         """
         try:
-            inspect = self.celery_app.control.inspect()
-            
-            # Get active tasks
-            active_tasks = inspect.active()
-            
-            # Get scheduled tasks
-            scheduled_tasks = inspect.scheduled()
+            snapshot = self.introspection.get_snapshot(max_age_seconds, refresh)
             
-            # Get reserved tasks
-            reserved_tasks = inspect.reserved()
-            
-            # Get queue lengths (requires Redis inspection)
-            from ..core.redis_config import get_redis_client
-            redis_client = get_redis_client()
-            
-            queue_lengths = {}
-            for queue_name in ['ingest', 'ocr', 'llm', 'export', 'system']:
-                try:
-                    length = redis_client.llen(queue_name)
-                    queue_lengths[queue_name] = length
-                except Exception:
-                    queue_lengths[queue_name] = 0
+            active_tasks = snapshot.active_tasks
+            scheduled_tasks = snapshot.scheduled_tasks
+            reserved_tasks = snapshot.reserved_tasks
             
             return {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": snapshot.timestamp.isoformat(),
+                "snapshot_age_seconds": snapshot.age_seconds,
                 "active_tasks": active_tasks,
                 "scheduled_tasks": scheduled_tasks,
                 "reserved_tasks": reserved_tasks,
-                "queue_lengths": queue_lengths,
+                "queue_lengths": snapshot.queue_lengths,
                 "total_active": sum(len(tasks) for tasks in (active_tasks or {}).values()),
                 "total_scheduled": sum(len(tasks) for tasks in (scheduled_tasks or {}).values()),
                 "total_reserved": sum(len(tasks) for tasks in (reserved_tasks or {}).values())
@@ -445,31 +507,33 @@ class TaskService:
                 "timestamp": datetime.utcnow().isoformat()
             }
     
-    def get_worker_stats(self) -> Dict[str, Any]:
+    def get_worker_stats(
+        self,
+        max_age_seconds: Optional[float] = None,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         Get worker statistics and health information.
         
+        Args:
+            max_age_seconds: Maximum acceptable snapshot age
+            refresh: Force a live sample
+        
         Returns:
             Dict: Worker statistics
         """
         try:
-            inspect = self.celery_app.control.inspect()
-            
-            # Get worker stats
-            stats = inspect.stats()
-            
-            # Get registered tasks
-            registered = inspect.registered()
-            
-            # Get worker ping
-            ping = inspect.ping()
+            snapshot = self.introspection.get_snapshot(max_age_seconds, refresh)
             
             return {
-                "timestamp": datetime.utcnow().isoformat(),
-                "worker_stats": stats,
-                "registered_tasks": registered,
-                "worker_ping": ping,
-                "total_workers": len(ping or {})
+                "timestamp": snapshot.timestamp.isoformat(),
+                "snapshot_age_seconds": snapshot.age_seconds,
+                "worker_stats": snapshot.worker_stats,
+                "registered_tasks": snapshot.registered_tasks,
+                "worker_ping": snapshot.worker_ping,
+                "workers": snapshot.workers,
+                "total_workers": len(snapshot.worker_ping or {}),
+                "collector": self.introspection.get_metrics()
             }
             
         except Exception as exc:
@@ -0,0 +1,306 @@
+"""
+Materialized template inheritance resolution.
+
+Template families (national -> state -> brokerage) are flattened once into
+an "effective template" that merges variables, business rules, rulesets,
+schema and content along the full ancestor chain. The result is stored in
+Redis together with the version stamps of the chain, so contract generation
+reads a single precomputed record instead of walking and merging the chain.
+
+Every cached record registers itself as a dependent of each of its
+ancestors. Changing a template invalidates its own record and, through that
+dependents set, the records of all of its descendants. Reads additionally
+compare the stored stamps with the database, so a record outdated by a
+missed invalidation is rebuilt rather than served.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from sqlmodel import Session, select
+
+from ..core.redis_config import get_redis_client
+from ..models.template import Template
+
+logger = logging.getLogger(__name__)
+
+EFFECTIVE_KEY_PREFIX = "template:effective:"
+DEPENDENTS_KEY_PREFIX = "template:effective:dependents:"
+
+# Guard against cycles or runaway parent chains
+MAX_INHERITANCE_DEPTH = 16
+
+# Cached records are rebuilt at least this often even without invalidation
+EFFECTIVE_TEMPLATE_TTL = 24 * 3600
+
+
+def deep_merge_dict(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge two dictionaries, with values from override winning."""
+    result = base.copy()
+
+    for key, value in override.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = deep_merge_dict(result[key], value)
+        else:
+            result[key] = value
+
+    return result
+
+
+@dataclass
+class EffectiveTemplate:
+    """Template with its full ancestor chain merged in."""
+    template_id: int
+    chain: List[int]
+    fingerprint: str
+    # Version stamps of the chain, nearest first
+    stamps: List[str] = field(default_factory=list)
+    variables: List[Dict[str, Any]] = field(default_factory=list)
+    business_rules: Dict[str, Any] = field(default_factory=dict)
+    ruleset: Dict[str, Any] = field(default_factory=dict)
+    schema: Optional[Dict[str, Any]] = None
+    html_content: Optional[str] = None
+    docx_key: Optional[str] = None
+    resolved_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    @property
+    def depth(self) -> int:
+        """Number of ancestors merged into this template."""
+        return len(self.chain) - 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EffectiveTemplate":
+        return cls(**data)
+
+
+class TemplateInheritanceResolver:
+    """
+    Resolves and caches effective templates.
+
+    Resolution falls back to walking the chain on every call when Redis
+    is unavailable.
+    """
+
+    def __init__(self):
+        """Initialize resolver."""
+        self.metrics = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "invalidations": 0,
+        }
+
+    def resolve(self, template: Template, session: Session) -> EffectiveTemplate:
+        """
+        Get the effective template, materializing it on a cache miss.
+
+        Args:
+            template: Leaf template (already loaded by the caller)
+            session: Database session
+
+        Returns:
+            EffectiveTemplate: Flattened template
+        """
+        cached = self._read(template.id)
+        if cached and self._is_current(cached, template, session):
+            self.metrics["cache_hits"] += 1
+            return cached
+
+        self.metrics["cache_misses"] += 1
+        effective = self.materialize(template, session)
+        self._write(effective)
+        return effective
+
+    def materialize(self, template: Template, session: Session) -> EffectiveTemplate:
+        """
+        Flatten the ancestor chain of a template.
+
+        Args:
+            template: Leaf template
+            session: Database session
+
+        Returns:
+            EffectiveTemplate: Flattened template (not cached)
+        """
+        chain = self._load_chain(template, session)
+
+        variables: Dict[str, Dict[str, Any]] = {}
+        business_rules: Dict[str, Any] = {}
+        ruleset: Dict[str, Any] = {}
+        schema = None
+        html_content = None
+        docx_key = None
+
+        # Apply from the root down so that descendants override ancestors
+        for ancestor in reversed(chain):
+            for var in ancestor.variables or []:
+                if isinstance(var, dict) and var.get("name"):
+                    variables[var["name"]] = var
+            if ancestor.business_rules:
+                business_rules = deep_merge_dict(business_rules, ancestor.business_rules)
+            if ancestor.ruleset:
+                ruleset = deep_merge_dict(ruleset, ancestor.ruleset)
+            schema = ancestor.schema or schema
+            html_content = ancestor.html_content or html_content
+            docx_key = ancestor.docx_key or docx_key
+
+        return EffectiveTemplate(
+            template_id=template.id,
+            chain=[t.id for t in chain],
+            fingerprint=self._fingerprint(chain),
+            stamps=[self._stamp(t) for t in chain],
+            variables=list(variables.values()),
+            business_rules=business_rules,
+            ruleset=ruleset,
+            schema=schema,
+            html_content=html_content,
+            docx_key=docx_key,
+        )
+
+    def invalidate(self, template_id: int) -> int:
+        """
+        Drop the cached record of a template and of all its descendants.
+
+        Args:
+            template_id: Template that changed
+
+        Returns:
+            int: Number of cached records removed
+        """
+        try:
+            redis_client = get_redis_client()
+            dependents_key = f"{DEPENDENTS_KEY_PREFIX}{template_id}"
+            dependents = redis_client.smembers(dependents_key) or set()
+
+            keys = [f"{EFFECTIVE_KEY_PREFIX}{template_id}", dependents_key]
+            keys.extend(
+                f"{EFFECTIVE_KEY_PREFIX}{int(dependent)}" for dependent in dependents
+            )
+            removed = redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate effective template {template_id}: {e}")
+            return 0
+
+        self.metrics["invalidations"] += 1
+        logger.debug(f"Invalidated effective template {template_id} and {len(dependents)} dependents")
+        return removed
+
+    def _load_chain(self, template: Template, session: Session) -> List[Template]:
+        """Load the template followed by its ancestors, nearest first."""
+        chain = [template]
+        seen = {template.id}
+        parent_id = template.parent_template_id
+
+        while parent_id is not None:
+            if parent_id in seen or len(chain) >= MAX_INHERITANCE_DEPTH:
+                logger.warning(f"Template {template.id} has a cyclic or too deep inheritance chain")
+                break
+            parent = session.get(Template, parent_id)
+            if parent is None:
+                break
+            chain.append(parent)
+            seen.add(parent_id)
+            parent_id = parent.parent_template_id
+
+        return chain
+
+    def _is_current(self, cached: EffectiveTemplate, template: Template, session: Session) -> bool:
+        """
+        Check a cached record against the templates it was built from.
+
+        The leaf is compared directly; the ancestors' stamps are loaded with a
+        single narrow query instead of walking the chain.
+        """
+        if len(cached.stamps) != len(cached.chain) or cached.stamps[0] != self._stamp(template):
+            return False
+
+        ancestor_ids = cached.chain[1:]
+        if template.parent_template_id != (ancestor_ids[0] if ancestor_ids else None):
+            return False
+        if not ancestor_ids:
+            return True
+
+        rows = session.exec(
+            select(Template.id, Template.version, Template.updated_at, Template.created_at)
+            .where(Template.id.in_(ancestor_ids))
+        ).all()
+        current = {row.id: self._stamp(row) for row in rows}
+        return all(
+            current.get(ancestor_id) == stamp
+            for ancestor_id, stamp in zip(ancestor_ids, cached.stamps[1:])
+        )
+
+    @staticmethod
+    def _stamp(template: Template) -> str:
+        """Version stamp of a single template."""
+        updated_at = template.updated_at or template.created_at
+        return f"{template.id}:{template.version}:{updated_at.isoformat() if updated_at else ''}"
+
+    def _fingerprint(self, chain: List[Template]) -> str:
+        """Fingerprint of the ancestor chain, ending in the leaf's own stamp."""
+        ancestors = "|".join(self._stamp(t) for t in reversed(chain[1:]))
+        digest = hashlib.sha256(ancestors.encode()).hexdigest()[:16]
+        return f"{digest}/{self._stamp(chain[0])}"
+
+    def _read(self, template_id: int) -> Optional[EffectiveTemplate]:
+        """Read a cached effective template."""
+        try:
+            raw = get_redis_client().get(f"{EFFECTIVE_KEY_PREFIX}{template_id}")
+            if not raw:
+                return None
+            return EffectiveTemplate.from_dict(json.loads(raw))
+        except Exception as e:
+            logger.warning(f"Failed to read effective template {template_id}: {e}")
+            return None
+
+    def _write(self, effective: EffectiveTemplate):
+        """Store an effective template and register it with its ancestors."""
+        try:
+            redis_client = get_redis_client()
+            pipe = redis_client.pipeline()
+            pipe.set(
+                f"{EFFECTIVE_KEY_PREFIX}{effective.template_id}",
+                json.dumps(effective.to_dict(), default=str),
+                ex=EFFECTIVE_TEMPLATE_TTL
+            )
+            for ancestor_id in effective.chain[1:]:
+                dependents_key = f"{DEPENDENTS_KEY_PREFIX}{ancestor_id}"
+                pipe.sadd(dependents_key, effective.template_id)
+                pipe.expire(dependents_key, EFFECTIVE_TEMPLATE_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to store effective template {effective.template_id}: {e}")
+
+
+# Global resolver instance
+_template_inheritance_resolver: Optional[TemplateInheritanceResolver] = None
+
+
+def get_template_inheritance_resolver() -> TemplateInheritanceResolver:
+    """
+    Get global template inheritance resolver instance.
+
+    Returns:
+        TemplateInheritanceResolver: Effective template resolver
+    """
+    global _template_inheritance_resolver
+
+    if _template_inheritance_resolver is None:
+        _template_inheritance_resolver = TemplateInheritanceResolver()
+
+    return _template_inheritance_resolver
+
+
+# Export resolver
+__all__ = [
+    "EffectiveTemplate",
+    "TemplateInheritanceResolver",
+    "deep_merge_dict",
+    "get_template_inheritance_resolver",
+]
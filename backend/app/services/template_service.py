@@ -16,6 +16,7 @@ from fastapi import HTTPException, status
 from ..core.database import get_session_context
 from ..core.storage import get_storage_client, StorageError
 from ..core.template_engine import get_template_engine, TemplateRenderingError
+from .template_inheritance import get_template_inheritance_resolver, deep_merge_dict
 from ..models.template import (
     Template, TemplateCreate, TemplateUpdate, TemplatePublic, TemplateWithDetails,
     TemplateVersion, TemplateVariable, TemplateStatus, TemplateType,
@@ -50,6 +51,7 @@ class TemplateService:
         """Initialize template service."""
         self.storage_client = get_storage_client()
         self.template_engine = get_template_engine()
+        self.inheritance_resolver = get_template_inheritance_resolver()
 
     async def create_template_with_inheritance(
         self,
@@ -505,6 +507,9 @@ class TemplateService:
             session.commit()
             session.refresh(template)
 
+            # Drop materialized inheritance for this template and its descendants
+            self.inheritance_resolver.invalidate(template.id)
+
             # Create version if content changed and requested
             if create_version and self._has_content_changed(original_content, template):
                 change_summary = template_update.version_notes or "Template updated"
@@ -600,6 +605,8 @@ class TemplateService:
                 session.delete(template)
                 session.commit()
 
+            self.inheritance_resolver.invalidate(template_id)
+
             # Log deletion
             audit_log = AuditLog(
                 user_id=user.id,
@@ -915,15 +922,7 @@ class TemplateService:
 
     def _deep_merge_dict(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
         """Deep merge two dictionaries."""
-        result = base.copy()
-
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge_dict(result[key], value)
-            else:
-                result[key] = value
-
-        return result
+        return deep_merge_dict(base, override)
 
 
 # Global template service instance
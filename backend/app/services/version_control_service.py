@@ -8,7 +8,7 @@ diff generation, rollback functionality, and change comparison.
 import logging
 import json
 import hashlib
-import difflib
+import asyncio
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from sqlmodel import Session, select, and_, or_, func
@@ -20,6 +20,8 @@ from ..models.template import Template
 from ..models.version import Version, VersionCreate, VersionUpdate, VersionPublic
 from ..models.user import User
 from ..models.audit_log import AuditLog, AuditAction
+from .diff_engine import get_diff_engine
+from .version_store import get_version_store, is_payload
 
 logger = logging.getLogger(__name__)
 
@@ -96,14 +98,23 @@ class VersionControlService:
                 )
             ).first() or 0
 
-            # Generate content hash
-            content_hash = await self._generate_content_hash(entity, content_data)
+            # Contract content is stored as a snapshot, delta or reference
+            diff = change_summary
+            if entity_type == "contract":
+                diff, content_hash = get_version_store().prepare(
+                    session,
+                    entity_id,
+                    version_count + 1,
+                    content_data if content_data is not None else entity.variables
+                )
+            else:
+                content_hash = await self._generate_content_hash(entity, content_data)
 
             # Create version
             version_data = VersionCreate(
                 contract_id=entity_id if entity_type == "contract" else None,
                 number=version_count + 1,
-                diff=change_summary,
+                diff=diff,
                 created_by=user.email,
                 change_summary=change_summary,
                 content_hash=content_hash,
@@ -263,8 +274,8 @@ class VersionControlService:
                     )
 
             # Get content for both versions
-            content1 = await self._get_version_content(version1, entity_type, session)
-            content2 = await self._get_version_content(version2, entity_type, session)
+            contents = await self._get_versions_content([version1, version2], entity_type, session)
+            content1, content2 = contents[version1.id], contents[version2.id]
 
             # Generate diff
             diff_result = await self._generate_content_diff(
@@ -429,28 +440,34 @@ class VersionControlService:
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=f"Version {version_id} not found"
                     )
+                if entity_type == "contract" and version.contract_id != entity_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Versions do not belong to the specified entity"
+                    )
                 versions.append(version)
 
+            # Rebuild every version's content once, reading a single chain
+            contents = await self._get_versions_content(versions, entity_type, session)
+
             # Generate comparison matrix
             comparison_matrix = []
             for i, version1 in enumerate(versions):
                 for j, version2 in enumerate(versions):
                     if i < j:  # Avoid duplicate comparisons
-                        diff_result = await self.generate_diff(
-                            entity_type,
-                            entity_id,
-                            version1.id,
-                            version2.id,
-                            user,
-                            session,
-                            "summary"
+                        diff_result = await self._generate_content_diff(
+                            contents[version1.id],
+                            contents[version2.id],
+                            "summary",
+                            version1,
+                            version2
                         )
                         comparison_matrix.append({
                             "version1_id": version1.id,
                             "version2_id": version2.id,
-                            "changes_count": len(diff_result["diff"].get("changes", [])),
+                            "changes_count": len(diff_result.get("changes", [])),
                             "similarity_score": await self._calculate_similarity_score(
-                                version1, version2, entity_type, session
+                                contents[version1.id], contents[version2.id]
                             )
                         })
 
@@ -541,9 +558,12 @@ class VersionControlService:
     ) -> str:
         """Get content for a specific version."""
         try:
-            # For now, get current entity content
-            # In production, store version snapshots
             if entity_type == "contract":
+                content = get_version_store().load_content(session, version)
+                if content is not None:
+                    return content
+
+                # Versions created before content was stored
                 entity = session.get(Contract, version.contract_id)
                 if entity and entity.variables:
                     return json.dumps(entity.variables, indent=2)
@@ -554,6 +574,27 @@ class VersionControlService:
             logger.warning(f"Failed to get version content: {e}")
             return f"Version {version.number} - content unavailable"
 
+    async def _get_versions_content(
+        self,
+        versions: List[Version],
+        entity_type: str,
+        session: Session
+    ) -> Dict[int, str]:
+        """Get content for several versions of one entity, keyed by version ID."""
+        stored: Dict[int, Optional[str]] = {}
+        if entity_type == "contract" and versions:
+            stored = get_version_store().load_contents(
+                session, versions[0].contract_id, [version.number for version in versions]
+            )
+
+        contents = {}
+        for version in versions:
+            content = stored.get(version.number)
+            if content is None:
+                content = await self._get_version_content(version, entity_type, session)
+            contents[version.id] = content
+        return contents
+
     async def _generate_content_diff(
         self,
         content1: str,
@@ -564,13 +605,11 @@ class VersionControlService:
     ) -> Dict[str, Any]:
         """Generate diff between two content strings."""
         try:
-            lines1 = content1.splitlines(keepends=True)
-            lines2 = content2.splitlines(keepends=True)
+            # Line diffs are cached by content, so repeated views reuse them
+            diff = await asyncio.to_thread(get_diff_engine().diff_lines, content1, content2)
 
             if diff_format == "unified":
-                diff_lines = list(difflib.unified_diff(
-                    lines1,
-                    lines2,
+                diff_lines = list(diff.unified(
                     fromfile=f"Version {version1.number}",
                     tofile=f"Version {version2.number}",
                     lineterm=""
@@ -582,9 +621,7 @@ class VersionControlService:
                 }
 
             elif diff_format == "context":
-                diff_lines = list(difflib.context_diff(
-                    lines1,
-                    lines2,
+                diff_lines = list(diff.context(
                     fromfile=f"Version {version1.number}",
                     tofile=f"Version {version2.number}",
                     lineterm=""
@@ -595,10 +632,7 @@ class VersionControlService:
                 }
 
             elif diff_format == "html":
-                differ = difflib.HtmlDiff()
-                html_diff = differ.make_file(
-                    lines1,
-                    lines2,
+                html_diff = diff.html(
                     fromdesc=f"Version {version1.number}",
                     todesc=f"Version {version2.number}"
                 )
@@ -609,7 +643,7 @@ class VersionControlService:
 
             else:  # summary
                 changes = []
-                for line in difflib.unified_diff(lines1, lines2, lineterm=""):
+                for line in diff.unified(lineterm=""):
                     if line.startswith('+') and not line.startswith('+++'):
                         changes.append({"type": "addition", "content": line[1:]})
                     elif line.startswith('-') and not line.startswith('---'):
@@ -652,20 +686,12 @@ class VersionControlService:
 
         return changes
 
-    async def _calculate_similarity_score(
-        self,
-        version1: Version,
-        version2: Version,
-        entity_type: str,
-        session: Session
-    ) -> float:
-        """Calculate similarity score between two versions."""
+    async def _calculate_similarity_score(self, content1: str, content2: str) -> float:
+        """Calculate similarity score between the contents of two versions."""
         try:
-            content1 = await self._get_version_content(version1, entity_type, session)
-            content2 = await self._get_version_content(version2, entity_type, session)
-
-            # Simple similarity based on difflib
-            similarity = difflib.SequenceMatcher(None, content1, content2).ratio()
+            # Unrelated contents are rejected on a shingle estimate; others
+            # are scored on the (cached) line diff
+            similarity = await asyncio.to_thread(get_diff_engine().similarity, content1, content2)
             return round(similarity * 100, 2)
 
         except Exception as e:
@@ -680,10 +706,18 @@ class VersionControlService:
     ):
         """Restore entity to target version state."""
         try:
-            # This is a simplified implementation
-            # In production, restore from version snapshots
+            content = None
+            if isinstance(entity, Contract):
+                content = get_version_store().load_content(session, target_version)
+
+            if content is not None:
+                entity.variables = json.loads(content)
+            else:
+                logger.warning(
+                    f"Version {target_version.number} has no stored content; "
+                    "only the entity timestamp is updated"
+                )
 
-            # Update entity timestamp
             entity.updated_at = datetime.utcnow()
             session.add(entity)
             session.commit()
@@ -699,7 +733,8 @@ class VersionControlService:
             created_at=version.created_at,
             contract_id=version.contract_id,
             number=version.number,
-            diff=version.diff,
+            # Stored content stays internal; the summary was the diff text
+            diff=version.change_summary if is_payload(version.diff) else version.diff,
             created_by=version.created_by,
             change_summary=version.change_summary,
             content_hash=version.content_hash,
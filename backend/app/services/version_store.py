@@ -0,0 +1,263 @@
+"""
+Delta-compressed storage of contract version content.
+
+The content of a contract version is its variables as indented, key-sorted
+JSON. Instead of a full copy per version, each version stores one of:
+
+- a full snapshot, for version 1 and every ``VERSION_SNAPSHOT_INTERVAL``
+  versions after it;
+- a forward line delta from the previous version;
+- a reference to an earlier version with the same content hash, as
+  created by rollbacks and backups of unchanged contracts.
+
+Payloads are zlib-compressed JSON kept in the version's ``diff`` column
+behind a ``vstore:`` prefix; rows without the prefix predate this format
+and have no stored content. Version ``n`` is rebuilt from the snapshot at
+``snapshot_number(n)`` and the deltas after it, all loaded by one query
+over that range.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import Session, select, and_
+
+from ..core.config import get_settings
+from ..models.version import Version
+from .diff_engine import diff_opcodes
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PAYLOAD_PREFIX = "vstore:1:"
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+REFERENCE = "ref"
+
+
+def render_content(variables: Optional[Dict[str, Any]]) -> str:
+    """Canonical text of a contract's versioned content."""
+    return json.dumps(variables or {}, indent=2, sort_keys=True, default=str)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def is_payload(diff: Optional[str]) -> bool:
+    """Whether a version's ``diff`` column holds stored content."""
+    return bool(diff) and diff.startswith(PAYLOAD_PREFIX)
+
+
+def encode_payload(payload: Dict[str, Any]) -> str:
+    packed = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 9)
+    return PAYLOAD_PREFIX + base64.b64encode(packed).decode("ascii")
+
+
+def decode_payload(diff: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode a stored payload, or None for legacy and unreadable rows."""
+    if not is_payload(diff):
+        return None
+    try:
+        return json.loads(zlib.decompress(base64.b64decode(diff[len(PAYLOAD_PREFIX):])))
+    except (ValueError, zlib.error) as e:
+        logger.warning(f"Unreadable version payload: {e}")
+        return None
+
+
+def make_delta(base: str, content: str) -> List[list]:
+    """
+    Forward line delta turning ``base`` into ``content``.
+
+    Operations are ``["=", n]`` (keep n lines), ``["-", n]`` (skip n lines)
+    and ``["+", lines]`` (insert lines).
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = content.splitlines(keepends=True)
+    ops: List[list] = []
+    for tag, i1, i2, j1, j2 in diff_opcodes(list(map(hash, base_lines)), list(map(hash, lines))):
+        if tag == "equal":
+            ops.append(["=", i2 - i1])
+            continue
+        if tag in ("replace", "delete"):
+            ops.append(["-", i2 - i1])
+        if tag in ("replace", "insert"):
+            ops.append(["+", lines[j1:j2]])
+    return ops
+
+
+def apply_delta(base: str, ops: Iterable[list]) -> str:
+    base_lines = base.splitlines(keepends=True)
+    position = 0
+    parts: List[str] = []
+    for op, value in ops:
+        if op == "=":
+            parts.extend(base_lines[position:position + value])
+            position += value
+        elif op == "-":
+            position += value
+        else:
+            parts.extend(value)
+    return "".join(parts)
+
+
+class VersionStore:
+    """Writes and rebuilds delta-compressed contract version content."""
+
+    def __init__(self, snapshot_interval: Optional[int] = None, cache_size: Optional[int] = None):
+        self.snapshot_interval = max(1, snapshot_interval or settings.VERSION_SNAPSHOT_INTERVAL)
+        self.cache_size = cache_size or settings.VERSION_CONTENT_CACHE_SIZE
+        # (contract_id, number) -> (content hash, content)
+        self._cache: "OrderedDict[Tuple[int, int], Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def snapshot_number(self, number: int) -> int:
+        """Number of the snapshot version ``number`` is rebuilt from."""
+        return number - (number - 1) % self.snapshot_interval
+
+    def _cache_get(self, contract_id: int, number: int, digest: Optional[str]) -> Optional[str]:
+        with self._lock:
+            cached = self._cache.get((contract_id, number))
+            if cached is None or cached[0] != digest:
+                return None
+            self._cache.move_to_end((contract_id, number))
+            return cached[1]
+
+    def _cache_put(self, contract_id: int, number: int, digest: str, content: str) -> None:
+        with self._lock:
+            self._cache[(contract_id, number)] = (digest, content)
+            self._cache.move_to_end((contract_id, number))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def prepare(
+        self,
+        session: Session,
+        contract_id: int,
+        number: int,
+        variables: Optional[Dict[str, Any]]
+    ) -> Tuple[str, str]:
+        """
+        Build the stored payload of a new version.
+
+        Args:
+            session: Database session
+            contract_id: Contract the version belongs to
+            number: Number the new version will get
+            variables: Contract variables to version
+
+        Returns:
+            Tuple[str, str]: Payload for the ``diff`` column and content hash
+        """
+        content = render_content(variables)
+        digest = content_hash(content)
+        payload = None
+
+        # Same content as an earlier version: store a reference
+        duplicate = session.exec(
+            select(Version).where(
+                and_(Version.contract_id == contract_id,
+                     Version.content_hash == digest,
+                     Version.number < number)
+            ).order_by(Version.number.desc())
+        ).first()
+        if duplicate is not None:
+            stored = decode_payload(duplicate.diff)
+            if stored is not None:
+                target = stored["number"] if stored["kind"] == REFERENCE else duplicate.number
+                payload = {"kind": REFERENCE, "number": target}
+
+        if payload is None and number != self.snapshot_number(number):
+            previous = self.load_contents(session, contract_id, [number - 1]).get(number - 1)
+            if previous is not None:
+                payload = {"kind": DELTA, "ops": make_delta(previous, content)}
+
+        encoded = encode_payload(payload) if payload is not None else None
+        snapshot = encode_payload({"kind": SNAPSHOT, "content": content})
+        if encoded is None or (payload["kind"] == DELTA and len(encoded) >= len(snapshot)):
+            # First version, interval boundary, unreadable predecessor, or a
+            # delta no smaller than the content itself
+            encoded = snapshot
+
+        self._cache_put(contract_id, number, digest, content)
+        return encoded, digest
+
+    def load_contents(self, session: Session, contract_id: int, numbers: Iterable[int]) -> Dict[int, Optional[str]]:
+        """
+        Rebuild the content of several versions of a contract.
+
+        Only the versions from the snapshot of the lowest requested number
+        up to the highest one are read, in a single query.
+
+        Returns:
+            Dict[int, Optional[str]]: Content by version number; None where
+            the version has no stored content
+        """
+        wanted = set(numbers)
+        if not wanted:
+            return {}
+
+        rows = session.exec(
+            select(Version).where(
+                and_(Version.contract_id == contract_id,
+                     Version.number >= self.snapshot_number(min(wanted)),
+                     Version.number <= max(wanted))
+            ).order_by(Version.number)
+        ).all()
+
+        contents: Dict[int, Optional[str]] = {number: None for number in wanted}
+        current: Optional[str] = None
+        previous_number = None
+        for row in rows:
+            cached = self._cache_get(contract_id, row.number, row.content_hash)
+            if cached is not None:
+                current = cached
+            else:
+                payload = decode_payload(row.diff)
+                kind = payload.get("kind") if payload else None
+                if kind == SNAPSHOT:
+                    current = payload["content"]
+                elif kind == DELTA and current is not None and previous_number == row.number - 1:
+                    current = apply_delta(current, payload["ops"])
+                elif kind == REFERENCE:
+                    current = self.load_contents(session, contract_id, [payload["number"]]).get(payload["number"])
+                else:
+                    current = None
+
+                if current is not None and content_hash(current) != row.content_hash:
+                    logger.warning(f"Version {row.number} of contract {contract_id} failed its content hash check")
+                    current = None
+
+            if row.number in wanted:
+                contents[row.number] = current
+                if current is not None and cached is None:
+                    self._cache_put(contract_id, row.number, row.content_hash, current)
+            previous_number = row.number
+
+        return contents
+
+    def load_content(self, session: Session, version: Version) -> Optional[str]:
+        """Rebuild the content of one version, or None if it has none stored."""
+        cached = self._cache_get(version.contract_id, version.number, version.content_hash)
+        if cached is not None:
+            return cached
+        return self.load_contents(session, version.contract_id, [version.number]).get(version.number)
+
+
+# Global version store instance
+_version_store: Optional[VersionStore] = None
+
+
+def get_version_store() -> VersionStore:
+    """Get the global version store."""
+    global _version_store
+    if _version_store is None:
+        _version_store = VersionStore()
+    return _version_store
@@ -14,21 +14,27 @@ from io import BytesIO
 
 from celery import current_task
 import structlog
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from docx import Document
-from docx.shared import Inches
 
 from ..core.celery_app import celery_app, DatabaseTask
-from ..core.storage import get_storage_client
+from ..services.export_artifacts import get_export_artifact_store
 from ..models.contract import Contract
 from ..models.audit_log import AuditLog, AuditAction
 
 logger = structlog.get_logger(__name__)
 
 
+def _contract_metadata_lines(contract: Contract) -> List[str]:
+    """Contract information lines included in exported documents."""
+    lines = [
+        f"Contract ID: {contract.id}",
+        f"Created: {contract.created_at.strftime('%Y-%m-%d %H:%M:%S') if contract.created_at else 'Unknown'}",
+        f"Status: {contract.status}",
+        f"Deal ID: {contract.deal_id}" if contract.deal_id else None,
+        f"Template ID: {contract.template_id}" if contract.template_id else None
+    ]
+    return [line for line in lines if line]
+
+
 @celery_app.task(bind=True, base=DatabaseTask, name="app.tasks.export_tasks.generate_pdf_document")
 def generate_pdf_document(
     self,
@@ -49,6 +55,12 @@ def generate_pdf_document(
     Returns:
         Dict: Generation results with storage information
     """
+    # Rendering libraries are imported here so that the API process, which
+    # only submits these tasks, never loads them.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
     try:
         logger.info(
             "Starting PDF document generation",
@@ -68,77 +80,72 @@ def generate_pdf_document(
         font_size = options.get("font_size", 12)
         margins = options.get("margins", {"top": 72, "bottom": 72, "left": 72, "right": 72})
         
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=page_size,
-            topMargin=margins["top"],
-            bottomMargin=margins["bottom"],
-            leftMargin=margins["left"],
-            rightMargin=margins["right"]
-        )
-        
-        # Build PDF content
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title
         title = f"Real Estate Contract - {contract.title or 'Untitled'}"
-        story.append(Paragraph(title, styles['Title']))
-        story.append(Spacer(1, 12))
-        
-        # Contract metadata
-        if include_metadata and contract.metadata:
-            story.append(Paragraph("Contract Information", styles['Heading2']))
+        metadata_info = _contract_metadata_lines(contract) if include_metadata and contract.metadata else []
+        content = contract.content or "No content available"
+        artifact_metadata = {"contract_id": str(contract_id), "generated_by": str(user_id)}
+        
+        def render() -> bytes:
+            # Create PDF in memory
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(
+                buffer,
+                pagesize=page_size,
+                topMargin=margins["top"],
+                bottomMargin=margins["bottom"],
+                leftMargin=margins["left"],
+                rightMargin=margins["right"]
+            )
             
-            metadata_info = [
-                f"Contract ID: {contract.id}",
-                f"Created: {contract.created_at.strftime('%Y-%m-%d %H:%M:%S') if contract.created_at else 'Unknown'}",
-                f"Status: {contract.status}",
-                f"Deal ID: {contract.deal_id}" if contract.deal_id else None,
-                f"Template ID: {contract.template_id}" if contract.template_id else None
-            ]
+            # Build PDF content
+            story = []
+            styles = getSampleStyleSheet()
+            
+            # Title
+            story.append(Paragraph(title, styles['Title']))
+            story.append(Spacer(1, 12))
             
-            for info in metadata_info:
-                if info:
+            # Contract metadata
+            if metadata_info:
+                story.append(Paragraph("Contract Information", styles['Heading2']))
+                for info in metadata_info:
                     story.append(Paragraph(info, styles['Normal']))
+                story.append(Spacer(1, 12))
             
-            story.append(Spacer(1, 12))
-        
-        # Contract content
-        story.append(Paragraph("Contract Content", styles['Heading2']))
-        story.append(Spacer(1, 6))
-        
-        # Split content into paragraphs and add to PDF
-        content = contract.content or "No content available"
-        paragraphs = content.split('\n\n')
-        
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                story.append(Paragraph(paragraph.strip(), styles['Normal']))
-                story.append(Spacer(1, 6))
+            # Contract content
+            story.append(Paragraph("Contract Content", styles['Heading2']))
+            story.append(Spacer(1, 6))
+            
+            # Split content into paragraphs and add to PDF
+            for paragraph in content.split('\n\n'):
+                if paragraph.strip():
+                    story.append(Paragraph(paragraph.strip(), styles['Normal']))
+                    story.append(Spacer(1, 6))
+            
+            # Build PDF
+            doc.build(story)
+            artifact_metadata["page_count"] = str(len(story))
+            
+            pdf_content = buffer.getvalue()
+            buffer.close()
+            return pdf_content
         
-        # Build PDF
+        # Unchanged contracts map to an existing artifact and are neither
+        # rendered nor uploaded again
         start_time = datetime.utcnow()
-        doc.build(story)
+        artifact, reused = get_export_artifact_store().get_or_create(
+            f"contract:{contract_id}:export",
+            "\n\n".join([title, *metadata_info, content]),
+            "pdf",
+            {"renderer": "reportlab", "template_options": options, "include_metadata": include_metadata},
+            render,
+            artifact_metadata
+        )
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
-        # Get PDF content
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        
-        # Store PDF in storage
-        storage_client = get_storage_client()
+        storage_key = artifact["storage_key"]
+        page_count = artifact.get("metadata", {}).get("page_count")
         filename = f"contract_{contract_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-        storage_key = storage_client.generate_storage_key(filename, "pdf", user_id)
-        
-        upload_result = storage_client.upload_file(
-            BytesIO(pdf_content),
-            storage_key,
-            "application/pdf",
-            {"contract_id": str(contract_id), "generated_by": str(user_id)}
-        )
         
         # Create audit log
         audit_log = AuditLog(
@@ -151,8 +158,10 @@ def generate_pdf_document(
             meta={
                 "contract_id": contract_id,
                 "export_format": "pdf",
-                "file_size": len(pdf_content),
+                "file_size": artifact["size"],
                 "storage_key": storage_key,
+                "artifact_hash": artifact["artifact_hash"],
+                "cache_hit": reused,
                 "processing_time": processing_time
             }
         )
@@ -164,11 +173,13 @@ def generate_pdf_document(
             "contract_id": contract_id,
             "format": "pdf",
             "storage_key": storage_key,
-            "file_size": len(pdf_content),
+            "file_size": artifact["size"],
             "filename": filename,
             "metadata": {
                 "processing_time": processing_time,
-                "page_count": len(story),
+                "cache_hit": reused,
+                "artifact_hash": artifact["artifact_hash"],
+                "page_count": int(page_count) if page_count else None,
                 "generation_timestamp": datetime.utcnow().isoformat(),
                 "task_id": self.request.id
             }
@@ -177,7 +188,8 @@ def generate_pdf_document(
         logger.info(
             "PDF document generation completed",
             contract_id=contract_id,
-            file_size=len(pdf_content),
+            file_size=artifact["size"],
+            cache_hit=reused,
             processing_time=processing_time
         )
         
@@ -229,6 +241,8 @@ def generate_docx_document(
     Returns:
         Dict: Generation results with storage information
     """
+    from docx import Document
+
     try:
         logger.info(
             "Starting DOCX document generation",
@@ -242,60 +256,52 @@ def generate_docx_document(
         if not contract:
             raise ValueError(f"Contract record not found: {contract_id}")
         
-        # Create DOCX document
-        doc = Document()
-        
-        # Add title
         title = f"Real Estate Contract - {contract.title or 'Untitled'}"
-        doc.add_heading(title, 0)
+        metadata_info = _contract_metadata_lines(contract) if include_metadata and contract.metadata else []
+        content = contract.content or "No content available"
         
-        # Add contract metadata
-        if include_metadata and contract.metadata:
-            doc.add_heading('Contract Information', level=1)
+        def render() -> bytes:
+            # Create DOCX document
+            doc = Document()
             
-            metadata_info = [
-                f"Contract ID: {contract.id}",
-                f"Created: {contract.created_at.strftime('%Y-%m-%d %H:%M:%S') if contract.created_at else 'Unknown'}",
-                f"Status: {contract.status}",
-                f"Deal ID: {contract.deal_id}" if contract.deal_id else None,
-                f"Template ID: {contract.template_id}" if contract.template_id else None
-            ]
+            # Add title
+            doc.add_heading(title, 0)
             
-            for info in metadata_info:
-                if info:
+            # Add contract metadata
+            if metadata_info:
+                doc.add_heading('Contract Information', level=1)
+                for info in metadata_info:
                     doc.add_paragraph(info)
-        
-        # Add contract content
-        doc.add_heading('Contract Content', level=1)
-        
-        content = contract.content or "No content available"
-        paragraphs = content.split('\n\n')
-        
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                doc.add_paragraph(paragraph.strip())
-        
-        # Save to memory buffer
+            
+            # Add contract content
+            doc.add_heading('Contract Content', level=1)
+            
+            for paragraph in content.split('\n\n'):
+                if paragraph.strip():
+                    doc.add_paragraph(paragraph.strip())
+            
+            # Save to memory buffer
+            buffer = BytesIO()
+            doc.save(buffer)
+            docx_content = buffer.getvalue()
+            buffer.close()
+            return docx_content
+        
+        # Unchanged contracts map to an existing artifact and are neither
+        # rendered nor uploaded again
         start_time = datetime.utcnow()
-        buffer = BytesIO()
-        doc.save(buffer)
+        artifact, reused = get_export_artifact_store().get_or_create(
+            f"contract:{contract_id}:export",
+            "\n\n".join([title, *metadata_info, content]),
+            "docx",
+            {"renderer": "python-docx", "template_options": template_options or {}, "include_metadata": include_metadata},
+            render,
+            {"contract_id": str(contract_id), "generated_by": str(user_id)}
+        )
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
-        # Get DOCX content
-        docx_content = buffer.getvalue()
-        buffer.close()
-        
-        # Store DOCX in storage
-        storage_client = get_storage_client()
+        storage_key = artifact["storage_key"]
         filename = f"contract_{contract_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.docx"
-        storage_key = storage_client.generate_storage_key(filename, "docx", user_id)
-        
-        upload_result = storage_client.upload_file(
-            BytesIO(docx_content),
-            storage_key,
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            {"contract_id": str(contract_id), "generated_by": str(user_id)}
-        )
         
         # Create audit log
         audit_log = AuditLog(
@@ -308,8 +314,10 @@ def generate_docx_document(
             meta={
                 "contract_id": contract_id,
                 "export_format": "docx",
-                "file_size": len(docx_content),
+                "file_size": artifact["size"],
                 "storage_key": storage_key,
+                "artifact_hash": artifact["artifact_hash"],
+                "cache_hit": reused,
                 "processing_time": processing_time
             }
         )
@@ -321,10 +329,12 @@ def generate_docx_document(
             "contract_id": contract_id,
             "format": "docx",
             "storage_key": storage_key,
-            "file_size": len(docx_content),
+            "file_size": artifact["size"],
             "filename": filename,
             "metadata": {
                 "processing_time": processing_time,
+                "cache_hit": reused,
+                "artifact_hash": artifact["artifact_hash"],
                 "generation_timestamp": datetime.utcnow().isoformat(),
                 "task_id": self.request.id
             }
@@ -333,7 +343,8 @@ def generate_docx_document(
         logger.info(
             "DOCX document generation completed",
             contract_id=contract_id,
-            file_size=len(docx_content),
+            file_size=artifact["size"],
+            cache_hit=reused,
             processing_time=processing_time
         )
         
@@ -481,6 +492,7 @@ def send_document_notification(
         
         # Prepare email content
         subject = f"Document Ready for Download: {document_name}"
+        closing = f"Best regards,\n{sender_name}" if sender_name else "Best regards,"
         
         body = f"""
         Hello,
@@ -492,7 +504,7 @@ def send_document_notification(
         
         This link will expire in 24 hours for security purposes.
         
-        {"Best regards," if not sender_name else f"Best regards,\n{sender_name}"}
+        {closing}
         
         RealtorAgentAI Platform
         """
@@ -12,21 +12,71 @@ from datetime import datetime
 
 from celery import current_task
 import structlog
-import openai
-from anthropic import Anthropic
 
 from ..core.celery_app import celery_app, DatabaseTask
 from ..core.config import get_settings
 from ..models.contract import Contract
 from ..models.template import Template
 from ..models.audit_log import AuditLog, AuditAction
+from ..services.chunked_summarization import ChunkedSummarizer
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
-# Initialize AI clients
-openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY) if hasattr(settings, 'OPENAI_API_KEY') else None
-anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY) if hasattr(settings, 'ANTHROPIC_API_KEY') else None
+# AI clients are created on first use so that importing the task modules
+# (which the API process does to submit tasks) does not load the provider SDKs.
+_openai_client = None
+_anthropic_client = None
+
+
+def get_openai_client():
+    """Get the shared OpenAI client, or None if no API key is configured."""
+    global _openai_client
+    if _openai_client is None and settings.OPENAI_API_KEY:
+        import openai
+        _openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
+
+
+def get_anthropic_client():
+    """Get the shared Anthropic client, or None if no API key is configured."""
+    global _anthropic_client
+    if _anthropic_client is None and settings.ANTHROPIC_API_KEY:
+        from anthropic import Anthropic
+        _anthropic_client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    return _anthropic_client
+
+
+def _openai_completion(model: str, temperature: float):
+    """Completion function over the OpenAI client for ChunkedSummarizer."""
+    def complete(system_prompt: str, prompt: str, max_tokens: int) -> str:
+        response = get_openai_client().chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+    return complete
+
+
+def _anthropic_completion(model: str, temperature: float):
+    """Completion function over the Anthropic client for ChunkedSummarizer."""
+    def complete(system_prompt: str, prompt: str, max_tokens: int) -> str:
+        response = get_anthropic_client().messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response.content[0].text
+    return complete
 
 
 @celery_app.task(bind=True, base=DatabaseTask, name="app.tasks.llm_tasks.analyze_contract_content")
@@ -108,19 +158,21 @@ def analyze_contract_content(
         prompt = analysis_prompts.get(analysis_type, analysis_prompts["comprehensive"])
         
         # Perform AI analysis
-        if model_preference.startswith("gpt") and openai_client:
-            analysis_result = self._analyze_with_openai(contract_text, prompt, model_preference)
-        elif model_preference.startswith("claude") and anthropic_client:
-            analysis_result = self._analyze_with_anthropic(contract_text, prompt, model_preference)
+        if model_preference.startswith("gpt") and get_openai_client():
+            model, complete = model_preference, _openai_completion(model_preference, 0.1)
+        elif model_preference.startswith("claude") and get_anthropic_client():
+            model, complete = model_preference, _anthropic_completion(model_preference, 0.1)
         else:
             # Fallback to available model
-            if openai_client:
-                analysis_result = self._analyze_with_openai(contract_text, prompt, "gpt-4")
-            elif anthropic_client:
-                analysis_result = self._analyze_with_anthropic(contract_text, prompt, "claude-3-sonnet")
+            if get_openai_client():
+                model, complete = "gpt-4", _openai_completion("gpt-4", 0.1)
+            elif get_anthropic_client():
+                model, complete = "claude-3-sonnet", _anthropic_completion("claude-3-sonnet", 0.1)
             else:
                 raise ValueError("No AI models available for analysis")
         
+        analysis_result = _analyze_contract(complete, model, contract_text, prompt, analysis_type)
+        
         # Structure the analysis results
         structured_results = {
             "contract_id": contract_id,
@@ -135,6 +187,8 @@ def analyze_contract_content(
                 "analysis_timestamp": datetime.utcnow().isoformat(),
                 "contract_length": len(contract_text),
                 "processing_time": analysis_result.get("processing_time", 0),
+                "chunk_count": analysis_result.get("chunk_count", 1),
+                "cached_chunks": analysis_result.get("cached_chunks", 0),
                 "task_id": self.request.id
             }
         }
@@ -199,93 +253,77 @@ def analyze_contract_content(
         # Retry with exponential backoff
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
-    def _analyze_with_openai(self, contract_text: str, prompt: str, model: str) -> Dict[str, Any]:
-        """Analyze contract using OpenAI models."""
-        try:
-            start_time = datetime.utcnow()
-            
-            response = openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an expert real estate attorney and contract analyst."},
-                    {"role": "user", "content": f"{prompt}\n\nContract:\n{contract_text}"}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            analysis_text = response.choices[0].message.content
-            
-            # Parse structured response
-            return self._parse_analysis_response(analysis_text, model, processing_time)
-            
-        except Exception as e:
-            logger.error(f"OpenAI analysis failed: {str(e)}")
-            raise
 
-    def _analyze_with_anthropic(self, contract_text: str, prompt: str, model: str) -> Dict[str, Any]:
-        """Analyze contract using Anthropic models."""
-        try:
-            start_time = datetime.utcnow()
-            
-            response = anthropic_client.messages.create(
-                model=model,
-                max_tokens=2000,
-                temperature=0.1,
-                messages=[
-                    {"role": "user", "content": f"{prompt}\n\nContract:\n{contract_text}"}
-                ]
-            )
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            analysis_text = response.content[0].text
-            
-            # Parse structured response
-            return self._parse_analysis_response(analysis_text, model, processing_time)
-            
-        except Exception as e:
-            logger.error(f"Anthropic analysis failed: {str(e)}")
-            raise
+def _analyze_contract(complete, model: str, contract_text: str, prompt: str,
+                      analysis_type: str) -> Dict[str, Any]:
+    """
+    Analyze contract text with a completion function.
 
-    def _parse_analysis_response(self, analysis_text: str, model: str, processing_time: float) -> Dict[str, Any]:
-        """Parse AI analysis response into structured format."""
-        # Basic parsing - in production, would use more sophisticated NLP
-        lines = analysis_text.split('\n')
-        
-        key_insights = []
-        recommendations = []
-        risk_factors = []
-        
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if "insight" in line.lower() or "key" in line.lower():
-                current_section = "insights"
-            elif "recommend" in line.lower():
-                current_section = "recommendations"
-            elif "risk" in line.lower():
-                current_section = "risks"
-            elif line.startswith(('-', '•', '*')) or line[0].isdigit():
-                if current_section == "insights":
-                    key_insights.append(line.lstrip('-•* 0123456789.'))
-                elif current_section == "recommendations":
-                    recommendations.append(line.lstrip('-•* 0123456789.'))
-                elif current_section == "risks":
-                    risk_factors.append(line.lstrip('-•* 0123456789.'))
-        
-        return {
-            "analysis": analysis_text,
-            "key_insights": key_insights,
-            "recommendations": recommendations,
-            "risk_factors": risk_factors,
-            "model_used": model,
-            "processing_time": processing_time,
-            "confidence_score": 0.85  # Would be calculated based on model confidence
-        }
+    Long contracts are first condensed to per-section summaries, which are
+    produced concurrently and cached by section content.
+    """
+    start_time = datetime.utcnow()
+    
+    summarizer = ChunkedSummarizer(complete, model)
+    condensed, chunk_stats = summarizer.condense(contract_text, focus=f"{analysis_type} analysis")
+    if chunk_stats["chunk_count"] > 1:
+        contract_section = f"Contract (summarized section by section, in document order):\n{condensed}"
+    else:
+        contract_section = f"Contract:\n{contract_text}"
+    
+    analysis_text = complete(
+        "You are an expert real estate attorney and contract analyst.",
+        f"{prompt}\n\n{contract_section}",
+        2000
+    )
+    
+    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    
+    # Parse structured response
+    result = _parse_analysis_response(analysis_text, model, processing_time)
+    result["chunk_count"] = chunk_stats["chunk_count"]
+    result["cached_chunks"] = chunk_stats["cached_chunks"]
+    return result
+
+
+def _parse_analysis_response(analysis_text: str, model: str, processing_time: float) -> Dict[str, Any]:
+    """Parse AI analysis response into structured format."""
+    # Basic parsing - in production, would use more sophisticated NLP
+    lines = analysis_text.split('\n')
+    
+    key_insights = []
+    recommendations = []
+    risk_factors = []
+    
+    current_section = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        if "insight" in line.lower() or "key" in line.lower():
+            current_section = "insights"
+        elif "recommend" in line.lower():
+            current_section = "recommendations"
+        elif "risk" in line.lower():
+            current_section = "risks"
+        elif line.startswith(('-', '•', '*')) or line[0].isdigit():
+            if current_section == "insights":
+                key_insights.append(line.lstrip('-•* 0123456789.'))
+            elif current_section == "recommendations":
+                recommendations.append(line.lstrip('-•* 0123456789.'))
+            elif current_section == "risks":
+                risk_factors.append(line.lstrip('-•* 0123456789.'))
+    
+    return {
+        "analysis": analysis_text,
+        "key_insights": key_insights,
+        "recommendations": recommendations,
+        "risk_factors": risk_factors,
+        "model_used": model,
+        "processing_time": processing_time,
+        "confidence_score": 0.85  # Would be calculated based on model confidence
+    }
 
 
 @celery_app.task(bind=True, name="app.tasks.llm_tasks.generate_contract_summary")
@@ -324,42 +362,30 @@ def generate_contract_summary(
         prompt = summary_prompts.get(summary_type, summary_prompts["executive"])
         
         # Generate summary using available AI model
-        if openai_client:
-            start_time = datetime.utcnow()
-            
-            response = openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert real estate contract analyst."},
-                    {"role": "user", "content": f"{prompt}\n\nContract:\n{contract_text}"}
-                ],
-                temperature=0.2,
-                max_tokens=max_length * 2  # Allow some buffer for token estimation
-            )
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            summary = response.choices[0].message.content
+        if get_openai_client():
+            complete = _openai_completion("gpt-4", 0.2)
             model_used = "gpt-4"
             
-        elif anthropic_client:
-            start_time = datetime.utcnow()
-            
-            response = anthropic_client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=max_length * 2,
-                temperature=0.2,
-                messages=[
-                    {"role": "user", "content": f"{prompt}\n\nContract:\n{contract_text}"}
-                ]
-            )
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            summary = response.content[0].text
+        elif get_anthropic_client():
+            complete = _anthropic_completion("claude-3-sonnet-20240229", 0.2)
             model_used = "claude-3-sonnet"
             
         else:
             raise ValueError("No AI models available for summary generation")
         
+        # Long contracts are summarized section by section, concurrently,
+        # and the section summaries combined
+        start_time = datetime.utcnow()
+        outcome = ChunkedSummarizer(complete, model_used).summarize(
+            contract_text,
+            prompt,
+            max_tokens=max_length * 2,  # Allow some buffer for token estimation
+            system_prompt="You are an expert real estate contract analyst.",
+            focus=f"{summary_type} summary"
+        )
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        summary = outcome["summary"]
+        
         results = {
             "summary": summary,
             "summary_type": summary_type,
@@ -369,6 +395,8 @@ def generate_contract_summary(
                 "original_length": len(contract_text),
                 "compression_ratio": len(summary) / len(contract_text),
                 "processing_time": processing_time,
+                "chunk_count": outcome["chunk_count"],
+                "cached_chunks": outcome["cached_chunks"],
                 "generation_timestamp": datetime.utcnow().isoformat()
             },
             "success": True
@@ -378,6 +406,7 @@ def generate_contract_summary(
             "Contract summary generation completed",
             summary_length=len(summary),
             word_count=results["word_count"],
+            chunk_count=outcome["chunk_count"],
             processing_time=processing_time
         )
         
@@ -444,10 +473,10 @@ def extract_contract_entities(
         """
         
         # Extract entities using available AI model
-        if openai_client:
+        if get_openai_client():
             start_time = datetime.utcnow()
             
-            response = openai_client.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert at extracting structured information from real estate contracts. Always return valid JSON."},
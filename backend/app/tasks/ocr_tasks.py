@@ -14,16 +14,20 @@ from io import BytesIO
 
 from celery import current_task
 import structlog
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import pymupdf4llm
 
 from ..core.celery_app import celery_app, DatabaseTask
 from ..core.document_processor import get_document_processor, DocumentProcessingError
+from ..core.lazy_imports import lazy_import
 from ..models.file import File, ProcessingStatus
 from ..models.audit_log import AuditLog, AuditAction
 
+# OCR libraries are imported on first use; the API imports this module to
+# dispatch tasks but never runs them
+fitz = lazy_import("fitz")  # PyMuPDF
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+pymupdf4llm = lazy_import("pymupdf4llm")
+
 logger = structlog.get_logger(__name__)
 
 
@@ -443,3 +443,86 @@ def optimize_storage(self) -> Dict[str, Any]:
             "timestamp": datetime.utcnow().isoformat(),
             "task_id": self.request.id
         }
+
+
+@celery_app.task(bind=True, base=DatabaseTask, name="app.tasks.system_tasks.reconcile_storage_quotas")
+def reconcile_storage_quotas(self, user_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Reconcile storage quota counters against actual file sizes.
+    
+    Args:
+        user_ids: Users to reconcile (defaults to users with reservations
+            since the last run)
+    
+    Returns:
+        Dict: Reconciliation results
+    """
+    try:
+        from ..services.storage_quota import get_storage_quota_manager
+        
+        stats = get_storage_quota_manager().reconcile(self.session, user_ids)
+        
+        logger.info(
+            "Storage quota reconciliation completed",
+            users_reconciled=stats["users_reconciled"],
+            users_corrected=stats["users_corrected"]
+        )
+        
+        return {
+            "status": "completed",
+            "reconciliation_stats": stats,
+            "timestamp": datetime.utcnow().isoformat(),
+            "task_id": self.request.id
+        }
+        
+    except Exception as exc:
+        logger.error("Storage quota reconciliation failed", error=str(exc), exc_info=True)
+        
+        return {
+            "status": "failed",
+            "error": str(exc),
+            "timestamp": datetime.utcnow().isoformat(),
+            "task_id": self.request.id
+        }
+
+
+@celery_app.task(bind=True, name="app.tasks.system_tasks.collect_export_artifacts")
+def collect_export_artifacts(self, grace_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Delete rendered export artifacts that are no longer referenced.
+    
+    Args:
+        grace_seconds: Minimum time an artifact must have been unreferenced
+            (defaults to EXPORT_ARTIFACT_GC_GRACE_SECONDS)
+    
+    Returns:
+        Dict: Garbage collection results
+    """
+    try:
+        from ..services.export_artifacts import get_export_artifact_store
+        
+        stats = get_export_artifact_store().collect_garbage(grace_seconds)
+        
+        logger.info(
+            "Export artifact garbage collection completed",
+            examined=stats["examined"],
+            deleted=stats["deleted"],
+            errors=len(stats["errors"])
+        )
+        
+        return {
+            "status": "completed",
+            "gc_stats": stats,
+            "timestamp": datetime.utcnow().isoformat(),
+            "task_id": self.request.id
+        }
+        
+    except Exception as exc:
+        logger.error("Export artifact garbage collection failed", error=str(exc), exc_info=True)
+        
+        return {
+            "status": "failed",
+            "error": str(exc),
+            "timestamp": datetime.utcnow().isoformat(),
+            "task_id": self.request.id
+        }
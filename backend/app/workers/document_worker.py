@@ -3,21 +3,53 @@ Background worker for document processing.
 
 This module provides asynchronous document processing capabilities
 for extracting text, performing OCR, and updating file records.
+
+Jobs are claimed atomically in batches (``FOR UPDATE SKIP LOCKED`` on
+PostgreSQL, a compare-and-set update elsewhere) so several worker
+instances can share the job table. A claim is a lease that runs out
+``DOCUMENT_WORKER_LEASE_SECONDS`` after ``started_at``; jobs left
+IN_PROGRESS by a worker that died are claimed again once it expires.
+Results are only written while ``started_at`` still matches the claim,
+so a worker whose lease was taken over drops its late result.
+
+Workers are woken through a Redis channel as soon as a job is committed
+and keep their processing slots continuously refilled; the table is
+still polled at a slow interval in case a notification is missed.
 """
 
 import asyncio
+import functools
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Set
+from sqlalchemy import update
+from sqlmodel import Session, select, and_, or_
 
+from ..core.config import get_settings
 from ..core.database import get_session_context
+from ..core.redis_config import get_redis_client
 from ..core.storage import get_storage_client, StorageError
 from ..core.document_processor import get_document_processor, DocumentProcessingError
 from ..models.file import File, FileProcessingJob, ProcessingStatus, FileStatus
 from ..models.audit_log import AuditLog
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Redis pub/sub channel used to wake workers when jobs are queued
+DOCUMENT_JOBS_CHANNEL = "document_worker:jobs"
+
+
+def notify_jobs_available() -> None:
+    """
+    Wake document workers after new processing jobs have been committed.
+
+    Failures are logged and ignored; workers fall back to polling.
+    """
+    try:
+        get_redis_client().publish(DOCUMENT_JOBS_CHANNEL, "1")
+    except Exception as e:
+        logger.warning(f"Failed to publish document job notification: {e}")
 
 
 class DocumentWorker:
@@ -33,8 +65,13 @@ class DocumentWorker:
         self.storage_client = get_storage_client()
         self.document_processor = get_document_processor()
         self.is_running = False
-        self.max_concurrent_jobs = 3
+        self.max_concurrent_jobs = settings.DOCUMENT_WORKER_CONCURRENCY
+        self.poll_interval = settings.DOCUMENT_WORKER_POLL_INTERVAL
+        self.lease_seconds = settings.DOCUMENT_WORKER_LEASE_SECONDS
+        self.lease_margin_seconds = settings.DOCUMENT_WORKER_LEASE_MARGIN_SECONDS
         self.processing_semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        self._in_flight: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
     
     async def start(self):
         """Start the document processing worker."""
@@ -43,59 +80,163 @@ class DocumentWorker:
             return
         
         self.is_running = True
+        self._wakeup = asyncio.Event()
         logger.info("Starting document processing worker")
         
+        listener = asyncio.create_task(self._listen_for_notifications())
+        
         try:
             while self.is_running:
-                await self._process_pending_jobs()
-                await asyncio.sleep(10)  # Check for new jobs every 10 seconds
+                # Clear before claiming so a wake-up that arrives while
+                # claiming triggers another pass
+                self._wakeup.clear()
+                await self._fill_pipeline()
+                
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
                 
         except Exception as e:
             logger.error(f"Document worker error: {e}")
         finally:
             self.is_running = False
+            await asyncio.gather(listener, return_exceptions=True)
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
             logger.info("Document processing worker stopped")
     
     async def stop(self):
         """Stop the document processing worker."""
         logger.info("Stopping document processing worker")
         self.is_running = False
+        if self._wakeup:
+            self._wakeup.set()
     
-    async def _process_pending_jobs(self):
-        """Process all pending document processing jobs."""
+    async def _fill_pipeline(self):
+        """Claim pending jobs for every free processing slot and start them."""
+        free_slots = self.max_concurrent_jobs - len(self._in_flight)
+        if free_slots <= 0:
+            return
+        
         try:
-            with get_session_context() as session:
-                # Get pending jobs ordered by priority and creation time
-                pending_jobs = session.exec(
-                    select(FileProcessingJob)
-                    .where(FileProcessingJob.status == ProcessingStatus.PENDING)
-                    .order_by(FileProcessingJob.priority.asc(), FileProcessingJob.created_at.asc())
-                    .limit(self.max_concurrent_jobs * 2)  # Get more jobs than we can process concurrently
-                ).all()
-                
-                if not pending_jobs:
-                    return
-                
-                logger.info(f"Found {len(pending_jobs)} pending processing jobs")
-                
-                # Process jobs concurrently
-                tasks = []
-                for job in pending_jobs[:self.max_concurrent_jobs]:
-                    task = asyncio.create_task(self._process_job(job.id))
-                    tasks.append(task)
-                
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    
+            # The claim runs blocking database I/O; keep it off the event loop
+            claims = await asyncio.to_thread(self._claim_jobs, free_slots)
         except Exception as e:
-            logger.error(f"Error processing pending jobs: {e}")
+            logger.error(f"Error claiming pending jobs: {e}")
+            return
+        
+        if claims:
+            logger.info(f"Claimed {len(claims)} processing jobs")
+        
+        for job_id, claimed_at in claims.items():
+            task = asyncio.create_task(self._process_job(job_id, claimed_at))
+            self._in_flight.add(task)
+            task.add_done_callback(self._on_job_done)
     
-    async def _process_job(self, job_id: int):
+    def _on_job_done(self, task: asyncio.Task):
+        """Free the slot of a finished job and wake the worker to refill it."""
+        self._in_flight.discard(task)
+        if self._wakeup:
+            self._wakeup.set()
+    
+    def _claim_jobs(self, limit: int) -> Dict[int, datetime]:
+        """
+        Atomically claim up to ``limit`` pending jobs for this worker.
+        
+        Claimed jobs are moved to IN_PROGRESS in the same transaction, so
+        concurrent worker instances never process the same job. Jobs whose
+        lease has expired are claimed like pending ones.
+        
+        Args:
+            limit: Maximum number of jobs to claim
+            
+        Returns:
+            Dict[int, datetime]: Claimed job IDs mapped to the ``started_at``
+            stamp that identifies this worker's claim
+        """
+        with get_session_context() as session:
+            now = datetime.utcnow()
+            claimable = or_(
+                FileProcessingJob.status == ProcessingStatus.PENDING,
+                and_(
+                    FileProcessingJob.status == ProcessingStatus.IN_PROGRESS,
+                    FileProcessingJob.started_at < now - timedelta(seconds=self.lease_seconds)
+                )
+            )
+            query = (
+                select(FileProcessingJob)
+                .where(claimable)
+                .order_by(FileProcessingJob.priority.asc(), FileProcessingJob.created_at.asc())
+                .limit(limit)
+            )
+            
+            if session.get_bind().dialect.name == "postgresql":
+                # Rows locked by another worker's claim are skipped, not waited on
+                jobs = session.exec(query.with_for_update(skip_locked=True)).all()
+                expired = [job.id for job in jobs if job.status == ProcessingStatus.IN_PROGRESS]
+                for job in jobs:
+                    job.status = ProcessingStatus.IN_PROGRESS
+                    job.started_at = now
+                    session.add(job)
+                session.commit()
+                claimed = {job.id: now for job in jobs}
+            else:
+                # Compare-and-set fallback for databases without SKIP LOCKED
+                # (SQLite); re-checking the claim condition lets only one
+                # worker take over an expired lease
+                claimed, expired = {}, []
+                for job in session.exec(query).all():
+                    lease_expired = job.status == ProcessingStatus.IN_PROGRESS
+                    result = session.execute(
+                        update(FileProcessingJob)
+                        .where(and_(FileProcessingJob.id == job.id, claimable))
+                        .values(status=ProcessingStatus.IN_PROGRESS, started_at=now)
+                    )
+                    if result.rowcount == 1:
+                        claimed[job.id] = now
+                        if lease_expired:
+                            expired.append(job.id)
+                session.commit()
+            
+            if expired:
+                logger.warning(f"Reclaimed processing jobs with expired leases: {expired}")
+            return claimed
+    
+    async def _listen_for_notifications(self):
+        """Set the wake-up event whenever a job notification is published."""
+        loop = asyncio.get_running_loop()
+        
+        while self.is_running:
+            pubsub = None
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                await loop.run_in_executor(None, pubsub.subscribe, DOCUMENT_JOBS_CHANNEL)
+                
+                while self.is_running:
+                    message = await loop.run_in_executor(
+                        None, functools.partial(pubsub.get_message, timeout=1.0)
+                    )
+                    if message and self._wakeup:
+                        self._wakeup.set()
+                        
+            except Exception as e:
+                logger.warning(f"Job notification listener unavailable, polling only: {e}")
+                await asyncio.sleep(self.poll_interval)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+    
+    async def _process_job(self, job_id: int, claimed_at: datetime):
         """
         Process a single document processing job.
         
         Args:
             job_id: ID of the processing job
+            claimed_at: ``started_at`` stamp written when the job was claimed
         """
         async with self.processing_semaphore:
             try:
@@ -106,28 +247,43 @@ class DocumentWorker:
                         logger.warning(f"Processing job {job_id} not found")
                         return
                     
-                    # Check if job is still pending
-                    if job.status != ProcessingStatus.PENDING:
-                        logger.info(f"Job {job_id} is no longer pending (status: {job.status})")
+                    # Jobs are moved to IN_PROGRESS when claimed; a different
+                    # stamp means another worker took over the lease
+                    if job.status != ProcessingStatus.IN_PROGRESS or job.started_at != claimed_at:
+                        logger.info(f"Job {job_id} is no longer claimed (status: {job.status})")
                         return
                     
                     # Get associated file
                     file_record = session.get(File, job.file_id)
                     if not file_record:
                         logger.error(f"File {job.file_id} not found for job {job_id}")
-                        await self._mark_job_failed(job, "Associated file not found", session)
+                        await self._mark_job_failed(job, "Associated file not found", session, claimed_at)
                         return
                     
-                    # Update job status to in progress
-                    job.status = ProcessingStatus.IN_PROGRESS
-                    job.started_at = datetime.utcnow()
-                    session.add(job)
-                    session.commit()
+                    # Give up a margin before the lease runs out, counted
+                    # from the claim, so no other worker picks the job up
+                    # while it is still being processed
+                    deadline = claimed_at + timedelta(
+                        seconds=self.lease_seconds - self.lease_margin_seconds
+                    )
+                    timeout = (deadline - datetime.utcnow()).total_seconds()
+                    if timeout <= 0:
+                        logger.warning(f"Lease of job {job_id} ran out before processing started")
+                        return
                     
                     logger.info(f"Processing job {job_id} for file {file_record.filename}")
                     
-                    # Process the document
-                    await self._process_document(job, file_record, session)
+                    try:
+                        await asyncio.wait_for(
+                            self._process_document(job, file_record, session, claimed_at),
+                            timeout=timeout
+                        )
+                    except asyncio.TimeoutError:
+                        session.rollback()
+                        await self._mark_job_failed(
+                            job, f"Processing exceeded the {self.lease_seconds}s job lease",
+                            session, claimed_at
+                        )
                     
             except Exception as e:
                 logger.error(f"Error processing job {job_id}: {e}")
@@ -135,15 +291,54 @@ class DocumentWorker:
                     with get_session_context() as session:
                         job = session.get(FileProcessingJob, job_id)
                         if job:
-                            await self._mark_job_failed(job, str(e), session)
+                            await self._mark_job_failed(job, str(e), session, claimed_at)
                 except Exception as cleanup_error:
                     logger.error(f"Error during job cleanup: {cleanup_error}")
     
+    def _finish_job(
+        self,
+        job: FileProcessingJob,
+        session: Session,
+        claimed_at: datetime,
+        **values: Any
+    ) -> bool:
+        """
+        Write a job's final state if this worker still holds its claim.
+        
+        The update only matches while ``started_at`` equals the claim stamp;
+        otherwise the lease expired and another worker reclaimed the job, so
+        every pending change in the session is rolled back.
+        
+        Args:
+            job: Processing job
+            session: Database session
+            claimed_at: ``started_at`` stamp written when the job was claimed
+            **values: Columns to set on the job
+            
+        Returns:
+            bool: True if the job was updated, False if the claim was lost
+        """
+        result = session.execute(
+            update(FileProcessingJob)
+            .where(and_(
+                FileProcessingJob.id == job.id,
+                FileProcessingJob.status == ProcessingStatus.IN_PROGRESS,
+                FileProcessingJob.started_at == claimed_at
+            ))
+            .values(**values)
+        )
+        if result.rowcount != 1:
+            session.rollback()
+            logger.warning(f"Job {job.id} was reclaimed by another worker; dropping its result")
+            return False
+        return True
+    
     async def _process_document(
         self,
         job: FileProcessingJob,
         file_record: File,
-        session: Session
+        session: Session,
+        claimed_at: datetime
     ):
         """
         Process a document file.
@@ -152,6 +347,7 @@ class DocumentWorker:
             job: Processing job
             file_record: File record
             session: Database session
+            claimed_at: ``started_at`` stamp written when the job was claimed
         """
         try:
             # Update file processing status
@@ -191,7 +387,7 @@ class DocumentWorker:
                 })
                 
                 # Store detailed results in job
-                job.result = {
+                job_result = {
                     'processing_success': True,
                     'extracted_text_length': len(processing_result.get('extracted_text', '')),
                     'ocr_text_length': len(processing_result.get('ocr_text', '') or ''),
@@ -204,15 +400,20 @@ class DocumentWorker:
             else:
                 raise DocumentProcessingError("Document processing failed")
             
-            # Mark job as completed
-            job.status = ProcessingStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
+            # Mark job as completed, unless the lease was lost meanwhile
+            completed_at = datetime.utcnow()
+            if not self._finish_job(
+                job, session, claimed_at,
+                status=ProcessingStatus.COMPLETED,
+                completed_at=completed_at,
+                result=job_result
+            ):
+                return
             
             # Update file status if it was just uploaded
             if file_record.status == FileStatus.UPLOADED:
                 file_record.status = FileStatus.PROCESSED
             
-            session.add(job)
             session.add(file_record)
             session.commit()
             
@@ -225,9 +426,7 @@ class DocumentWorker:
                     "file_id": file_record.id,
                     "job_id": job.id,
                     "filename": file_record.filename,
-                    "processing_time_seconds": (
-                        job.completed_at - job.started_at
-                    ).total_seconds() if job.started_at else None
+                    "processing_time_seconds": (completed_at - claimed_at).total_seconds()
                 }
             )
             session.add(audit_log)
@@ -235,7 +434,8 @@ class DocumentWorker:
             
         except Exception as e:
             logger.error(f"Document processing failed for file {file_record.id}: {e}")
-            await self._mark_job_failed(job, str(e), session)
+            if not await self._mark_job_failed(job, str(e), session, claimed_at):
+                return
             
             # Update file processing status
             file_record.processing_status = ProcessingStatus.FAILED
@@ -247,8 +447,9 @@ class DocumentWorker:
         self,
         job: FileProcessingJob,
         error_message: str,
-        session: Session
-    ):
+        session: Session,
+        claimed_at: datetime
+    ) -> bool:
         """
         Mark a processing job as failed.
         
@@ -256,13 +457,19 @@ class DocumentWorker:
             job: Processing job
             error_message: Error message
             session: Database session
+            claimed_at: ``started_at`` stamp written when the job was claimed
+            
+        Returns:
+            bool: False if the job was reclaimed and left untouched
         """
         try:
-            job.status = ProcessingStatus.FAILED
-            job.error_message = error_message
-            job.completed_at = datetime.utcnow()
-            
-            session.add(job)
+            if not self._finish_job(
+                job, session, claimed_at,
+                status=ProcessingStatus.FAILED,
+                error_message=error_message,
+                completed_at=datetime.utcnow()
+            ):
+                return False
             session.commit()
             
             # Log failed processing
@@ -284,6 +491,7 @@ class DocumentWorker:
             
         except Exception as e:
             logger.error(f"Error marking job {job.id} as failed: {e}")
+        return True
     
     async def process_file_immediately(
         self,
@@ -307,13 +515,16 @@ class DocumentWorker:
                 if not file_record:
                     raise ValueError(f"File {file_id} not found")
                 
-                # Create processing job
+                # Create processing job, claimed up front so no worker
+                # picks it up while it is processed here
+                claimed_at = datetime.utcnow()
                 job = FileProcessingJob(
                     file_id=file_id,
                     job_type="immediate_processing",
-                    status=ProcessingStatus.PENDING,
+                    status=ProcessingStatus.IN_PROGRESS,
                     priority=1,  # High priority
-                    parameters=processing_options or {}
+                    parameters=processing_options or {},
+                    started_at=claimed_at
                 )
                 
                 session.add(job)
@@ -321,7 +532,7 @@ class DocumentWorker:
                 session.refresh(job)
                 
                 # Process immediately
-                await self._process_document(job, file_record, session)
+                await self._process_document(job, file_record, session, claimed_at)
                 
                 # Return results
                 session.refresh(job)
@@ -433,4 +644,6 @@ def get_document_worker() -> DocumentWorker:
 __all__ = [
     "DocumentWorker",
     "get_document_worker",
+    "notify_jobs_available",
+    "DOCUMENT_JOBS_CHANNEL",
 ]
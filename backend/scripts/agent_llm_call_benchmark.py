@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Per-call overhead benchmark for synchronous agent LLM calls.
+
+CrewAI calls ``ModelRouterLLM.call`` synchronously for every agent step.
+This script runs N sequential steps against a local OpenAI-compatible stub
+server in two modes:
+
+- ``per_call_loop``: the previous behaviour, a new event loop (and therefore
+  a new HTTP client and connection) for every call;
+- ``persistent_loop``: calls submitted to the long-lived ``AgentEventLoop``
+  with one keep-alive HTTP client shared across calls.
+
+The stub answers immediately (or after ``--latency-ms``), so the measured
+time is almost entirely per-call overhead. The number of TCP connections the
+server accepted shows how many connection setups (and, against a real
+provider, TLS handshakes) each mode pays for.
+
+Usage:
+    python scripts/agent_llm_call_benchmark.py [--steps 100] [--latency-ms 0] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.agent_event_loop import AgentEventLoop  # noqa: E402
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-benchmark",
+    "object": "chat.completion",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 1, "total_tokens": 11},
+}).encode()
+
+REQUEST_BODY = {
+    "model": "benchmark",
+    "messages": [{"role": "user", "content": "Summarize the inspection contingency."}],
+    "max_tokens": 16,
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions stub with HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    latency_seconds = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubHandler.lock:
+            StubHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _complete(client: httpx.AsyncClient, base_url: str) -> None:
+    response = await client.post(f"{base_url}/v1/chat/completions", json=REQUEST_BODY)
+    response.raise_for_status()
+    response.json()
+
+
+def run_per_call_loop(base_url: str, steps: int) -> List[float]:
+    """Previous behaviour: fresh event loop and client per call."""
+    timings = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        loop = asyncio.new_event_loop()
+        try:
+            async def call():
+                async with httpx.AsyncClient() as client:
+                    await _complete(client, base_url)
+            loop.run_until_complete(call())
+        finally:
+            loop.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_persistent_loop(base_url: str, steps: int) -> List[float]:
+    """New behaviour: long-lived agent loop with a shared keep-alive client."""
+    agent_loop = AgentEventLoop(name="agent-llm-benchmark")
+    agent_loop.start()
+
+    async def make_client():
+        return httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=120))
+
+    client = agent_loop.run(make_client())
+    timings = []
+    try:
+        for _ in range(steps):
+            start = time.perf_counter()
+            agent_loop.run(_complete(client, base_url))
+            timings.append(time.perf_counter() - start)
+    finally:
+        agent_loop.run(client.aclose())
+        agent_loop.stop()
+    return timings
+
+
+def summarize(timings: List[float], connections: int) -> Dict[str, Any]:
+    ordered = sorted(timings)
+    return {
+        "calls": len(timings),
+        "total_ms": round(sum(timings) * 1000, 1),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "connections_opened": connections,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Agent LLM per-call overhead benchmark")
+    parser.add_argument("--steps", type=int, default=100, help="Sequential agent steps per mode")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated provider latency")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    StubHandler.latency_seconds = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    report = {"steps": args.steps, "latency_ms": args.latency_ms, "modes": {}}
+    try:
+        for mode, runner in (("per_call_loop", run_per_call_loop), ("persistent_loop", run_persistent_loop)):
+            # Warm up imports and the server before measuring
+            runner(base_url, 1)
+            StubHandler.connections = 0
+            timings = runner(base_url, args.steps)
+            report["modes"][mode] = summarize(timings, StubHandler.connections)
+    finally:
+        server.shutdown()
+
+    legacy = report["modes"]["per_call_loop"]
+    persistent = report["modes"]["persistent_loop"]
+    report["overhead_saved_per_call_ms"] = round(legacy["mean_ms"] - persistent["mean_ms"], 3)
+
+    print(f"{args.steps} sequential agent steps (stub latency {args.latency_ms} ms)")
+    for mode, summary in report["modes"].items():
+        print(f"  {mode:<16} mean {summary['mean_ms']:>8.3f} ms  p95 {summary['p95_ms']:>8.3f} ms  "
+              f"total {summary['total_ms']:>9.1f} ms  connections {summary['connections_opened']}")
+    print(f"Per-call overhead saved: {report['overhead_saved_per_call_ms']:.3f} ms")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compliance rule scanning benchmark on large contracts.
+
+Generates a contract of ``--size-mb`` megabytes from realistic clauses and
+checks it against the compliance validator's rules in two modes:
+
+- ``per_rule``: the previous behaviour, ``re.finditer`` over the whole
+  document once per rule;
+- ``compiled``: the compiled rule set, one prefilter pass over the document
+  with anchored, windowed verification of each candidate.
+
+Both modes are checked to report the same elements before timings are
+printed. ``--pathological`` adds long lines in which the parties rule's
+first term repeats without a matching second party, the input on which
+the lazy parties pattern backtracks over the rest of the line.
+
+Usage:
+    python scripts/compliance_scan_benchmark.py [--size-mb 1] [--repeat 5] [--pathological] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.agent_tools.compliance_checking import (  # noqa: E402
+    ComplianceValidationTool, REQUIRED_ELEMENT_RULES
+)
+from app.services.compliance_rule_engine import CompiledRuleSet  # noqa: E402
+
+CLAUSES = [
+    "The Buyer agrees to purchase and the Seller agrees to sell the property located at {n} Oak Street.",
+    "The purchase price shall be ${price:,}.00 payable at closing.",
+    "Closing shall occur on or before {month}/{day}/2025 at the offices of the escrow agent.",
+    "This agreement is contingent upon the Buyer obtaining financing on terms acceptable to the Buyer.",
+    "The premises are situated in the county of record and subject to existing easements.",
+    "Each party shall bear its own costs, and neither party may assign this agreement without consent.",
+    "Notices shall be in writing and delivered to the addresses stated above, provided that email is sufficient.",
+    "The inspection period ends {days} days after acceptance, and any objection must be delivered in writing.",
+]
+
+PATHOLOGICAL_LINE = " ".join(["the buyer may inspect and review the records"] * 60)
+
+
+def build_contract(size_bytes: int, pathological: bool, seed: int = 7) -> str:
+    """Generate contract text of roughly ``size_bytes`` characters."""
+    rng = random.Random(seed)
+    paragraphs: List[str] = []
+    size = 0
+    while size < size_bytes:
+        sentences = [
+            rng.choice(CLAUSES).format(
+                n=rng.randint(1, 9999), price=rng.randint(100, 5000) * 1000,
+                month=rng.randint(1, 12), day=rng.randint(1, 28), days=rng.randint(5, 21)
+            )
+            for _ in range(rng.randint(3, 8))
+        ]
+        if pathological and rng.random() < 0.05:
+            sentences.append(PATHOLOGICAL_LINE)
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    paragraphs.append("IN WITNESS WHEREOF, the parties have signed and executed this agreement.")
+    return "\n\n".join(paragraphs)
+
+
+def scan_per_rule(content: str, rules: List[Any]) -> Dict[str, int]:
+    """Previous behaviour: one full regex pass per rule."""
+    found = {}
+    for rule in rules:
+        matches = list(re.finditer(rule.pattern, content))
+        found[rule.id] = min(len(matches), 1) if rule.id in REQUIRED_ELEMENT_RULES else len(matches)
+    return found
+
+
+def scan_compiled(content: str, rule_set: CompiledRuleSet) -> Dict[str, int]:
+    results = rule_set.scan(content, first_only=REQUIRED_ELEMENT_RULES)
+    return {rule_id: len(result.matches) for rule_id, result in results.items()}
+
+
+def measure(fn, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=1.0, help="Contract size in megabytes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per mode")
+    parser.add_argument("--pathological", action="store_true", help="Add backtracking-heavy lines")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+    args = parser.parse_args()
+
+    # Only the rule definitions are needed, not a memory manager
+    tool = ComplianceValidationTool.__new__(ComplianceValidationTool)
+    rules = asyncio.run(tool._load_compliance_rules("residential_purchase", "default"))
+    content = build_contract(int(args.size_mb * 1024 * 1024), args.pathological)
+
+    start = time.perf_counter()
+    rule_set = CompiledRuleSet([(rule.id, rule.pattern) for rule in rules])
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    legacy = scan_per_rule(content, rules)
+    compiled = scan_compiled(content, rule_set)
+    if legacy != compiled:
+        print(f"Result mismatch:\n  per_rule {legacy}\n  compiled {compiled}")
+        return 1
+
+    report = {
+        "size_bytes": len(content),
+        "rules": len(rules),
+        "pathological": args.pathological,
+        "compile_ms": round(compile_ms, 2),
+        "elements_found": compiled,
+        "modes": {
+            "per_rule": measure(lambda: scan_per_rule(content, rules), args.repeat),
+            "compiled": measure(lambda: scan_compiled(content, rule_set), args.repeat),
+        },
+    }
+    report["speedup"] = round(report["modes"]["per_rule"]["mean_ms"] / report["modes"]["compiled"]["mean_ms"], 2)
+
+    print(f"{len(rules)} rules on a {len(content) / 1024 / 1024:.2f} MB contract"
+          f"{' with pathological lines' if args.pathological else ''} (compiled in {compile_ms:.2f} ms)")
+    for mode, summary in report["modes"].items():
+        print(f"  {mode:<9} mean {summary['mean_ms']:>9.2f} ms  min {summary['min_ms']:>9.2f} ms  "
+              f"max {summary['max_ms']:>9.2f} ms")
+    print(f"Speedup: {report['speedup']:.2f}x")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Import-time profiling report for the API application.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+summarizes the slowest imports and checks the result against a regression
+budget. Heavy subsystems (CrewAI, LLM provider SDKs, PDF/OCR libraries) are
+expected to load lazily on first use and must not appear in the report.
+
+Usage:
+    python scripts/import_time_report.py [--budget-ms 1500] [--top 20] [--json report.json]
+
+Exit status is non-zero when the budget is exceeded or a deferred module
+was imported eagerly.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budget for ``app.main`` in milliseconds
+DEFAULT_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# Top-level packages that must only be imported on first use
+DEFERRED_PACKAGES = [
+    "crewai",
+    "langchain",
+    "langchain_community",
+    "langchain_openai",
+    "openai",
+    "anthropic",
+    "fitz",
+    "pymupdf4llm",
+    "pytesseract",
+    "PIL",
+    "bs4",
+    "reportlab",
+    "docx",
+    "weasyprint",
+    "scipy",
+]
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def run_importtime(module: str = "app.main") -> str:
+    """Import a module in a fresh interpreter and return the -X importtime output."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(BACKEND_DIR),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-4000:]}")
+    return result.stderr
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse -X importtime lines into records of self/cumulative microseconds."""
+    records = []
+    for line in output.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append({
+            "module": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": len(indent) // 2,
+        })
+    return records
+
+
+def build_report(records: List[Dict[str, Any]], module: str = "app.main",
+                 top: int = 20, budget_ms: int = DEFAULT_BUDGET_MS) -> Dict[str, Any]:
+    """Summarize parsed import records and evaluate them against the budget."""
+    target = next((r for r in records if r["module"] == module), None)
+    total_ms = (target["cumulative_us"] if target else sum(r["self_us"] for r in records)) / 1000
+
+    loaded_packages = {r["module"].split(".")[0] for r in records}
+    eager_deferred = sorted(p for p in DEFERRED_PACKAGES if p in loaded_packages)
+
+    # Aggregate self time per top-level package
+    by_package: Dict[str, int] = {}
+    for record in records:
+        package = record["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0) + record["self_us"]
+
+    return {
+        "module": module,
+        "total_ms": round(total_ms, 1),
+        "budget_ms": budget_ms,
+        "within_budget": total_ms <= budget_ms,
+        "module_count": len(records),
+        "eager_deferred_packages": eager_deferred,
+        "slowest_cumulative": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in sorted(records, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+        ],
+        "slowest_packages": [
+            {"package": name, "self_ms": round(us / 1000, 1)}
+            for name, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary of the report."""
+    status = "OK" if report["within_budget"] else "OVER BUDGET"
+    print(f"Import time for {report['module']}: {report['total_ms']:.1f} ms "
+          f"(budget {report['budget_ms']} ms) [{status}]")
+    print(f"Modules imported: {report['module_count']}")
+
+    print("\nSlowest packages (self time):")
+    for entry in report["slowest_packages"]:
+        print(f"  {entry['self_ms']:>8.1f} ms  {entry['package']}")
+
+    print("\nSlowest imports (cumulative):")
+    for entry in report["slowest_cumulative"]:
+        print(f"  {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+
+    if report["eager_deferred_packages"]:
+        print("\nDeferred packages imported eagerly: " + ", ".join(report["eager_deferred_packages"]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time profiling report")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS,
+                        help="Cumulative import time budget in milliseconds")
+    parser.add_argument("--top", type=int, default=20, help="Number of entries to show")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    records = parse_importtime(run_importtime(args.module))
+    report = build_report(records, module=args.module, top=args.top, budget_ms=args.budget_ms)
+    print_report(report)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+
+    if not report["within_budget"] or report["eager_deferred_packages"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ This module contains comprehensive integration tests for advanced agent capabili
 including multi-agent workflows, real estate domain specialization, and enterprise features.
 """
 
+import json
+import os
 import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
@@ -271,6 +273,73 @@ class TestRealEstateKnowledgeBase:
         flood_clauses = [c for c in clauses if "flood" in c.get("category", "").lower()]
         assert len(flood_clauses) > 0
 
+    def test_suggested_clauses_are_memoized_copies(self, knowledge_base):
+        """Test repeated clause suggestions reuse the memoized result."""
+        args = (PropertyType.RESIDENTIAL_SINGLE_FAMILY, TransactionType.PURCHASE, Jurisdiction.US_CALIFORNIA)
+
+        first = knowledge_base.get_suggested_clauses(*args, risk_factors=["flood"])
+        first[0]["content"] = "modified"
+        second = knowledge_base.get_suggested_clauses(*args, risk_factors=["flood"])
+
+        assert second[0]["content"] != "modified"
+        assert knowledge_base._index.suggested_clauses.cache_info().hits == 1
+
+    def test_hot_reload_from_versioned_file(self, knowledge_base, tmp_path):
+        """Test knowledge data reloads when the data file gets a new version."""
+        requirement = {
+            "requirement_id": "tx_res_purchase_survey",
+            "jurisdiction": "us_texas",
+            "property_type": "residential_single_family",
+            "transaction_type": "purchase",
+            "title": "Survey",
+            "description": "Buyer obtains a property survey",
+            "mandatory": True,
+            "deadline_days": 10
+        }
+        data_file = tmp_path / "knowledge.json"
+        data_file.write_text(json.dumps({"version": "1", "legal_requirements": [requirement]}))
+
+        assert knowledge_base.load_data_file(str(data_file)) == "1"
+        texas = (Jurisdiction.US_TEXAS, PropertyType.RESIDENTIAL_SINGLE_FAMILY, TransactionType.PURCHASE)
+        assert [req.requirement_id for req in knowledge_base.get_legal_requirements(*texas)] == ["tx_res_purchase_survey"]
+        # Sections missing from the file keep their data
+        assert knowledge_base.get_document_templates(
+            PropertyType.RESIDENTIAL_SINGLE_FAMILY, TransactionType.PURCHASE, Jurisdiction.US_CALIFORNIA
+        )
+
+        optional = {**requirement, "requirement_id": "tx_res_purchase_hoa", "mandatory": False, "deadline_days": 3}
+        data_file.write_text(json.dumps({"version": "2", "legal_requirements": [optional, requirement]}))
+        os.utime(data_file, ns=(0, 1))
+
+        assert knowledge_base.reload_if_changed()
+        assert knowledge_base.data_version == "2"
+        # Mandatory requirements sort first
+        assert [req.requirement_id for req in knowledge_base.get_legal_requirements(*texas)] == [
+            "tx_res_purchase_survey", "tx_res_purchase_hoa"
+        ]
+        assert not knowledge_base.reload_if_changed()
+
+    def test_knowledge_search(self, knowledge_base):
+        """Test BM25 search over help articles and the clause library."""
+        results = knowledge_base.search_knowledge("What are common contingencies?")
+        assert results.hits[0].document.doc_id == "help:contingencies"
+
+        knowledge_base.add_help_articles({
+            "earnest_money": {"title": "Earnest Money", "content": "Earnest money is held in escrow until closing."}
+        })
+        hits = knowledge_base.search_knowledge("earnest money escrow", kinds=["help"]).hits
+        assert hits[0].document.metadata["id"] == "earnest_money"
+
+    def test_suggested_clauses_ranked_by_query(self, knowledge_base):
+        """Test a deal description ranks the suggested clauses."""
+        clauses = knowledge_base.get_suggested_clauses(
+            PropertyType.RESIDENTIAL_SINGLE_FAMILY, TransactionType.PURCHASE, Jurisdiction.US_CALIFORNIA,
+            risk_factors=["flood"], query="property in a flood zone"
+        )
+
+        assert clauses[0]["clause_id"] == "flood_disclosure"
+        assert all("relevance_score" in clause for clause in clauses)
+
 
 class TestEnterpriseIntegration:
     """Test cases for enterprise integration features."""
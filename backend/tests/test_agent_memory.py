@@ -0,0 +1,203 @@
+"""
+Tests for write-behind agent memory storage.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.agent_event_loop import AgentEventLoop
+from app.services.agent_memory import AgentMemoryManager, MemoryScope, MemoryType, MemoryWriteBuffer
+
+
+class FakePipeline:
+    """Records pipelined commands into a shared store."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value):
+        self.commands.append((key, value, None))
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value, ttl))
+
+    async def execute(self):
+        if self.client.stall:
+            self.client.stall = False
+            self.client.stalled = True
+            await asyncio.sleep(10)
+        if self.client.fail:
+            raise ConnectionError("redis unavailable")
+        self.client.batches.append(len(self.commands))
+        for key, value, ttl in self.commands:
+            self.client.store[key] = (value, ttl)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.batches = []
+        self.fail = False
+        self.stall = False
+        self.stalled = False
+        self.connection_pool = MagicMock(disconnect=AsyncMock())
+        self.aclose = AsyncMock()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TestMemoryWriteBuffer:
+    """Test cases for batched, pipelined memory writes."""
+
+    @pytest.fixture
+    def event_loop_thread(self):
+        loop = AgentEventLoop(name="test-memory-loop")
+        yield loop
+        loop.stop()
+
+    @pytest.fixture
+    def redis(self):
+        return FakeRedis()
+
+    def make_buffer(self, event_loop_thread, redis, **kwargs):
+        options = {"flush_interval_ms": 10000, "batch_size": 10, "max_pending": 100}
+        options.update(kwargs)
+        buffer = MemoryWriteBuffer(redis_url="redis://test", event_loop=event_loop_thread, **options)
+        buffer._client = redis
+        return buffer
+
+    def test_flush_writes_pending_entries_in_batches(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis, batch_size=1000)
+        for i in range(25):
+            buffer.add(f"key:{i}", f"value:{i}", ttl_seconds=60 if i % 2 else None)
+
+        written = asyncio.run(buffer.flush())
+
+        assert written == 25
+        assert redis.batches == [25]
+        assert redis.store["key:1"] == ("value:1", 60)
+        assert redis.store["key:2"] == ("value:2", None)
+        assert buffer.metrics()["pending"] == 0
+        assert buffer.metrics()["written"] == 25
+
+    def test_full_batch_triggers_flush(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis, batch_size=5)
+        for i in range(5):
+            buffer.add(f"key:{i}", "value")
+
+        for _ in range(100):
+            if redis.batches:
+                break
+            asyncio.run(asyncio.sleep(0.01))
+
+        assert redis.batches == [5]
+
+    def test_interval_triggers_flush(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis, flush_interval_ms=20)
+        buffer.add("key", "value")
+
+        for _ in range(100):
+            if redis.store:
+                break
+            asyncio.run(asyncio.sleep(0.01))
+
+        assert redis.store == {"key": ("value", None)}
+
+    def test_failed_flush_keeps_entries_in_order(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis)
+        buffer.add("first", "1")
+        buffer.add("second", "2")
+
+        redis.fail = True
+        assert asyncio.run(buffer.flush()) == 0
+        assert buffer.metrics()["failed_flushes"] == 1
+        assert list(buffer._pending) == [("first", "1", None), ("second", "2", None)]
+
+        redis.fail = False
+        assert asyncio.run(buffer.flush()) == 2
+
+    def test_oldest_entries_dropped_beyond_max_pending(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis, max_pending=3)
+        for i in range(5):
+            buffer.add(f"key:{i}", "value")
+
+        assert [key for key, _, _ in buffer._pending] == ["key:2", "key:3", "key:4"]
+        assert buffer.metrics()["dropped"] == 2
+
+    def test_close_flushes_and_rejects_new_writes(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis)
+        buffer.add("key", "value")
+
+        assert asyncio.run(buffer.close()) == 1
+        assert redis.store == {"key": ("value", None)}
+        redis.connection_pool.disconnect.assert_awaited_once()
+        assert buffer.add("late", "value") is False
+
+    def test_close_stops_a_running_flush_first(self, event_loop_thread, redis):
+        buffer = self.make_buffer(event_loop_thread, redis, batch_size=1)
+        redis.stall = True
+        buffer.add("key", "value")
+        for _ in range(100):
+            if redis.stalled:
+                break
+            asyncio.run(asyncio.sleep(0.01))
+
+        assert asyncio.run(buffer.close()) == 1
+        assert redis.store == {"key": ("value", None)}
+        assert redis.batches == [1]
+        assert buffer.metrics()["flusher_running"] is False
+        redis.aclose.assert_awaited_once()
+
+
+class TestAgentMemoryManagerWriteBehind:
+    """Test cases for write-behind storage through the memory manager."""
+
+    @pytest.mark.asyncio
+    async def test_write_behind_store_is_buffered_and_cached(self):
+        write_buffer = MagicMock()
+        write_buffer.add.return_value = True
+        manager = AgentMemoryManager(write_buffer=write_buffer)
+        manager._redis_client = MagicMock()
+
+        memory_id = await manager.store_memory(
+            content={"tool_name": "parser"},
+            memory_type=MemoryType.WORKFLOW,
+            scope=MemoryScope.WORKFLOW,
+            identifier="tool_execution_parser",
+            write_behind=True
+        )
+
+        key, value, ttl_seconds = write_buffer.add.call_args.args
+        assert key == "agent_memory:workflow:workflow:tool_execution_parser"
+        assert json.loads(value)["id"] == memory_id
+        assert 0 < ttl_seconds <= 24 * 3600
+        assert memory_id in manager._memory_cache
+        manager._redis_client.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_closed_buffer_falls_back_to_direct_write(self):
+        write_buffer = MagicMock()
+        write_buffer.add.return_value = False
+        manager = AgentMemoryManager(write_buffer=write_buffer)
+        manager._redis_client = MagicMock()
+
+        await manager.store_memory(
+            content={},
+            memory_type=MemoryType.WORKFLOW,
+            scope=MemoryScope.WORKFLOW,
+            identifier="late",
+            write_behind=True
+        )
+
+        manager._redis_client.setex.assert_called_once()
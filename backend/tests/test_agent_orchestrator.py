@@ -7,6 +7,8 @@ including workflow management, agent creation, and memory system integration.
 
 import pytest
 import asyncio
+import threading
+import time
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
 
@@ -19,7 +21,9 @@ from app.services.agent_orchestrator import (
     ModelRouterLLM,
     get_agent_orchestrator
 )
+from app.services.agent_workflow_run import crew_step_callback, crew_task_callback
 from app.services.agent_memory import MemoryType, MemoryScope
+from app.services.model_router import ModelResponse, ModelProvider, StreamChunk
 
 
 class TestModelRouterLLM:
@@ -35,7 +39,7 @@ class TestModelRouterLLM:
     @pytest.fixture
     def model_router_llm(self, mock_model_router):
         """Create ModelRouterLLM instance for testing."""
-        with patch('app.services.agent_orchestrator.get_model_router', return_value=mock_model_router):
+        with patch('app.services.agent_llm.get_model_router', return_value=mock_model_router):
             return ModelRouterLLM(model_preference="test-model")
     
     def test_model_router_llm_initialization(self, model_router_llm):
@@ -60,6 +64,24 @@ class TestModelRouterLLM:
         
         assert result == "Test response"
         mock_model_router.generate_response.assert_called_once()
+    
+    def test_model_router_llm_calls_share_event_loop(self, model_router_llm, mock_model_router):
+        """Sequential calls run on one long-lived loop instead of a new loop each."""
+        loops = []
+        
+        async def generate_response(request):
+            loops.append(asyncio.get_running_loop())
+            response = Mock()
+            response.content = "ok"
+            return response
+        
+        mock_model_router.generate_response = generate_response
+        
+        for _ in range(3):
+            model_router_llm.call([{"role": "user", "content": "Hello"}])
+        
+        assert len(set(loops)) == 1
+        assert not loops[0].is_closed()
 
 
 class TestAgentOrchestrator:
@@ -229,6 +251,104 @@ class TestAgentOrchestrator:
         assert result.status == WorkflowStatus.FAILED
         assert "Test error" in result.errors
     
+    @pytest.mark.asyncio
+    async def test_execute_workflow_reports_progress(self, orchestrator):
+        """The crew runs off the event loop and reports progress per task."""
+        workflow_id = "test-workflow"
+        loop_thread = threading.current_thread()
+        
+        mock_crew = Mock()
+        mock_crew.tasks = [Mock(agent=Mock(role="Data Extractor")), Mock(agent=Mock(role="Summarizer"))]
+        
+        def kickoff():
+            assert threading.current_thread() is not loop_thread
+            crew_step_callback(Mock(tool="search_documents", tool_input="lease"))
+            crew_task_callback(Mock(raw="extracted"))
+            crew_task_callback(Mock(raw="summary"))
+            return "done"
+        
+        mock_crew.kickoff.side_effect = kickoff
+        orchestrator.active_workflows[workflow_id] = mock_crew
+        events = []
+        
+        async def on_progress(event):
+            events.append(event)
+        
+        result = await orchestrator.execute_workflow(workflow_id, on_progress=on_progress)
+        await asyncio.sleep(0)
+        
+        assert result.status == WorkflowStatus.COMPLETED
+        types = [event["type"] for event in events]
+        assert types[0] == "workflow_queued"
+        assert "tool_invoked" in types
+        assert types[-1] == "workflow_completed"
+        assert events[-1]["progress"] == 100.0
+        agents = [event["agent"] for event in events if event["type"] == "agent_started"]
+        assert agents == ["Data Extractor", "Summarizer"]
+        assert workflow_id not in orchestrator.workflow_runs
+    
+    @pytest.mark.asyncio
+    async def test_cancel_running_workflow(self, orchestrator):
+        """Cancelling stops the crew at its next step without blocking the loop."""
+        workflow_id = "test-workflow"
+        started = threading.Event()
+        
+        def kickoff():
+            started.set()
+            while True:
+                crew_step_callback(Mock(tool=None))
+                time.sleep(0.01)
+        
+        mock_crew = Mock()
+        mock_crew.kickoff.side_effect = kickoff
+        orchestrator.active_workflows[workflow_id] = mock_crew
+        
+        execution = asyncio.create_task(orchestrator.execute_workflow(workflow_id))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        
+        status = await orchestrator.get_workflow_status(workflow_id)
+        assert status["status"] == WorkflowStatus.RUNNING.value
+        assert status["cancel_requested"] is False
+        
+        assert await orchestrator.cancel_workflow(workflow_id) is True
+        result = await asyncio.wait_for(execution, timeout=5)
+        
+        assert result.status == WorkflowStatus.CANCELLED
+        assert orchestrator.workflow_results[workflow_id] is result
+        assert workflow_id not in orchestrator.active_workflows
+    
+    @pytest.mark.asyncio
+    async def test_stream_agent_response_forwards_chunks(self, orchestrator, mock_model_router):
+        """Streamed deltas reach the callback and the final response is returned."""
+        final = ModelResponse(
+            content="Hi",
+            model_used="test-model",
+            provider=ModelProvider.OPENAI,
+            cost=0.0,
+            processing_time=0.1,
+            token_usage={"total_tokens": 3}
+        )
+        
+        async def generate_stream(request):
+            assert "Summarize" in request.messages[0]["content"]
+            yield StreamChunk(delta="H", model_used="test-model", index=0)
+            yield StreamChunk(delta="i", model_used="test-model", index=1)
+            yield StreamChunk(delta="", model_used="test-model", index=2, response=final)
+        
+        mock_model_router.generate_stream = generate_stream
+        received = []
+        
+        async def on_chunk(chunk):
+            received.append(chunk.delta)
+        
+        response = await orchestrator.stream_agent_response(
+            AgentRole.SUMMARY_AGENT, "Summarize the lease", {"property": "12 Oak St"}, on_chunk=on_chunk
+        )
+        
+        assert response is final
+        assert received == ["H", "i", ""]
+    
     @pytest.mark.asyncio
     async def test_get_workflow_status(self, orchestrator):
         """Test getting workflow status."""
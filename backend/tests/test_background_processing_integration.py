@@ -150,27 +150,25 @@ class TestBackgroundProcessingIntegration:
         with patch('psutil.cpu_percent', return_value=45.0), \
              patch('psutil.virtual_memory') as mock_memory, \
              patch('psutil.disk_usage') as mock_disk, \
-             patch.object(performance_monitor, 'redis_client') as mock_redis:
+             patch.object(performance_monitor, 'introspection') as mock_introspection:
             
             # Mock system metrics
             mock_memory.return_value.percent = 60.0
             mock_disk.return_value.percent = 30.0
             
-            # Mock Redis queue lengths
-            mock_redis.llen.return_value = 5
+            # Mock cached queue lengths and active tasks
+            snapshot = mock_introspection.get_snapshot.return_value
+            snapshot.queue_lengths = {"ingest": 5, "ocr": 5, "llm": 5, "export": 5, "system": 5}
+            snapshot.active_tasks = {"worker1": [{"id": "task1"}]}
             
-            # Mock Celery inspect
-            with patch.object(performance_monitor.celery_app.control, 'inspect') as mock_inspect:
-                mock_inspect.return_value.active.return_value = {"worker1": [{"id": "task1"}]}
-                
-                # Collect metrics
-                metrics = performance_monitor.collect_metrics()
-                
-                assert metrics.cpu_percent == 45.0
-                assert metrics.memory_percent == 60.0
-                assert metrics.disk_percent == 30.0
-                assert metrics.active_tasks == 1
-                assert all(length == 5 for length in metrics.queue_lengths.values())
+            # Collect metrics
+            metrics = performance_monitor.collect_metrics()
+            
+            assert metrics.cpu_percent == 45.0
+            assert metrics.memory_percent == 60.0
+            assert metrics.disk_percent == 30.0
+            assert metrics.active_tasks == 1
+            assert all(length == 5 for length in metrics.queue_lengths.values())
     
     def test_scaling_decision_logic(self, performance_monitor):
         """Test auto-scaling decision logic."""
@@ -269,13 +267,14 @@ class TestBackgroundProcessingIntegration:
             mock_inspect.return_value.scheduled.return_value = {"worker1": [{"id": "scheduled-task"}]}
             mock_inspect.return_value.reserved.return_value = {"worker1": []}
             
-            with patch('app.services.task_service.get_redis_client') as mock_redis:
+            with patch('app.core.celery_introspection.get_redis_client') as mock_redis:
                 mock_redis_client = Mock()
-                mock_redis_client.llen.return_value = 3
+                mock_redis_client.get.return_value = None
+                mock_redis_client.pipeline.return_value.execute.return_value = [3] * 5
                 mock_redis.return_value = mock_redis_client
                 
                 # Get queue status
-                queue_status = task_service.get_queue_status()
+                queue_status = task_service.get_queue_status(refresh=True)
                 
                 assert "timestamp" in queue_status
                 assert queue_status["total_active"] == 1
@@ -308,7 +307,7 @@ class TestBackgroundProcessingIntegration:
             mock_inspect.return_value.ping.return_value = {"worker1": "pong"}
             
             # Get worker stats
-            stats = task_service.get_worker_stats()
+            stats = task_service.get_worker_stats(refresh=True)
             
             assert "timestamp" in stats
             assert stats["total_workers"] == 1
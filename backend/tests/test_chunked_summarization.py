@@ -0,0 +1,131 @@
+"""
+Tests for map-reduce summarization of long contracts.
+"""
+
+import re
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from app.services.chunked_summarization import ChunkedSummarizer, split_document
+
+
+def make_contract(articles: int = 12) -> str:
+    """Build a long contract with numbered article headings."""
+    headings = {1: "PARTIES", 2: "PURCHASE PRICE", 5: "CLOSING"}
+    body = "The Buyer shall deliver the deposit within five business days. " * 6
+    return "\n\n".join(
+        f"ARTICLE {i}. {headings.get(i, 'GENERAL TERMS')}\n\n{body}\n\n{body}"
+        for i in range(1, articles + 1)
+    )
+
+
+class FakeRedis:
+    """Minimal Redis stand-in for the chunk summary cache."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+class TestSplitDocument:
+    """Test cases for section-based chunking."""
+
+    def test_chunks_respect_size_limit_and_order(self):
+        contract = make_contract()
+        chunks = split_document(contract, max_chars=1500)
+
+        assert len(chunks) > 1
+        assert all(len(chunk.text) <= 1500 for chunk in chunks)
+        assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+        # Nothing is lost
+        assert re.sub(r"\s", "", "".join(chunk.text for chunk in chunks)) == re.sub(r"\s", "", contract)
+
+    def test_chunks_start_at_section_headings(self):
+        chunks = split_document(make_contract(), max_chars=1500)
+
+        assert chunks[0].label == "parties"
+        assert chunks[0].text.startswith("ARTICLE 1.")
+        assert any(chunk.label == "closing" for chunk in chunks)
+
+    def test_short_document_is_one_chunk(self):
+        chunks = split_document("Buyer agrees to purchase the property.", max_chars=1500)
+
+        assert len(chunks) == 1
+
+
+class TestChunkedSummarizer:
+    """Test cases for the map-reduce summarizer."""
+
+    @pytest.fixture
+    def redis(self):
+        fake = FakeRedis()
+        with patch("app.services.chunked_summarization.get_redis_client", return_value=fake):
+            yield fake
+
+    def test_short_document_uses_single_call(self, redis):
+        calls = []
+
+        def complete(system_prompt, prompt, max_tokens):
+            calls.append(prompt)
+            return "summary"
+
+        result = ChunkedSummarizer(complete, "test-model", chunk_chars=1500).summarize(
+            "Buyer agrees to purchase the property.", "Summarize", max_tokens=100
+        )
+
+        assert result["summary"] == "summary"
+        assert result["chunk_count"] == 1
+        assert len(calls) == 1
+        assert "Buyer agrees" in calls[0]
+
+    def test_chunks_are_summarized_concurrently(self, redis):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def complete(system_prompt, prompt, max_tokens):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return "Deposit due in five business days."
+
+        summarizer = ChunkedSummarizer(complete, "test-model", chunk_chars=1500, max_concurrency=4)
+        result = summarizer.summarize(make_contract(), "Summarize", max_tokens=100)
+
+        assert result["chunk_count"] > 4
+        assert peak == 4
+        assert result["summary"] == "Deposit due in five business days."
+
+    def test_unchanged_chunks_come_from_cache(self, redis):
+        prompts = []
+        lock = threading.Lock()
+
+        def complete(system_prompt, prompt, max_tokens):
+            with lock:
+                prompts.append(prompt)
+            return "section summary"
+
+        summarizer = ChunkedSummarizer(complete, "test-model", chunk_chars=1500)
+        contract = make_contract()
+        first = summarizer.summarize(contract, "Summarize", max_tokens=100)
+        assert first["cached_chunks"] == 0
+
+        prompts.clear()
+        edited = contract.replace("ARTICLE 5. CLOSING\n\n", "ARTICLE 5. CLOSING\n\nClosing moves to June 30.\n\n")
+        second = summarizer.summarize(edited, "Summarize", max_tokens=100)
+
+        assert second["cached_chunks"] == second["chunk_count"] - 1
+        # One changed section plus the final reduce
+        assert len(prompts) == 2
+        assert "June 30" in prompts[0]
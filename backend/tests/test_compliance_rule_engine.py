@@ -0,0 +1,97 @@
+"""
+Tests for compiled compliance rule sets.
+"""
+
+import re
+import pytest
+
+from app.services.compliance_rule_engine import CompiledRuleSet, compile_rule_set, extract_trigger_terms
+
+
+RULES = [
+    ("required_parties", r"(?i)(buyer|purchaser).*?and.*?(seller|vendor)"),
+    ("purchase_price", r"\$[\d,]+\.?\d*"),
+    ("property_description", r"(?i)(property|premises|real estate).*?(located|situated|address)"),
+    ("closing_date", r"(?i)(closing|settlement).*?(\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})"),
+    ("contingencies", r"(?i)(contingent|subject to|provided that)"),
+    ("signatures", r"(?i)(signature|signed|executed)"),
+]
+
+CONTRACT = """
+REAL ESTATE PURCHASE AGREEMENT
+
+This agreement is between John Doe (Buyer) and Jane Smith (Seller) for the
+purchase of the Property located at 123 Main St. The premises are situated
+in Springfield. Purchase Price: $250,000.00, subject to appraisal.
+
+Closing shall occur on 06/30/2025, provided that financing is approved.
+Settlement statement due 07-01-2025. This offer is contingent on inspection.
+
+Buyer and Seller signatures required below. Signed and executed in duplicate.
+"""
+
+
+class TestTriggerTerms:
+    """Test cases for literal term extraction."""
+
+    def test_terms_of_leading_group(self):
+        assert extract_trigger_terms(RULES[0][1]) == ("buyer", "purchaser")
+        assert extract_trigger_terms(r"(?:ab|cd)e") == ("ab", "cd")
+        assert extract_trigger_terms(r"foo|bar(baz)") == ("foo", "bar")
+
+    def test_escaped_and_quantified_literals(self):
+        assert extract_trigger_terms(RULES[1][1]) == ("$",)
+        assert extract_trigger_terms(r"ab?c") == ("a",)
+
+    def test_patterns_without_leading_literals(self):
+        assert extract_trigger_terms(r"\d+") is None
+        assert extract_trigger_terms(r"(a|b)?c") is None
+        assert extract_trigger_terms(r"(?=x)y") is None
+        assert extract_trigger_terms(r"(?x) foo") is None
+
+
+class TestCompiledRuleSet:
+    """Test cases for single-pass rule scanning."""
+
+    @pytest.fixture
+    def rule_set(self):
+        return CompiledRuleSet(RULES + [("dates", r"\d{1,2}/\d{1,2}/\d{4}")])
+
+    def test_matches_equal_per_rule_finditer(self, rule_set):
+        results = rule_set.scan(CONTRACT)
+
+        for rule_id, pattern in RULES + [("dates", r"\d{1,2}/\d{1,2}/\d{4}")]:
+            expected = [(m.start(), m.end(), m.group(0)) for m in re.finditer(pattern, CONTRACT)]
+            assert results[rule_id].matches == expected, rule_id
+            assert not results[rule_id].timed_out
+
+    def test_first_only_stops_at_first_match(self, rule_set):
+        results = rule_set.scan(CONTRACT, first_only={"signatures"})
+
+        assert len(results["signatures"].matches) == 1
+        assert len(results["contingencies"].matches) == 3
+
+    def test_missing_element(self, rule_set):
+        results = rule_set.scan("The Buyer agrees to purchase the property.")
+
+        assert not results["required_parties"].found
+        assert not results["purchase_price"].found
+
+    def test_match_window_bounds_backtracking(self):
+        rule_set = CompiledRuleSet(RULES[:1], max_match_chars=100)
+        filler = "x" * 200
+
+        assert rule_set.scan(f"Buyer and {filler} Seller")["required_parties"].matches == []
+        assert rule_set.scan("Buyer and the Seller")["required_parties"].found
+
+    def test_time_budget_stops_rule(self):
+        rule_set = CompiledRuleSet(RULES[:1], time_budget_ms=1e-6)
+        content = "the buyer may inspect and review the records " * 500
+
+        result = rule_set.scan(content)["required_parties"]
+
+        assert result.timed_out
+        assert result.candidates == 1
+
+    def test_compiled_sets_are_cached(self):
+        assert compile_rule_set(RULES) is compile_rule_set(list(RULES))
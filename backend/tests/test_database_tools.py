@@ -0,0 +1,184 @@
+"""
+Tests for batched database tool operations.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import Contract, Deal, Template, User, Version
+from app.services.agent_tools import database_access
+from app.services.agent_tools.database_access import (
+    ContractDatabaseTool,
+    DatabaseQueryInput,
+    UserDatabaseTool
+)
+from app.services.agent_tools.performance_optimization import ResourcePool
+
+
+test_engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+
+@pytest.fixture
+def session_pool():
+    """Route the database tools to the in-memory test database."""
+    SQLModel.metadata.create_all(test_engine)
+    pool = ResourcePool(
+        "test_database",
+        factory=lambda: Session(test_engine),
+        close=Session.close,
+        reset=database_access._reset_session,
+        max_size=2
+    )
+    with patch.object(database_access, "get_session_pool", return_value=pool):
+        yield pool
+    SQLModel.metadata.drop_all(test_engine)
+
+
+@pytest.fixture
+def contracts(session_pool):
+    """Five contracts of one deal, the first with two versions."""
+    with Session(test_engine) as session:
+        user = User(email="agent@example.com", name="Agent", role="agent", password_hash="secret")
+        template = Template(name="Purchase Agreement", version="1.0", docx_key="templates/purchase.docx")
+        session.add_all([user, template])
+        session.commit()
+        deal = Deal(title="Main St", status="active", owner_id=user.id, property_address="1 Main St")
+        session.add(deal)
+        session.commit()
+
+        items = [
+            Contract(deal_id=deal.id, template_id=template.id, status="draft", title=f"Contract {i}")
+            for i in range(5)
+        ]
+        session.add_all(items)
+        session.commit()
+        session.add_all([
+            Version(contract_id=items[0].id, number=number, diff="", created_by="agent", is_current=number == 2)
+            for number in (1, 2)
+        ])
+        session.commit()
+        return [item.id for item in items]
+
+
+def make_tool(tool_class):
+    return tool_class(memory_manager=MagicMock(store_memory=AsyncMock()))
+
+
+def make_input(operation, model_type="contract", **kwargs):
+    query_params = {"operation": operation, **kwargs.pop("query_params", {})}
+    return DatabaseQueryInput(model_type=model_type, query_params=query_params, **kwargs)
+
+
+class TestBatchedDatabaseTools:
+    """Test cases for get_many, stream and bulk_update."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_projects_fields_in_request_order(self, contracts):
+        ids = [contracts[3], 9999, contracts[0]]
+
+        result = await make_tool(ContractDatabaseTool).execute(
+            make_input("get_many", query_params={"ids": ids}, fields=["title"])
+        )
+
+        assert result.success, result.errors
+        assert result.data["records"] == [
+            {"id": contracts[3], "title": "Contract 3"},
+            {"id": contracts[0], "title": "Contract 0"},
+        ]
+        assert result.data["missing_ids"] == [9999]
+
+    @pytest.mark.asyncio
+    async def test_related_rows_load_with_one_query_per_relationship(self, contracts):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_engine, "before_cursor_execute", listener)
+        try:
+            result = await make_tool(ContractDatabaseTool).execute(make_input(
+                "get_many",
+                query_params={"ids": contracts},
+                fields=["title"],
+                include=["deal", "versions"],
+                related_fields={"deal": ["title"], "versions": ["number"]}
+            ))
+        finally:
+            event.remove(test_engine, "before_cursor_execute", listener)
+
+        assert result.success, result.errors
+        first = result.data["records"][0]
+        assert first["deal"]["title"] == "Main St"
+        assert sorted(version["number"] for version in first["versions"]) == [1, 2]
+        assert result.data["records"][1]["versions"] == []
+        assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_pages_with_a_cursor(self, contracts):
+        tool = make_tool(ContractDatabaseTool)
+        pages = []
+        cursor = None
+        while True:
+            result = await tool.execute(make_input(
+                "stream", query_params={"after_id": cursor}, fields=["title"], limit=2
+            ))
+            assert result.success, result.errors
+            pages.append([record["id"] for record in result.data["records"]])
+            cursor = result.data["next_cursor"]
+            if not result.data["has_more"]:
+                break
+
+        assert pages == [contracts[:2], contracts[2:4], contracts[4:]]
+        assert cursor is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_update(self, contracts):
+        tool = make_tool(ContractDatabaseTool)
+
+        shared = await tool.execute(make_input(
+            "bulk_update", query_params={"ids": contracts[:2] + [9999], "data": {"title": "Reviewed"}}
+        ))
+        per_row = await tool.execute(make_input(
+            "bulk_update", query_params={"updates": [{"id": contracts[4], "title": "Final"}]}
+        ))
+        denied = await tool.execute(make_input(
+            "bulk_update", query_params={"ids": contracts[:1], "data": {"id": 1}}
+        ))
+
+        assert shared.data["updated_ids"] == contracts[:2]
+        assert shared.data["missing_ids"] == [9999]
+        assert per_row.data["updated_count"] == 1
+        assert not denied.success
+        with Session(test_engine) as session:
+            titles = [session.get(Contract, contract_id).title for contract_id in contracts]
+        assert titles == ["Reviewed", "Reviewed", "Contract 2", "Contract 3", "Final"]
+
+    @pytest.mark.asyncio
+    async def test_stream_rejects_empty_pages(self, contracts):
+        result = await make_tool(ContractDatabaseTool).execute(make_input("stream", limit=0))
+
+        assert not result.success
+        assert "limit must be at least 1" in result.errors[0]
+
+    @pytest.mark.asyncio
+    async def test_user_fields_are_limited(self, contracts):
+        tool = make_tool(UserDatabaseTool)
+        with Session(test_engine) as session:
+            user_id = session.exec(select(User.id)).one()
+
+        listed = await tool.execute(make_input("get_many", model_type="user", query_params={"ids": [user_id]}))
+        secret = await tool.execute(make_input(
+            "get_many", model_type="user", query_params={"ids": [user_id]}, fields=["password_hash"]
+        ))
+        streamed = await tool.execute(make_input("stream", model_type="user"))
+
+        assert listed.success, listed.errors
+        assert "password_hash" not in listed.data["records"][0]
+        assert listed.data["records"][0]["email"] == "agent@example.com"
+        assert not secret.success
+        assert not streamed.success
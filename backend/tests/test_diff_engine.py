@@ -0,0 +1,143 @@
+"""
+Tests for the document diff engine.
+"""
+
+import difflib
+import random
+
+import pytest
+
+from app.services.diff_engine import DiffEngine, diff_opcodes
+
+
+ORIGINAL = """RESIDENTIAL LEASE AGREEMENT
+
+1. Parties. Landlord: Jane Smith. Tenant: John Doe.
+2. Premises. 123 Main Street, Springfield.
+3. Term. Twelve months beginning 01/01/2025.
+4. Rent. $2,000 per month, due on the first day of each month.
+5. Deposit. $2,000 held by Landlord.
+6. Utilities. Tenant pays all utilities.
+7. Pets. No pets without written consent.
+8. Notices. In writing to the addresses above.
+"""
+
+MODIFIED = """RESIDENTIAL LEASE AGREEMENT
+
+1. Parties. Landlord: Jane Smith. Tenant: John Doe.
+2. Premises. 123 Main Street, Springfield.
+3. Term. Eighteen months beginning 02/01/2025.
+4. Rent. $2,100 per month, due on the first day of each month.
+5. Deposit. $2,000 held by Landlord.
+6. Utilities. Tenant pays all utilities except water.
+7. Pets. No pets without written consent.
+7a. Parking. One assigned space.
+8. Notices. In writing to the addresses above.
+"""
+
+
+def assert_valid_opcodes(a, b, opcodes):
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+
+
+def lcs_length(a, b):
+    row = [0] * (len(b) + 1)
+    for x in a:
+        previous = 0
+        for j, y in enumerate(b):
+            current = row[j + 1]
+            row[j + 1] = previous + 1 if x == y else max(row[j + 1], row[j])
+            previous = current
+    return row[-1]
+
+
+class TestDiffOpcodes:
+    """Test cases for patience/Myers opcodes."""
+
+    def test_random_edits_produce_valid_minimal_opcodes(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            # Every token repeats, so there are no unique anchors and the
+            # Myers diff must find a longest common subsequence
+            a = [rng.randint(0, 4) for _ in range(rng.randint(0, 15))] * 2
+            b = [rng.randint(0, 4) for _ in range(rng.randint(0, 15))] * 2
+            rng.shuffle(a)
+            rng.shuffle(b)
+            opcodes = diff_opcodes(a, b, max_edits=1000)
+
+            assert_valid_opcodes(a, b, opcodes)
+            matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+            assert matched == lcs_length(a, b)
+
+    def test_gap_over_edit_bound_is_replaced(self):
+        opcodes = diff_opcodes([1, 2, 1, 2], [2, 1, 2, 1], max_edits=1)
+
+        assert opcodes == [("replace", 0, 4, 0, 4)]
+
+    def test_unique_lines_anchor_moved_blocks(self):
+        a = ["header", "a", "b", "c", "footer"]
+        b = ["header", "c", "a", "b", "footer"]
+
+        opcodes = diff_opcodes(a, b, max_edits=1000)
+
+        assert_valid_opcodes(a, b, opcodes)
+        assert ("equal", 1, 3, 2, 4) in opcodes
+
+
+class TestDiffEngine:
+    """Test cases for cached diffs and similarity."""
+
+    @pytest.fixture
+    def engine(self):
+        return DiffEngine(cache_size=8, max_edits=1000, reject_below=0.3)
+
+    def test_unified_and_context_match_difflib(self, engine):
+        lines1, lines2 = ORIGINAL.splitlines(keepends=True), MODIFIED.splitlines(keepends=True)
+        diff = engine.diff_lines(ORIGINAL, MODIFIED)
+
+        assert list(diff.unified("v1", "v2", lineterm="")) == list(
+            difflib.unified_diff(lines1, lines2, "v1", "v2", lineterm="")
+        )
+        assert list(diff.context("v1", "v2", lineterm="")) == list(
+            difflib.context_diff(lines1, lines2, "v1", "v2", lineterm="")
+        )
+
+    def test_line_ratio_matches_sequence_matcher(self, engine):
+        diff = engine.diff_lines(ORIGINAL, MODIFIED, keepends=False)
+        expected = difflib.SequenceMatcher(None, ORIGINAL.splitlines(), MODIFIED.splitlines()).ratio()
+
+        assert diff.ratio() == pytest.approx(expected)
+
+    def test_word_diff(self, engine):
+        diff = engine.diff_words("rent is $2,000 per month", "rent is $2,100 per month")
+
+        assert [op for op in diff.opcodes if op[0] != "equal"] == [("replace", 2, 3, 2, 3)]
+
+    def test_diffs_are_cached_by_content(self, engine):
+        first = engine.diff_lines(ORIGINAL, MODIFIED)
+        second = engine.diff_lines("".join([ORIGINAL]), "".join([MODIFIED]))
+
+        assert first is second
+        assert engine.cache_info()["diffs"]["hits"] == 1
+
+    def test_html_marks_changes(self, engine):
+        page = engine.diff_lines(ORIGINAL, MODIFIED).html("Version 1", "Version 2")
+
+        assert '<span class="diff_add">7a. Parking. One assigned space.</span>' in page
+        assert page.count('class="diff_chg"') == 6
+
+    def test_similarity(self, engine):
+        assert engine.similarity(ORIGINAL, ORIGINAL) == 1.0
+        assert 0.75 < engine.similarity(ORIGINAL, MODIFIED) < 1.0
+        assert engine.estimate_similarity(ORIGINAL, "An unrelated invoice for consulting services.") == 0.0
+
+    def test_dissimilar_texts_are_not_diffed(self, engine):
+        engine.similarity(ORIGINAL, "An unrelated invoice for consulting services.")
+
+        assert engine.cache_info()["diffs"]["entries"] == 0
@@ -0,0 +1,102 @@
+"""
+Tests for the structural document index.
+"""
+
+import pytest
+
+from app.services.document_index import DocumentIndexer, build_document_index
+
+
+CONTRACT = """RESIDENTIAL PURCHASE AGREEMENT
+
+1. PARTIES
+The Buyer, John Doe, and the Seller, Jane Smith, agree as follows.
+
+2. PROPERTY
+2.1 Location. The property is located at 123 Main Street.
+2.2 Fixtures. All fixtures are included.
+
+3. PURCHASE PRICE
+The purchase price is $250,000 due at closing on 12/31/2024.
+Buyer shall deposit $5,000 within three days.
+"""
+
+
+class TestDocumentIndex:
+    """Test cases for parsing a document into an index."""
+
+    @pytest.fixture
+    def index(self):
+        return build_document_index(CONTRACT)
+
+    def test_section_tree(self, index):
+        titles = [(section.level, section.title) for section in index.headings()]
+
+        assert titles == [
+            (1, "RESIDENTIAL PURCHASE AGREEMENT"),
+            (1, "1. PARTIES"),
+            (1, "2. PROPERTY"),
+            (2, "2.1 Location. The property is located at 123 Main Street."),
+            (2, "2.2 Fixtures. All fixtures are included."),
+            (1, "3. PURCHASE PRICE"),
+        ]
+        prop = index.root.children[2]
+        assert [child.title[:3] for child in prop.children] == ["2.1", "2.2"]
+        assert prop.end == CONTRACT.index("3. PURCHASE PRICE")
+
+    def test_paragraphs_are_split_at_headings(self, index):
+        location = index.root.children[2].children[0]
+
+        assert [index.text(span) for span in location.paragraphs] == [
+            "2.1 Location. The property is located at 123 Main Street."
+        ]
+        assert index.section_at(CONTRACT.index("$250,000")).title == "3. PURCHASE PRICE"
+
+    def test_keyword_sections_run_to_the_next_line(self, index):
+        assert index.sections["purchase_price"] == "PURCHASE PRICE"
+        assert index.sections["closing"] == "closing on 12/31/2024."
+        # Lines starting with a digit continue the section
+        assert index.sections["property"] == (
+            "PROPERTY\n2.1 Location. The property is located at 123 Main Street.\n"
+            "2.2 Fixtures. All fixtures are included."
+        )
+        assert "disclosures" not in index.sections
+
+    def test_paragraphs_are_sections_without_keywords(self):
+        index = build_document_index("First note.\n\nSecond note.")
+
+        assert index.sections == {"section_1": "First note.", "section_2": "Second note."}
+
+    def test_amounts_dates_and_actions(self, index):
+        assert index.amounts == ["$250,000", "$5,000"]
+        assert index.dates == ["12/31/2024"]
+        assert index.actions == ["deposit $5,000 within three days"]
+
+    def test_action_items_are_limited(self):
+        index = build_document_index("Buyer shall pay. " * 20)
+
+        assert len(index.actions) == 10
+
+
+class TestDocumentIndexer:
+    """Test cases for the content-hash index cache."""
+
+    def test_same_content_is_parsed_once(self):
+        indexer = DocumentIndexer(cache_size=2)
+
+        first = indexer.index(CONTRACT)
+        second = indexer.index("".join([CONTRACT]))
+
+        assert first is second
+        assert indexer.cache_info() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_least_recently_used_index_is_evicted(self):
+        indexer = DocumentIndexer(cache_size=2)
+        first = indexer.index("one")
+        indexer.index("two")
+        indexer.index("one")
+        indexer.index("three")
+
+        assert indexer.index("one") is first
+        assert indexer.cache_info()["entries"] == 2
+        assert indexer.cache_info()["misses"] == 3
@@ -0,0 +1,138 @@
+"""
+Tests for document worker job claiming.
+
+Covers atomic claims shared between worker instances, reclaiming jobs
+whose lease expired because their worker died, and dropping the late
+result of a worker whose lease was taken over.
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.models.file import FileProcessingJob, ProcessingStatus
+from app.workers import document_worker
+from app.workers.document_worker import DocumentWorker
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed SQLite database so worker threads use separate connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    SQLModel.metadata.create_all(engine)
+
+    @contextmanager
+    def session_context():
+        with Session(engine) as session:
+            yield session
+
+    with patch.object(document_worker, "get_session_context", session_context), \
+            patch.object(document_worker, "get_storage_client"), \
+            patch.object(document_worker, "get_document_processor"):
+        yield engine
+    SQLModel.metadata.drop_all(engine)
+
+
+def add_jobs(engine, count, **fields):
+    with Session(engine) as session:
+        jobs = [
+            FileProcessingJob(
+                file_id=1,
+                job_type="text_extraction",
+                status=fields.get("status", ProcessingStatus.PENDING),
+                priority=5,
+                parameters={},
+                started_at=fields.get("started_at")
+            )
+            for _ in range(count)
+        ]
+        session.add_all(jobs)
+        session.commit()
+        return [job.id for job in jobs]
+
+
+class TestJobClaiming:
+    """Test cases for claiming processing jobs."""
+
+    def test_concurrent_workers_claim_each_job_once(self, engine):
+        job_ids = add_jobs(engine, 40)
+        workers = [DocumentWorker(), DocumentWorker()]
+        claims = [[], []]
+        barrier = threading.Barrier(len(workers))
+
+        def drain(index):
+            barrier.wait()
+            while True:
+                claimed = workers[index]._claim_jobs(3)
+                if not claimed:
+                    return
+                claims[index].extend(claimed)
+
+        threads = [threading.Thread(target=drain, args=(index,)) for index in range(len(workers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not set(claims[0]) & set(claims[1])
+        assert sorted(claims[0] + claims[1]) == job_ids
+        with Session(engine) as session:
+            assert all(
+                session.get(FileProcessingJob, job_id).status == ProcessingStatus.IN_PROGRESS
+                for job_id in job_ids
+            )
+
+    def test_expired_lease_is_reclaimed(self, engine):
+        worker = DocumentWorker()
+        worker.lease_seconds = 60
+        abandoned = add_jobs(
+            engine, 1, status=ProcessingStatus.IN_PROGRESS,
+            started_at=datetime.utcnow() - timedelta(seconds=120)
+        )
+        running = add_jobs(
+            engine, 1, status=ProcessingStatus.IN_PROGRESS,
+            started_at=datetime.utcnow() - timedelta(seconds=10)
+        )
+
+        assert list(worker._claim_jobs(5)) == abandoned
+        assert not DocumentWorker()._claim_jobs(5)
+
+        with Session(engine) as session:
+            reclaimed = session.get(FileProcessingJob, abandoned[0])
+            assert reclaimed.status == ProcessingStatus.IN_PROGRESS
+            assert reclaimed.started_at > datetime.utcnow() - timedelta(seconds=5)
+            assert session.get(FileProcessingJob, running[0]).status == ProcessingStatus.IN_PROGRESS
+
+    def test_late_result_of_reclaimed_job_is_dropped(self, engine):
+        stale_claim = datetime.utcnow() - timedelta(seconds=120)
+        job_ids = add_jobs(engine, 1, status=ProcessingStatus.IN_PROGRESS, started_at=stale_claim)
+        worker = DocumentWorker()
+        worker.lease_seconds = 60
+        new_claim = worker._claim_jobs(1)[job_ids[0]]
+
+        with Session(engine) as session:
+            job = session.get(FileProcessingJob, job_ids[0])
+            assert not worker._finish_job(
+                job, session, stale_claim,
+                status=ProcessingStatus.COMPLETED, completed_at=datetime.utcnow()
+            )
+            session.commit()
+
+        with Session(engine) as session:
+            job = session.get(FileProcessingJob, job_ids[0])
+            assert job.status == ProcessingStatus.IN_PROGRESS
+            assert job.started_at == new_claim
+            assert worker._finish_job(
+                job, session, new_claim,
+                status=ProcessingStatus.COMPLETED, completed_at=datetime.utcnow()
+            )
+            session.commit()
+            session.refresh(job)
+            assert job.status == ProcessingStatus.COMPLETED
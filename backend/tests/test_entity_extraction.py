@@ -0,0 +1,109 @@
+"""
+Tests for single-pass entity extraction.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import PropertyMock, patch
+
+import pytest
+
+from app.services.entity_extraction import EntityExtractor, EntityScanner
+
+
+CONTRACT = (
+    "Buyer: John Smith agrees to purchase the single-family home at 123 Oak Street, "
+    "Austin, TX 78701. Purchase price: $450,000.00 with a deposit of $10,000 due 06/30/2025. "
+    "Mary Jones, Seller, will deliver the disclosure by March 3, 2025. The 3-bedroom home "
+    "of 2,100 square feet is sold as-is, subject to the inspection contingency and 5% commission."
+)
+
+
+class TestEntityScanner:
+    """Test cases for the combined pattern scanner."""
+
+    @pytest.fixture
+    def extractor(self):
+        return EntityExtractor(max_workers=0)
+
+    def test_extracts_all_categories(self, extractor):
+        entities = extractor.extract(CONTRACT)
+
+        assert list(entities) == ["properties", "parties", "financial_terms", "dates", "legal_terms", "addresses"]
+        assert {e["value"] for e in entities["properties"]} == {"single-family", "3-bedroom", "2,100 square feet"}
+        assert {e["value"] for e in entities["dates"]} == {"06/30/2025", "March 3, 2025"}
+        assert {e["value"] for e in entities["legal_terms"]} == {"disclosure", "as-is", "subject to", "contingency"}
+        assert {e["value"] for e in entities["addresses"]} == {"123 Oak Street", "Austin, TX 78701"}
+
+    def test_party_name_and_role(self, extractor):
+        parties = extractor.extract(CONTRACT, ["parties"])["parties"]
+
+        assert [(p["name"], p["role"]) for p in parties] == [("John Smith", "Buyer"), ("Mary Jones", "Seller")]
+        assert parties[0]["type"] == "party"
+        assert CONTRACT[parties[0]["start_pos"]:parties[0]["end_pos"]] == "Buyer: John Smith"
+
+    def test_overlapping_spans_are_deduplicated(self, extractor):
+        amounts = [e["value"] for e in extractor.extract(CONTRACT, ["financial_terms"])["financial_terms"]]
+
+        # The labeled amount covers its dollar figure
+        assert amounts == ["Purchase price: $450,000.00", "$10,000", "5%"]
+
+    def test_matches_start_at_word_boundaries(self):
+        values = [e.fields[0][1] for e in EntityScanner(["properties"]).scan("nonresidential and residential")]
+
+        assert values == ["residential"]
+
+    def test_entities_stream_in_document_order(self, extractor):
+        starts = [entity.start for entity in extractor.iter_entities(CONTRACT)]
+
+        assert starts == sorted(starts)
+
+
+class TestParallelExtraction:
+    """Test cases for chunked extraction of large texts."""
+
+    @pytest.fixture
+    def extractor(self):
+        extractor = EntityExtractor(max_workers=2)
+        extractor.chunk_chars = 500
+        extractor.chunk_overlap = 100
+        extractor._pool = ThreadPoolExecutor(2)
+        with patch.object(EntityExtractor, "in_process", new_callable=PropertyMock, return_value=False):
+            yield extractor
+        extractor.shutdown()
+
+    def test_chunked_extraction_equals_single_pass(self, extractor):
+        text = " ".join([CONTRACT] * 20)
+
+        chunked = list(extractor.iter_entities(text))
+        single = list(EntityScanner().scan(text))
+
+        assert chunked == single
+
+    def test_entity_crossing_a_chunk_boundary(self, extractor):
+        # The first chunk ends inside the street address; scanning the second
+        # chunk from there matches "Street, TX 78701", which hides the area
+        text = ("filler " * 80)[:496] + " 123 Oak Street, TX 78701 square feet. " + CONTRACT
+        assert next(extractor._chunks(text))[1] == text.index("123") + 3
+
+        chunked = list(extractor.iter_entities(text))
+        single = list(EntityScanner().scan(text))
+
+        assert chunked == single
+        assert [text[e.start:e.end] for e in chunked[:2]] == ["123 Oak Street", "78701 square feet"]
+
+    def test_chunks_end_at_whitespace(self, extractor):
+        text = " ".join([CONTRACT] * 5)
+        chunks = list(extractor._chunks(text))
+
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(text)
+        for (_, stop, scan_end), (next_start, _, _) in zip(chunks, chunks[1:]):
+            assert stop == next_start
+            assert text[stop].isspace()
+            assert scan_end == stop + 100
+
+    def test_batch_extraction_preserves_order(self, extractor):
+        documents = [f"Closing on {month}/1/2025." for month in range(1, 13)]
+
+        results = list(extractor.extract_batch(documents, ["dates"], batch_size=2))
+
+        assert [r["dates"][0]["value"] for r in results] == [f"{month}/1/2025" for month in range(1, 13)]
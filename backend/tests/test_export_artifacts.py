@@ -0,0 +1,266 @@
+"""
+Tests for the content-addressed export artifact store.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.core.storage import StorageError
+from app.services import export_artifacts
+from app.services.export_artifacts import ExportArtifactStore, compute_artifact_hash
+
+
+CONTENT = "Real Estate Contract - Purchase Agreement\n\nBuyer agrees to purchase the property."
+
+
+class FakeStorage:
+    """In-memory stand-in for the storage client."""
+
+    def __init__(self):
+        self.files = {}
+        self.metadata = {}
+        self.uploads = 0
+
+    def upload_file(self, file_obj, storage_key, mime_type, metadata=None):
+        self.uploads += 1
+        self.files[storage_key] = file_obj.read()
+        self.metadata[storage_key] = dict(metadata or {})
+        return {"storage_key": storage_key, "size": len(self.files[storage_key])}
+
+    def get_file_metadata(self, storage_key):
+        if storage_key not in self.files:
+            raise StorageError(f"File not found: {storage_key}")
+        return {
+            "size": len(self.files[storage_key]),
+            "content_type": "application/pdf",
+            "metadata": self.metadata.get(storage_key, {}),
+        }
+
+    def download_file(self, storage_key):
+        if storage_key not in self.files:
+            raise StorageError(f"File not found: {storage_key}")
+        return self.files[storage_key]
+
+    def delete_file(self, storage_key):
+        self.files.pop(storage_key, None)
+        return True
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis client running the store's scripts."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.scores = {}
+
+    def exists(self, key):
+        return int(key in self.values or bool(self.sets.get(key)))
+
+    def zadd(self, key, mapping, nx=False, xx=False):
+        for member, score in mapping.items():
+            if (nx and member in self.scores) or (xx and member not in self.scores):
+                continue
+            self.scores[member] = score
+
+    def zrangebyscore(self, key, low, high, start=0, num=None):
+        members = sorted((score, member) for member, score in self.scores.items() if score <= high)
+        return [member.encode() for _, member in members][start:None if num is None else start + num]
+
+    def register_script(self, script):
+        return {
+            export_artifacts._ATTACH_SCRIPT: self._attach,
+            export_artifacts._DETACH_SCRIPT: self._detach,
+            export_artifacts._CLAIM_SCRIPT: self._claim,
+        }[script]
+
+    def _release(self, refs_key, owner, artifact_id, now):
+        refs = self.sets.setdefault(refs_key, set())
+        refs.discard(owner)
+        if not refs:
+            self.scores[artifact_id] = now
+
+    def _attach(self, keys, args):
+        owner, artifact_id, now, prefix = args
+        previous = self.values.get(keys[0])
+        self.values[keys[0]] = artifact_id
+        self.sets.setdefault(keys[1], set()).add(owner)
+        self.scores.pop(artifact_id, None)
+        if previous and previous != artifact_id:
+            self._release(prefix + previous, owner, previous, now)
+        return (previous or "").encode()
+
+    def _detach(self, keys, args):
+        owner, now, prefix = args
+        current = self.values.pop(keys[0], None)
+        if current:
+            self._release(prefix + current, owner, current, now)
+        return (current or "").encode()
+
+    def _claim(self, keys, args):
+        self.scores.pop(args[0], None)
+        return 0 if self.sets.get(keys[0]) else 1
+
+
+class TestArtifactHash:
+    """Test cases for artifact hashing."""
+
+    def test_hash_is_stable(self):
+        style = {"renderer": "reportlab", "template_options": {"font_size": 12, "page_size": "letter"}}
+        reordered = {"template_options": {"page_size": "letter", "font_size": 12}, "renderer": "reportlab"}
+
+        assert compute_artifact_hash(CONTENT, "pdf", style) == compute_artifact_hash(CONTENT, "PDF", reordered)
+        assert compute_artifact_hash(CONTENT, "pdf") == compute_artifact_hash(CONTENT.encode(), "pdf")
+
+    def test_hash_covers_content_format_and_style(self):
+        base = compute_artifact_hash(CONTENT, "pdf", {"font_size": 12})
+
+        assert compute_artifact_hash(CONTENT + " ", "pdf", {"font_size": 12}) != base
+        assert compute_artifact_hash(CONTENT, "docx", {"font_size": 12}) != base
+        assert compute_artifact_hash(CONTENT, "pdf", {"font_size": 11}) != base
+
+
+class TestExportArtifactStore:
+    """Test cases for ExportArtifactStore."""
+
+    @pytest.fixture
+    def storage(self):
+        fake = FakeStorage()
+        with patch("app.services.export_artifacts.get_storage_client", return_value=fake):
+            yield fake
+
+    @pytest.fixture
+    def redis(self):
+        client = MagicMock()
+        client.exists.return_value = 0
+        with patch("app.services.export_artifacts.get_redis_client", return_value=client):
+            yield client
+
+    @pytest.fixture
+    def store(self, storage, redis):
+        return ExportArtifactStore()
+
+    def test_miss_renders_and_stores(self, store, storage):
+        render = MagicMock(return_value=b"%PDF-1.4 contract")
+
+        record, reused = store.get_or_create("contract:1", CONTENT, "pdf", {"font_size": 12}, render)
+
+        assert not reused
+        render.assert_called_once()
+        assert record["storage_key"].startswith("artifacts/pdf/")
+        assert record["storage_key"].endswith(f"{record['artifact_hash']}.pdf")
+        assert storage.files[record["storage_key"]] == b"%PDF-1.4 contract"
+
+    def test_unchanged_content_is_reused(self, store, storage):
+        first, _ = store.get_or_create("contract:1", CONTENT, "pdf", None, lambda: b"%PDF-1.4 contract")
+        render = MagicMock(return_value=b"%PDF-1.4 contract")
+
+        second, reused = store.get_or_create("contract:2", CONTENT, "pdf", None, render)
+
+        assert reused
+        render.assert_not_called()
+        assert second["storage_key"] == first["storage_key"]
+        assert second["size"] == first["size"]
+        assert storage.uploads == 1
+
+    def test_new_artifact_starts_unreferenced(self, store, redis):
+        store.store("ab" * 32, "pdf", b"%PDF-1.4")
+
+        redis.zadd.assert_called_once()
+        assert redis.zadd.call_args.kwargs["nx"] is True
+
+    def test_attach_returns_previous_artifact(self, store, redis):
+        redis.register_script.return_value = MagicMock(return_value=b"pdf:" + b"cd" * 32)
+
+        previous = store.attach("contract:1", "pdf", "ab" * 32)
+
+        assert previous == "cd" * 32
+        keys = redis.register_script.return_value.call_args.kwargs["keys"]
+        assert keys[0] == "export_artifact:owner:contract:1:pdf"
+
+    def test_garbage_collection_skips_rereferenced_artifacts(self, store, storage, redis):
+        stale, kept = "ab" * 32, "cd" * 32
+        for artifact_hash in (stale, kept):
+            storage.files[store.storage_key(artifact_hash, "pdf")] = b"%PDF-1.4"
+        redis.zrangebyscore.return_value = [f"pdf:{stale}".encode(), f"pdf:{kept}".encode()]
+        redis.register_script.return_value = MagicMock(side_effect=[1, 0])
+
+        stats = store.collect_garbage(grace_seconds=0)
+
+        assert stats["deleted"] == 1
+        assert stats["rereferenced"] == 1
+        assert list(storage.files) == [store.storage_key(kept, "pdf")]
+
+
+class TestArtifactReferences:
+    """Test cases for reference counting against garbage collection."""
+
+    @pytest.fixture
+    def storage(self):
+        fake = FakeStorage()
+        with patch("app.services.export_artifacts.get_storage_client", return_value=fake):
+            yield fake
+
+    @pytest.fixture
+    def store(self, storage):
+        with patch("app.services.export_artifacts.get_redis_client", return_value=FakeRedis()):
+            yield ExportArtifactStore()
+
+    def test_export_keeps_generated_artifact(self, store):
+        generated, _ = store.get_or_create(
+            "contract:1:generated", CONTENT, "pdf", None, lambda: b"%PDF-1.4 generated"
+        )
+        first_export, _ = store.get_or_create(
+            "contract:1:export", "Title\n\n" + CONTENT, "pdf", {"renderer": "reportlab"}, lambda: b"%PDF-1.4 v1"
+        )
+        latest_export, _ = store.get_or_create(
+            "contract:1:export", "Title\n\n" + CONTENT + " Amended.", "pdf", {"renderer": "reportlab"},
+            lambda: b"%PDF-1.4 v2"
+        )
+
+        stats = store.collect_garbage(grace_seconds=0)
+
+        assert stats["deleted"] == 1
+        assert store.fetch(generated["artifact_hash"], "pdf") == b"%PDF-1.4 generated"
+        assert store.fetch(latest_export["artifact_hash"], "pdf") == b"%PDF-1.4 v2"
+        assert store.fetch(first_export["artifact_hash"], "pdf") is None
+
+    def test_detached_artifacts_are_collected(self, store):
+        record, _ = store.get_or_create("contract:1:export", CONTENT, "pdf", None, lambda: b"%PDF-1.4")
+
+        assert store.detach("contract:1:export", "pdf") == record["artifact_hash"]
+        assert store.collect_garbage(grace_seconds=0)["deleted"] == 1
+        assert store.fetch(record["artifact_hash"], "pdf") is None
+
+    def test_render_metadata_is_returned_on_reuse(self, store):
+        metadata = {"contract_id": "1"}
+
+        def render():
+            metadata["page_count"] = "3"
+            return b"%PDF-1.4"
+
+        store.get_or_create("contract:1:export", CONTENT, "pdf", None, render, metadata)
+        record, reused = store.get_or_create("contract:2:export", CONTENT, "pdf", None, render)
+
+        assert reused
+        assert record["metadata"]["page_count"] == "3"
+
+    def test_unreferenced_new_artifact_is_not_collectable(self, store):
+        store._attach_script = MagicMock(side_effect=ConnectionError("Redis unavailable"))
+
+        with pytest.raises(ConnectionError):
+            store.get_or_create("contract:1:export", CONTENT, "pdf", None, lambda: b"%PDF-1.4")
+
+        assert store.collect_garbage(grace_seconds=-1)["examined"] == 0
+
+    def test_failed_reference_fails_the_export(self, store):
+        store.get_or_create("contract:1:export", CONTENT, "pdf", None, lambda: b"%PDF-1.4")
+        store.detach("contract:1:export", "pdf")
+        store._attach_script = MagicMock(side_effect=ConnectionError("Redis unavailable"))
+
+        with pytest.raises(ConnectionError):
+            store.get_or_create("contract:2:export", CONTENT, "pdf", None, lambda: b"%PDF-1.4")
+        with pytest.raises(ConnectionError):
+            store.get_or_create("contract:2:export", CONTENT + " Amended.", "pdf", None, lambda: b"%PDF-1.4 v2")
+
+        assert store.attach("contract:2:export", "pdf", "ab" * 32) is None
@@ -5,10 +5,11 @@ This module tests file upload, download, processing, storage,
 and all file management operations.
 """
 
+import fakeredis
 import pytest
 import tempfile
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, create_engine, Session
@@ -19,6 +20,8 @@ from app.core.database import get_session
 from app.core.storage import StorageClient, StorageError
 from app.core.document_processor import DocumentProcessor, DocumentProcessingError
 from app.core.security import auth_rate_limiter, general_rate_limiter
+from app.services.storage_quota import StorageQuotaManager, QuotaExceededError, QuotaLimit
+from app.services import storage_quota
 from app.models.file import (
     File, FileStatus, ProcessingStatus, FileType,
     FileUploadInitiate, StorageQuota
@@ -236,6 +239,25 @@ class TestFileUpload:
         
         assert response.status_code == 404
         assert "File not found" in response.json()["detail"]
+    
+    def test_complete_upload_missing_from_storage_releases_quota(self, client, test_user, mock_storage_client):
+        """A failed upload gives back the quota reserved for it."""
+        upload_data = {
+            "filename": "test.pdf",
+            "file_size": 1024,
+            "mime_type": "application/pdf",
+            "checksum": "abc123"
+        }
+        
+        headers = {"Authorization": f"Bearer {test_user}"}
+        file_id = client.post("/files/upload/initiate", json=upload_data, headers=headers).json()["file_id"]
+        mock_storage_client.file_exists.return_value = False
+        
+        response = client.post("/files/upload/complete", json={"file_id": file_id, "etag": "test-etag"}, headers=headers)
+        
+        assert response.status_code == 400
+        quota = client.get("/files/quota/me", headers=headers).json()
+        assert (quota["used_storage_bytes"], quota["used_files"]) == (0, 0)
 
 
 class TestFileDownload:
@@ -410,6 +432,199 @@ class TestStorageQuota:
         
         assert response.status_code == 413
         assert "quota exceeded" in response.json()["detail"]
+    
+    def test_quota_reservation_and_release(self, client, test_user, mock_storage_client):
+        """Test that reservations are enforced atomically and can be released."""
+        manager = StorageQuotaManager()
+        manager.use_redis = False
+        
+        with Session(test_engine) as session:
+            from sqlmodel import select
+            user = session.exec(select(User).where(User.email == "test@example.com")).first()
+            
+            session.add(StorageQuota(
+                user_id=user.id,
+                max_storage_bytes=1000,
+                max_files=10,
+                used_storage_bytes=0,
+                used_files=0
+            ))
+            session.commit()
+            
+            manager.reserve(session, user.id, 600)
+            with pytest.raises(QuotaExceededError) as exc_info:
+                manager.reserve(session, user.id, 600)
+            assert exc_info.value.limit == QuotaLimit.STORAGE
+            
+            manager.release(session, user.id, 600)
+            manager.reserve(session, user.id, 600)
+            
+            usage = manager.get_usage(session, user.id)
+            assert usage.used_storage_bytes == 600
+            assert usage.used_files == 1
+    
+    def test_reconcile_expires_abandoned_uploads_without_redis(self, client, test_user, mock_storage_client):
+        """Uploads never completed within the upload window stop holding quota."""
+        manager = StorageQuotaManager()
+        manager.use_redis = False
+        
+        with Session(test_engine) as session:
+            from sqlmodel import select
+            user = session.exec(select(User).where(User.email == "test@example.com")).first()
+            session.add(StorageQuota(user_id=user.id, max_storage_bytes=1000, max_files=10))
+            session.commit()
+            
+            manager.reserve(session, user.id, 600)
+            abandoned = File(
+                filename="contract.pdf",
+                file_type=FileType.PDF,
+                mime_type="application/pdf",
+                file_size=600,
+                storage_path="s3://test-bucket/contract.pdf",
+                storage_bucket="test-bucket",
+                storage_key="contract.pdf",
+                uploaded_by=user.id,
+                status=FileStatus.UPLOADING,
+                created_at=datetime.utcnow() - manager.upload_window - timedelta(minutes=1)
+            )
+            session.add(abandoned)
+            session.commit()
+            with pytest.raises(QuotaExceededError):
+                manager.reserve(session, user.id, 600)
+            
+            stats = manager.reconcile(session)
+            
+            assert stats["uploads_expired"] == 1
+            session.refresh(abandoned)
+            assert abandoned.status == FileStatus.DELETED
+            manager.reserve(session, user.id, 600)
+
+
+class TestStorageQuotaRedis:
+    """Test storage quota reservations through the Redis counters."""
+    
+    @pytest.fixture
+    def redis_client(self):
+        client = fakeredis.FakeStrictRedis()
+        with patch.object(storage_quota, "get_redis_client", return_value=client):
+            yield client
+    
+    @pytest.fixture
+    def quota_user(self, client, test_user, redis_client):
+        """User with a 1000 byte, 3 file quota."""
+        with Session(test_engine) as session:
+            from sqlmodel import select
+            user = session.exec(select(User).where(User.email == "test@example.com")).first()
+            session.add(StorageQuota(
+                user_id=user.id,
+                max_storage_bytes=1000,
+                max_files=3,
+                used_storage_bytes=0,
+                used_files=0
+            ))
+            session.commit()
+            return user.id
+    
+    def _manager(self):
+        manager = StorageQuotaManager()
+        manager.use_redis = True
+        return manager
+    
+    def _add_file(self, session, user_id, size, status=FileStatus.UPLOADING):
+        file_record = File(
+            filename="contract.pdf",
+            file_type=FileType.PDF,
+            mime_type="application/pdf",
+            file_size=size,
+            storage_path="s3://test-bucket/contract.pdf",
+            storage_bucket="test-bucket",
+            storage_key="contract.pdf",
+            uploaded_by=user_id,
+            status=status
+        )
+        session.add(file_record)
+        session.commit()
+        return file_record
+    
+    def test_reserve_commit_and_cancel(self, quota_user, redis_client):
+        """Reservations hold quota until committed into usage or cancelled."""
+        manager = self._manager()
+        
+        with Session(test_engine) as session:
+            cancelled = manager.reserve(session, quota_user, 600)
+            assert cancelled.token is not None
+            with pytest.raises(QuotaExceededError):
+                manager.reserve(session, quota_user, 600)
+            manager.cancel(session, cancelled)
+            
+            reservation = manager.reserve(session, quota_user, 600)
+            assert manager.get_usage(session, quota_user).used_storage_bytes == 600
+            self._add_file(session, quota_user, 600)
+            manager.commit(session, reservation)
+            
+            usage = manager.get_usage(session, quota_user)
+            assert (usage.used_storage_bytes, usage.used_files) == (600, 1)
+            assert redis_client.hget(manager._key(quota_user), "used_bytes") == b"600"
+            assert redis_client.zcard(manager._reservations_key(quota_user)) == 0
+    
+    def test_release_frees_quota_of_deleted_file(self, quota_user):
+        """Releasing a deleted file's size makes room for new reservations."""
+        manager = self._manager()
+        
+        with Session(test_engine) as session:
+            reservation = manager.reserve(session, quota_user, 800)
+            file_record = self._add_file(session, quota_user, 800, FileStatus.UPLOADED)
+            manager.commit(session, reservation)
+            
+            manager.release(session, quota_user, 800)
+            file_record.status = FileStatus.DELETED
+            session.add(file_record)
+            session.commit()
+            
+            manager.reserve(session, quota_user, 800)
+            assert manager.get_usage(session, quota_user).used_storage_bytes == 800
+    
+    def test_reconcile_keeps_open_reservations(self, quota_user):
+        """Reconciliation replaces usage with file sizes but keeps in-flight reservations."""
+        manager = self._manager()
+        
+        with Session(test_engine) as session:
+            stored = manager.reserve(session, quota_user, 300)
+            self._add_file(session, quota_user, 300, FileStatus.UPLOADED)
+            manager.commit(session, stored)
+            in_flight = manager.reserve(session, quota_user, 400)
+            
+            stats = manager.reconcile(session)
+            
+            assert stats["users_reconciled"] == 1
+            assert manager.get_usage(session, quota_user).used_storage_bytes == 700
+            with pytest.raises(QuotaExceededError):
+                manager.reserve(session, quota_user, 400)
+            
+            self._add_file(session, quota_user, 400)
+            manager.commit(session, in_flight)
+            manager.reconcile(session, [quota_user])
+            
+            usage = manager.get_usage(session, quota_user)
+            assert (usage.used_storage_bytes, usage.used_files) == (700, 2)
+    
+    def test_reconcile_covers_abandoned_uploads_of_clean_users(self, quota_user, redis_client):
+        """Users with expired uploads are reconciled even when not marked dirty."""
+        manager = self._manager()
+        
+        with Session(test_engine) as session:
+            reservation = manager.reserve(session, quota_user, 800)
+            abandoned = self._add_file(session, quota_user, 800)
+            manager.commit(session, reservation)
+            abandoned.created_at = datetime.utcnow() - manager.upload_window - timedelta(minutes=1)
+            session.add(abandoned)
+            session.commit()
+            redis_client.delete(storage_quota.DIRTY_USERS_KEY)
+            
+            stats = manager.reconcile(session)
+            
+            assert stats["users_reconciled"] == 1
+            assert manager.get_usage(session, quota_user).used_storage_bytes == 0
 
 
 class TestFileValidation:
@@ -0,0 +1,111 @@
+"""
+Tests for lazy imports and the API import-time budget.
+
+These tests make sure heavy subsystems (CrewAI, provider SDKs, PDF/OCR
+libraries, the agent tool registry) stay deferred until first use.
+"""
+
+import sys
+
+import pytest
+
+from app.core.lazy_imports import LazyAttributes, lazy_import
+from scripts.import_time_report import (
+    DEFERRED_PACKAGES,
+    build_report,
+    parse_importtime,
+    run_importtime,
+)
+
+
+class TestLazyModule:
+    """Test cases for the lazy module facade."""
+
+    def test_module_not_imported_until_attribute_access(self):
+        """Creating the facade does not import the module."""
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+
+        assert not colorsys.is_loaded
+        assert "colorsys" not in sys.modules
+
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+        assert colorsys.is_loaded
+        assert "colorsys" in sys.modules
+
+    def test_missing_module_raises_on_use(self):
+        """Import errors surface on first use, not at creation."""
+        missing = lazy_import("definitely_not_a_real_module_name")
+        with pytest.raises(ImportError):
+            missing.anything
+
+
+class TestLazyAttributes:
+    """Test cases for PEP 562 lazy module attributes."""
+
+    def test_resolve_binds_into_globals(self):
+        """Resolved names are cached in the owning namespace."""
+        namespace = {"__name__": "fake_module", "__package__": None}
+        lazy = LazyAttributes(namespace, {"JSONDecoder": "json", "dumps_alias": "json:dumps"})
+
+        assert "JSONDecoder" not in namespace
+        decoder = lazy.module_getattr("JSONDecoder")
+        assert namespace["JSONDecoder"] is decoder
+        assert lazy.resolve("dumps_alias")({"a": 1}) == '{"a": 1}'
+
+    def test_existing_binding_is_not_overwritten(self):
+        """Values bound by patching take precedence over the lazy import."""
+        sentinel = object()
+        namespace = {"__name__": "fake_module", "__package__": None, "JSONDecoder": sentinel}
+        lazy = LazyAttributes(namespace, {"JSONDecoder": "json"})
+
+        lazy.load()
+        assert namespace["JSONDecoder"] is sentinel
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Unknown names behave like missing module attributes."""
+        lazy = LazyAttributes({"__name__": "fake_module"}, {})
+        with pytest.raises(AttributeError):
+            lazy.module_getattr("missing")
+
+
+class TestImportTimeReport:
+    """Test cases for the import-time report parser."""
+
+    SAMPLE = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   json.decoder\n"
+        "import time:       200 |        300 | json\n"
+        "import time:      5000 |       5000 |   crewai\n"
+        "import time:      1000 |       6300 | app.main\n"
+    )
+
+    def test_parse_and_report(self):
+        """The report totals the target module and flags deferred packages."""
+        records = parse_importtime(self.SAMPLE)
+        assert len(records) == 4
+
+        report = build_report(records, module="app.main", budget_ms=5)
+        assert report["total_ms"] == 6.3
+        assert report["within_budget"] is False
+        assert report["eager_deferred_packages"] == ["crewai"]
+        assert report["slowest_cumulative"][0]["module"] == "app.main"
+
+
+@pytest.mark.slow
+class TestAppImportBudget:
+    """Import-time regression budget for the API application."""
+
+    def test_app_main_defers_heavy_packages(self):
+        """Importing app.main does not load deferred subsystems."""
+        report = build_report(parse_importtime(run_importtime("app.main")))
+
+        assert report["eager_deferred_packages"] == [], report["eager_deferred_packages"]
+        assert report["within_budget"], (
+            f"app.main import took {report['total_ms']} ms, budget {report['budget_ms']} ms"
+        )
+
+    def test_deferred_package_list_is_not_empty(self):
+        """Guard against accidentally disabling the check."""
+        assert "crewai" in DEFERRED_PACKAGES
+        assert "openai" in DEFERRED_PACKAGES
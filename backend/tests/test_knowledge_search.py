@@ -0,0 +1,107 @@
+"""
+Tests for BM25 knowledge search.
+"""
+
+import math
+from collections import Counter
+
+import pytest
+
+from app.services.knowledge_search import BM25Index, SearchDocument, tokenize
+
+
+DOCUMENTS = [
+    ("inspection", "clause", "Inspection Contingency", "Buyer's obligation is contingent upon satisfactory inspection of the property."),
+    ("financing", "clause", "Financing Contingency", "Buyer's obligation is contingent upon obtaining financing."),
+    ("flood", "clause", "Flood Zone Disclosure", "Property is located in a designated flood zone."),
+    ("closing", "help", "Closing Process", "The closing process typically takes 30-45 days and involves loan approval and inspections."),
+    ("contingencies", "help", "Contingencies", "Contingencies are conditions that must be met for the contract to proceed."),
+]
+
+
+def make_documents(items=DOCUMENTS):
+    return [SearchDocument(doc_id=doc_id, kind=kind, title=title, content=content) for doc_id, kind, title, content in items]
+
+
+def reference_scores(documents, query, k1=1.2, b=0.75):
+    """Textbook BM25 over the given documents."""
+    counts = [Counter(tokenize(document.text)) for document in documents]
+    average_length = sum(sum(c.values()) for c in counts) / len(counts)
+    scores = {}
+    for document, tf in zip(documents, counts):
+        length = sum(tf.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for c in counts if term in c)
+            if tf[term]:
+                idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+                score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / average_length))
+        if score:
+            scores[document.doc_id] = score
+    return scores
+
+
+def result_scores(results):
+    return {hit.document.doc_id: hit.score for hit in results.hits}
+
+
+class TestTokenize:
+    """Test cases for search terms."""
+
+    def test_drops_stop_words_and_folds_plurals(self):
+        assert tokenize("What are the Contingencies in my contracts?") == ["contingency", "contract"]
+
+
+class TestBM25Index:
+    """Test cases for ranking and incremental updates."""
+
+    @pytest.fixture
+    def index(self):
+        return BM25Index(make_documents(), cache_size=16, merge_threshold=2)
+
+    def test_scores_match_reference_bm25(self, index):
+        results = index.search("inspection contingency for the property")
+
+        assert result_scores(results) == pytest.approx(reference_scores(make_documents(), "inspection contingency for the property"))
+        assert results.hits[0].document.doc_id == "inspection"
+        assert results.total == 5
+
+    def test_limit_and_kinds(self, index):
+        results = index.search("contingency", limit=1, kinds=["help"])
+
+        assert [hit.document.doc_id for hit in results.hits] == ["contingencies"]
+        assert results.total == 1
+
+    def test_unknown_terms_match_nothing(self, index):
+        assert index.search("zoning variance") == ((), 0)
+
+    def test_updates_score_like_a_rebuilt_index(self, index):
+        added = make_documents([
+            ("escrow", "help", "Escrow", "Escrow holds the earnest money deposit until closing."),
+            ("financing", "clause", "Financing Contingency", "Buyer may cancel if the loan is not approved."),
+        ])
+        index.add(added[:1])
+        index.add(added[1:])
+        index.remove(["flood"])
+
+        expected = [doc for doc in make_documents() if doc.doc_id not in ("financing", "flood")] + added
+        for query in ["loan closing money", "contingency flood inspection"]:
+            assert result_scores(index.search(query, limit=None)) == pytest.approx(reference_scores(expected, query))
+        assert len(index) == 5
+        assert "flood" not in index
+
+    def test_merge_keeps_results(self, index):
+        index.add(make_documents([(f"note_{i}", "help", "Note", f"Appraisal note {i}") for i in range(5)]))
+
+        assert index.cache_info()["tail"] == 0
+        assert index.search("appraisal").total == 5
+        assert index.get("note_3").content == "Appraisal note 3"
+
+    def test_queries_are_cached_until_the_index_changes(self, index):
+        first = index.search("Inspection contingency")
+        assert index.search("contingency inspections") is first
+
+        index.add(make_documents([("survey", "help", "Survey", "A survey of the property boundaries.")]))
+
+        assert index.search("contingency inspections") is not first
+        assert index.cache_info()["hits"] == 1
@@ -199,6 +199,70 @@ class TestModelRouter:
         assert response.content == "Fallback response"
         assert response.provider in [ModelProvider.OPENAI, ModelProvider.ANTHROPIC]
     
+    def test_async_clients_are_per_event_loop(self, model_router):
+        """Each event loop gets its own long-lived client; pinned clients are shared."""
+        model_router._async_client_factories["test_client"] = AsyncMock
+        
+        async def client():
+            return model_router._async_client("test_client"), model_router._async_client("test_client")
+        
+        a, b = asyncio.run(client())
+        c, _ = asyncio.run(client())
+        
+        assert a is b
+        assert a is not c
+        assert model_router.openai_async_client is model_router.openai_async_client
+        # Each loop's clients are closed when the loop shuts down
+        a.aclose.assert_awaited_once()
+        c.aclose.assert_awaited_once()
+        assert len(model_router._loop_clients) == 0
+    
+    def test_clients_created_outside_a_loop_are_closed(self, model_router):
+        """Clients created for presence checks outside a loop are closed with a loop's clients."""
+        model_router._async_client_factories["test_client"] = AsyncMock
+        unbound = model_router._async_client("test_client")
+        
+        async def client():
+            return model_router._async_client("test_client")
+        
+        bound = asyncio.run(client())
+        
+        assert bound is not unbound
+        unbound.aclose.assert_awaited_once()
+        bound.aclose.assert_awaited_once()
+        assert model_router._unbound_clients == {}
+    
+    @pytest.mark.asyncio
+    async def test_generate_stream_yields_deltas_and_usage(self, model_router):
+        """Streaming yields token deltas, then a final chunk with usage and cost."""
+        def chunk(content=None, usage=None):
+            mock_chunk = Mock()
+            mock_chunk.choices = []
+            if content is not None:
+                mock_chunk.choices = [Mock()]
+                mock_chunk.choices[0].delta.content = content
+            mock_chunk.usage = usage
+            return mock_chunk
+        
+        async def stream():
+            for mock_chunk in (chunk("Hel"), chunk("lo"), chunk(usage=Mock(prompt_tokens=5, completion_tokens=2))):
+                yield mock_chunk
+        
+        model_router.openai_async_client.chat.completions.create = AsyncMock(return_value=stream())
+        
+        request = ModelRequest(
+            messages=[{"role": "user", "content": "Hello"}],
+            model_preference="gpt-4o-mini"
+        )
+        chunks = [c async for c in model_router.generate_stream(request)]
+        
+        assert [c.delta for c in chunks if not c.done] == ["Hel", "lo"]
+        final = chunks[-1].response
+        assert final.content == "Hello"
+        assert final.token_usage == {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+        assert final.cost == 7 * model_router.models["gpt-4o-mini"].cost_per_token
+        assert final.metadata["time_to_first_token"] is not None
+    
     @pytest.mark.asyncio
     async def test_no_available_models_error(self, model_router):
         """Test error handling when no models are available."""
@@ -214,6 +278,418 @@ class TestModelRouter:
             await model_router.select_model(request)
 
 
+class TestResponseCache:
+    """Test cases for the LLM response cache."""
+    
+    @pytest.fixture
+    def response_cache(self):
+        """Create an in-memory-only response cache."""
+        from app.services.llm_response_cache import LLMResponseCache
+        
+        with patch('app.services.llm_response_cache.get_redis_client', side_effect=Exception("no redis")):
+            cache = LLMResponseCache()
+            cache.enabled = True
+            yield cache
+    
+    def _response(self, content="Cached answer"):
+        return ModelResponse(
+            content=content,
+            model_used="gpt-4o-mini",
+            provider=ModelProvider.OPENAI,
+            cost=0.01,
+            processing_time=1.0,
+            token_usage={"total_tokens": 30}
+        )
+    
+    def test_only_deterministic_requests_are_cacheable(self, response_cache):
+        """Sampling temperature, streaming and opt-out bypass the cache."""
+        messages = [{"role": "user", "content": "Hello"}]
+        
+        assert response_cache.is_cacheable(ModelRequest(messages=messages, temperature=0))
+        assert not response_cache.is_cacheable(ModelRequest(messages=messages, temperature=0.7))
+        assert not response_cache.is_cacheable(ModelRequest(messages=messages, temperature=0, stream=True))
+        assert not response_cache.is_cacheable(ModelRequest(messages=messages, temperature=0, cache=False))
+    
+    def test_key_ignores_formatting_whitespace(self, response_cache):
+        """Normalized messages share a key; model and parameters do not."""
+        a = ModelRequest(messages=[{"role": "user", "content": "Check clause 4  \r\n"}], temperature=0)
+        b = ModelRequest(messages=[{"role": "User", "content": "Check clause 4"}], temperature=0)
+        c = ModelRequest(messages=[{"role": "user", "content": "Check clause 4"}], temperature=0, max_tokens=10)
+        
+        assert response_cache.make_key(a, "m") == response_cache.make_key(b, "m")
+        assert response_cache.make_key(a, "m") != response_cache.make_key(a, "other")
+        assert response_cache.make_key(a, "m") != response_cache.make_key(c, "m")
+    
+    def test_hit_rate_and_size_bound(self, response_cache):
+        """Hits are counted and the memory tier stays within its entry limit."""
+        response_cache.max_entries = 2
+        for key in ("k1", "k2", "k3"):
+            response_cache.set(key, self._response())
+        
+        assert response_cache.get("k1") is None
+        assert response_cache.get("k3")["content"] == "Cached answer"
+        
+        stats = response_cache.get_stats()
+        assert stats["memory_entries"] == 2
+        assert stats["evictions"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_router_serves_repeated_request_from_cache(self, response_cache):
+        """A repeated deterministic request does not reach the provider."""
+        with patch('app.services.model_router.get_llm_response_cache', return_value=response_cache):
+            router = ModelRouter()
+        router._ensure_health_check = AsyncMock()
+        router.select_model = AsyncMock(return_value="gpt-4o-mini")
+        router._generate_with_fallback = AsyncMock(return_value=self._response())
+        
+        request = ModelRequest(messages=[{"role": "user", "content": "Summarize"}], temperature=0)
+        first = await router.generate_response(request)
+        second = await router.generate_response(request)
+        
+        assert router._generate_with_fallback.await_count == 1
+        assert second.content == first.content
+        assert second.metadata["cache_hit"] is True
+        assert second.cost == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self, response_cache):
+        """Identical in-flight requests share one call that outlives its first caller."""
+        with patch('app.services.model_router.get_llm_response_cache', return_value=response_cache):
+            router = ModelRouter()
+        router._ensure_health_check = AsyncMock()
+        router.select_model = AsyncMock(return_value="gpt-4o-mini")
+        release = asyncio.Event()
+        
+        async def generate(*args):
+            await release.wait()
+            return self._response()
+        
+        router._generate_with_fallback = AsyncMock(side_effect=generate)
+        request = ModelRequest(messages=[{"role": "user", "content": "Summarize"}], temperature=0)
+        
+        leader = asyncio.create_task(router.generate_response(request))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(router.generate_response(request))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        
+        response = await follower
+        assert leader.cancelled()
+        assert response.content == "Cached answer"
+        assert router._generate_with_fallback.await_count == 1
+        assert router.get_cache_stats()["inflight"] == 0
+
+
+class TestProviderAdmission:
+    """Test cases for provider admission control."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_queues_and_times_out(self):
+        """Requests beyond the limit wait and fail at their deadline."""
+        from app.services.provider_limiter import AdaptiveConcurrencyLimit, AdmissionTimeout
+        import time
+        
+        limit = AdaptiveConcurrencyLimit("test", initial_limit=1)
+        await limit.acquire(time.monotonic() + 1)
+        
+        with pytest.raises(AdmissionTimeout):
+            await limit.acquire(time.monotonic() + 0.05)
+        assert limit.metrics["timeouts"] == 1
+        
+        waiter = asyncio.create_task(limit.acquire(time.monotonic() + 1))
+        await asyncio.sleep(0)
+        assert limit.queue_depth == 1
+        limit.release()
+        await waiter
+        assert limit.in_flight == 1
+        assert limit.queue_depth == 0
+    
+    @pytest.mark.asyncio
+    async def test_timed_out_admission_refunds_rate_budget(self):
+        """A request that never got a slot gives its reserved tokens back."""
+        from app.services.provider_limiter import AdmissionTimeout, ProviderAdmissionController
+        
+        controller = ProviderAdmissionController()
+        controller.provider_config = {
+            "openai": {"max_concurrency": 1, "requests_per_minute": 60, "tokens_per_minute": 6000}
+        }
+        
+        async with controller.admit("openai", "gpt-4o", 1000):
+            with pytest.raises(AdmissionTimeout):
+                async with controller.admit("openai", "gpt-4o", 1000, timeout=0.05):
+                    pass
+        
+        assert controller._token_buckets["openai"].tokens == pytest.approx(5000, abs=10)
+        assert controller._request_buckets["openai"].tokens == pytest.approx(59, abs=0.1)
+    
+    def test_aimd_adjusts_limit(self):
+        """Throttling halves the limit and successes grow it back."""
+        from app.services.provider_limiter import AdaptiveConcurrencyLimit
+        
+        limit = AdaptiveConcurrencyLimit("test", initial_limit=8, latency_target=10)
+        limit.on_throttled()
+        assert limit.limit == 4
+        
+        for _ in range(10):
+            limit.on_success(latency=1.0)
+        assert 4 < limit.limit <= 8
+        
+        limit.on_success(latency=60.0)
+        assert limit.metrics["decreases"] == 2
+    
+    def test_limits_grow_above_configured_concurrency(self):
+        """AIMD may raise a limit past its starting value while latency is on target."""
+        from app.services.provider_limiter import AdaptiveConcurrencyLimit, ProviderAdmissionController
+        import math
+        
+        limit = AdaptiveConcurrencyLimit("test", initial_limit=2, latency_target=10)
+        for _ in range(20):
+            limit.on_success(latency=1.0)
+        assert limit.limit == 4
+        
+        controller = ProviderAdmissionController()
+        controller.provider_config = {"openai": {"max_concurrency": 16}}
+        controller.concurrency_headroom = 1.5
+        provider_limit, model_limit = controller._limits_for("openai", "gpt-4o")
+        assert provider_limit.max_limit == 24
+        assert model_limit.max_limit == math.ceil(controller.model_max_concurrency * 1.5)
+    
+    def test_stream_duration_is_not_latency(self):
+        """A long stream with a fast first token does not shrink the limit."""
+        from app.services.provider_limiter import AdaptiveConcurrencyLimit, Permit, TokenBucket
+        
+        limit = AdaptiveConcurrencyLimit("test", initial_limit=4, latency_target=10)
+        permit = Permit((limit,), TokenBucket(rate_per_minute=0), 100)
+        permit._start -= 120
+        
+        permit.record_success(100, latency=0.5)
+        
+        assert limit.metrics["decreases"] == 0
+        assert limit.limit > 4
+        
+        permit.record_success(100)
+        assert limit.metrics["decreases"] == 1
+    
+    def test_token_bucket_reports_wait(self):
+        """Draining the bucket returns the time until tokens are available."""
+        from app.services.provider_limiter import TokenBucket
+        
+        bucket = TokenBucket(rate_per_minute=60)
+        assert bucket.reserve(60) == 0.0
+        assert bucket.reserve(1) == pytest.approx(1.0, abs=0.1)
+        assert TokenBucket(rate_per_minute=0).reserve(10 ** 6) == 0.0
+    
+    def test_rate_limit_detection(self):
+        """429 responses are recognized from status codes and messages."""
+        from app.services.provider_limiter import is_rate_limit_error
+        
+        error = Exception("throttled")
+        error.status_code = 429
+        assert is_rate_limit_error(error)
+        assert is_rate_limit_error(Exception("Rate limit reached for requests"))
+        assert not is_rate_limit_error(Exception("API Error"))
+
+
+class TestModelHealth:
+    """Test cases for model health tracking and latency-aware routing."""
+    
+    @pytest.fixture
+    def health(self):
+        """Create a health tracker with a short breaker cooldown."""
+        from app.services.model_health import ModelHealthTracker
+        
+        tracker = ModelHealthTracker()
+        tracker.alpha = 0.5
+        tracker.failure_threshold = 2
+        tracker.cooldown_seconds = 0.05
+        return tracker
+    
+    def test_circuit_opens_and_half_open_allows_one_probe(self, health):
+        """Consecutive failures open the circuit; after cooldown a single probe passes."""
+        import time
+        
+        health.record_failure("m")
+        assert health.allow_request("m")
+        health.record_failure("m")
+        assert not health.allow_request("m")
+        
+        time.sleep(0.06)
+        assert health.allow_request("m", claim_probe=True)
+        assert not health.allow_request("m", claim_probe=True)
+        
+        health.record_success("m", latency=1.0)
+        assert health.allow_request("m")
+        assert health.get_stats()["m"]["circuit_state"] == "closed"
+    
+    def test_rate_limits_do_not_trip_breaker(self, health):
+        """Throttling raises the error rate but keeps the circuit closed."""
+        for _ in range(5):
+            health.record_failure("m", trip=False)
+        
+        assert health.allow_request("m")
+        assert health.get_stats()["m"]["ewma_error_rate"] > 0.9
+    
+    def test_expected_completion_time_uses_ewma(self, health):
+        """Observed throughput and error rate drive the completion estimate."""
+        health.record_success("fast", latency=1.0, completion_tokens=100)
+        health.record_success("slow", latency=10.0, completion_tokens=100)
+        
+        assert health.expected_completion_time("fast", 100) == pytest.approx(1.0)
+        assert health.expected_completion_time("slow", 100) == pytest.approx(10.0)
+        
+        health.record_failure("fast", trip=False)
+        assert health.expected_completion_time("fast", 100) == pytest.approx(2.0)
+    
+    @pytest.mark.asyncio
+    async def test_latency_strategy_avoids_slow_and_open_models(self, health):
+        """The latency strategy picks the fastest model whose circuit is closed."""
+        with patch('app.services.model_router.get_model_health_tracker', return_value=health):
+            router = ModelRouter()
+        router.strategy = RoutingStrategy.LATENCY_OPTIMIZED
+        router.models = {
+            model_id: ModelInfo(
+                id=model_id,
+                name=model_id,
+                provider=ModelProvider.OPENAI,
+                cost_per_token=0.00001,
+                context_length=context_length
+            )
+            for model_id, context_length in (("slow", 128000), ("fast", 128000), ("tiny", 50))
+        }
+        
+        health.record_success("slow", latency=20.0, completion_tokens=100)
+        health.record_success("fast", latency=1.0, completion_tokens=100)
+        health.record_success("tiny", latency=0.1, completion_tokens=100)
+        request = ModelRequest(messages=[{"role": "user", "content": "Hello"}], max_tokens=100)
+        assert await router.select_model(request) == "fast"
+        
+        health.record_failure("fast")
+        health.record_failure("fast")
+        assert await router.select_model(request) == "slow"
+    
+    @pytest.mark.asyncio
+    async def test_hedged_request_returns_first_success(self, health):
+        """A slow primary is raced against a second model and the loser cancelled."""
+        with patch('app.services.model_router.get_model_health_tracker', return_value=health):
+            router = ModelRouter()
+        router.select_model = AsyncMock(return_value="gpt-4o")
+        cancelled = []
+        
+        async def attempt(request, model_id):
+            if model_id == "gpt-4o-mini":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(model_id)
+                    raise
+            return ModelResponse(
+                content=model_id,
+                model_used=model_id,
+                provider=ModelProvider.OPENAI,
+                cost=0.0,
+                processing_time=0.0,
+                token_usage={}
+            )
+        
+        router._attempt_model = attempt
+        with patch('app.services.model_router.settings') as mock_settings:
+            mock_settings.MODEL_ROUTER_HEDGE_DELAY = 0.01
+            response = await router._generate_hedged(
+                ModelRequest(messages=[{"role": "user", "content": "Hello"}], latency_critical=True),
+                "gpt-4o-mini",
+                set()
+            )
+        await asyncio.sleep(0)
+        
+        assert response.model_used == "gpt-4o"
+        assert cancelled == ["gpt-4o-mini"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_hedged_request_cancels_primary(self, health):
+        """Cancelling the caller before the hedge starts also cancels the primary attempt."""
+        with patch('app.services.model_router.get_model_health_tracker', return_value=health):
+            router = ModelRouter()
+        cancelled = []
+
+        async def attempt(request, model_id):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(model_id)
+                raise
+
+        router._attempt_model = attempt
+        with patch('app.services.model_router.settings') as mock_settings:
+            mock_settings.MODEL_ROUTER_HEDGE_DELAY = 5.0
+            call = asyncio.ensure_future(router._generate_hedged(
+                ModelRequest(messages=[{"role": "user", "content": "Hello"}], latency_critical=True),
+                "gpt-4o-mini",
+                set()
+            ))
+            await asyncio.sleep(0.01)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+        await asyncio.sleep(0)
+
+        assert cancelled == ["gpt-4o-mini"]
+
+    @pytest.mark.asyncio
+    async def test_hedge_failure_is_attributed_to_the_hedge_model(self, health):
+        """When primary and hedge both fail, each model's failure counts against it."""
+        with patch('app.services.model_router.get_model_health_tracker', return_value=health):
+            router = ModelRouter()
+        router.max_retries = 2
+        primary, hedge, fallback = "primary", "hedge", "fallback"
+        router.models = {
+            model_id: ModelInfo(
+                id=model_id,
+                name=model_id,
+                provider=ModelProvider.OPENAI,
+                cost_per_token=0.00001,
+                context_length=128000
+            )
+            for model_id in (primary, hedge, fallback)
+        }
+        
+        async def select_model(request, exclude=frozenset()):
+            return next(model_id for model_id in (hedge, fallback) if model_id not in exclude)
+        
+        async def call_provider(provider, request, model_id):
+            if model_id == primary:
+                await asyncio.sleep(0.05)
+                raise ValueError("primary unavailable")
+            if model_id == hedge:
+                raise ValueError("hedge unavailable")
+            return ModelResponse(
+                content=model_id,
+                model_used=model_id,
+                provider=provider,
+                cost=0.0,
+                processing_time=0.0,
+                token_usage={}
+            )
+        
+        router.select_model = select_model
+        router._call_provider = call_provider
+        with patch('app.services.model_router.settings') as mock_settings:
+            mock_settings.MODEL_ROUTER_HEDGE_DELAY = 0.01
+            response = await router._generate_with_fallback(
+                ModelRequest(messages=[{"role": "user", "content": "Hello"}], latency_critical=True),
+                primary,
+                0.0
+            )
+        
+        stats = health.get_stats()
+        assert response.model_used == fallback
+        assert stats[primary]["ewma_error_rate"] > 0
+        assert stats[hedge]["ewma_error_rate"] > 0
+        assert stats[fallback]["ewma_error_rate"] == 0
+
+
 class TestModelRouterAPI:
     """Test cases for the Model Router API endpoints."""
     
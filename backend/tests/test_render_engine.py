@@ -0,0 +1,111 @@
+"""
+Tests for the process-pool rendering engine.
+"""
+
+import io
+import os
+import zipfile
+import pytest
+
+from app.core.render_engine import RenderEngine, RenderJob
+
+
+CONTENT = "<h1>Purchase Agreement</h1><p>Buyer agrees to purchase the property.</p>"
+
+
+class TestRenderEngine:
+    """Test cases for RenderEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        """Engine rendering in the calling process."""
+        return RenderEngine(max_workers=0)
+
+    @pytest.fixture
+    def pool(self):
+        """Engine rendering in two warm worker processes."""
+        engine = RenderEngine(max_workers=2)
+        engine.start()
+        yield engine
+        engine.shutdown()
+
+    def test_renders_in_process_when_pool_disabled(self, engine):
+        assert engine.in_process
+
+        result = engine.submit(RenderJob("html", CONTENT, title="Purchase Agreement")).result()
+
+        assert not result.spooled
+        assert b"Buyer agrees to purchase" in result.read()
+        assert b"<title>Purchase Agreement</title>" in result.read()
+        assert result.size == len(result.read())
+
+    def test_spooled_result(self, engine, tmp_path):
+        engine.spool_dir = str(tmp_path)
+
+        result = engine.submit(RenderJob("html", CONTENT, spool=True)).result()
+
+        assert result.spooled
+        assert os.path.dirname(result.path) == str(tmp_path)
+        with result.open() as f:
+            assert b"Buyer agrees" in f.read()
+
+        result.cleanup()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_large_results_spool_by_default(self, engine, tmp_path):
+        engine.spool_dir = str(tmp_path)
+        engine.spool_threshold = 100
+
+        small = engine.submit(RenderJob("html", "<p>x</p>", prepared=True)).result()
+        large = engine.submit(RenderJob("html", CONTENT * 10)).result()
+
+        assert not small.spooled
+        assert large.spooled
+        large.cleanup()
+
+    def test_render_errors_propagate(self, engine):
+        with pytest.raises(ValueError):
+            engine.submit(RenderJob("rtf", CONTENT)).result()
+
+    @pytest.mark.asyncio
+    async def test_render_batch_preserves_order(self, engine):
+        jobs = [RenderJob("html", f"<p>Document {i}</p>") for i in range(5)]
+
+        results = await engine.render_batch(jobs)
+
+        assert [f"Document {i}".encode() in result.read() for i, result in enumerate(results)] == [True] * 5
+
+    def test_process_pool_renders_batch(self, pool):
+        results = pool.render_batch_sync(
+            [RenderJob("html", f"<p>Document {i}</p>") for i in range(4)], timeout=60
+        )
+
+        assert [b"Document" in result.read() for result in results] == [True] * 4
+
+    def test_process_pool_renders_pdf(self, pool):
+        result = pool.submit(RenderJob("pdf", CONTENT, title="Purchase Agreement")).result(60)
+
+        assert result.read().startswith(b"%PDF")
+        assert result.size == len(result.read())
+        assert result.render_time > 0
+
+    def test_process_pool_renders_docx(self, pool):
+        result = pool.submit(RenderJob("docx", CONTENT, title="Purchase Agreement")).result(60)
+
+        with zipfile.ZipFile(io.BytesIO(result.read())) as docx:
+            document = docx.read("word/document.xml")
+        assert b"Buyer agrees to purchase the property." in document
+
+    def test_process_pool_spools_documents(self, pool, tmp_path):
+        pool.spool_dir = str(tmp_path)
+
+        results = pool.render_batch_sync(
+            [RenderJob("pdf", CONTENT, spool=True), RenderJob("docx", CONTENT, spool=True)], timeout=60
+        )
+
+        assert [result.spooled for result in results] == [True, True]
+        with results[0].open() as f:
+            assert f.read(4) == b"%PDF"
+        for result in results:
+            result.cleanup()
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,203 @@
+"""
+Tests for the agent resource pool.
+"""
+
+import asyncio
+import itertools
+
+import pytest
+
+from app.services.agent_tools.performance_optimization import (
+    ResourcePool,
+    ResourcePoolError,
+    close_resource_pools,
+    get_resource_pool,
+    get_resource_pool_status
+)
+
+
+class FakeConnection:
+    """Connection recording how the pool treats it."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.closed = False
+        self.resets = 0
+        self.healthy = True
+
+
+def make_pool(**options):
+    options.setdefault("max_size", 2)
+    options.setdefault("max_idle", 60)
+    options.setdefault("max_lifetime", 60)
+    options.setdefault("health_check_after", 60)
+    options.setdefault("acquire_timeout", 1)
+    return ResourcePool(
+        "test",
+        factory=FakeConnection,
+        close=lambda connection: setattr(connection, "closed", True),
+        reset=lambda connection: setattr(connection, "resets", connection.resets + 1),
+        health_check=lambda connection: connection.healthy,
+        **options
+    )
+
+
+class TestResourcePool:
+    """Test cases for reuse, waiting and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_released_resources_are_reset_and_reused(self):
+        pool = make_pool()
+
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            status = pool.get_status()
+
+        assert second is first
+        assert first.resets == 2
+        assert status["in_use"] == 1
+        assert status["stats"]["created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_callers_wait_for_a_released_resource(self):
+        pool = make_pool(max_size=1)
+        held = await pool.acquire()
+
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.02)
+        assert pool.get_status()["waiting"] == 1
+        await pool.release(held)
+
+        assert await waiter is held
+        stats = pool.get_status()["stats"]
+        assert stats["created"] == 1
+        assert stats["waits"] == 1
+        assert stats["wait_time_max"] >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        pool = make_pool(max_size=1)
+        held = await pool.acquire()
+
+        with pytest.raises(ResourcePoolError):
+            await pool.acquire(timeout=0.01)
+
+        assert pool.get_status()["stats"]["wait_timeouts"] == 1
+        assert pool.get_status()["waiting"] == 0
+        await pool.release(held)
+        assert await pool.acquire() is held
+
+    @pytest.mark.asyncio
+    async def test_expired_and_unhealthy_resources_are_replaced(self):
+        pool = make_pool(max_lifetime=0.01, health_check_after=0)
+        old = await pool.acquire()
+        await pool.release(old)
+        await asyncio.sleep(0.02)
+
+        replacement = await pool.acquire()
+        assert replacement is not old and old.closed
+        replacement.healthy = False
+        await pool.release(replacement)
+
+        pool.max_lifetime = 60
+        third = await pool.acquire()
+        assert third is not replacement and replacement.closed
+        stats = pool.get_status()["stats"]
+        assert stats["expired"] == 1
+        assert stats["health_check_failures"] == 1
+        assert pool.get_status()["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_resources_are_pruned_down_to_min_size(self):
+        pool = make_pool(max_size=3, min_size=1, max_idle=0.01)
+        connections = [await pool.acquire() for _ in range(3)]
+        for connection in connections[:2]:
+            await pool.release(connection)
+        await asyncio.sleep(0.02)
+
+        await pool.release(connections[2])
+
+        assert pool.get_status()["available"] == 1
+        assert [connection.closed for connection in connections] == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_frees_the_slot(self):
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("refused")
+            return FakeConnection()
+
+        pool = ResourcePool("flaky", factory=factory, max_size=1, acquire_timeout=1)
+
+        with pytest.raises(ConnectionError):
+            await pool.acquire()
+        assert isinstance(await pool.acquire(), FakeConnection)
+        assert pool.get_status()["stats"]["creation_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_health_check_frees_the_slot(self):
+        checking = asyncio.Event()
+
+        async def health_check(connection):
+            checking.set()
+            await asyncio.sleep(10)
+            return True
+
+        pool = make_pool(max_size=1, health_check_after=0)
+        pool.health_check = health_check
+        connection = await pool.acquire()
+        await pool.release(connection)
+
+        acquiring = asyncio.create_task(pool.acquire())
+        await checking.wait()
+        acquiring.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await acquiring
+
+        assert connection.closed
+        assert pool.get_status()["total"] == 0
+        pool.health_check = None
+        assert await pool.acquire(timeout=0.1) is not connection
+
+    @pytest.mark.asyncio
+    async def test_resource_handed_over_after_close_is_closed(self):
+        pool = make_pool(max_size=1)
+        held = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+
+        # The waiter gives up just before the resource is handed to it
+        waiter.cancel()
+        await pool.release(held)
+        await pool.close()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+        assert held.closed
+        assert pool.get_status()["available"] == 0
+        assert pool.get_status()["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_pools_are_closed_together(self):
+        pool = get_resource_pool("test_shared", factory=FakeConnection, max_size=1)
+        connection = await pool.acquire()
+        await pool.release(connection)
+
+        assert get_resource_pool("test_shared") is pool
+        assert get_resource_pool_status()["test_shared"]["available"] == 1
+
+        await close_resource_pools()
+
+        assert connection.closed is False  # no close hook configured
+        assert pool.get_status()["closed"] is True
+        with pytest.raises(ResourcePoolError):
+            await pool.acquire()
+        with pytest.raises(KeyError):
+            get_resource_pool("test_shared")
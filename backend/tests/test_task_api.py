@@ -223,6 +223,45 @@ class TestTaskAPI:
         assert response.status_code == 400
         assert "Unsupported export format" in response.json()["detail"]
     
+    def test_submit_document_package_export(self, client, session: Session, auth_headers):
+        """Test multi-document package export task submission."""
+        contracts = [create_test_contract(session, user_id=1) for _ in range(2)]
+        contract_ids = [contract.id for contract in contracts]
+        
+        with patch('app.api.tasks.task_service') as mock_task_service:
+            mock_task_service.submit_document_package.return_value = {
+                "status": "submitted",
+                "group_id": "package-group-id",
+                "task_ids": {contract_id: f"export-{contract_id}" for contract_id in contract_ids},
+                "export_format": "pdf",
+                "priority": "NORMAL",
+                "estimated_completion": "2023-01-01T01:00:00"
+            }
+            
+            response = client.post(
+                "/api/tasks/contracts/export/package",
+                json={"contract_ids": contract_ids, "export_format": "pdf"},
+                headers=auth_headers
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["task_id"] == "package-group-id"
+        assert mock_task_service.submit_document_package.call_args.kwargs["contract_ids"] == contract_ids
+    
+    def test_submit_document_package_export_missing_contract(self, client, session: Session, auth_headers):
+        """Test package export with an unknown contract."""
+        contract = create_test_contract(session, user_id=1)
+        
+        response = client.post(
+            "/api/tasks/contracts/export/package",
+            json={"contract_ids": [contract.id, 99999], "export_format": "pdf"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 404
+        assert "99999" in response.json()["detail"]
+    
     def test_get_task_status(self, client, auth_headers):
         """Test getting task status."""
         with patch('app.services.task_service.get_task_service') as mock_service:
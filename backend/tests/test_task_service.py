@@ -5,11 +5,17 @@ This module contains comprehensive tests for the task service,
 including task submission, monitoring, and management operations.
 """
 
+import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 
 from app.services.task_service import TaskService, TaskPriority, TaskStatus
+from app.core.celery_introspection import (
+    CeleryIntrospectionService,
+    IntrospectionSnapshot,
+    SNAPSHOT_CACHE_KEY
+)
 from app.core.task_retry import RetryConfig, RetryHandler, DeadLetterQueue
 
 
@@ -151,6 +157,41 @@ class TestTaskService:
         assert result["task_id"] == "docx-export-task-id"
         assert result["export_format"] == "docx"
     
+    def test_submit_document_package(self, task_service):
+        """Test multi-document package export as a Celery group."""
+        with patch('app.services.task_service.generate_pdf_document') as mock_task, \
+                patch('app.services.task_service.group') as mock_group:
+            mock_result = Mock()
+            mock_result.id = "package-group-id"
+            mock_result.results = [Mock(id="export-1"), Mock(id="export-2")]
+            mock_group.return_value.apply_async.return_value = mock_result
+            
+            result = task_service.submit_document_package(
+                contract_ids=[11, 12],
+                user_id=1,
+                export_format="pdf",
+                template_options={"page_size": "A4"},
+                priority=TaskPriority.HIGH
+            )
+            signatures = list(mock_group.call_args.args[0])
+        
+        assert [call.args for call in mock_task.s.call_args_list] == [
+            (11, 1, {"page_size": "A4"}, True),
+            (12, 1, {"page_size": "A4"}, True)
+        ]
+        mock_task.s.return_value.set.assert_called_with(priority=TaskPriority.HIGH.value)
+        assert len(signatures) == 2
+        mock_result.save.assert_called_once()
+        assert result["status"] == "submitted"
+        assert result["group_id"] == "package-group-id"
+        assert result["task_ids"] == {11: "export-1", 12: "export-2"}
+        assert result["priority"] == "HIGH"
+    
+    def test_submit_document_package_invalid_format(self, task_service):
+        """Test package export with invalid format."""
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            task_service.submit_document_package(contract_ids=[1, 2], user_id=1, export_format="rtf")
+    
     def test_submit_document_export_invalid_format(self, task_service):
         """Test document export with invalid format."""
         with pytest.raises(ValueError, match="Unsupported export format"):
@@ -209,11 +250,13 @@ class TestTaskService:
         mock_inspect.reserved.return_value = {"worker1": [{"id": "task3"}]}
         
         mock_celery_app.control.inspect.return_value = mock_inspect
+        task_service.introspection = CeleryIntrospectionService(mock_celery_app)
         
-        # Mock Redis client
-        with patch('app.services.task_service.get_redis_client') as mock_redis:
+        # Mock Redis client (queue lengths are read in one pipeline)
+        with patch('app.core.celery_introspection.get_redis_client') as mock_redis:
             mock_redis_client = Mock()
-            mock_redis_client.llen.return_value = 5
+            mock_redis_client.get.return_value = None
+            mock_redis_client.pipeline.return_value.execute.return_value = [5] * 5
             mock_redis.return_value = mock_redis_client
             
             queue_status = task_service.get_queue_status()
@@ -226,6 +269,7 @@ class TestTaskService:
         assert queue_status["total_scheduled"] == 1
         assert queue_status["total_reserved"] == 1
         assert all(length == 5 for length in queue_status["queue_lengths"].values())
+        mock_redis_client.llen.assert_not_called()
     
     def test_cancel_task(self, task_service, mock_celery_app):
         """Test cancelling a task."""
@@ -256,8 +300,13 @@ class TestTaskService:
         mock_inspect.ping.return_value = {"worker1": "pong"}
         
         mock_celery_app.control.inspect.return_value = mock_inspect
+        task_service.introspection = CeleryIntrospectionService(mock_celery_app)
         
-        stats = task_service.get_worker_stats()
+        with patch('app.core.celery_introspection.get_redis_client') as mock_redis:
+            mock_redis.return_value.get.return_value = None
+            mock_redis.return_value.pipeline.return_value.execute.return_value = [0] * 5
+            
+            stats = task_service.get_worker_stats()
         
         assert "timestamp" in stats
         assert stats["worker_stats"] == {"worker1": {"pool": {"max-concurrency": 4}}}
@@ -266,6 +315,81 @@ class TestTaskService:
         assert stats["total_workers"] == 1
 
 
+class TestCeleryIntrospectionService:
+    """Test cases for the cached Celery introspection service."""
+    
+    @pytest.fixture
+    def celery_app(self):
+        """Mock Celery application with inspect replies."""
+        celery_app = Mock()
+        inspect = celery_app.control.inspect.return_value
+        inspect.active.return_value = {"worker1": [{"id": "task1"}]}
+        inspect.scheduled.return_value = {}
+        inspect.reserved.return_value = {}
+        inspect.stats.return_value = {"worker1": {}}
+        inspect.registered.return_value = {"worker1": ["task1"]}
+        inspect.ping.return_value = {"worker1": "pong"}
+        return celery_app
+    
+    @pytest.fixture
+    def mock_redis_client(self):
+        """Mock Redis client used for queue lengths and the shared cache."""
+        with patch('app.core.celery_introspection.get_redis_client') as mock_redis:
+            client = Mock()
+            client.get.return_value = None
+            client.pipeline.return_value.execute.return_value = [1, 2, 3, 4, 5]
+            mock_redis.return_value = client
+            yield client
+    
+    def test_snapshot_is_served_from_cache(self, celery_app, mock_redis_client):
+        """Repeated reads within the interval do not re-inspect workers."""
+        service = CeleryIntrospectionService(celery_app)
+        
+        first = service.get_snapshot()
+        second = service.get_snapshot()
+        
+        assert first is second
+        assert celery_app.control.inspect.call_count == 1
+        assert service.metrics["cache_hits"] == 1
+        assert first.queue_lengths == {"ingest": 1, "ocr": 2, "llm": 3, "export": 4, "system": 5}
+    
+    def test_snapshot_is_published_to_shared_cache(self, celery_app, mock_redis_client):
+        """Collected snapshots are written to Redis for other processes."""
+        service = CeleryIntrospectionService(celery_app)
+        service.collect_snapshot()
+        
+        key, payload = mock_redis_client.set.call_args[0]
+        assert key == SNAPSHOT_CACHE_KEY
+        restored = IntrospectionSnapshot.from_dict(json.loads(payload))
+        assert restored.active_tasks == {"worker1": [{"id": "task1"}]}
+    
+    def test_shared_snapshot_is_used_when_fresh(self, celery_app, mock_redis_client):
+        """A fresh snapshot from another process avoids a live collection."""
+        shared = IntrospectionSnapshot(
+            timestamp=datetime.utcnow(),
+            queue_lengths={"ingest": 7},
+            worker_ping={"worker2": "pong"}
+        )
+        mock_redis_client.get.return_value = json.dumps(shared.to_dict())
+        service = CeleryIntrospectionService(celery_app)
+        
+        snapshot = service.get_snapshot()
+        
+        assert snapshot.queue_lengths == {"ingest": 7}
+        celery_app.control.inspect.assert_not_called()
+    
+    def test_inspect_errors_are_recorded(self, celery_app, mock_redis_client):
+        """A failing broadcast does not fail the whole snapshot."""
+        celery_app.control.inspect.return_value.stats.side_effect = Exception("timeout")
+        service = CeleryIntrospectionService(celery_app)
+        
+        snapshot = service.collect_snapshot()
+        
+        assert snapshot.worker_stats is None
+        assert snapshot.active_tasks == {"worker1": [{"id": "task1"}]}
+        assert any(error.startswith("stats:") for error in snapshot.errors)
+
+
 class TestRetryHandler:
     """Test cases for RetryHandler class."""
     
@@ -5,6 +5,7 @@ This module tests template CRUD operations, versioning,
 inheritance, validation, and template library management.
 """
 
+import json
 import pytest
 from datetime import datetime
 from unittest.mock import Mock, patch
@@ -548,6 +549,111 @@ class TestTemplateOperations:
         assert all(cat in category_names for cat in categories)
 
 
+class TestEffectiveTemplateResolution:
+    """Test materialized template inheritance resolution."""
+    
+    def _template(self, template_id, parent_id=None, **fields):
+        template = Mock(spec=[
+            "id", "parent_template_id", "version", "updated_at", "created_at",
+            "variables", "business_rules", "ruleset", "schema", "html_content", "docx_key"
+        ])
+        template.id = template_id
+        template.parent_template_id = parent_id
+        template.version = "1.0"
+        template.updated_at = None
+        template.created_at = datetime(2024, 1, 1)
+        template.variables = fields.get("variables", [])
+        template.business_rules = fields.get("business_rules", {})
+        template.ruleset = fields.get("ruleset", {})
+        template.schema = fields.get("schema")
+        template.html_content = fields.get("html_content")
+        template.docx_key = None
+        return template
+    
+    def test_materialize_flattens_ancestor_chain(self):
+        """Variables and rules merge from root to leaf, leaf wins."""
+        from app.services.template_inheritance import TemplateInheritanceResolver
+        
+        national = self._template(
+            1,
+            variables=[{"name": "buyer"}, {"name": "price", "required": False}],
+            business_rules={"limits": {"max_price": 10, "currency": "USD"}},
+            html_content="<p>national</p>"
+        )
+        state = self._template(2, parent_id=1, business_rules={"limits": {"max_price": 20}})
+        brokerage = self._template(3, parent_id=2, variables=[{"name": "price", "required": True}])
+        
+        session = Mock()
+        session.get.side_effect = lambda model, template_id: {1: national, 2: state}[template_id]
+        
+        effective = TemplateInheritanceResolver().materialize(brokerage, session)
+        
+        assert effective.chain == [3, 2, 1]
+        assert effective.depth == 2
+        assert {v["name"]: v for v in effective.variables}["price"]["required"] is True
+        assert effective.business_rules == {"limits": {"max_price": 20, "currency": "USD"}}
+        assert effective.html_content == "<p>national</p>"
+    
+    def test_resolve_uses_cached_record(self):
+        """A cached record whose stamps match is returned without walking the chain."""
+        from app.services.template_inheritance import TemplateInheritanceResolver
+        
+        resolver = TemplateInheritanceResolver()
+        leaf = self._template(3, parent_id=2)
+        parent = self._template(2)
+        session = Mock()
+        session.get.return_value = parent
+        session.exec.return_value.all.return_value = [parent]
+        
+        with patch("app.services.template_inheritance.get_redis_client") as mock_redis:
+            materialized = resolver.materialize(leaf, session)
+            mock_redis.return_value.get.return_value = json.dumps(materialized.to_dict())
+            session.get.reset_mock()
+            
+            effective = resolver.resolve(leaf, session)
+        
+        assert effective.fingerprint == materialized.fingerprint
+        session.get.assert_not_called()
+        assert resolver.metrics["cache_hits"] == 1
+    
+    def test_resolve_rebuilds_when_ancestor_changed_after_caching(self):
+        """An ancestor update is noticed even if its invalidation never reached Redis."""
+        from app.services.template_inheritance import TemplateInheritanceResolver
+        
+        resolver = TemplateInheritanceResolver()
+        root = self._template(1, business_rules={"limits": {"max_price": 10}})
+        state = self._template(2, parent_id=1)
+        leaf = self._template(3, parent_id=2)
+        session = Mock()
+        session.get.side_effect = lambda model, template_id: {1: root, 2: state}[template_id]
+        session.exec.return_value.all.return_value = [state, root]
+        
+        with patch("app.services.template_inheritance.get_redis_client") as mock_redis:
+            mock_redis.return_value.get.return_value = json.dumps(resolver.materialize(leaf, session).to_dict())
+            
+            root.business_rules = {"limits": {"max_price": 30}}
+            root.updated_at = datetime(2024, 2, 1)
+            effective = resolver.resolve(leaf, session)
+        
+        assert effective.business_rules == {"limits": {"max_price": 30}}
+        assert resolver.metrics["cache_hits"] == 0
+        assert resolver.metrics["cache_misses"] == 1
+    
+    def test_invalidate_removes_dependents(self):
+        """Invalidating an ancestor drops every descendant's record."""
+        from app.services.template_inheritance import TemplateInheritanceResolver
+        
+        with patch("app.services.template_inheritance.get_redis_client") as mock_redis:
+            mock_redis.return_value.smembers.return_value = {b"2", b"3"}
+            TemplateInheritanceResolver().invalidate(1)
+            
+            deleted_keys = mock_redis.return_value.delete.call_args[0]
+        
+        assert "template:effective:1" in deleted_keys
+        assert "template:effective:2" in deleted_keys
+        assert "template:effective:3" in deleted_keys
+
+
 class TestAuthentication:
     """Test authentication for template operations."""
     
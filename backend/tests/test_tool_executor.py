@@ -0,0 +1,174 @@
+"""
+Tests for concurrent tool execution through the tool registry.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import Field
+
+from app.services.agent_tools.base import BaseTool, ToolCategory, ToolInput, ToolRegistry, ToolResult
+from app.services.agent_tools.executor import LatencyHistogram, ToolExecutor
+
+
+class SleepInput(ToolInput):
+    """Input for the sleeping test tool."""
+    seconds: float = Field(0.0, description="Time to sleep")
+    value: int = Field(0, description="Value echoed back")
+
+
+class SleepTool(BaseTool):
+    """Sleeps, then echoes its input while tracking concurrent executions."""
+
+    def __init__(self, name: str = "sleeper", **limits):
+        super().__init__(memory_manager=MagicMock(store_memory=AsyncMock()))
+        self._name = name
+        self.__dict__.update(limits)
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "Sleep and echo"
+
+    @property
+    def category(self) -> ToolCategory:
+        return ToolCategory.WORKFLOW_MANAGEMENT
+
+    async def execute(self, input_data: SleepInput) -> ToolResult:
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(input_data.seconds)
+        finally:
+            self.running -= 1
+        if input_data.value < 0:
+            raise ValueError("negative value")
+        return ToolResult(success=True, data={"value": input_data.value}, execution_time=0.0, tool_name=self.name)
+
+
+def make_executor(*tools, **options):
+    registry = ToolRegistry()
+    for tool in tools:
+        registry.register_tool(tool)
+    options.setdefault("timeout", 5.0)
+    options.setdefault("max_concurrency", 4)
+    options.setdefault("cache_size", 8)
+    options.setdefault("cache_ttl", 60)
+    return ToolExecutor(registry, **options)
+
+
+class TestToolExecutor:
+    """Test cases for concurrency limits, deadlines and caching."""
+
+    @pytest.mark.asyncio
+    async def test_execute_many_runs_concurrently_in_order(self):
+        tool = SleepTool()
+        executor = make_executor(tool)
+
+        results = await executor.execute_many([("sleeper", SleepInput(seconds=0.05, value=i)) for i in range(4)])
+
+        assert [result.data["value"] for result in results] == [0, 1, 2, 3]
+        assert tool.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited_per_tool(self):
+        limited = SleepTool("limited", max_concurrency=2)
+        other = SleepTool("other")
+        executor = make_executor(limited, other)
+
+        await executor.execute_many(
+            [("limited", SleepInput(seconds=0.02)) for _ in range(6)] +
+            [("other", SleepInput(seconds=0.02)) for _ in range(3)]
+        )
+
+        assert limited.peak == 2
+        assert other.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_becomes_failed_result(self):
+        tool = SleepTool(timeout=0.01)
+        executor = make_executor(tool)
+
+        result = await executor.execute("sleeper", SleepInput(seconds=1))
+
+        assert not result.success
+        assert result.metadata["error_type"] == "TimeoutError"
+        assert executor.metrics("sleeper")["outcomes"] == {"timeout": 1}
+        assert tool.running == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_and_errors_are_failed_results(self):
+        executor = make_executor(SleepTool())
+
+        unknown, failed = await executor.execute_many([("missing", SleepInput()), ("sleeper", SleepInput(value=-1))])
+
+        assert unknown.errors == ["Unknown tool: missing"]
+        assert not failed.success
+        assert failed.metadata["error_type"] == "ValueError"
+
+    @pytest.mark.asyncio
+    async def test_cacheable_results_are_reused_by_input(self):
+        tool = SleepTool(cacheable=True)
+        executor = make_executor(tool)
+
+        first = await executor.execute(tool, SleepInput(value=1))
+        again = await executor.execute(tool, SleepInput(value=1))
+        other = await executor.execute(tool, SleepInput(value=2))
+        again.data["value"] = 99
+        third = await executor.execute(tool, SleepInput(value=1))
+
+        assert tool.calls == 2
+        assert again.metadata["cache_hit"] is True
+        assert "cache_hit" not in first.metadata
+        assert other.data["value"] == 2
+        assert third.data["value"] == 1
+        assert executor.metrics("sleeper")["outcomes"] == {"success": 2, "cache_hit": 2}
+
+    @pytest.mark.asyncio
+    async def test_failures_and_uncacheable_tools_are_not_cached(self):
+        cacheable = SleepTool("cacheable", cacheable=True)
+        plain = SleepTool("plain")
+        executor = make_executor(cacheable, plain)
+
+        for _ in range(2):
+            await executor.execute_many([("cacheable", SleepInput(value=-1)), ("plain", SleepInput(value=1))])
+
+        assert cacheable.calls == 2
+        assert plain.calls == 2
+        assert executor.cache_info()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_registry_executes_through_its_executor(self):
+        registry = ToolRegistry()
+        registry.register_tool(SleepTool())
+
+        result = await registry.execute("sleeper", SleepInput(value=7))
+
+        assert result.data == {"value": 7}
+        assert registry.executor.metrics()["sleeper"]["count"] == 1
+
+
+class TestLatencyHistogram:
+    """Test cases for latency buckets and quantiles."""
+
+    def test_snapshot(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.05, 0.5, 2.0):
+            histogram.observe(seconds, "success")
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert snapshot["count"] == 4
+        assert snapshot["max"] == 2.0
+        assert snapshot["p50"] == pytest.approx(0.1)
+        assert snapshot["p99"] <= 2.0
+        assert snapshot["outcomes"] == {"success": 4}
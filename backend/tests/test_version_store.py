@@ -0,0 +1,118 @@
+"""
+Tests for delta-compressed contract version storage.
+"""
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from app.models.version import Version
+from app.services.version_store import (
+    DELTA, REFERENCE, SNAPSHOT, VersionStore, apply_delta, decode_payload,
+    is_payload, make_delta, render_content
+)
+
+
+# Test database engine
+test_engine = create_engine(
+    "sqlite://",  # In-memory SQLite database
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+
+@pytest.fixture
+def session():
+    SQLModel.metadata.create_all(test_engine)
+    with Session(test_engine) as session:
+        yield session
+    SQLModel.metadata.drop_all(test_engine)
+
+
+def add_version(session, store, variables, contract_id=1):
+    number = len(session.exec(select(Version).where(Version.contract_id == contract_id)).all()) + 1
+    diff, content_hash = store.prepare(session, contract_id, number, variables)
+    version = Version(
+        contract_id=contract_id, number=number, diff=diff, change_summary="Update",
+        content_hash=content_hash, is_current=True
+    )
+    session.add(version)
+    session.commit()
+    session.refresh(version)
+    return version
+
+
+def history(count):
+    variables = {"buyer": "John Doe", "seller": "Jane Smith", "price": 400000, "closing_date": "2025-06-30"}
+    for index in range(count):
+        variables = dict(variables, price=400000 + 1000 * index, **{f"term_{index}": f"Negotiated term {index}"})
+        yield variables
+
+
+class TestDeltas:
+    """Test cases for line deltas."""
+
+    def test_apply_delta_rebuilds_content(self):
+        base = render_content({"a": 1, "b": 2, "c": 3})
+        content = render_content({"a": 1, "b": 5, "d": 4})
+
+        assert apply_delta(base, make_delta(base, content)) == content
+
+
+class TestVersionStore:
+    """Test cases for snapshot and delta chains."""
+
+    @pytest.fixture
+    def store(self):
+        return VersionStore(snapshot_interval=5, cache_size=100)
+
+    def test_snapshots_at_interval_and_deltas_between(self, session, store):
+        versions = [add_version(session, store, variables) for variables in history(12)]
+
+        kinds = [decode_payload(version.diff)["kind"] for version in versions]
+        assert [number for number, kind in enumerate(kinds, 1) if kind == SNAPSHOT] == [1, 6, 11]
+        assert kinds.count(DELTA) == 9
+        assert all(is_payload(version.diff) for version in versions)
+
+    def test_rebuilds_any_version_from_its_chain(self, session, store):
+        expected = [render_content(variables) for variables in history(12)]
+        for variables in history(12):
+            add_version(session, store, variables)
+
+        # A fresh store has nothing cached
+        rebuilt = VersionStore(snapshot_interval=5).load_contents(session, 1, [3, 9])
+
+        assert rebuilt == {3: expected[2], 9: expected[8]}
+
+    def test_deltas_are_smaller_than_snapshots(self, session, store):
+        versions = [add_version(session, store, variables) for variables in history(5)]
+
+        assert all(len(version.diff) < len(versions[0].diff) for version in versions[1:])
+
+    def test_unchanged_content_references_earlier_version(self, session, store):
+        variables = list(history(3))
+        for item in variables:
+            add_version(session, store, item)
+
+        rollback = add_version(session, store, variables[0])
+
+        assert decode_payload(rollback.diff) == {"kind": REFERENCE, "number": 1}
+        assert VersionStore().load_content(session, rollback) == render_content(variables[0])
+
+    def test_legacy_versions_have_no_content(self, session, store):
+        session.add(Version(contract_id=1, number=1, diff="Initial creation", content_hash="", is_current=False))
+        session.commit()
+
+        version = add_version(session, store, {"price": 1})
+
+        # Without a readable predecessor the new version is a snapshot
+        assert decode_payload(version.diff)["kind"] == SNAPSHOT
+        assert VersionStore().load_contents(session, 1, [1, 2]) == {1: None, 2: render_content({"price": 1})}
+
+    def test_corrupted_chain_fails_hash_check(self, session, store):
+        versions = [add_version(session, store, variables) for variables in history(3)]
+        versions[2].content_hash = "0" * 64
+        session.add(versions[2])
+        session.commit()
+
+        assert VersionStore().load_contents(session, 1, [3]) == {3: None}